@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
@@ -5,8 +6,33 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import os
 
-from app.core.config import PROJECT_NAME, PROJECT_DESCRIPTION, PROJECT_VERSION, API_V1_STR
+from app.core.config import (
+    PROJECT_NAME, PROJECT_DESCRIPTION, PROJECT_VERSION, API_V1_STR, STARTUP_BACKGROUND_INIT, WARMUP_ENABLED,
+    METRICS_ENABLED, DEBUG_ENDPOINTS_ENABLED
+)
+from app.api import health, metrics as metrics_api
 from app.api.v1 import api_router
+from app.services.like_counter_service import LikeCounterService
+from app.utils.startup import start_background_initialization
+from app.utils.metrics import MetricsMiddleware
+from app.utils.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期
+
+    启动时在后台执行数据库初始化和预热（不阻塞服务启动，进度见 /health/ready），
+    关闭时写入内存中缓冲的点赞计数
+    """
+    if STARTUP_BACKGROUND_INIT:
+        start_background_initialization()
+    if WARMUP_ENABLED:
+        warmup.start_background()
+    yield
+    LikeCounterService.shutdown()
+
 
 def create_app() -> FastAPI:
     """
@@ -21,7 +47,8 @@ def create_app() -> FastAPI:
         description=PROJECT_DESCRIPTION,
         version=PROJECT_VERSION,
         docs_url=None,  # 禁用默认文档
-        redoc_url=None  # 禁用默认 ReDoc
+        redoc_url=None,  # 禁用默认 ReDoc
+        lifespan=lifespan
     )
     
     # 配置 CORS
@@ -32,6 +59,10 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+
+    # 请求计时（最外层，包含 CORS 等中间件的耗时）
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
     
     # 自定义 API 文档路由
     @app.get("/api/docs", include_in_schema=False)
@@ -102,6 +133,15 @@ def create_app() -> FastAPI:
             }
         }
 
+    # 健康检查路由
+    app.include_router(health.router, tags=["health"])
+    if METRICS_ENABLED:
+        app.include_router(metrics_api.router, tags=["metrics"])
+    if DEBUG_ENDPOINTS_ENABLED:
+        # 诊断端点默认不挂载，需要时再导入
+        from app.api import debug
+        app.include_router(debug.router, prefix="/debug", tags=["debug"], include_in_schema=False)
+
     # 包含 API 路由
     app.include_router(api_router, prefix=API_V1_STR)
 
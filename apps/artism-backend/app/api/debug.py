@@ -0,0 +1,127 @@
+"""
+诊断端点
+
+只有 DEBUG_ENDPOINTS_ENABLED=True 时才会挂载，所有请求需要在 X-Debug-Token 请求头中携带 DEBUG_TOKEN：
+
+- POST /debug/profile/start?seconds=30：开始采样分析，时长到后自动结束；
+- POST /debug/profile/stop：提前结束采样；
+- GET  /debug/profile：获取 collapsed stack 格式的采样结果（text/plain，可直接生成火焰图）；
+- POST /debug/tracemalloc/start、/snapshot、/stop：内存分配跟踪、快照和差异对比；
+- GET  /debug/tasks：asyncio 任务栈和所有线程的调用栈。
+"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import DEBUG_TOKEN, DEBUG_PROFILE_MAX_SECONDS, DEBUG_PROFILE_INTERVAL_MS
+from app.schemas.response import create_success_response
+from app.utils.profiling import profiler, memory_tracer, dump_asyncio_tasks, dump_thread_stacks
+
+
+async def require_debug_token(x_debug_token: str = Header(default="")):
+    """
+    校验诊断令牌
+
+    未配置 DEBUG_TOKEN 时拒绝所有请求
+    """
+    if not DEBUG_TOKEN or not hmac.compare_digest(x_debug_token.encode(), DEBUG_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+router = APIRouter(dependencies=[Depends(require_debug_token)])
+
+
+@router.post("/profile/start")
+async def start_profile(
+    seconds: float = Query(10, gt=0, description="采样时长（秒）"),
+    interval_ms: float = Query(DEBUG_PROFILE_INTERVAL_MS, ge=1, description="采样间隔（毫秒）")
+):
+    """
+    开始采样分析
+    """
+    if seconds > DEBUG_PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {DEBUG_PROFILE_MAX_SECONDS}")
+    if not profiler.start(seconds, interval_ms / 1000):
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    return create_success_response(data=profiler.status(), message="采样已开始")
+
+
+@router.post("/profile/stop")
+async def stop_profile():
+    """
+    提前结束采样分析
+    """
+    profiler.stop()
+    return create_success_response(data=profiler.status(), message="采样已结束")
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile():
+    """
+    获取 collapsed stack 格式的采样结果
+
+    采样进行中时返回 409，状态见响应头 X-Profile-Samples
+    """
+    status = profiler.status()
+    if status["running"]:
+        raise HTTPException(status_code=409, detail="Profiler is still running")
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(status["samples"]),
+            "Content-Disposition": 'attachment; filename="profile.collapsed"',
+        }
+    )
+
+
+@router.get("/profile/status")
+async def get_profile_status():
+    """
+    获取采样状态
+    """
+    return create_success_response(data=profiler.status())
+
+
+@router.post("/tracemalloc/start")
+async def start_tracemalloc(frames: int = Query(10, ge=1, le=100, description="每次分配保留的调用栈深度")):
+    """
+    开始跟踪内存分配（跟踪期间分配会明显变慢，排查完成后请调用 stop）
+    """
+    started = memory_tracer.start(frames)
+    return create_success_response(data=memory_tracer.status(),
+                                   message="内存跟踪已开始" if started else "内存跟踪已在运行")
+
+
+@router.post("/tracemalloc/snapshot")
+async def take_tracemalloc_snapshot(limit: int = Query(20, ge=1, le=200)):
+    """
+    拍摄内存快照，返回当前占用最多的位置以及相对基线和上一次快照的增长
+    """
+    try:
+        return create_success_response(data=memory_tracer.snapshot(limit))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/tracemalloc/stop")
+async def stop_tracemalloc():
+    """
+    停止跟踪内存分配
+    """
+    memory_tracer.stop()
+    return create_success_response(data=memory_tracer.status(), message="内存跟踪已停止")
+
+
+@router.get("/tasks")
+async def get_tasks(limit: int = Query(20, ge=1, le=200, description="每个任务最多返回的帧数")):
+    """
+    导出 asyncio 任务栈和所有线程的调用栈
+    """
+    tasks = dump_asyncio_tasks(limit)
+    return create_success_response(data={
+        "task_count": len(tasks),
+        "tasks": tasks,
+        "threads": dump_thread_stacks(),
+    })
@@ -0,0 +1,52 @@
+"""
+健康检查端点
+
+- /health/live：进程存活即返回 200，不访问数据库；
+- /health/ready：启动初始化和预热全部完成后返回 200，否则返回 503，并附带各组件状态。
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.config import STARTUP_BACKGROUND_INIT, WARMUP_ENABLED
+from app.utils.startup import get_startup_status
+from app.utils.warmup import warmup
+
+router = APIRouter()
+
+
+@router.get("/health/live")
+async def liveness():
+    """
+    存活检查
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    就绪检查
+
+    返回启动初始化和各预热组件的状态，未就绪时状态码为 503
+    """
+    components = {}
+
+    if STARTUP_BACKGROUND_INIT:
+        startup = get_startup_status()
+        components["startup"] = {"status": startup["status"], "steps": startup["steps"]}
+        startup_ready = startup["ready"]
+    else:
+        startup_ready = True
+
+    if WARMUP_ENABLED:
+        components.update(warmup.components())
+        warmup_ready = warmup.is_ready()
+    else:
+        warmup_ready = True
+
+    ready = startup_ready and warmup_ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "components": components}
+    )
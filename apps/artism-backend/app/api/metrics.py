@@ -0,0 +1,23 @@
+"""
+Prometheus 指标端点
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.monitoring import command_listener
+from app.utils.metrics import metrics
+from app.utils.query_cache import query_cache
+from app.utils.singleflight import singleflight_group
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """
+    以 Prometheus 文本格式导出请求指标、数据库命令统计、查询缓存和请求合并统计
+    """
+    text = (metrics.render_prometheus() + command_listener.render_prometheus()
+            + query_cache.render_prometheus() + singleflight_group.render_prometheus())
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4; charset=utf-8")
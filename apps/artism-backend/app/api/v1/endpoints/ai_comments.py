@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 from app.schemas.comment import (
     CommentResponse,
@@ -13,6 +15,9 @@ from app.schemas.comment import (
 from app.services.ai_comment_service import AICommentService
 from app.services.comment_service import CommentService
 from app.schemas.response import APIResponse, create_success_response, create_error_response
+from app.utils.event_bus import event_bus, Event
+from app.utils import json_response
+from app.core.config import SSE_HEARTBEAT_SECONDS
 
 router = APIRouter()
 
@@ -94,6 +99,92 @@ async def get_recent_comments(limit: int = Query(20, description="返回评论
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching recent comments: {str(e)}")
 
+def _format_sse(event: Event) -> str:
+    """将总线事件编码为 SSE 消息"""
+    data = json_response.dumps(event.data).decode("utf-8")  # datetime 编码为 ISO 字符串
+    return f"id: {event.id}\nevent: {event.event}\ndata: {data}\n\n"
+
+
+def _format_reset() -> str:
+    """通知客户端回放缓冲区无法覆盖断线期间的事件，需要重新拉取 /recent"""
+    return f"id: {event_bus.last_event_id}\nevent: reset\ndata: {{}}\n\n"
+
+
+async def _comment_event_stream(request: Request, topic: str, last_event_id: Optional[int] = None,
+                                heartbeat: float = SSE_HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """
+    SSE 事件流生成器
+
+    订阅在生成器内部注册，保证连接结束时一定会取消订阅。
+
+    Args:
+        request: 当前请求，用于检测客户端断开
+        topic: 订阅的事件主题
+        last_event_id: 客户端最后收到的事件 ID
+        heartbeat: 心跳间隔（秒），用于保持连接并及时发现断开
+    """
+    subscription, replay, gap = event_bus.subscribe([topic], last_event_id=last_event_id)
+    try:
+        # 告知浏览器断线重连间隔
+        yield "retry: 3000\n\n"
+        if gap:
+            yield _format_reset()
+        for event in replay:
+            yield _format_sse(event)
+
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                # 消费过慢导致队列溢出，丢弃积压并让客户端重新同步
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                yield _format_reset()
+                continue
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse(event)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_comments(
+    request: Request,
+    target_type: Optional[str] = Query(None, description="只订阅指定目标类型的评论"),
+    target_id: Optional[str] = Query(None, description="只订阅指定目标的评论"),
+    last_event_id: Optional[int] = Query(None, description="断线续传：最后收到的事件 ID"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    新评论实时推送（Server-Sent Events）
+
+    由 CommentService.create_comment 发布到进程内事件总线，空闲连接不产生数据库查询。
+    浏览器 EventSource 断线重连时会自动携带 Last-Event-ID 请求头，服务端从回放缓冲区补发遗漏的事件；
+    缓冲区无法覆盖时推送 reset 事件，客户端应重新拉取 /recent。
+
+    Args:
+        target_type: 目标类型（需与 target_id 同时提供）
+        target_id: 目标 ID
+        last_event_id: 最后收到的事件 ID（优先使用 Last-Event-ID 请求头）
+
+    Returns:
+        StreamingResponse: text/event-stream 响应
+    """
+    if bool(target_type) != bool(target_id):
+        raise HTTPException(status_code=400, detail="target_type and target_id must be provided together")
+
+    topic = (CommentService.target_topic(target_type, target_id)
+             if target_type else CommentService.STREAM_TOPIC)
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    return StreamingResponse(
+        _comment_event_stream(request, topic, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/auto-generate")
 async def trigger_auto_generation(background_tasks: BackgroundTasks):
     """
@@ -135,7 +226,8 @@ async def get_comment_stats():
         Dict[str, Any]: 统计信息
     """
     try:
-        stats = CommentService.get_comment_stats()
+        # 在线程池中执行，并发请求才能合并为一次聚合
+        stats = await run_in_threadpool(CommentService.get_comment_stats)
 
         return {
             "success": True,
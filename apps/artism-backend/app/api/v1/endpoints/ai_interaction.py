@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from app.schemas.artist import AIInteractionRequest, AIInteractionResponse
 from app.services.ai_service import AIService
 
@@ -8,21 +9,31 @@ router = APIRouter()
 async def ai_interaction(request: AIInteractionRequest):
     """
     与 AI 艺术家交互
-    
+
     发送消息给 AI 艺术家并获取回复
-    
+
     Args:
         request: AI 交互请求，包含消息和可选的艺术家 ID
     """
     try:
-        # 检查 OpenAI API 密钥是否已配置
-        if not AIService.is_api_key_configured():
-            # 在开发环境中使用模拟响应
-            response = AIService.interact(request.message, request.artist_id)
-        else:
-            # 在生产环境中使用 OpenAI API
-            response = AIService.interact(request.message, request.artist_id)
-        
+        # 未配置 LLM_BACKEND 时 AIService 会返回模拟响应
+        response = await AIService.interact(request.message, request.artist_id)
+
         return response
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error in AI interaction: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error in AI interaction: {str(e)}")
+
+@router.post("/stream")
+async def ai_interaction_stream(request: AIInteractionRequest):
+    """
+    与 AI 艺术家交互（流式输出）
+
+    以纯文本流的形式逐个返回生成的 token
+
+    Args:
+        request: AI 交互请求，包含消息和可选的艺术家 ID
+    """
+    return StreamingResponse(
+        AIService.stream_interact(request.message, request.artist_id),
+        media_type="text/plain; charset=utf-8"
+    )
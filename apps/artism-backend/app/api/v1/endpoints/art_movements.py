@@ -1,33 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
 
 from app.schemas.art_movement import (
     ArtMovement, ArtMovementCreate, ArtMovementUpdate, ArtMovementDetail,
     ArtMovementStatistics, TimelineEntry, PeriodQuery, ArtistMovementRequest, ArtworkMovementRequest
 )
-from app.schemas.response import APIResponse, PaginatedResponse
+from app.schemas.response import APIResponse, PaginatedResponse, BatchGetRequest, BatchResult
 from app.services.art_movement_service import ArtMovementService
-from app.utils.query_params import QueryParams
+from app.utils.query_params import QueryParams, ProjectionProfile
+from app.utils.json_response import render_response
+from app.utils import http_cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=PaginatedResponse[ArtMovement])
-async def get_art_movements(params: QueryParams = Depends()):
+async def get_art_movements(request: Request, response: Response, params: QueryParams = Depends()):
     """
     获取所有艺术运动
     
     支持查询参数：project, fields, include, search, tags, yearFrom, yearTo, sortBy, order, page, pageSize
     """
     try:
-        response = ArtMovementService.get_all(params)
-        return response
+        return http_cache.cached_list(
+            request, response,
+            lambda: render_response(ArtMovementService.get_all(params)),
+            ArtMovementService.dependent_collections(params.include)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching art movements: {str(e)}")
 
 
 @router.get("/{movement_id}", response_model=APIResponse[ArtMovement])
-async def get_art_movement(movement_id: str = Path(..., description="艺术运动ID")):
+async def get_art_movement(request: Request, response: Response,
+                           movement_id: str = Path(..., description="艺术运动ID"),
+                           include: Optional[str] = Query(None, description="填充关联字段，用逗号分隔")):
     """
     获取特定艺术运动
     
@@ -35,10 +43,10 @@ async def get_art_movement(movement_id: str = Path(..., description="艺术运
     
     Args:
         movement_id: 艺术运动ID
+        include: 填充关联字段，如 keyArtists,representativeWorks
     """
     try:
-        response = ArtMovementService.get_by_id(movement_id)
-        return response
+        return http_cache.cached_record(request, response, ArtMovementService, movement_id, include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching art movement: {str(e)}")
 
@@ -60,6 +68,21 @@ async def create_art_movement(movement: ArtMovementCreate):
         raise HTTPException(status_code=500, detail=f"Error creating art movement: {str(e)}")
 
 
+@router.post("/batch", response_model=APIResponse[BatchResult])
+async def get_art_movements_batch(request: BatchGetRequest):
+    """
+    按 ID 批量获取艺术运动
+
+    一次查询返回多个艺术运动，结果按请求的 ID 顺序排列，不存在的 ID 列在 missing 中
+
+    Args:
+        request: 批量获取请求，如 {"ids": ["m1", "m2"], "fields": ["name"]}
+    """
+    try:
+        return render_response(ArtMovementService.get_many(request.ids, request.fields, request.use_cache))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching art movements: {str(e)}")
+
 @router.put("/{movement_id}", response_model=APIResponse[ArtMovement])
 async def update_art_movement(
     movement_update: ArtMovementUpdate,
@@ -103,7 +126,8 @@ async def delete_art_movement(movement_id: str = Path(..., description="艺术
 @router.get("/search/", response_model=APIResponse[List[ArtMovement]])
 async def search_art_movements(
     query: str = Query(..., description="搜索关键词"),
-    limit: int = Query(10, description="结果数量限制")
+    limit: int = Query(10, description="结果数量限制"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     搜索艺术运动
@@ -115,7 +139,7 @@ async def search_art_movements(
         limit: 结果数量限制
     """
     try:
-        movements = ArtMovementService.search_movements(query, limit)
+        movements = ArtMovementService.search_movements(query, limit, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=movements, message=f"找到 {len(movements)} 个匹配的艺术运动")
     except Exception as e:
@@ -125,7 +149,8 @@ async def search_art_movements(
 @router.get("/period/", response_model=APIResponse[List[ArtMovement]])
 async def get_movements_by_period(
     start_year: int = Query(..., description="起始年份"),
-    end_year: int = Query(..., description="结束年份")
+    end_year: int = Query(..., description="结束年份"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     根据时期获取艺术运动
@@ -137,7 +162,7 @@ async def get_movements_by_period(
         end_year: 结束年份
     """
     try:
-        movements = ArtMovementService.get_movements_by_period(start_year, end_year)
+        movements = ArtMovementService.get_movements_by_period(start_year, end_year, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(
             data=movements, 
@@ -148,7 +173,10 @@ async def get_movements_by_period(
 
 
 @router.get("/active/{year}", response_model=APIResponse[List[ArtMovement]])
-async def get_active_movements(year: int = Path(..., description="指定年份")):
+async def get_active_movements(
+    year: int = Path(..., description="指定年份"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取指定年份活跃的艺术运动
     
@@ -156,7 +184,7 @@ async def get_active_movements(year: int = Path(..., description="指定年份")
         year: 指定年份
     """
     try:
-        movements = ArtMovementService.get_active_movements(year)
+        movements = ArtMovementService.get_active_movements(year, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(
             data=movements, 
@@ -167,14 +195,17 @@ async def get_active_movements(year: int = Path(..., description="指定年份")
 
 
 @router.get("/timeline/", response_model=APIResponse[List[ArtMovement]])
-async def get_movements_timeline():
+async def get_movements_timeline(
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取艺术运动时间线
     
     按时间顺序返回所有艺术运动
     """
     try:
-        movements = ArtMovementService.get_movements_timeline()
+        # 在线程池中执行，并发请求才能合并为一次查询
+        movements = await run_in_threadpool(ArtMovementService.get_movements_timeline, profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=movements, message=f"获取到 {len(movements)} 个艺术运动的时间线")
     except Exception as e:
@@ -203,7 +234,10 @@ async def get_movement_statistics(movement_id: str = Path(..., description="艺
 
 
 @router.get("/artist/{artist_id}", response_model=APIResponse[List[ArtMovement]])
-async def get_movements_by_artist(artist_id: str = Path(..., description="艺术家ID")):
+async def get_movements_by_artist(
+    artist_id: str = Path(..., description="艺术家ID"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     根据艺术家获取相关艺术运动
     
@@ -211,7 +245,7 @@ async def get_movements_by_artist(artist_id: str = Path(..., description="艺术
         artist_id: 艺术家ID
     """
     try:
-        movements = ArtMovementService.get_movements_by_artist(artist_id)
+        movements = ArtMovementService.get_movements_by_artist(artist_id, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=movements, message=f"找到 {len(movements)} 个相关艺术运动")
     except Exception as e:
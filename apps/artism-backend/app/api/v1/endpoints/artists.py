@@ -1,28 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
 from typing import List, Optional
 
 from app.schemas.artist import Artist, ArtistCreate, ArtistUpdate, ArtistResponse
-from app.schemas.response import APIResponse, PaginatedResponse
+from app.schemas.response import APIResponse, PaginatedResponse, BatchGetRequest, BatchResult
 from app.services.artist_service import ArtistService
-from app.utils.query_params import QueryParams
+from app.utils.query_params import QueryParams, ProjectionProfile
+from app.utils.json_response import render_response
+from app.utils import http_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=PaginatedResponse[Artist])
-async def get_artists(params: QueryParams = Depends()):
+async def get_artists(request: Request, response: Response, params: QueryParams = Depends()):
     """
     获取所有艺术家
 
     支持查询参数：project, fields, include, search, tags, yearFrom, yearTo, sortBy, order, page, pageSize, isFictional
     """
     try:
-        response = ArtistService.get_all(params)
-        return response
+        return http_cache.cached_list(
+            request, response,
+            lambda: render_response(ArtistService.get_all(params)),
+            ArtistService.dependent_collections(params.include)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching artists: {str(e)}")
 
 @router.get("/{artist_id}", response_model=APIResponse[Artist])
-async def get_artist(artist_id: str = Path(..., description="艺术家ID")):
+async def get_artist(request: Request, response: Response,
+                     artist_id: str = Path(..., description="艺术家ID"),
+                     include: Optional[str] = Query(None, description="填充关联字段，用逗号分隔")):
     """
     获取特定艺术家
 
@@ -30,10 +37,10 @@ async def get_artist(artist_id: str = Path(..., description="艺术家ID")):
 
     Args:
         artist_id: 艺术家ID
+        include: 填充关联字段，如 notableWorks,associatedMovements
     """
     try:
-        response = ArtistService.get_by_id(artist_id)
-        return response
+        return http_cache.cached_record(request, response, ArtistService, artist_id, include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching artist: {str(e)}")
 
@@ -53,6 +60,21 @@ async def create_artist(artist: ArtistCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating artist: {str(e)}")
 
+@router.post("/batch", response_model=APIResponse[BatchResult])
+async def get_artists_batch(request: BatchGetRequest):
+    """
+    按 ID 批量获取艺术家
+
+    一次查询返回多个艺术家，结果按请求的 ID 顺序排列，不存在的 ID 列在 missing 中
+
+    Args:
+        request: 批量获取请求，如 {"ids": ["a1", "a2"], "fields": ["name", "avatar_url"]}
+    """
+    try:
+        return render_response(ArtistService.get_many(request.ids, request.fields, request.use_cache))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching artists: {str(e)}")
+
 @router.put("/{artist_id}", response_model=APIResponse[Artist])
 async def update_artist(
     artist_update: ArtistUpdate,
@@ -95,7 +117,8 @@ async def delete_artist(artist_id: str = Path(..., description="艺术家ID")):
 @router.get("/search/", response_model=APIResponse[List[Artist]])
 async def search_artists(
     query: str = Query(..., description="搜索关键词"),
-    limit: int = Query(10, description="结果数量限制")
+    limit: int = Query(10, description="结果数量限制"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     搜索艺术家
@@ -107,7 +130,7 @@ async def search_artists(
         limit: 结果数量限制
     """
     try:
-        artists = ArtistService.search_artists(query, limit)
+        artists = ArtistService.search_artists(query, limit, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artists, message=f"找到 {len(artists)} 个匹配的艺术家")
     except Exception as e:
@@ -115,7 +138,8 @@ async def search_artists(
 
 @router.get("/fictional/", response_model=APIResponse[List[Artist]])
 async def get_fictional_artists(
-    project: Optional[str] = Query(None, description="项目名称筛选")
+    project: Optional[str] = Query(None, description="项目名称筛选"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     获取虚构艺术家
@@ -124,26 +148,31 @@ async def get_fictional_artists(
         project: 项目名称筛选（如 'zhuyizhuyi'）
     """
     try:
-        artists = ArtistService.get_fictional_artists(project)
+        artists = ArtistService.get_fictional_artists(project, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artists, message=f"找到 {len(artists)} 个虚构艺术家")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching fictional artists: {str(e)}")
 
 @router.get("/real/", response_model=APIResponse[List[Artist]])
-async def get_real_artists():
+async def get_real_artists(
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取真实艺术家
     """
     try:
-        artists = ArtistService.get_real_artists()
+        artists = ArtistService.get_real_artists(profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artists, message=f"找到 {len(artists)} 个真实艺术家")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching real artists: {str(e)}")
 
 @router.get("/{artist_id}/social-network/", response_model=APIResponse[List[Artist]])
-async def get_artist_social_network(artist_id: str = Path(..., description="艺术家ID")):
+async def get_artist_social_network(
+    artist_id: str = Path(..., description="艺术家ID"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取艺术家的社交网络
 
@@ -151,7 +180,7 @@ async def get_artist_social_network(artist_id: str = Path(..., description="艺
         artist_id: 艺术家ID
     """
     try:
-        connected_artists = ArtistService.get_artist_social_network(artist_id)
+        connected_artists = ArtistService.get_artist_social_network(artist_id, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=connected_artists, message=f"找到 {len(connected_artists)} 个连接的艺术家")
     except Exception as e:
@@ -1,31 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
 from typing import List, Optional
 
 from app.schemas.artwork import Artwork, ArtworkCreate, ArtworkUpdate, ArtworkResponse, SimilarArtworkRequest
-from app.schemas.response import APIResponse, PaginatedResponse
+from app.schemas.response import APIResponse, PaginatedResponse, BatchGetRequest, BatchResult
 from app.services.artwork_service import ArtworkService
 from app.services.artist_service import ArtistService
-from app.utils.query_params import QueryParams
+from app.utils.query_params import QueryParams, ProjectionProfile
+from app.utils.json_response import render_response
+from app.utils import http_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=PaginatedResponse[Artwork])
-async def get_artworks(params: QueryParams = Depends()):
+async def get_artworks(request: Request, response: Response, params: QueryParams = Depends()):
     """
     获取所有艺术品
 
     支持查询参数：project, fields, include, search, tags, yearFrom, yearTo, sortBy, order, page, pageSize
     """
     try:
-        response = ArtworkService.get_all(params)
-        return response
+        return http_cache.cached_list(
+            request, response,
+            lambda: render_response(ArtworkService.get_all(params)),
+            ArtworkService.dependent_collections(params.include)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching artworks: {str(e)}")
 
 # Removed import_test_data endpoint - will be handled by data generation utilities
 
 @router.get("/{artwork_id}", response_model=APIResponse[Artwork])
-async def get_artwork(artwork_id: str = Path(..., description="艺术品ID")):
+async def get_artwork(request: Request, response: Response,
+                      artwork_id: str = Path(..., description="艺术品ID"),
+                      include: Optional[str] = Query(None, description="填充关联字段，用逗号分隔")):
     """
     获取特定艺术品
 
@@ -33,10 +40,10 @@ async def get_artwork(artwork_id: str = Path(..., description="艺术品ID")):
 
     Args:
         artwork_id: 艺术品ID
+        include: 填充关联字段，如 artist,movements
     """
     try:
-        response = ArtworkService.get_by_id(artwork_id)
-        return response
+        return http_cache.cached_record(request, response, ArtworkService, artwork_id, include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching artwork: {str(e)}")
 
@@ -56,6 +63,21 @@ async def create_artwork(artwork: ArtworkCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating artwork: {str(e)}")
 
+@router.post("/batch", response_model=APIResponse[BatchResult])
+async def get_artworks_batch(request: BatchGetRequest):
+    """
+    按 ID 批量获取艺术品
+
+    一次查询返回多个艺术品，结果按请求的 ID 顺序排列，不存在的 ID 列在 missing 中
+
+    Args:
+        request: 批量获取请求，如 {"ids": ["w1", "w2"], "fields": ["title", "image_url"]}
+    """
+    try:
+        return render_response(ArtworkService.get_many(request.ids, request.fields, request.use_cache))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching artworks: {str(e)}")
+
 @router.put("/{artwork_id}", response_model=APIResponse[Artwork])
 async def update_artwork(artwork_data: ArtworkUpdate, artwork_id: str = Path(..., description="艺术品ID")):
     """
@@ -92,7 +114,10 @@ async def delete_artwork(artwork_id: str = Path(..., description="艺术品ID"))
         raise HTTPException(status_code=500, detail=f"Error deleting artwork: {str(e)}")
 
 @router.get("/artist/{artist_id}", response_model=APIResponse[List[Artwork]])
-async def get_artworks_by_artist(artist_id: str = Path(..., description="艺术家ID")):
+async def get_artworks_by_artist(
+    artist_id: str = Path(..., description="艺术家ID"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取艺术家的艺术品
 
@@ -102,7 +127,7 @@ async def get_artworks_by_artist(artist_id: str = Path(..., description="艺术
         artist_id: 艺术家ID
     """
     try:
-        artworks = ArtworkService.get_artworks_by_artist(artist_id)
+        artworks = ArtworkService.get_artworks_by_artist(artist_id, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artworks, message=f"找到 {len(artworks)} 件作品")
     except Exception as e:
@@ -112,7 +137,8 @@ async def get_artworks_by_artist(artist_id: str = Path(..., description="艺术
 async def get_similar_artworks(
     artwork_id: str = Path(..., description="艺术品ID"),
     threshold: float = Query(0.8, ge=0.0, le=1.0, description="相似度阈值"),
-    limit: int = Query(10, ge=1, le=50, description="返回结果数量限制")
+    limit: int = Query(10, ge=1, le=50, description="返回结果数量限制"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     获取相似艺术品
@@ -125,7 +151,7 @@ async def get_similar_artworks(
         limit: 返回结果数量限制
     """
     try:
-        similar_artworks = ArtworkService.get_similar_artworks(artwork_id, threshold, limit)
+        similar_artworks = ArtworkService.get_similar_artworks(artwork_id, threshold, limit, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(
             data=similar_artworks,
@@ -135,7 +161,10 @@ async def get_similar_artworks(
         raise HTTPException(status_code=500, detail=f"Error fetching similar artworks: {str(e)}")
 
 @router.get("/movement/{movement_id}", response_model=APIResponse[List[Artwork]])
-async def get_artworks_by_movement(movement_id: str = Path(..., description="艺术运动ID")):
+async def get_artworks_by_movement(
+    movement_id: str = Path(..., description="艺术运动ID"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
+):
     """
     获取艺术运动的代表作品
 
@@ -143,7 +172,7 @@ async def get_artworks_by_movement(movement_id: str = Path(..., description="艺
         movement_id: 艺术运动ID
     """
     try:
-        artworks = ArtworkService.get_artworks_by_movement(movement_id)
+        artworks = ArtworkService.get_artworks_by_movement(movement_id, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artworks, message=f"找到 {len(artworks)} 件代表作品")
     except Exception as e:
@@ -152,7 +181,8 @@ async def get_artworks_by_movement(movement_id: str = Path(..., description="艺
 @router.get("/style/search", response_model=APIResponse[List[Artwork]])
 async def search_artworks_by_style(
     tags: str = Query(..., description="风格标签，用逗号分隔"),
-    limit: int = Query(10, ge=1, le=50, description="返回结果数量限制")
+    limit: int = Query(10, ge=1, le=50, description="返回结果数量限制"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     根据风格标签搜索作品
@@ -163,7 +193,7 @@ async def search_artworks_by_style(
     """
     try:
         style_tags = [tag.strip() for tag in tags.split(",") if tag.strip()]
-        artworks = ArtworkService.search_artworks_by_style(style_tags, limit)
+        artworks = ArtworkService.search_artworks_by_style(style_tags, limit, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(data=artworks, message=f"找到 {len(artworks)} 件匹配作品")
     except Exception as e:
@@ -172,7 +202,8 @@ async def search_artworks_by_style(
 @router.get("/year-range/", response_model=APIResponse[List[Artwork]])
 async def get_artworks_by_year_range(
     start_year: int = Query(..., description="起始年份"),
-    end_year: int = Query(..., description="结束年份")
+    end_year: int = Query(..., description="结束年份"),
+    profile: Optional[ProjectionProfile] = Query(None, description="投影配置：summary / card / full，默认 card")
 ):
     """
     根据年份范围获取作品
@@ -182,7 +213,7 @@ async def get_artworks_by_year_range(
         end_year: 结束年份
     """
     try:
-        artworks = ArtworkService.get_artworks_by_year_range(start_year, end_year)
+        artworks = ArtworkService.get_artworks_by_year_range(start_year, end_year, profile=profile)
         from app.schemas.response import create_success_response
         return create_success_response(
             data=artworks,
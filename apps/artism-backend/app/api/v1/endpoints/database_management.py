@@ -2,7 +2,8 @@ from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 
 from app.schemas.response import APIResponse
-from app.utils.database_setup import DatabaseSetup, DatabaseMigration
+from app.utils.database_setup import DatabaseSetup
+from app.utils.migrations import run_pending_migrations
 
 router = APIRouter()
 
@@ -119,14 +120,16 @@ async def get_database_stats():
 @router.post("/migrate", response_model=APIResponse)
 async def migrate_database():
     """
-    执行数据库迁移
+    执行尚未执行的数据库迁移
+
+    与启动时相同，经过迁移注册表（app.utils.migrations）执行并记录版本，已执行的迁移不会重复执行。
     """
     try:
-        DatabaseMigration.migrate_to_new_schema()
-        DatabaseMigration.add_timestamps()
+        applied = run_pending_migrations()
         
         from app.schemas.response import create_success_response
         return create_success_response(
+            data={"applied": applied},
             message="数据库迁移完成"
         )
         
@@ -168,6 +171,61 @@ async def reset_database():
         raise HTTPException(status_code=500, detail=f"Error resetting database: {str(e)}")
 
 
+@router.get("/startup-status", response_model=APIResponse)
+async def get_startup_status():
+    """
+    获取启动初始化状态（不访问数据库）
+
+    包括后台初始化各步骤的进度和耗时
+    """
+    from app.utils.startup import get_startup_status as startup_status
+    from app.schemas.response import create_success_response
+
+    return create_success_response(data=startup_status())
+
+
+@router.get("/migrations", response_model=APIResponse)
+async def list_migrations():
+    """
+    列出已注册的迁移及执行状态
+    """
+    try:
+        from app.utils.migrations import get_migrations, get_applied_versions
+        from app.schemas.response import create_success_response
+
+        applied = get_applied_versions()
+        migrations = [
+            {
+                "version": item.version,
+                "name": item.name,
+                "applied": item.version in applied,
+                "applied_at": applied[item.version].get("applied_at") if item.version in applied else None
+            }
+            for item in get_migrations()
+        ]
+        return create_success_response(data=migrations)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing migrations: {str(e)}")
+
+
+@router.get("/command-stats", response_model=APIResponse)
+async def get_command_stats(slow_limit: int = 50):
+    """
+    获取数据库命令统计和最近的慢查询
+
+    统计来自 pymongo 命令监听器，使用 mongomock 时为空
+    """
+    from app.db.monitoring import command_listener
+    from app.schemas.response import create_success_response
+
+    return create_success_response(data={
+        "slow_query_ms": command_listener.slow_query_ms,
+        "commands": command_listener.snapshot(),
+        "slow_queries": command_listener.slow_queries(slow_limit),
+    })
+
+
 @router.get("/health", response_model=APIResponse)
 async def check_database_health():
     """
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from app.schemas.post import (
@@ -17,30 +18,58 @@ router = APIRouter()
 @router.get("/", response_model=Dict[str, Any])
 async def get_posts(
     skip: int = Query(0, description="跳过的帖子数"),
-    limit: int = Query(20, description="返回帖子数量限制")
+    limit: int = Query(20, description="返回帖子数量限制"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）")
 ):
     """
-    获取帖子列表
+    获取帖子列表（首页动态流）
     
     Args:
-        skip: 跳过的帖子数
+        skip: 跳过的帖子数（建议改用 cursor 分页）
         limit: 返回帖子数量限制
+        cursor: 分页游标
         
     Returns:
-        Dict[str, Any]: 帖子列表
+        Dict[str, Any]: 帖子列表和下一页游标
     """
     try:
-        posts = PostService.get_recent_posts(limit=limit, skip=skip)
+        page = PostService.get_feed_page(limit=limit, cursor=cursor, skip=skip)
         
         return {
             "success": True,
-            "posts": posts,
-            "total": len(posts)
+            "posts": page["posts"],
+            "total": len(page["posts"]),
+            "next_cursor": page["next_cursor"]
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching posts: {str(e)}")
 
+@router.get("/trending", response_model=Dict[str, Any])
+async def get_trending_posts(limit: int = Query(10, ge=1, le=100, description="返回帖子数量限制")):
+    """
+    获取热门帖子
+
+    按点赞、评论、浏览的时间衰减加权热度排序
+
+    Args:
+        limit: 返回帖子数量限制
+
+    Returns:
+        Dict[str, Any]: 热门帖子列表（附带 trending_score）
+    """
+    try:
+        posts = PostService.get_trending_posts(limit=limit)
+
+        return {
+            "success": True,
+            "posts": posts,
+            "total": len(posts)
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching trending posts: {str(e)}")
+
 @router.get("/{post_id}", response_model=Dict[str, Any])
 async def get_post(post_id: str):
     """
@@ -213,7 +242,8 @@ async def get_post_stats():
         Dict[str, Any]: 统计信息
     """
     try:
-        stats = PostService.get_post_stats()
+        # 在线程池中执行，并发请求才能合并为一次聚合
+        stats = await run_in_threadpool(PostService.get_post_stats)
         
         return {
             "success": True,
@@ -41,6 +41,13 @@ DATABASE_NAME = os.getenv("DATABASE_NAME", "aida")
 ARTISTS_COLLECTION = "artists"
 ARTWORKS_COLLECTION = "artworks"
 ART_MOVEMENTS_COLLECTION = "art_movements"
+POSTS_COLLECTION = "posts"
+POST_FEED_COLLECTION = "post_feed"
+POST_LIKE_SHARDS_COLLECTION = "post_like_shards"
+# 集合级元数据（例如是否可能含有 CSV 导入遗留的 NaN 值）
+COLLECTION_META_COLLECTION = "_collection_meta"
+# 已执行的数据库迁移记录
+MIGRATIONS_COLLECTION = "_migrations"
 
 # 安全配置
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key-for-jwt")
@@ -50,5 +57,138 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # OpenAI 配置
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+# LLM 生成后端配置
+# LLM_BACKEND: 留空表示禁用（使用模板生成），"stub" 为本地桩后端，"openai" 为 OpenAI 兼容接口
+LLM_BACKEND = os.getenv("LLM_BACKEND", "").lower()
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.openai.com/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo-instruct")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
+LLM_BATCH_WINDOW_MS = float(os.getenv("LLM_BATCH_WINDOW_MS", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "30"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "300"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "256"))
+
+# 实时推送（进程内事件总线 / SSE）配置
+EVENT_BUS_REPLAY_SIZE = int(os.getenv("EVENT_BUS_REPLAY_SIZE", "1000"))
+EVENT_BUS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_BUS_SUBSCRIBER_QUEUE_SIZE", "256"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# 首页动态流配置
+# FEED_MAX_ENTRIES: 动态流保留的最新帖子数量；每写入 FEED_TRIM_EVERY 条帖子裁剪一次
+FEED_MAX_ENTRIES = int(os.getenv("FEED_MAX_ENTRIES", "10000"))
+FEED_TRIM_EVERY = int(os.getenv("FEED_TRIM_EVERY", "100"))
+
+# 热门帖子排行配置
+# 热度 = Σ 权重 × 2^(-距今时间 / 半衰期)
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "6"))
+TRENDING_WEIGHT_POST = float(os.getenv("TRENDING_WEIGHT_POST", "1"))
+TRENDING_WEIGHT_LIKE = float(os.getenv("TRENDING_WEIGHT_LIKE", "1"))
+TRENDING_WEIGHT_COMMENT = float(os.getenv("TRENDING_WEIGHT_COMMENT", "3"))
+TRENDING_WEIGHT_VIEW = float(os.getenv("TRENDING_WEIGHT_VIEW", "0.2"))
+TRENDING_MAX_POSTS = int(os.getenv("TRENDING_MAX_POSTS", "5000"))
+# TRENDING_LOAD_HALF_LIVES: 初始化排行时只读取最近若干个半衰期内创建的帖子（更早的帖子热度已衰减到可忽略）
+TRENDING_LOAD_HALF_LIVES = float(os.getenv("TRENDING_LOAD_HALF_LIVES", "10"))
+
+# 点赞计数缓冲配置
+# 点赞先在内存中累加，每 LIKE_FLUSH_INTERVAL_SECONDS 秒或累计 LIKE_FLUSH_MAX_PENDING 次后批量写入
+# LIKE_COUNTER_SHARDS > 1 时把增量分散写入多个计数分片，读取时求和（0 或 1 表示直接写帖子文档）
+LIKE_BUFFER_ENABLED = os.getenv("LIKE_BUFFER_ENABLED", "True").lower() == "true"
+LIKE_FLUSH_INTERVAL_SECONDS = float(os.getenv("LIKE_FLUSH_INTERVAL_SECONDS", "1.0"))
+LIKE_FLUSH_MAX_PENDING = int(os.getenv("LIKE_FLUSH_MAX_PENDING", "1000"))
+LIKE_COUNTER_SHARDS = int(os.getenv("LIKE_COUNTER_SHARDS", "0"))
+
+# 快速 JSON 响应：列表等端点跳过 response_model 二次校验，使用 orjson（如已安装）直接编码
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "False").lower() == "true"
+
+# 启动初始化配置
+# 集合检查、迁移和索引创建在应用启动后于后台线程执行，不阻塞服务启动；设为 False 时跳过
+STARTUP_BACKGROUND_INIT = os.getenv("STARTUP_BACKGROUND_INIT", "True").lower() == "true"
+
+# 预热配置
+# 新 worker 启动后并行预加载缓存和索引，完成前 /health/ready 返回 503
+# WARMUP_COMPONENTS: 逗号分隔的组件名称，留空表示全部（mongodb, artist_profiles, style_vectors, feed, trending）
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True").lower() == "true"
+WARMUP_COMPONENTS = [name.strip() for name in os.getenv("WARMUP_COMPONENTS", "").split(",") if name.strip()]
+WARMUP_MAX_WORKERS = int(os.getenv("WARMUP_MAX_WORKERS", "4"))
+ARTIST_PROFILE_CACHE_TTL_SECONDS = float(os.getenv("ARTIST_PROFILE_CACHE_TTL_SECONDS", "300"))
+ARTIST_PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("ARTIST_PROFILE_CACHE_MAX_ENTRIES", "10000"))
+STYLE_VECTOR_INDEX_TTL_SECONDS = float(os.getenv("STYLE_VECTOR_INDEX_TTL_SECONDS", "300"))
+
+# 请求指标配置
+# 按路由模板记录延迟直方图、状态码和阶段耗时，在 /metrics 以 Prometheus 文本格式导出
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+METRICS_LATENCY_BUCKETS = [
+    float(bound) for bound in
+    os.getenv("METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")
+    if bound.strip()
+]
+
+# 数据库命令监控配置
+# 记录每个命令的耗时和按命令、集合的计数；超过 DB_SLOW_QUERY_MS 的命令以归一化的查询结构写入慢查询日志
+# DB_ROUND_TRIPS_HEADER=True 时在响应头 X-DB-Round-Trips 中返回请求的数据库往返次数（调试用）
+DB_COMMAND_MONITORING = os.getenv("DB_COMMAND_MONITORING", "True").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+DB_SLOW_LOG_SIZE = int(os.getenv("DB_SLOW_LOG_SIZE", "200"))
+DB_ROUND_TRIPS_HEADER = os.getenv("DB_ROUND_TRIPS_HEADER", "False").lower() == "true"
+
+# HTTP 条件请求配置
+# 详情端点的 ETag 由记录的 updated_at 生成，列表端点由集合版本号（每次写入递增）和查询参数生成，
+# If-None-Match 命中时在查询和序列化之前返回 304
+# COLLECTION_VERSION_CACHE_SECONDS: 进程内缓存集合版本号的时长（本进程的写入立即可见，其他 worker 的写入最多延迟该时长），
+# 0 表示每次读取元数据集合（多 worker 下最准确，但每次检查都多一次往返）
+HTTP_ETAGS_ENABLED = os.getenv("HTTP_ETAGS_ENABLED", "True").lower() == "true"
+HTTP_CACHE_CONTROL_DETAIL = os.getenv("HTTP_CACHE_CONTROL_DETAIL", "public, max-age=30, must-revalidate")
+HTTP_CACHE_CONTROL_LIST = os.getenv("HTTP_CACHE_CONTROL_LIST", "public, no-cache")
+COLLECTION_VERSION_CACHE_SECONDS = float(os.getenv("COLLECTION_VERSION_CACHE_SECONDS", "1"))
+
+# 查询结果缓存配置
+# BaseService.get_all 的结果按规范化的查询参数缓存，集合版本号变化（任何写入）时立即失效
+# QUERY_CACHE_MAX_BYTES: 缓存结果编码后的总字节数上限，超出时淘汰最久未使用的条目
+# 超过 QUERY_CACHE_TTL_SECONDS 的条目在随后 QUERY_CACHE_STALE_SECONDS 内仍直接返回，同时在后台刷新
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "True").lower() == "true"
+QUERY_CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "30"))
+QUERY_CACHE_STALE_SECONDS = float(os.getenv("QUERY_CACHE_STALE_SECONDS", "30"))
+
+# 关联填充配置
+# include 参数按关联类型各执行一次 $in 查询，结果写入记录的 included 字段
+# INCLUDE_MAX_PER_RECORD: 每条记录每种关联最多展开的 ID 数；INCLUDE_MAX_IDS: 每种关联一次最多查询的 ID 数
+INCLUDE_MAX_PER_RECORD = int(os.getenv("INCLUDE_MAX_PER_RECORD", "50"))
+INCLUDE_MAX_IDS = int(os.getenv("INCLUDE_MAX_IDS", "500"))
+
+# 列表投影配置
+# 列表方法默认使用的投影配置：summary（只含展示字段）、card（排除长文本和向量等大字段）或 full（完整记录）
+# 请求可通过 profile 或 fields 参数覆盖；详情端点始终返回完整记录
+LIST_PROJECTION_PROFILE = os.getenv("LIST_PROJECTION_PROFILE", "card")
+
+# 批量获取配置
+# POST /artists/batch 等端点一次最多获取的 ID 数
+BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", "100"))
+
+# 请求合并配置
+# 统计、时间线等开销大的读取在并发调用相同参数时只执行一次，其余请求共享结果（见 app/utils/singleflight.py）
+REQUEST_COALESCING_ENABLED = os.getenv("REQUEST_COALESCING_ENABLED", "True").lower() == "true"
+
+# 数据迁移配置
+# 逐批改写文档的迁移（例如时间戳转换为 BSON 日期）每批读取和写入的文档数
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+
+# 主键存储配置
+# UUID_PRIMARY_KEYS=True 时评论、评论线程和帖子以二进制 UUID 作为 _id，不再单独保存 id 字段（见 app/utils/primary_key.py）
+# 开启后启动时执行迁移改写已有文档；开启后不支持再关闭
+UUID_PRIMARY_KEYS = os.getenv("UUID_PRIMARY_KEYS", "False").lower() == "true"
+
+# 诊断端点配置
+# DEBUG_ENDPOINTS_ENABLED=True 时挂载 /debug 路由（采样分析、tracemalloc、asyncio 任务栈），默认关闭且不产生任何开销
+# 所有请求必须在 X-Debug-Token 请求头中携带 DEBUG_TOKEN；DEBUG_TOKEN 为空时一律拒绝
+DEBUG_ENDPOINTS_ENABLED = os.getenv("DEBUG_ENDPOINTS_ENABLED", "False").lower() == "true"
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
+DEBUG_PROFILE_MAX_SECONDS = float(os.getenv("DEBUG_PROFILE_MAX_SECONDS", "60"))
+DEBUG_PROFILE_INTERVAL_MS = float(os.getenv("DEBUG_PROFILE_INTERVAL_MS", "5"))
+
 # 数据目录
 DATA_DIR = BASE_DIR.parent / "data" 
\ No newline at end of file
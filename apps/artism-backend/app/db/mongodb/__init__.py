@@ -19,7 +19,8 @@ def get_client():
             _client = mongomock.MongoClient()
         else:
             print(f"Connecting to MongoDB: {MONGODB_URI}")
-            _client = pymongo.MongoClient(MONGODB_URI)
+            from app.db.monitoring import command_listener
+            _client = pymongo.MongoClient(MONGODB_URI, event_listeners=[command_listener])
     return _client
 
 def get_database():
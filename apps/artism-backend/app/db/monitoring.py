@@ -0,0 +1,241 @@
+"""
+MongoDB 命令监听
+
+pymongo 在发起命令的线程中同步回调 CommandListener，因此可以通过上下文变量
+把命令耗时计入当前 HTTP 请求的 db 阶段、把命令数计入 db_round_trips（见 app.utils.metrics）。
+
+同时按 (命令, 集合) 统计次数、失败数和耗时；耗时超过 DB_SLOW_QUERY_MS 的命令以归一化的
+查询结构（字段和操作符保留，值替换为 "?"）写入慢查询日志，相同结构的查询可以直接归并。
+mongomock 不会触发命令事件。
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import threading
+
+from pymongo import monitoring
+
+from app.core.config import DB_COMMAND_MONITORING, DB_SLOW_QUERY_MS, DB_SLOW_LOG_SIZE
+from app.utils.metrics import record_count, record_phase
+
+logger = logging.getLogger(__name__)
+
+# 握手、认证等非业务命令不计入统计
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "saslStart", "saslContinue", "endSessions", "killCursors"}
+
+# 不在命令文档中携带集合名时使用的标签
+NO_COLLECTION = "-"
+
+# 各命令中查询条件所在的字段
+_QUERY_FIELDS = {
+    "find": ("filter", "sort"),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query", "sort"),
+    "aggregate": ("pipeline",),
+}
+
+
+def normalize_shape(value: Any) -> Any:
+    """
+    将查询归一化为结构：保留字段名和操作符，值替换为 "?"
+
+    Args:
+        value: 查询条件
+
+    Returns:
+        Any: 查询结构
+    """
+    if isinstance(value, dict):
+        return {key: normalize_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [normalize_shape(item) for item in value]
+        # 标量数组（例如 $in 的取值）只保留一个占位符，避免长度不同的同类查询被区分开
+        return ["?"]
+    return "?"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    提取命令的查询结构
+
+    Args:
+        command_name: 命令名称
+        command: 命令文档
+
+    Returns:
+        Dict[str, Any]: 查询结构
+    """
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or []
+        return {"q": normalize_shape(statements[0].get("q", {}))} if statements else {}
+    shape = {}
+    for field in _QUERY_FIELDS.get(command_name, ()):
+        if field in command:
+            # 排序方向不是查询值，原样保留
+            shape[field] = dict(command[field]) if field == "sort" else normalize_shape(command[field])
+    return shape
+
+
+def _collection_name(command_name: str, command: Dict[str, Any]) -> str:
+    """获取命令作用的集合名"""
+    if command_name == "getMore":
+        return command.get("collection", NO_COLLECTION)
+    value = command.get(command_name)
+    return value if isinstance(value, str) else NO_COLLECTION
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    数据库命令监听器
+
+    记录每个命令的耗时（计入当前请求的 db 阶段）、按命令和集合的计数、每个请求的往返次数，
+    并把慢命令写入日志和最近慢查询列表。
+    """
+
+    def __init__(self, slow_query_ms: float = DB_SLOW_QUERY_MS, slow_log_size: int = DB_SLOW_LOG_SIZE,
+                 enabled: bool = DB_COMMAND_MONITORING):
+        self.slow_query_ms = slow_query_ms
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._slow_log: deque = deque(maxlen=slow_log_size)
+        self.reset()
+
+    def reset(self) -> None:
+        """清空统计和慢查询列表"""
+        with self._lock:
+            # (请求 ID, 连接) -> (命令, 集合, 命令文档)
+            self._pending: Dict[Tuple[int, Any], Tuple[str, str, Dict[str, Any]]] = {}
+            # (命令, 集合) -> [次数, 失败数, 总耗时, 最大耗时, 慢命令数]
+            self._stats: Dict[Tuple[str, str], List[float]] = {}
+            self._slow_log.clear()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if not self.enabled or event.command_name in IGNORED_COMMANDS:
+            return
+        record_count("db_round_trips")
+        entry = (event.command_name, _collection_name(event.command_name, event.command), event.command)
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = entry
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event, failed=True)
+
+    def _finished(self, event, failed: bool) -> None:
+        seconds = event.duration_micros / 1e6
+        record_phase("db", seconds)
+        if not self.enabled:
+            return
+
+        with self._lock:
+            entry = self._pending.pop((event.request_id, event.connection_id), None)
+            if entry is None:
+                return
+            command_name, collection, command = entry
+            stats = self._stats.get((command_name, collection))
+            if stats is None:
+                stats = self._stats[(command_name, collection)] = [0, 0, 0.0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += int(failed)
+            stats[2] += seconds
+            stats[3] = max(stats[3], seconds)
+            slow = seconds * 1000 >= self.slow_query_ms
+            if slow:
+                stats[4] += 1
+
+        if slow:
+            self._log_slow(event, command_name, collection, command, seconds, failed)
+
+    def _log_slow(self, event, command_name: str, collection: str, command: Dict[str, Any],
+                  seconds: float, failed: bool) -> None:
+        """写入慢查询日志"""
+        record = {
+            "command": command_name,
+            "collection": collection,
+            "database": event.database_name,
+            "duration_ms": round(seconds * 1000, 2),
+            "shape": command_shape(command_name, command),
+            "failed": failed,
+            "at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._slow_log.append(record)
+        logger.warning("Slow MongoDB command %s on %s.%s took %.1f ms: %s",
+                       command_name, event.database_name, collection, record["duration_ms"],
+                       json.dumps(record["shape"], default=str, sort_keys=True))
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        获取按命令和集合的统计
+
+        Returns:
+            List[Dict[str, Any]]: 统计列表，按总耗时降序
+        """
+        with self._lock:
+            items = [
+                {
+                    "command": command_name,
+                    "collection": collection,
+                    "count": int(count),
+                    "failures": int(failures),
+                    "total_ms": round(total * 1000, 2),
+                    "avg_ms": round(total * 1000 / count, 2) if count else 0.0,
+                    "max_ms": round(maximum * 1000, 2),
+                    "slow": int(slow),
+                }
+                for (command_name, collection), (count, failures, total, maximum, slow) in self._stats.items()
+            ]
+        return sorted(items, key=lambda item: item["total_ms"], reverse=True)
+
+    def slow_queries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        获取最近的慢查询（最新的在前）
+
+        Args:
+            limit: 返回数量，None 表示全部
+
+        Returns:
+            List[Dict[str, Any]]: 慢查询列表
+        """
+        with self._lock:
+            records = list(reversed(self._slow_log))
+        return records[:limit] if limit is not None else records
+
+    def render_prometheus(self) -> str:
+        """
+        以 Prometheus 文本格式导出命令统计
+
+        Returns:
+            str: 指标文本
+        """
+        lines = [
+            "# HELP mongodb_command_duration_seconds MongoDB command latency by command and collection.",
+            "# TYPE mongodb_command_duration_seconds summary",
+        ]
+        with self._lock:
+            stats = sorted(self._stats.items())
+        for (command_name, collection), (count, _, total, _, _) in stats:
+            labels = f'command="{command_name}",collection="{collection}"'
+            lines.append(f"mongodb_command_duration_seconds_sum{{{labels}}} {float(total)!r}")
+            lines.append(f"mongodb_command_duration_seconds_count{{{labels}}} {int(count)}")
+
+        for name, index, help_text in (
+            ("mongodb_command_failures_total", 1, "Failed MongoDB commands."),
+            ("mongodb_slow_commands_total", 4, "MongoDB commands slower than DB_SLOW_QUERY_MS."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (command_name, collection), values in stats:
+                lines.append(f'{name}{{command="{command_name}",collection="{collection}"}} {int(values[index])}')
+
+        return "\n".join(lines) + "\n"
+
+
+# 全局命令监听器
+command_listener = CommandMonitor()
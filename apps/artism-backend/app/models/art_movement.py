@@ -1,7 +1,9 @@
-from typing import Optional, Dict, Any, List
-import pandas as pd
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from .base import BaseModel
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ArtMovement(BaseModel):
     """
@@ -69,7 +71,7 @@ class ArtMovement(BaseModel):
         return errors
     
     @staticmethod
-    def validate_csv_data(df: pd.DataFrame) -> List[str]:
+    def validate_csv_data(df: "pd.DataFrame") -> List[str]:
         """
         验证 CSV 数据是否符合艺术运动模型要求
         
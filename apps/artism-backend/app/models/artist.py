@@ -1,7 +1,9 @@
-from typing import Optional, Dict, Any, List
-import pandas as pd
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from .base import BaseModel
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class Artist(BaseModel):
     """
     艺术家数据模型
@@ -79,7 +81,7 @@ class Artist(BaseModel):
         return errors
     
     @staticmethod
-    def validate_csv_data(df: pd.DataFrame) -> List[str]:
+    def validate_csv_data(df: "pd.DataFrame") -> List[str]:
         """
         验证 CSV 数据是否符合艺术家模型要求
 
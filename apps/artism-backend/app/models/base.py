@@ -1,8 +1,10 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from datetime import datetime
-import pandas as pd
 from bson import ObjectId
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class BaseModel:
     """
@@ -44,7 +46,7 @@ class BaseModel:
         
         # 处理 NaN 值
         for key, value in data.items():
-            if isinstance(value, float) and pd.isna(value):
+            if isinstance(value, float) and value != value:
                 data[key] = None
         
         # 处理日期字段
@@ -72,6 +74,22 @@ class BaseModel:
                 else:
                     result[key] = value
         return result
+
+    def to_document(self) -> Dict[str, Any]:
+        """
+        将模型实例转换为写入 MongoDB 的文档
+
+        与 to_dict 不同，datetime 保持原样，存储为 BSON 日期（排序、范围查询和索引都按日期比较），
+        由响应层统一编码为 ISO 字符串。
+
+        Returns:
+            Dict[str, Any]: 文档字典
+        """
+        return {
+            key: str(value) if isinstance(value, ObjectId) else value
+            for key, value in self.__dict__.items()
+            if not key.startswith('_')
+        }
     
     def validate_data(self) -> List[str]:
         """
@@ -115,7 +133,7 @@ class BaseModel:
         return cleaned
     
     @staticmethod
-    def validate_csv_data(df: pd.DataFrame) -> List[str]:
+    def validate_csv_data(df: "pd.DataFrame") -> List[str]:
         """
         验证 CSV 数据是否符合模型要求
         
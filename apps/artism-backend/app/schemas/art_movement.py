@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from app.schemas.response import ProjectedRecord
+
 
 class ArtMovementBase(BaseModel):
     """艺术运动基础模式"""
@@ -30,7 +32,7 @@ class ArtMovementUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
-class ArtMovement(ArtMovementBase):
+class ArtMovement(ArtMovementBase, ProjectedRecord):
     """艺术运动完整模式"""
     id: str
     created_at: Optional[datetime] = None
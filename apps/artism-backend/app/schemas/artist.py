@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from app.schemas.response import ProjectedRecord
+
 class FictionalMeta(BaseModel):
     """虚构艺术家元数据"""
     origin_project: str
@@ -45,7 +47,7 @@ class ArtistUpdate(BaseModel):
     art_movement: Optional[str] = None
     image_url: Optional[str] = None
 
-class Artist(ArtistBase):
+class Artist(ArtistBase, ProjectedRecord):
     """艺术家完整模式"""
     id: str
     created_at: Optional[datetime] = None
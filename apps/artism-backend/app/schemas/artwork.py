@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from app.schemas.response import ProjectedRecord
+
 class ArtworkBase(BaseModel):
     """艺术品基础模式"""
     title: str
@@ -28,7 +30,7 @@ class ArtworkUpdate(BaseModel):
     tags: Optional[List[str]] = None
     style_vector: Optional[List[float]] = None
 
-class Artwork(ArtworkBase):
+class Artwork(ArtworkBase, ProjectedRecord):
     """艺术品完整模式"""
     id: str
     created_at: Optional[datetime] = None
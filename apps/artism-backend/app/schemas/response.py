@@ -1,10 +1,28 @@
-from pydantic import BaseModel
-from typing import Optional, Any, List, Generic, TypeVar
+from pydantic import BaseModel, Field, model_serializer
+from typing import Optional, Any, Dict, List, Generic, TypeVar
 from datetime import datetime
 
 T = TypeVar('T')
 
 
+class ProjectedRecord(BaseModel):
+    """
+    按投影读取的记录
+
+    序列化时只输出记录中实际存在的字段：列表按投影配置或 fields 参数只读取部分字段时，
+    响应模型不会为未读取的字段补上默认值。include 填充的关联记录放在 included 字段中。
+    """
+    # 关联名称 -> 记录或记录列表
+    included: Optional[Dict[str, Any]] = None
+
+    @model_serializer(mode="wrap")
+    def _only_present_fields(self, handler):
+        data = handler(self)
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if key in self.model_fields_set}
+        return data
+
+
 class APIResponse(BaseModel, Generic[T]):
     """
     统一API响应格式
@@ -21,6 +39,21 @@ class APIResponse(BaseModel, Generic[T]):
         }
 
 
+class BatchGetRequest(BaseModel):
+    """按 ID 批量获取请求"""
+    ids: List[str] = Field(..., description="记录 ID 列表，结果按此顺序返回")
+    fields: Optional[List[str]] = Field(None, description="限定返回字段，如 ['name', 'avatar_url']")
+    use_cache: bool = Field(True, description="是否允许使用查询缓存")
+
+
+class BatchResult(BaseModel):
+    """按 ID 批量获取结果"""
+    # 按请求顺序的记录，只含响应模型声明的字段（见 BaseService.READ_PROJECTION）
+    records: List[Dict[str, Any]] = []
+    # 不存在的 ID（按请求顺序）
+    missing: List[str] = []
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """
     分页响应格式
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from app.models.comment import Comment, AICommentThread
 from app.services.artist_service import ArtistService
 from app.services.ai_service import AIService
+from app.services.llm_backend import get_llm_backend
 from app.services.comment_service import CommentService
 from app.schemas.comment import CommentCreate
 import logging
@@ -143,7 +144,7 @@ class AICommentService:
             artists = []
             try:
                 from app.utils.query_params import QueryParams
-                real_artists_response = ArtistService.get_all(QueryParams(page_size=50))
+                real_artists_response = ArtistService.get_all(QueryParams(page_size=50, profile="full"))
                 if real_artists_response.success and len(real_artists_response.data) >= 2:
                     artists = [artist.dict() for artist in real_artists_response.data]
                     logger.info(f"Using {len(artists)} real artists from database")
@@ -160,14 +161,21 @@ class AICommentService:
 
             generated_comments = []
 
+            # 先选定评论者与对象并生成模板草稿，再统一交给生成后端并发润色
+            pairings = []
             for _ in range(max_comments):
                 # 随机选择评论者和被评论对象
                 commenter = random.choice(artists)
                 target = random.choice([a for a in artists if a.get('id') != commenter.get('id')])
+                draft = cls._generate_comment_content(commenter, target)
+                prompt = cls._build_generation_prompt(
+                    commenter, f"评价艺术家 {target.get('name', '')}", draft
+                )
+                pairings.append((commenter, target, prompt, draft))
 
-                # 生成评论内容
-                comment_content = cls._generate_comment_content(commenter, target)
+            contents = await cls._generate_contents([(prompt, draft) for _, _, prompt, draft in pairings])
 
+            for (commenter, target, _, _), comment_content in zip(pairings, contents):
                 # 创建评论数据
                 comment_data = {
                     'content': comment_content,
@@ -231,7 +239,7 @@ class AICommentService:
             artists = []
             try:
                 from app.utils.query_params import QueryParams
-                real_artists_response = ArtistService.get_all(QueryParams(page_size=50))
+                real_artists_response = ArtistService.get_all(QueryParams(page_size=50, profile="full"))
                 if real_artists_response.success and len(real_artists_response.data) >= 2:
                     artists = [artist.dict() for artist in real_artists_response.data]
                     logger.info(f"Using {len(artists)} real artists")
@@ -246,18 +254,21 @@ class AICommentService:
 
             generated_replies = []
 
-            for i in range(max_replies):
-                # 随机选择回复者（不能是原评论作者）
-                available_artists = [a for a in artists if str(a.get('id')) != str(parent_comment['author_id'])]
-                if not available_artists:
-                    logger.warning("No available artists for reply")
-                    break
+            # 随机选择回复者（不能是原评论作者）
+            available_artists = [a for a in artists if str(a.get('id')) != str(parent_comment['author_id'])]
+            if not available_artists:
+                logger.warning("No available artists for reply")
+                return []
 
-                replier = random.choice(available_artists)
-                logger.info(f"Selected replier: {replier.get('name', 'Unknown')}")
+            repliers = [random.choice(available_artists) for _ in range(max_replies)]
+            drafts = [cls._generate_reply_content(replier, parent_comment) for replier in repliers]
+            contents = await cls._generate_contents([
+                (cls._build_generation_prompt(replier, f"回复评论：{parent_comment.get('content', '')}", draft), draft)
+                for replier, draft in zip(repliers, drafts)
+            ])
 
-                # 生成回复内容
-                reply_content = cls._generate_reply_content(replier, parent_comment)
+            for i, (replier, reply_content) in enumerate(zip(repliers, contents)):
+                logger.info(f"Selected replier: {replier.get('name', 'Unknown')}")
                 logger.info(f"Generated reply content: {reply_content[:50]}...")
 
                 # 创建回复数据
@@ -299,6 +310,60 @@ class AICommentService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return []
 
+    @classmethod
+    async def _generate_contents(cls, items: List[tuple]) -> List[str]:
+        """
+        通过生成后端并发生成评论内容
+
+        未配置生成后端或生成失败时使用模板草稿
+
+        Args:
+            items: (提示词, 模板草稿) 列表
+
+        Returns:
+            List[str]: 与输入一一对应的评论内容
+        """
+        drafts = [draft for _, draft in items]
+        backend = get_llm_backend()
+        if backend is None or not items:
+            return drafts
+
+        results = await asyncio.gather(
+            *(backend.generate(prompt) for prompt, _ in items),
+            return_exceptions=True
+        )
+
+        contents = []
+        for result, draft in zip(results, drafts):
+            if isinstance(result, Exception) or not result:
+                if isinstance(result, Exception):
+                    logger.warning(f"LLM generation failed, using template: {result}")
+                contents.append(draft)
+            else:
+                contents.append(result)
+        return contents
+
+    @classmethod
+    def _build_generation_prompt(cls, author: Dict[str, Any], subject: str, draft: str) -> str:
+        """
+        构建评论生成提示词
+
+        Args:
+            author: 评论者信息
+            subject: 评论对象描述
+            draft: 模板生成的草稿，作为风格参考
+
+        Returns:
+            str: 提示词
+        """
+        return (
+            f"你是 {author.get('name', 'AI 艺术家')}，艺术风格为 {cls._get_artist_style(author)}。"
+            f"{author.get('bio') or ''}\n"
+            f"任务：{subject}\n"
+            f"参考草稿：{draft}\n"
+            "请用一到两句话写出你的评论。"
+        )
+
     @classmethod
     def _generate_reply_content(cls, replier: Dict[str, Any], parent_comment: Dict[str, Any]) -> str:
         """
@@ -438,7 +503,7 @@ class AICommentService:
             artists = []
             try:
                 from app.utils.query_params import QueryParams
-                real_artists_response = ArtistService.get_all(QueryParams(page_size=50))
+                real_artists_response = ArtistService.get_all(QueryParams(page_size=50, profile="full"))
                 if real_artists_response.success and len(real_artists_response.data) >= 2:
                     artists = [artist.dict() for artist in real_artists_response.data]
                     logger.info(f"Using {len(artists)} real artists")
@@ -453,18 +518,22 @@ class AICommentService:
 
             generated_comments = []
 
-            for i in range(max_comments):
-                # 随机选择评论者（不能是帖子作者）
-                available_artists = [a for a in artists if str(a.get('id')) != str(post['author_id'])]
-                if not available_artists:
-                    logger.warning("No available artists for comment")
-                    break
+            # 随机选择评论者（不能是帖子作者）
+            available_artists = [a for a in artists if str(a.get('id')) != str(post['author_id'])]
+            if not available_artists:
+                logger.warning("No available artists for comment")
+                return []
+
+            commenters = [random.choice(available_artists) for _ in range(max_comments)]
+            drafts = [cls._generate_post_comment_content(commenter, post) for commenter in commenters]
+            post_subject = f"评论帖子《{post.get('title', '')}》：{post.get('content', '')}"
+            contents = await cls._generate_contents([
+                (cls._build_generation_prompt(commenter, post_subject, draft), draft)
+                for commenter, draft in zip(commenters, drafts)
+            ])
 
-                commenter = random.choice(available_artists)
+            for i, (commenter, comment_content) in enumerate(zip(commenters, contents)):
                 logger.info(f"Selected commenter: {commenter.get('name', 'Unknown')}")
-
-                # 生成评论内容
-                comment_content = cls._generate_post_comment_content(commenter, post)
                 logger.info(f"Generated comment content: {comment_content[:50]}...")
 
                 # 创建评论数据
@@ -1,6 +1,10 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from app.core.config import OPENAI_API_KEY
 from app.services.artist_service import ArtistService
+from app.services.llm_backend import get_llm_backend
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AIService:
     """
@@ -9,8 +13,10 @@ class AIService:
     提供与 AI 艺术家交互的功能
     """
     
+    DEFAULT_ARTIST_NAME = "AI Leonardo da Vinci"  # 默认 AI 艺术家名称
+    
     @classmethod
-    def interact(cls, message: str, artist_id: Optional[int] = None) -> Dict[str, Any]:
+    async def interact(cls, message: str, artist_id: Optional[int] = None) -> Dict[str, Any]:
         """
         与 AI 艺术家交互
         
@@ -21,25 +27,93 @@ class AIService:
         Returns:
             Dict[str, Any]: 包含 AI 艺术家回复的字典
         """
-        # 获取艺术家信息（如果指定了艺术家 ID）
-        artist_info = None
-        artist_name = "AI Leonardo da Vinci"  # 默认 AI 艺术家名称
-        
-        if artist_id is not None:
-            artist = ArtistService.get_artist_by_id(artist_id)
-            if artist:
-                artist_info = artist
-                artist_name = f"AI {artist['name']}"
+        artist_info, artist_name = cls._get_artist_info(artist_id)
         
-        # TODO: 在生产环境中，这里应该集成 OpenAI API 或其他 LLM
-        # 目前返回模拟响应
-        response = cls._generate_mock_response(message, artist_info)
+        backend = get_llm_backend()
+        if backend is None:
+            # 未配置生成后端时返回模拟响应
+            response = cls._generate_mock_response(message, artist_info)
+        else:
+            try:
+                response = await backend.generate(cls._build_prompt(message, artist_info))
+            except Exception as e:
+                logger.error(f"LLM generation failed, falling back to mock response: {e}")
+                response = cls._generate_mock_response(message, artist_info)
         
         return {
             "response": response,
             "artist_name": artist_name
         }
     
+    @classmethod
+    async def stream_interact(cls, message: str, artist_id: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        与 AI 艺术家交互（流式输出）
+        
+        Args:
+            message: 用户消息
+            artist_id: 艺术家 ID
+        
+        Yields:
+            str: 回复的 token 片段
+        """
+        artist_info, _ = cls._get_artist_info(artist_id)
+        
+        backend = get_llm_backend()
+        if backend is None:
+            yield cls._generate_mock_response(message, artist_info)
+            return
+        
+        yielded = False
+        try:
+            async for token in backend.stream(cls._build_prompt(message, artist_info)):
+                yielded = True
+                yield token
+        except Exception as e:
+            if yielded:
+                # 已输出部分内容，无法再回退，结束本次回复
+                logger.error(f"LLM stream failed after partial output: {e}")
+                return
+            logger.error(f"LLM stream failed, falling back to mock response: {e}")
+            yield cls._generate_mock_response(message, artist_info)
+    
+    @classmethod
+    def _get_artist_info(cls, artist_id: Optional[int]) -> tuple:
+        """
+        获取艺术家信息（如果指定了艺术家 ID）
+        
+        Returns:
+            tuple: (艺术家信息, 艺术家显示名称)
+        """
+        if artist_id is None:
+            return None, cls.DEFAULT_ARTIST_NAME
+        
+        artist_response = ArtistService.get_by_id(str(artist_id))
+        if getattr(artist_response, "success", False) and artist_response.data:
+            artist = artist_response.data
+            return artist, f"AI {artist['name']}"
+        return None, cls.DEFAULT_ARTIST_NAME
+    
+    @staticmethod
+    def _build_prompt(message: str, artist_info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        构建发送给生成后端的提示词
+        
+        Args:
+            message: 用户消息
+            artist_info: 艺术家信息
+        
+        Returns:
+            str: 提示词
+        """
+        if artist_info:
+            persona = f"你是 AI {artist_info['name']}。"
+            if artist_info.get("bio"):
+                persona += f"简介：{artist_info['bio']}。"
+        else:
+            persona = "你是一位 AI 艺术家。"
+        return f"{persona}\n请以第一人称回复用户的消息。\n用户：{message}"
+    
     @staticmethod
     def _generate_mock_response(message: str, artist_info: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -65,4 +139,4 @@ class AIService:
         Returns:
             bool: 是否已配置 API 密钥
         """
-        return bool(OPENAI_API_KEY) 
\ No newline at end of file
+        return bool(OPENAI_API_KEY) 
@@ -1,12 +1,13 @@
 from typing import List, Dict, Any, Optional
-import pandas as pd
 from bson import json_util
 import json
 
 from app.db.mongodb import get_collection
 from app.models.art_movement import ArtMovement
-from app.core.config import ART_MOVEMENTS_COLLECTION
-from .base_service import BaseService
+from app.core.config import ARTISTS_COLLECTION, ARTWORKS_COLLECTION, ART_MOVEMENTS_COLLECTION
+from app.utils.singleflight import singleflight
+from app.schemas.art_movement import ArtMovement as ArtMovementSchema
+from .base_service import BaseService, schema_projection
 
 
 class ArtMovementService(BaseService):
@@ -18,15 +19,29 @@ class ArtMovementService(BaseService):
     
     COLLECTION_NAME = ART_MOVEMENTS_COLLECTION
     MODEL_CLASS = ArtMovement
+
+    READ_PROJECTION = schema_projection(ArtMovementSchema)
+
+    PROJECTION_PROFILES = {
+        "summary": {"_id": 0, "id": 1, "name": 1, "start_year": 1, "end_year": 1},
+        "card": schema_projection(ArtMovementSchema, exclude=("description",)),
+        "full": READ_PROJECTION,
+    }
+
+    RELATIONS = {
+        "keyArtists": ("key_artists", ARTISTS_COLLECTION, ("name", "avatar_url")),
+        "representativeWorks": ("representative_works", ARTWORKS_COLLECTION, ("title", "year", "image_url")),
+    }
     
     @classmethod
-    def get_movements_by_period(cls, start_year: int, end_year: int) -> List[Dict[str, Any]]:
+    def get_movements_by_period(cls, start_year: int, end_year: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据时期获取艺术运动
         
         Args:
             start_year: 起始年份
             end_year: 结束年份
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
             
         Returns:
             List[Dict[str, Any]]: 艺术运动列表
@@ -57,22 +72,18 @@ class ArtMovementService(BaseService):
             ]
         }
         
-        movements = list(collection.find(filter_dict))
-        
-        processed_movements = []
-        for movement in movements:
-            processed_movement = cls._process_record(movement)
-            processed_movements.append(processed_movement)
+        processed_movements = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)))
         
         return processed_movements
     
     @classmethod
-    def get_active_movements(cls, year: int) -> List[Dict[str, Any]]:
+    def get_active_movements(cls, year: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取指定年份活跃的艺术运动
         
         Args:
             year: 指定年份
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
             
         Returns:
             List[Dict[str, Any]]: 活跃的艺术运动列表
@@ -86,23 +97,19 @@ class ArtMovementService(BaseService):
             ]
         }
         
-        movements = list(collection.find(filter_dict))
-        
-        processed_movements = []
-        for movement in movements:
-            processed_movement = cls._process_record(movement)
-            processed_movements.append(processed_movement)
+        processed_movements = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)))
         
         return processed_movements
     
     @classmethod
-    def search_movements(cls, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def search_movements(cls, query: str, limit: int = 10, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         搜索艺术运动
         
         Args:
             query: 搜索关键词
             limit: 结果限制数量
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
             
         Returns:
             List[Dict[str, Any]]: 搜索结果
@@ -119,33 +126,24 @@ class ArtMovementService(BaseService):
             ]
         }
         
-        movements = list(collection.find(filter_dict).limit(limit))
-        
-        processed_movements = []
-        for movement in movements:
-            processed_movement = cls._process_record(movement)
-            processed_movements.append(processed_movement)
+        processed_movements = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)).limit(limit))
         
         return processed_movements
     
     @classmethod
-    def get_movements_by_artist(cls, artist_id: str) -> List[Dict[str, Any]]:
+    def get_movements_by_artist(cls, artist_id: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据艺术家获取相关艺术运动
         
         Args:
             artist_id: 艺术家ID
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
             
         Returns:
             List[Dict[str, Any]]: 艺术运动列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
-        movements = list(collection.find({"key_artists": artist_id}))
-        
-        processed_movements = []
-        for movement in movements:
-            processed_movement = cls._process_record(movement)
-            processed_movements.append(processed_movement)
+        processed_movements = cls._process_records(collection.find({"key_artists": artist_id}, cls.projection_for(profile)))
         
         return processed_movements
     
@@ -161,11 +159,11 @@ class ArtMovementService(BaseService):
         Returns:
             bool: 是否成功添加
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-        
-        result = collection.update_one(
-            {"id": movement_id},
-            {"$addToSet": {"key_artists": artist_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            movement_id,
+            {"$addToSet": {"key_artists": artist_id}},
+            {"key_artists": {"$ne": artist_id}}
         )
         
         return result.modified_count > 0
@@ -182,11 +180,11 @@ class ArtMovementService(BaseService):
         Returns:
             bool: 是否成功移除
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-        
-        result = collection.update_one(
-            {"id": movement_id},
-            {"$pull": {"key_artists": artist_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            movement_id,
+            {"$pull": {"key_artists": artist_id}},
+            {"key_artists": artist_id}
         )
         
         return result.modified_count > 0
@@ -203,11 +201,11 @@ class ArtMovementService(BaseService):
         Returns:
             bool: 是否成功添加
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-        
-        result = collection.update_one(
-            {"id": movement_id},
-            {"$addToSet": {"representative_works": artwork_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            movement_id,
+            {"$addToSet": {"representative_works": artwork_id}},
+            {"representative_works": {"$ne": artwork_id}}
         )
         
         return result.modified_count > 0
@@ -224,11 +222,11 @@ class ArtMovementService(BaseService):
         Returns:
             bool: 是否成功移除
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-        
-        result = collection.update_one(
-            {"id": movement_id},
-            {"$pull": {"representative_works": artwork_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            movement_id,
+            {"$pull": {"representative_works": artwork_id}},
+            {"representative_works": artwork_id}
         )
         
         return result.modified_count > 0
@@ -267,21 +265,22 @@ class ArtMovementService(BaseService):
         return stats
     
     @classmethod
-    def get_movements_timeline(cls) -> List[Dict[str, Any]]:
+    @singleflight
+    def get_movements_timeline(cls, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取艺术运动时间线
         
+        并发调用合并为一次查询，返回的列表由调用方共享。
+        
+        Args:
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
+        
         Returns:
             List[Dict[str, Any]]: 按时间排序的艺术运动列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
         
         # 按开始年份排序
-        movements = list(collection.find().sort("start_year", 1))
-        
-        processed_movements = []
-        for movement in movements:
-            processed_movement = cls._process_record(movement)
-            processed_movements.append(processed_movement)
+        processed_movements = cls._process_records(collection.find({}, cls.projection_for(profile)).sort("start_year", 1))
         
         return processed_movements
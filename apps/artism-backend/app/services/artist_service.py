@@ -1,12 +1,20 @@
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
 from bson import json_util
 import json
+import threading
+import time
 
 from app.db.mongodb import get_collection
 from app.models.artist import Artist
-from app.core.config import ARTISTS_COLLECTION
-from .base_service import BaseService
+from app.core.config import (
+    ARTISTS_COLLECTION, ARTWORKS_COLLECTION, ART_MOVEMENTS_COLLECTION,
+    ARTIST_PROFILE_CACHE_TTL_SECONDS, ARTIST_PROFILE_CACHE_MAX_ENTRIES
+)
+from app.schemas.response import APIResponse
+from app.utils.background import run_in_background
+from app.schemas.artist import Artist as ArtistSchema
+from .base_service import BaseService, schema_projection
 
 class ArtistService(BaseService):
     """
@@ -17,35 +25,141 @@ class ArtistService(BaseService):
 
     COLLECTION_NAME = ARTISTS_COLLECTION
     MODEL_CLASS = Artist
+
+    READ_PROJECTION = schema_projection(ArtistSchema)
+
+    PROJECTION_PROFILES = {
+        "summary": {"_id": 0, "id": 1, "name": 1, "avatar_url": 1, "birth_year": 1, "death_year": 1,
+                    "nationality": 1, "is_fictional": 1},
+        "card": schema_projection(ArtistSchema, exclude=("bio", "fictional_meta", "agent")),
+        "full": READ_PROJECTION,
+    }
+
+    RELATIONS = {
+        "notableWorks": ("notable_works", ARTWORKS_COLLECTION, ("title", "year", "image_url")),
+        "associatedMovements": ("associated_movements", ART_MOVEMENTS_COLLECTION, ("name", "start_year", "end_year")),
+    }
+
+    # 冗余保存在动态流中的艺术家字段
+    FEED_PROFILE_FIELDS = ("name", "avatar_url")
+
+    # 艺术家资料缓存：艺术家 ID -> (写入时间, 资料)，资料为 None 表示艺术家不存在
+    PROFILE_PROJECTION = {"_id": 0, "id": 1, "name": 1, "avatar_url": 1}
+    _profiles: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+    _profiles_lock = threading.Lock()
+
+    @classmethod
+    def update(cls, record_id: str, record_data: Dict[str, Any]) -> APIResponse:
+        """
+        更新艺术家
+
+        名称或头像变化时，在后台将新的作者资料扇出到首页动态流。
+
+        Args:
+            record_id: 艺术家 ID
+            record_data: 要更新的数据
+
+        Returns:
+            APIResponse: API响应
+        """
+        response = super().update(record_id, record_data)
+        cls.invalidate_profile(record_id)
+
+        if response.success and any(field in record_data for field in cls.FEED_PROFILE_FIELDS):
+            from app.services.feed_service import FeedService
+            run_in_background(FeedService.update_author, record_id)
+
+        return response
     
     @classmethod
-    def get_artists_by_movement(cls, movement_id: str) -> List[Dict[str, Any]]:
+    def get_profile(cls, artist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取艺术家资料（名称、头像），带 TTL 缓存
+
+        Args:
+            artist_id: 艺术家ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 艺术家资料，不存在时返回 None
+        """
+        now = time.monotonic()
+        with cls._profiles_lock:
+            entry = cls._profiles.get(artist_id)
+            if entry is not None and now - entry[0] < ARTIST_PROFILE_CACHE_TTL_SECONDS:
+                cls._profiles.move_to_end(artist_id)
+                return entry[1]
+
+        profile = get_collection(cls.COLLECTION_NAME).find_one({"id": artist_id}, cls.PROFILE_PROJECTION)
+        cls._store_profiles([(artist_id, profile)], now)
+        return profile
+
+    @classmethod
+    def preload_profiles(cls, limit: Optional[int] = None) -> int:
+        """
+        预加载艺术家资料缓存（预热时调用）
+
+        Args:
+            limit: 最多加载的数量，默认为缓存容量
+
+        Returns:
+            int: 加载的艺术家数量
+        """
+        limit = limit or ARTIST_PROFILE_CACHE_MAX_ENTRIES
+        cursor = get_collection(cls.COLLECTION_NAME).find({}, cls.PROFILE_PROJECTION).limit(limit)
+        profiles = [(profile["id"], profile) for profile in cursor if profile.get("id")]
+        cls._store_profiles(profiles, time.monotonic())
+        return len(profiles)
+
+    @classmethod
+    def _store_profiles(cls, profiles: List[Tuple[str, Optional[Dict[str, Any]]]], now: float) -> None:
+        """写入资料缓存并按容量淘汰最久未使用的条目"""
+        if ARTIST_PROFILE_CACHE_TTL_SECONDS <= 0:
+            return
+        with cls._profiles_lock:
+            for artist_id, profile in profiles:
+                cls._profiles[artist_id] = (now, profile)
+                cls._profiles.move_to_end(artist_id)
+            while len(cls._profiles) > ARTIST_PROFILE_CACHE_MAX_ENTRIES:
+                cls._profiles.popitem(last=False)
+
+    @classmethod
+    def invalidate_profile(cls, artist_id: str) -> None:
+        """艺术家更新后清除资料缓存"""
+        with cls._profiles_lock:
+            cls._profiles.pop(artist_id, None)
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """清空缓存（切换数据库或测试时使用）"""
+        super().reset_state()
+        with cls._profiles_lock:
+            cls._profiles = OrderedDict()
+
+    @classmethod
+    def get_artists_by_movement(cls, movement_id: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据艺术运动获取艺术家
 
         Args:
             movement_id: 艺术运动ID
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 艺术家列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
-        artists = list(collection.find({"associated_movements": movement_id}))
-
-        processed_artists = []
-        for artist in artists:
-            processed_artist = cls._process_record(artist)
-            processed_artists.append(processed_artist)
+        processed_artists = cls._process_records(collection.find({"associated_movements": movement_id}, cls.projection_for(profile)))
 
         return processed_artists
     
     @classmethod
-    def get_fictional_artists(cls, project: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_fictional_artists(cls, project: Optional[str] = None, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取虚构艺术家
 
         Args:
             project: 项目名称筛选
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 虚构艺术家列表
@@ -56,41 +170,35 @@ class ArtistService(BaseService):
         if project:
             filter_dict["fictional_meta.origin_project"] = project
 
-        artists = list(collection.find(filter_dict))
-
-        processed_artists = []
-        for artist in artists:
-            processed_artist = cls._process_record(artist)
-            processed_artists.append(processed_artist)
+        processed_artists = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)))
 
         return processed_artists
     
     @classmethod
-    def get_real_artists(cls) -> List[Dict[str, Any]]:
+    def get_real_artists(cls, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取真实艺术家
 
+        Args:
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
+
         Returns:
             List[Dict[str, Any]]: 真实艺术家列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
-        artists = list(collection.find({"is_fictional": {"$ne": True}}))
-
-        processed_artists = []
-        for artist in artists:
-            processed_artist = cls._process_record(artist)
-            processed_artists.append(processed_artist)
+        processed_artists = cls._process_records(collection.find({"is_fictional": {"$ne": True}}, cls.projection_for(profile)))
 
         return processed_artists
     
     @classmethod
-    def search_artists(cls, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def search_artists(cls, query: str, limit: int = 10, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         搜索艺术家
 
         Args:
             query: 搜索关键词
             limit: 结果限制数量
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 搜索结果
@@ -108,22 +216,18 @@ class ArtistService(BaseService):
             ]
         }
 
-        artists = list(collection.find(filter_dict).limit(limit))
-
-        processed_artists = []
-        for artist in artists:
-            processed_artist = cls._process_record(artist)
-            processed_artists.append(processed_artist)
+        processed_artists = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)).limit(limit))
 
         return processed_artists
     
     @classmethod
-    def get_artist_social_network(cls, artist_id: str) -> List[Dict[str, Any]]:
+    def get_artist_social_network(cls, artist_id: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取艺术家的社交网络
 
         Args:
             artist_id: 艺术家ID
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 连接的艺术家列表
@@ -137,12 +241,7 @@ class ArtistService(BaseService):
 
         # 获取连接的艺术家
         connected_ids = artist["agent"]["connected_network_ids"]
-        connected_artists = list(collection.find({"id": {"$in": connected_ids}}))
-
-        processed_artists = []
-        for connected_artist in connected_artists:
-            processed_artist = cls._process_record(connected_artist)
-            processed_artists.append(processed_artist)
+        processed_artists = cls._process_records(collection.find({"id": {"$in": connected_ids}}, cls.projection_for(profile)))
 
         return processed_artists
     
@@ -158,11 +257,11 @@ class ArtistService(BaseService):
         Returns:
             bool: 是否成功添加
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-
-        result = collection.update_one(
-            {"id": artist_id},
-            {"$addToSet": {"associated_movements": movement_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            artist_id,
+            {"$addToSet": {"associated_movements": movement_id}},
+            {"associated_movements": {"$ne": movement_id}}
         )
 
         return result.modified_count > 0
@@ -179,11 +278,11 @@ class ArtistService(BaseService):
         Returns:
             bool: 是否成功移除
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-
-        result = collection.update_one(
-            {"id": artist_id},
-            {"$pull": {"associated_movements": movement_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            artist_id,
+            {"$pull": {"associated_movements": movement_id}},
+            {"associated_movements": movement_id}
         )
 
         return result.modified_count > 0
\ No newline at end of file
@@ -1,14 +1,19 @@
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
 from bson import json_util
 import json
+import math
 import os
+import threading
+import time
 from pymongo.collection import Collection
 
 from app.db.mongodb import get_collection
 from app.models.artwork import Artwork
-from app.core.config import ARTWORKS_COLLECTION
-from .base_service import BaseService
+from app.core.config import (
+    ARTISTS_COLLECTION, ARTWORKS_COLLECTION, ART_MOVEMENTS_COLLECTION, STYLE_VECTOR_INDEX_TTL_SECONDS
+)
+from app.schemas.artwork import Artwork as ArtworkSchema
+from .base_service import BaseService, schema_projection
 
 class ArtworkService(BaseService):
     """
@@ -19,105 +24,175 @@ class ArtworkService(BaseService):
 
     COLLECTION_NAME = ARTWORKS_COLLECTION
     MODEL_CLASS = Artwork
+
+    READ_PROJECTION = schema_projection(ArtworkSchema)
+
+    PROJECTION_PROFILES = {
+        "summary": {"_id": 0, "id": 1, "title": 1, "artist_id": 1, "year": 1, "image_url": 1},
+        "card": schema_projection(ArtworkSchema, exclude=("description", "style_vector")),
+        "full": READ_PROJECTION,
+    }
+
+    RELATIONS = {
+        "artist": ("artist_id", ARTISTS_COLLECTION, ("name", "avatar_url")),
+        "movements": ("movement_ids", ART_MOVEMENTS_COLLECTION, ("name", "start_year", "end_year")),
+    }
+
+    # 风格向量索引：作品 ID -> (风格向量, 向量模长)
+    # 每隔 STYLE_VECTOR_INDEX_TTL_SECONDS 秒重建一次，新建或删除的作品在重建后生效
+    _style_index: Optional[Dict[str, Tuple[List[float], float]]] = None
+    _style_index_built_at = 0.0
+    _style_index_lock = threading.Lock()
     
     @classmethod
-    def get_artworks_by_artist(cls, artist_id: str) -> List[Dict[str, Any]]:
+    def get_artworks_by_artist(cls, artist_id: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据艺术家ID获取作品
 
         Args:
             artist_id: 艺术家ID
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 作品列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
-        artworks = list(collection.find({"artist_id": artist_id}))
-
-        processed_artworks = []
-        for artwork in artworks:
-            processed_artwork = cls._process_record(artwork)
-            processed_artworks.append(processed_artwork)
+        processed_artworks = cls._process_records(collection.find({"artist_id": artist_id}, cls.projection_for(profile)))
 
         return processed_artworks
     
     @classmethod
-    def get_artworks_by_movement(cls, movement_id: str) -> List[Dict[str, Any]]:
+    def get_artworks_by_movement(cls, movement_id: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据艺术运动ID获取作品
 
         Args:
             movement_id: 艺术运动ID
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 作品列表
         """
         collection = get_collection(cls.COLLECTION_NAME)
-        artworks = list(collection.find({"movement_ids": movement_id}))
-
-        processed_artworks = []
-        for artwork in artworks:
-            processed_artwork = cls._process_record(artwork)
-            processed_artworks.append(processed_artwork)
+        processed_artworks = cls._process_records(collection.find({"movement_ids": movement_id}, cls.projection_for(profile)))
 
         return processed_artworks
     
     @classmethod
-    def get_similar_artworks(cls, artwork_id: str, threshold: float = 0.8, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_similar_artworks(cls, artwork_id: str, threshold: float = 0.8, limit: int = 10,
+                             profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据风格向量获取相似作品
 
+        相似度在内存中的风格向量索引上计算，只查询最终返回的作品。
+
         Args:
             artwork_id: 作品ID
             threshold: 相似度阈值
             limit: 结果限制数量
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 相似作品列表
         """
-        collection = get_collection(cls.COLLECTION_NAME)
+        index = cls._get_style_index()
+
+        # 获取目标作品（不在索引中时查询数据库，例如索引重建前新建的作品）
+        target = index.get(artwork_id)
+        if target is None:
+            target_artwork = get_collection(cls.COLLECTION_NAME).find_one(
+                {"id": artwork_id}, {"_id": 0, "style_vector": 1}
+            )
+            if not target_artwork or not target_artwork.get("style_vector"):
+                return []
+            target = cls._index_entry(target_artwork["style_vector"])
+
+        target_vector, target_magnitude = target
+        if target_magnitude == 0:
+            return []
 
-        # 获取目标作品
-        target_artwork = collection.find_one({"id": artwork_id})
-        if not target_artwork or not target_artwork.get("style_vector"):
+        # 在索引中计算余弦相似度并筛选
+        scored = []
+        for other_id, (vector, magnitude) in index.items():
+            if other_id == artwork_id or magnitude == 0 or len(vector) != len(target_vector):
+                continue
+            similarity = sum(a * b for a, b in zip(target_vector, vector)) / (target_magnitude * magnitude)
+            if similarity >= threshold:
+                scored.append((similarity, other_id))
+
+        # 按相似度排序，只查询需要返回的作品
+        scored.sort(reverse=True)
+        scored = scored[:limit]
+        if not scored:
             return []
 
-        target_vector = target_artwork["style_vector"]
+        artworks = get_collection(cls.COLLECTION_NAME).find(
+            {"id": {"$in": [other_id for _, other_id in scored]}}, cls.projection_for(profile)
+        )
+        artworks_by_id = {artwork["id"]: artwork for artwork in cls._iter_processed(artworks)}
 
-        # 获取所有有风格向量的作品
-        artworks_with_vectors = list(collection.find({
-            "style_vector": {"$exists": True, "$ne": []},
-            "id": {"$ne": artwork_id}
-        }))
+        processed_artworks = []
+        for similarity, other_id in scored:
+            artwork = artworks_by_id.get(other_id)
+            if artwork is not None:
+                artwork["similarity_score"] = similarity
+                processed_artworks.append(artwork)
 
-        # 计算相似度并筛选
-        similar_artworks = []
-        for artwork in artworks_with_vectors:
-            if artwork.get("style_vector"):
-                similarity = Artwork.calculate_style_similarity(target_vector, artwork["style_vector"])
-                if similarity >= threshold:
-                    artwork["similarity_score"] = similarity
-                    similar_artworks.append(artwork)
+        return processed_artworks
 
-        # 按相似度排序
-        similar_artworks.sort(key=lambda x: x["similarity_score"], reverse=True)
+    @staticmethod
+    def _index_entry(vector: List[float]) -> Tuple[List[float], float]:
+        """风格向量索引条目：(向量, 模长)"""
+        return vector, math.sqrt(sum(a * a for a in vector))
 
-        # 处理结果
-        processed_artworks = []
-        for artwork in similar_artworks[:limit]:
-            processed_artwork = cls._process_record(artwork)
-            processed_artworks.append(processed_artwork)
+    @classmethod
+    def build_style_index(cls) -> int:
+        """
+        从数据库构建风格向量索引（预热时调用）
 
-        return processed_artworks
+        Returns:
+            int: 索引中的作品数量
+        """
+        cursor = get_collection(cls.COLLECTION_NAME).find(
+            {"style_vector": {"$exists": True, "$ne": []}},
+            {"_id": 0, "id": 1, "style_vector": 1}
+        )
+        index = {
+            artwork["id"]: cls._index_entry(artwork["style_vector"])
+            for artwork in cursor
+            if artwork.get("id") and artwork.get("style_vector")
+        }
+        with cls._style_index_lock:
+            cls._style_index = index
+            cls._style_index_built_at = time.monotonic()
+        return len(index)
+
+    @classmethod
+    def _get_style_index(cls) -> Dict[str, Tuple[List[float], float]]:
+        """获取风格向量索引，未构建或已过期时重建"""
+        index = cls._style_index
+        if index is None or time.monotonic() - cls._style_index_built_at >= STYLE_VECTOR_INDEX_TTL_SECONDS:
+            cls.build_style_index()
+            index = cls._style_index
+        return index
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """清空风格向量索引（切换数据库或测试时使用）"""
+        super().reset_state()
+        with cls._style_index_lock:
+            cls._style_index = None
+            cls._style_index_built_at = 0.0
     
     @classmethod
-    def search_artworks_by_style(cls, style_tags: List[str], limit: int = 10) -> List[Dict[str, Any]]:
+    def search_artworks_by_style(cls, style_tags: List[str], limit: int = 10, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据风格标签搜索作品
 
         Args:
             style_tags: 风格标签列表
             limit: 结果限制数量
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 搜索结果
@@ -127,23 +202,19 @@ class ArtworkService(BaseService):
         # 构建查询条件
         filter_dict = {"tags": {"$in": style_tags}}
 
-        artworks = list(collection.find(filter_dict).limit(limit))
-
-        processed_artworks = []
-        for artwork in artworks:
-            processed_artwork = cls._process_record(artwork)
-            processed_artworks.append(processed_artwork)
+        processed_artworks = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)).limit(limit))
 
         return processed_artworks
     
     @classmethod
-    def get_artworks_by_year_range(cls, start_year: int, end_year: int) -> List[Dict[str, Any]]:
+    def get_artworks_by_year_range(cls, start_year: int, end_year: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         根据年份范围获取作品
 
         Args:
             start_year: 起始年份
             end_year: 结束年份
+            profile: 投影配置（summary / card / full），默认 LIST_PROFILE
 
         Returns:
             List[Dict[str, Any]]: 作品列表
@@ -157,12 +228,7 @@ class ArtworkService(BaseService):
             }
         }
 
-        artworks = list(collection.find(filter_dict))
-
-        processed_artworks = []
-        for artwork in artworks:
-            processed_artwork = cls._process_record(artwork)
-            processed_artworks.append(processed_artwork)
+        processed_artworks = cls._process_records(collection.find(filter_dict, cls.projection_for(profile)))
 
         return processed_artworks
     
@@ -178,11 +244,11 @@ class ArtworkService(BaseService):
         Returns:
             bool: 是否成功添加
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-
-        result = collection.update_one(
-            {"id": artwork_id},
-            {"$addToSet": {"movement_ids": movement_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            artwork_id,
+            {"$addToSet": {"movement_ids": movement_id}},
+            {"movement_ids": {"$ne": movement_id}}
         )
 
         return result.modified_count > 0
@@ -199,11 +265,11 @@ class ArtworkService(BaseService):
         Returns:
             bool: 是否成功移除
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-
-        result = collection.update_one(
-            {"id": artwork_id},
-            {"$pull": {"movement_ids": movement_id}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            artwork_id,
+            {"$pull": {"movement_ids": movement_id}},
+            {"movement_ids": movement_id}
         )
 
         return result.modified_count > 0
@@ -220,11 +286,19 @@ class ArtworkService(BaseService):
         Returns:
             bool: 是否成功更新
         """
-        collection = get_collection(cls.COLLECTION_NAME)
-
-        result = collection.update_one(
-            {"id": artwork_id},
-            {"$set": {"style_vector": style_vector}}
+        # 只匹配确实会变化的记录，返回值仍表示数据是否变化
+        result = cls._update_fields(
+            artwork_id,
+            {"$set": {"style_vector": style_vector}},
+            {"style_vector": {"$ne": style_vector}}
         )
 
+        # 同步更新已构建的风格向量索引
+        with cls._style_index_lock:
+            if cls._style_index is not None and result.matched_count > 0:
+                if style_vector:
+                    cls._style_index[artwork_id] = cls._index_entry(style_vector)
+                else:
+                    cls._style_index.pop(artwork_id, None)
+
         return result.modified_count > 0
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from app.services.post_service import PostService
 from app.services.ai_comment_service import AICommentService
 from app.services.comment_service import CommentService
+from app.services.feed_service import FeedService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -89,8 +90,8 @@ class AutoCommentService:
             bool: 是否应该生成评论
         """
         try:
-            # 检查帖子年龄（只为较新的帖子生成评论）
-            created_at = datetime.fromisoformat(post['created_at'].replace('Z', '+00:00'))
+            # 检查帖子年龄（只为较新的帖子生成评论；迁移前的帖子 created_at 仍可能是 ISO 字符串）
+            created_at = FeedService.to_datetime(post.get('created_at'))
             age_hours = (datetime.utcnow() - created_at).total_seconds() / 3600
             
             if age_hours > 24:  # 超过24小时的帖子不再生成评论
@@ -1,15 +1,41 @@
-from typing import List, Dict, Any, Optional, Type, Union
-import pandas as pd
+from typing import List, Dict, Any, Optional, Type, Union, Iterable, Iterator, Set, Tuple
 from bson import json_util
 import json
+import threading
 from datetime import datetime
+from pymongo.errors import DuplicateKeyError
+
+from pydantic import BaseModel as PydanticModel
 
 from app.db.mongodb import get_collection
 from app.models.base import BaseModel
+from app.core.config import (
+    COLLECTION_META_COLLECTION, INCLUDE_MAX_PER_RECORD, INCLUDE_MAX_IDS, BATCH_GET_MAX_IDS, LIST_PROJECTION_PROFILE
+)
+from app.utils.collection_versions import CollectionVersions
+from app.utils.query_cache import query_cache
 from app.utils.query_params import QueryParams, QueryParamsParser
 from app.schemas.response import APIResponse, PaginatedResponse, create_success_response, create_error_response, create_paginated_response
 
 
+def schema_projection(schema: Type[PydanticModel], exclude: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    根据响应模型生成包含式投影
+    
+    只读取响应模型声明的字段（include 填充的 included 不是存储字段），文档中的其他字段不会出现在结果中，
+    因此快速 JSON 路径跳过响应模型校验时输出也与默认路径一致。
+    
+    Args:
+        schema: 响应模型（如 app.schemas.artist.Artist）
+        exclude: 额外排除的字段
+        
+    Returns:
+        Dict[str, int]: MongoDB 投影
+    """
+    excluded = set(exclude) | {"included"}
+    return {"_id": 0, **{name: 1 for name in schema.model_fields if name not in excluded}}
+
+
 class BaseService:
     """
     基础服务类
@@ -19,12 +45,37 @@ class BaseService:
     
     COLLECTION_NAME: str = None  # 子类必须定义
     MODEL_CLASS: Type[BaseModel] = None  # 子类必须定义
+
+    # 列表查询默认投影：由数据库排除 _id，不再逐条删除
+    # 子类使用 schema_projection 限定为响应模型的字段，fields 参数也只接受这些字段
+    READ_PROJECTION = {"_id": 0}
+    # 内部读-改-写使用的投影：保留完整文档（包括更新模式接受、但响应模型不含的字段）
+    DOCUMENT_PROJECTION = {"_id": 0}
+
+    # 投影配置：summary 只含列表展示字段，card 排除长文本、向量等大字段，full 为完整记录
+    # 子类按集合覆盖 summary / card（均为包含式投影），未定义的配置回退到 full
+    PROJECTION_PROFILES: Dict[str, Dict[str, int]] = {"full": READ_PROJECTION}
+    # 列表方法未指定配置时使用
+    LIST_PROFILE: str = LIST_PROJECTION_PROFILE
+
+    # 集合名称 -> 是否可能含有 NaN（所有子类共享）
+    _nan_flags: Dict[str, bool] = {}
+    _nan_lock = threading.Lock()
+
+    # 已确认存在 id 唯一索引的集合
+    _id_indexes: Set[str] = set()
+
+    # 可通过 include 参数填充的关联：include 名称 -> (本集合中的 ID 字段, 关联集合, 关联记录返回的字段)
+    RELATIONS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
     
     @classmethod
     def get_all(cls, params: Optional[QueryParams] = None) -> PaginatedResponse:
         """
         获取所有记录
         
+        结果按规范化的查询参数缓存（见 query_cache），集合发生写入后立即失效。
+        缓存的响应由多个请求共享，调用方不应修改。
+        
         Args:
             params: 查询参数
             
@@ -34,6 +85,23 @@ class BaseService:
         if not cls.COLLECTION_NAME:
             raise NotImplementedError("COLLECTION_NAME must be defined in subclass")
         
+        return query_cache.get_or_compute(
+            cls.dependent_collections(params.include if params else None),
+            QueryParamsParser.build_cache_key(params),
+            lambda: cls._query_all(params)
+        )
+    
+    @classmethod
+    def _query_all(cls, params: Optional[QueryParams] = None) -> PaginatedResponse:
+        """
+        执行列表查询（不经过缓存）
+        
+        Args:
+            params: 查询参数
+            
+        Returns:
+            PaginatedResponse: 分页响应
+        """
         collection = get_collection(cls.COLLECTION_NAME)
         
         # 构建查询条件
@@ -41,10 +109,19 @@ class BaseService:
         sort_params = None
         projection = None
         
+        relations = cls.resolve_includes(params.include if params else None)
+        
         if params:
             filter_dict = QueryParamsParser.build_mongo_filter(params)
             sort_params = QueryParamsParser.build_mongo_sort(params)
             projection = QueryParamsParser.build_mongo_projection(params)
+            if projection is not None:
+                projection = cls._restrict_projection(projection)
+        # 未指定 fields（或指定的字段都不可读取）时使用投影配置
+        if projection is None:
+            projection = cls.projection_for(params.profile if params else None)
+        # 投影不含关联的 ID 字段时仍需读取，填充后再移除
+        hidden_fields = cls._require_fields(projection, [cls.RELATIONS[name][0] for name in relations])
         
         # 计算总数
         total = collection.count_documents(filter_dict)
@@ -60,13 +137,12 @@ class BaseService:
         if sort_params:
             cursor = cursor.sort(sort_params)
         
-        records = list(cursor.skip(skip).limit(page_size))
-        
-        # 处理数据
-        processed_records = []
-        for record in records:
-            processed_record = cls._process_record(record)
-            processed_records.append(processed_record)
+        processed_records = cls._process_records(cursor.skip(skip).limit(page_size))
+        if relations:
+            cls._populate(processed_records, relations)
+            for record in processed_records:
+                for field in hidden_fields:
+                    record.pop(field, None)
         
         return create_paginated_response(
             data=processed_records,
@@ -76,12 +152,13 @@ class BaseService:
         )
     
     @classmethod
-    def get_by_id(cls, record_id: str) -> APIResponse:
+    def get_by_id(cls, record_id: str, include: Optional[str] = None) -> APIResponse:
         """
         根据 ID 获取记录
         
         Args:
             record_id: 记录 ID
+            include: 要填充的关联，逗号分隔（见 RELATIONS）
             
         Returns:
             APIResponse: API响应
@@ -90,7 +167,7 @@ class BaseService:
             raise NotImplementedError("COLLECTION_NAME must be defined in subclass")
         
         collection = get_collection(cls.COLLECTION_NAME)
-        record = collection.find_one({"id": record_id})
+        record = collection.find_one({"id": record_id}, cls.READ_PROJECTION)
         
         if not record:
             return create_error_response(
@@ -99,8 +176,214 @@ class BaseService:
             )
         
         processed_record = cls._process_record(record)
+        relations = cls.resolve_includes(include)
+        if relations:
+            cls._populate([processed_record], relations)
         return create_success_response(data=processed_record)
     
+    @classmethod
+    def get_many(cls, ids: List[str], fields: Optional[List[str]] = None, use_cache: bool = True) -> APIResponse:
+        """
+        按 ID 批量获取记录（一次 $in 查询）
+        
+        Args:
+            ids: 记录 ID 列表，重复的 ID 只返回一次
+            fields: 限定返回字段，id 总是返回；响应模型之外的字段忽略
+            use_cache: 是否通过查询缓存读取（集合写入后立即失效）
+            
+        Returns:
+            APIResponse: data 为 {"records": 按请求顺序的记录, "missing": 不存在的 ID}
+        """
+        if not cls.COLLECTION_NAME:
+            raise NotImplementedError("COLLECTION_NAME must be defined in subclass")
+        
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > BATCH_GET_MAX_IDS:
+            return create_error_response(
+                message=f"At most {BATCH_GET_MAX_IDS} ids can be fetched at once",
+                code=400
+            )
+        readable = cls.readable_fields()
+        # 指定的字段都不可读取时只返回 id
+        fields = sorted(field for field in set(fields) if readable is None or field in readable) if fields else None
+        
+        def fetch() -> APIResponse:
+            projection = {"_id": 0, "id": 1, **{field: 1 for field in fields}} if fields is not None else cls.READ_PROJECTION
+            found = {
+                record["id"]: record
+                for record in cls._iter_processed(get_collection(cls.COLLECTION_NAME).find({"id": {"$in": ids}}, projection))
+            }
+            return create_success_response(data={
+                "records": [found[record_id] for record_id in ids if record_id in found],
+                "missing": [record_id for record_id in ids if record_id not in found]
+            })
+        
+        if not ids:
+            return create_success_response(data={"records": [], "missing": []})
+        if not use_cache:
+            return fetch()
+        key = json.dumps({"batch": ids, "fields": fields}, ensure_ascii=False, separators=(",", ":"))
+        return query_cache.get_or_compute([cls.COLLECTION_NAME], key, fetch)
+    
+    @classmethod
+    def projection_for(cls, profile: Optional[str] = None) -> Dict[str, int]:
+        """
+        获取投影配置
+        
+        Args:
+            profile: summary / card / full，默认 LIST_PROFILE
+            
+        Returns:
+            Dict[str, int]: MongoDB 投影（副本，可修改）
+        """
+        profile = profile or cls.LIST_PROFILE
+        if profile not in ("summary", "card", "full"):
+            raise ValueError(f"Unknown projection profile: {profile}")
+        return dict(cls.PROJECTION_PROFILES.get(profile, cls.READ_PROJECTION))
+    
+    @classmethod
+    def readable_fields(cls) -> Optional[Set[str]]:
+        """
+        可通过 fields 参数读取的字段
+        
+        Returns:
+            Optional[Set[str]]: READ_PROJECTION 包含的字段；READ_PROJECTION 为排除式时为 None（不限制）
+        """
+        fields = {key for key, value in cls.READ_PROJECTION.items() if value and key != "_id"}
+        return fields or None
+    
+    @classmethod
+    def _response_fields(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        只保留 READ_PROJECTION 包含的字段（完整文档用于构造响应时）
+
+        Args:
+            record: 记录
+
+        Returns:
+            Dict[str, Any]: 新的记录；READ_PROJECTION 为排除式时原样返回
+        """
+        readable = cls.readable_fields()
+        if readable is None:
+            return record
+        return {key: value for key, value in record.items() if key in readable}
+    
+    @classmethod
+    def _restrict_projection(cls, projection: Dict[str, int]) -> Optional[Dict[str, int]]:
+        """
+        移除 fields 投影中响应模型之外的字段
+        
+        Args:
+            projection: 由 fields 参数生成的包含式投影
+            
+        Returns:
+            Optional[Dict[str, int]]: 限定后的投影；没有可读取的字段时为 None
+        """
+        readable = cls.readable_fields()
+        if readable is None:
+            return projection
+        restricted = {key: value for key, value in projection.items() if key == "_id" or key in readable}
+        return restricted if len(restricted) > 1 else None
+    
+    @staticmethod
+    def _require_fields(projection: Dict[str, int], fields: List[str]) -> List[str]:
+        """
+        确保投影返回指定字段（原地修改）
+        
+        Args:
+            projection: 包含式或排除式投影
+            fields: 需要读取的字段
+            
+        Returns:
+            List[str]: 原投影不会返回、需要在结果中移除的字段
+        """
+        inclusive = any(value and key != "_id" for key, value in projection.items())
+        hidden = []
+        for field in fields:
+            if inclusive and field not in projection:
+                projection[field] = 1
+                hidden.append(field)
+            elif not inclusive and projection.get(field) == 0:
+                del projection[field]
+                hidden.append(field)
+        return hidden
+    
+    @classmethod
+    def resolve_includes(cls, include: Optional[str]) -> List[str]:
+        """
+        解析 include 参数
+        
+        同时接受 RELATIONS 中的名称（如 notableWorks）和对应的字段名（如 notable_works），未知的名称忽略。
+        
+        Args:
+            include: 逗号分隔的关联名称
+            
+        Returns:
+            List[str]: RELATIONS 中的名称（去重，保持顺序）
+        """
+        names = []
+        for item in QueryParamsParser.parse_include(include) or []:
+            for name, (field, _, _) in cls.RELATIONS.items():
+                if item in (name, field) and name not in names:
+                    names.append(name)
+        return names
+    
+    @classmethod
+    def dependent_collections(cls, include: Optional[str] = None) -> List[str]:
+        """
+        读取结果依赖的集合（本集合和填充的关联集合），用于查询缓存和 ETag 失效
+        
+        Args:
+            include: 逗号分隔的关联名称
+            
+        Returns:
+            List[str]: 集合名称，第一个为本集合
+        """
+        collections = [cls.COLLECTION_NAME]
+        for name in cls.resolve_includes(include):
+            related = cls.RELATIONS[name][1]
+            if related not in collections:
+                collections.append(related)
+        return collections
+    
+    @classmethod
+    def _populate(cls, records: List[Dict[str, Any]], relations: List[str]) -> None:
+        """
+        填充关联记录
+        
+        每种关联只执行一次 $in 查询，结果写入记录的 included 字段（include 名称 -> 关联记录，保持 ID 顺序，
+        不存在的 ID 跳过）。只填充一层，关联记录本身不再展开，因此不会出现循环；
+        每条记录最多展开 INCLUDE_MAX_PER_RECORD 个 ID，每种关联一次最多查询 INCLUDE_MAX_IDS 个 ID。
+        
+        Args:
+            records: 记录列表（原地修改）
+            relations: RELATIONS 中的名称
+        """
+        for name in relations:
+            field, related_collection, related_fields = cls.RELATIONS[name]
+            
+            wanted: Dict[str, None] = {}
+            for record in records:
+                value = record.get(field)
+                for related_id in (value if isinstance(value, list) else [value])[:INCLUDE_MAX_PER_RECORD]:
+                    if isinstance(related_id, str) and len(wanted) < INCLUDE_MAX_IDS:
+                        wanted[related_id] = None
+            
+            found: Dict[str, Dict[str, Any]] = {}
+            if wanted:
+                projection = {"_id": 0, "id": 1, **{related_field: 1 for related_field in related_fields}}
+                for related in get_collection(related_collection).find({"id": {"$in": list(wanted)}}, projection):
+                    found[related["id"]] = cls._scrub_nan(related)
+            
+            for record in records:
+                value = record.get(field)
+                included = record.setdefault("included", {})
+                if isinstance(value, list):
+                    included[name] = [found[related_id] for related_id in value[:INCLUDE_MAX_PER_RECORD]
+                                      if related_id in found]
+                else:
+                    included[name] = found.get(value)
+    
     @classmethod
     def create(cls, record_data: Dict[str, Any]) -> APIResponse:
         """
@@ -122,14 +405,9 @@ class BaseService:
             if "id" not in record_data or not record_data["id"]:
                 record_data["id"] = cls._generate_id()
             
-            # 检查ID唯一性
-            existing = collection.find_one({"id": record_data["id"]})
-            if existing:
-                return create_error_response(
-                    message=f"Record with ID {record_data['id']} already exists",
-                    code=409
-                )
-            
+            # NaN 不写入数据库，保持集合的“无 NaN”标记成立
+            cls._scrub_nan(record_data)
+
             # 添加时间戳
             now = datetime.utcnow()
             record_data["created_at"] = now
@@ -137,7 +415,7 @@ class BaseService:
             
             # 验证数据
             if cls.MODEL_CLASS:
-                model_instance = cls.MODEL_CLASS.from_dict(record_data)
+                model_instance = cls.MODEL_CLASS.from_dict(dict(record_data))
                 validation_errors = model_instance.validate_data()
                 if validation_errors:
                     return create_error_response(
@@ -146,11 +424,19 @@ class BaseService:
                         error_details={"validation_errors": validation_errors}
                     )
             
-            # 插入数据
-            collection.insert_one(record_data)
+            # 插入数据：ID 唯一性由 id 唯一索引保证，不再先查询
+            cls._ensure_id_index(collection)
+            try:
+                collection.insert_one(record_data)
+                CollectionVersions.bump(cls.COLLECTION_NAME)
+            except DuplicateKeyError as e:
+                key_pattern = (e.details or {}).get("keyPattern") or {"id": 1}
+                message = (f"Record with ID {record_data['id']} already exists" if "id" in key_pattern
+                           else f"Record with duplicate {', '.join(key_pattern)} already exists")
+                return create_error_response(message=message, code=409)
             
             # 返回创建的记录
-            created_record = cls._process_record(record_data)
+            created_record = cls._response_fields(cls._process_record(record_data))
             return create_success_response(
                 data=created_record,
                 message="Record created successfully",
@@ -181,22 +467,25 @@ class BaseService:
         try:
             collection = get_collection(cls.COLLECTION_NAME)
             
-            # 检查记录是否存在
-            existing = collection.find_one({"id": record_id})
+            # 更新时间戳
+            cls._scrub_nan(record_data)
+            record_data["updated_at"] = datetime.utcnow()
+            
+            # 先读取完整的当前文档，合并本次修改后验证，验证通过才写入：
+            # 验证失败时数据库、列表缓存和 ETag 都不会看到无效数据
+            existing = collection.find_one({"id": record_id}, cls.DOCUMENT_PROJECTION)
             if not existing:
                 return create_error_response(
                     message=f"Record with ID {record_id} not found",
                     code=404
                 )
             
-            # 更新时间戳
-            record_data["updated_at"] = datetime.utcnow()
+            # 更新后的记录：当前文档合并本次修改的顶层字段
+            merged_data = {**existing, **record_data}
             
             # 验证数据
             if cls.MODEL_CLASS:
-                # 合并现有数据和更新数据进行验证
-                merged_data = {**existing, **record_data}
-                model_instance = cls.MODEL_CLASS.from_dict(merged_data)
+                model_instance = cls.MODEL_CLASS.from_dict(dict(merged_data))
                 validation_errors = model_instance.validate_data()
                 if validation_errors:
                     return create_error_response(
@@ -205,12 +494,17 @@ class BaseService:
                         error_details={"validation_errors": validation_errors}
                     )
             
-            # 更新数据
-            collection.update_one({"id": record_id}, {"$set": record_data})
+            result = collection.update_one({"id": record_id}, {"$set": record_data})
+            if not result.matched_count:
+                # 读取与写入之间记录已被删除
+                return create_error_response(
+                    message=f"Record with ID {record_id} not found",
+                    code=404
+                )
+            CollectionVersions.bump(cls.COLLECTION_NAME)
             
-            # 返回更新后的记录
-            updated_record = collection.find_one({"id": record_id})
-            processed_record = cls._process_record(updated_record)
+            # 返回更新后的记录（只含响应模型的字段）
+            processed_record = cls._response_fields(cls._process_record(merged_data))
             return create_success_response(
                 data=processed_record,
                 message="Record updated successfully"
@@ -239,26 +533,18 @@ class BaseService:
         try:
             collection = get_collection(cls.COLLECTION_NAME)
             
-            # 检查记录是否存在
-            existing = collection.find_one({"id": record_id})
-            if not existing:
+            # 一次往返完成存在性检查和删除
+            deleted = collection.find_one_and_delete({"id": record_id}, projection={"_id": 1})
+            if not deleted:
                 return create_error_response(
                     message=f"Record with ID {record_id} not found",
                     code=404
                 )
+            CollectionVersions.bump(cls.COLLECTION_NAME)
             
-            # 删除记录
-            result = collection.delete_one({"id": record_id})
-            
-            if result.deleted_count > 0:
-                return create_success_response(
-                    message="Record deleted successfully"
-                )
-            else:
-                return create_error_response(
-                    message="Failed to delete record",
-                    code=500
-                )
+            return create_success_response(
+                message="Record deleted successfully"
+            )
                 
         except Exception as e:
             return create_error_response(
@@ -266,6 +552,48 @@ class BaseService:
                 code=500
             )
     
+    @classmethod
+    def get_record_stamp(cls, record_id: str) -> Optional[str]:
+        """
+        获取记录的修改时间戳，用于生成 ETag（只读取 updated_at 字段）
+
+        Args:
+            record_id: 记录 ID
+
+        Returns:
+            Optional[str]: updated_at 的字符串形式；记录没有 updated_at 时为空字符串；记录不存在时为 None
+        """
+        collection = get_collection(cls.COLLECTION_NAME)
+        record = collection.find_one({"id": record_id}, {"_id": 0, "updated_at": 1})
+        if record is None:
+            return None
+        updated_at = record.get("updated_at")
+        return updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at or "")
+
+    @classmethod
+    def _update_fields(cls, record_id: str, update: Dict[str, Any],
+                       conditions: Optional[Dict[str, Any]] = None):
+        """
+        对单条记录执行更新操作符，同时刷新 updated_at 并递增集合版本号
+
+        由于 updated_at 总会变化，调用方应通过 conditions 只匹配确实需要修改的记录，
+        这样 matched_count / modified_count 仍表示数据是否变化。
+
+        Args:
+            record_id: 记录 ID
+            update: 更新操作，例如 {"$addToSet": {...}}
+            conditions: 附加的匹配条件
+
+        Returns:
+            UpdateResult: 更新结果
+        """
+        update = dict(update)
+        update["$set"] = {**update.get("$set", {}), "updated_at": datetime.utcnow()}
+        result = get_collection(cls.COLLECTION_NAME).update_one({"id": record_id, **(conditions or {})}, update)
+        if result.matched_count:
+            CollectionVersions.bump(cls.COLLECTION_NAME)
+        return result
+
     @classmethod
     def import_from_csv(cls, csv_path: str, clear_existing: bool = False) -> APIResponse:
         """
@@ -279,8 +607,9 @@ class BaseService:
             APIResponse: 导入结果
         """
         try:
-            # 读取 CSV 文件
-            df = pd.read_csv(csv_path)
+            # 读取 CSV 文件（pandas 由 CSVHandler 按需加载）
+            from app.utils.csv_handler import CSVHandler
+            df = CSVHandler.read_csv(csv_path)
             
             # 验证数据
             if cls.MODEL_CLASS:
@@ -292,8 +621,8 @@ class BaseService:
                         error_details={"validation_errors": errors}
                     )
             
-            # 转换为记录列表
-            records = df.to_dict('records')
+            # 转换为记录列表（空单元格读出为 NaN，转为 None 后由 clean_data 丢弃）
+            records = df.astype(object).where(df.notna(), None).to_dict('records')
             
             # 获取集合
             collection = get_collection(cls.COLLECTION_NAME)
@@ -322,6 +651,8 @@ class BaseService:
             # 插入记录
             if processed_records:
                 collection.insert_many(processed_records)
+            if processed_records or clear_existing:
+                CollectionVersions.bump(cls.COLLECTION_NAME)
             
             return create_success_response(
                 data={
@@ -348,15 +679,137 @@ class BaseService:
         Returns:
             Dict[str, Any]: 处理后的记录
         """
-        if "_id" in record:
-            del record["_id"]
+        record.pop("_id", None)
         
         # 转换 NaN 值为 None
+        if cls._may_contain_nan():
+            cls._scrub_nan(record)
+        
+        return record
+
+    @classmethod
+    def _process_records(cls, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量处理记录
+
+        Args:
+            records: 游标或记录列表（查询时应使用 READ_PROJECTION 排除 _id）
+
+        Returns:
+            List[Dict[str, Any]]: 处理后的记录列表
+        """
+        return list(cls._iter_processed(records))
+
+    @classmethod
+    def _iter_processed(cls, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出处理后的记录
+
+        NaN 检查在整批开始前只判断一次；集合中没有 NaN 时，记录原样产出。
+
+        Args:
+            records: 游标或记录列表
+
+        Returns:
+            Iterator[Dict[str, Any]]: 处理后的记录
+        """
+        scrub = cls._may_contain_nan()
+        for record in records:
+            record.pop("_id", None)
+            if scrub:
+                cls._scrub_nan(record)
+            yield record
+
+    @staticmethod
+    def _scrub_nan(record: Dict[str, Any]) -> Dict[str, Any]:
+        """将顶层字段中的 NaN 替换为 None（原地修改）"""
         for key, value in record.items():
-            if isinstance(value, float) and pd.isna(value):
+            # NaN 是唯一不等于自身的浮点数
+            if isinstance(value, float) and value != value:
                 record[key] = None
-        
         return record
+
+    @classmethod
+    def _may_contain_nan(cls) -> bool:
+        """
+        集合中是否可能存在 NaN
+
+        早期的 CSV 导入会把空单元格原样写成 NaN。集合经过 repair_nan_values 清理后
+        在元数据集合中记录标记，之后读取不再逐字段检查。
+
+        Returns:
+            bool: 是否需要清理 NaN
+        """
+        flag = BaseService._nan_flags.get(cls.COLLECTION_NAME)
+        if flag is not None:
+            return flag
+
+        try:
+            meta = get_collection(COLLECTION_META_COLLECTION).find_one({"_id": cls.COLLECTION_NAME})
+            flag = not (meta and meta.get("nan_free"))
+        except Exception:
+            # 读取元数据失败时按可能含有 NaN 处理
+            return True
+
+        with BaseService._nan_lock:
+            BaseService._nan_flags[cls.COLLECTION_NAME] = flag
+        return flag
+
+    @classmethod
+    def repair_nan_values(cls) -> int:
+        """
+        将集合中遗留的 NaN 字段改写为 None，并标记集合为无 NaN
+
+        已标记的集合直接跳过，启动时重复调用只需一次元数据查询。
+
+        Returns:
+            int: 修复的记录数
+        """
+        if not cls._may_contain_nan():
+            return 0
+
+        collection = get_collection(cls.COLLECTION_NAME)
+        repaired = 0
+        for record in collection.find({}):
+            nan_fields = [key for key, value in record.items() if isinstance(value, float) and value != value]
+            if nan_fields:
+                collection.update_one({"_id": record["_id"]}, {"$set": {key: None for key in nan_fields}})
+                repaired += 1
+
+        # 有记录被修改时同时递增集合版本号
+        meta_update = {"$set": {"nan_free": True, "updated_at": datetime.utcnow()}}
+        if repaired:
+            meta_update["$inc"] = {"version": 1}
+        get_collection(COLLECTION_META_COLLECTION).update_one(
+            {"_id": cls.COLLECTION_NAME}, meta_update, upsert=True
+        )
+        with BaseService._nan_lock:
+            BaseService._nan_flags[cls.COLLECTION_NAME] = False
+        return repaired
+
+    @classmethod
+    def _ensure_id_index(cls, collection) -> None:
+        """
+        确保集合存在 id 唯一索引（每个集合每个进程只创建一次）
+
+        正常情况下索引在启动时由 DatabaseSetup.create_indexes 创建，这里保证新集合也能依赖索引去重。
+
+        Args:
+            collection: 集合
+        """
+        if cls.COLLECTION_NAME in BaseService._id_indexes:
+            return
+        collection.create_index("id", unique=True)
+        BaseService._id_indexes.add(cls.COLLECTION_NAME)
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """清空 NaN 标记、索引缓存和查询缓存（切换数据库或测试时使用）"""
+        with BaseService._nan_lock:
+            BaseService._nan_flags = {}
+        BaseService._id_indexes = set()
+        CollectionVersions.reset_state()
+        query_cache.reset_state()
     
     @classmethod
     def _generate_id(cls) -> str:
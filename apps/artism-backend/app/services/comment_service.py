@@ -4,6 +4,10 @@ from app.db.mongodb import get_collection
 from app.models.comment import Comment, AICommentThread
 from app.schemas.comment import CommentCreate, CommentUpdate, CommentStats
 from app.services.artist_service import ArtistService
+from app.utils.event_bus import event_bus
+from app.utils.metrics import phase
+from app.utils import primary_key
+from app.utils.singleflight import singleflight
 import uuid
 import logging
 
@@ -21,6 +25,45 @@ class CommentService:
     def get_threads_collection():
         """获取线程集合"""
         return get_collection("comment_threads")
+
+    # 事件总线主题
+    STREAM_TOPIC = "comments"
+
+    @classmethod
+    def target_topic(cls, target_type: str, target_id: str) -> str:
+        """获取某个评论目标对应的事件主题"""
+        return f"{cls.STREAM_TOPIC}:{target_type}:{target_id}"
+
+    @staticmethod
+    def _resolve_author_name(author_id: str) -> str:
+        """获取评论作者的显示名称"""
+        try:
+            with phase("authors"):
+                profile = ArtistService.get_profile(author_id)
+            if profile and profile.get("name"):
+                return profile["name"]
+        except Exception:
+            pass
+        return f"AI Artist {author_id}"
+
+    @classmethod
+    def _publish_created(cls, comment_dict: Dict[str, Any]) -> None:
+        """
+        将新评论发布到事件总线
+
+        作者名称在发布时解析一次，所有订阅者共享同一份事件数据。
+        """
+        try:
+            payload = dict(comment_dict)
+            payload["author_name"] = cls._resolve_author_name(payload["author_id"])
+            event_bus.publish(
+                "comment.created",
+                payload,
+                topics=(cls.STREAM_TOPIC, cls.target_topic(payload["target_type"], payload["target_id"]))
+            )
+        except Exception as e:
+            # 推送失败不影响评论写入
+            logger.warning(f"Failed to publish comment event: {e}")
     
     @classmethod
     def create_comment(cls, comment_data: CommentCreate) -> Dict[str, Any]:
@@ -41,12 +84,13 @@ class CommentService:
             )
             
             # 转换为字典并插入数据库
-            comment_dict = comment.to_dict()
+            comment_dict = primary_key.prepare_document(comment.to_document())
             result = collection.insert_one(comment_dict)
             
             if result.inserted_id:
-                comment_dict['_id'] = str(result.inserted_id)
+                primary_key.to_public(comment_dict)
                 logger.info(f"Created comment {comment.id}")
+                cls._publish_created(comment_dict)
                 return comment_dict
             else:
                 raise Exception("Failed to insert comment")
@@ -60,11 +104,10 @@ class CommentService:
         """根据ID获取评论"""
         try:
             collection = cls.get_collection()
-            comment = collection.find_one({"id": comment_id})
+            comment = collection.find_one(primary_key.id_filter(comment_id))
             
             if comment:
-                comment['_id'] = str(comment['_id'])
-                return comment
+                return primary_key.to_public(comment)
             return None
             
         except Exception as e:
@@ -88,9 +131,9 @@ class CommentService:
                           .skip(skip)
                           .limit(limit))
             
-            # 转换ObjectId为字符串
+            # 转换主键为响应格式
             for comment in comments:
-                comment['_id'] = str(comment['_id'])
+                primary_key.to_public(comment)
             
             return comments
             
@@ -108,17 +151,12 @@ class CommentService:
                           .sort("created_at", -1)
                           .limit(limit))
             
-            # 转换ObjectId为字符串并添加作者信息
+            # 转换主键为响应格式并添加作者信息
             for comment in comments:
-                comment['_id'] = str(comment['_id'])
+                primary_key.to_public(comment)
                 
                 # 获取作者信息
-                try:
-                    artist_response = ArtistService.get_by_id(comment['author_id'])
-                    if artist_response.success and artist_response.data:
-                        comment['author_name'] = artist_response.data.name
-                except Exception:
-                    comment['author_name'] = f"AI Artist {comment['author_id']}"
+                comment['author_name'] = cls._resolve_author_name(comment['author_id'])
             
             return comments
             
@@ -144,7 +182,7 @@ class CommentService:
             update_dict['updated_at'] = datetime.utcnow()
             
             result = collection.update_one(
-                {"id": comment_id},
+                primary_key.id_filter(comment_id),
                 {"$set": update_dict}
             )
             
@@ -161,7 +199,7 @@ class CommentService:
         """删除评论"""
         try:
             collection = cls.get_collection()
-            result = collection.delete_one({"id": comment_id})
+            result = collection.delete_one(primary_key.id_filter(comment_id))
             return result.deleted_count > 0
             
         except Exception as e:
@@ -169,8 +207,9 @@ class CommentService:
             return False
     
     @classmethod
+    @singleflight
     def get_comment_stats(cls) -> CommentStats:
-        """获取评论统计"""
+        """获取评论统计（并发调用合并为一次聚合）"""
         try:
             collection = cls.get_collection()
             
@@ -210,14 +249,8 @@ class CommentService:
             most_active_artists = []
             
             for result in active_artists_results:
-                try:
-                    artist_response = ArtistService.get_by_id(result["_id"])
-                    artist_name = artist_response.data.name if artist_response.success and artist_response.data else f"AI Artist {result['_id']}"
-                except Exception:
-                    artist_name = f"AI Artist {result['_id']}"
-                
                 most_active_artists.append({
-                    "name": artist_name,
+                    "name": cls._resolve_author_name(result["_id"]),
                     "comment_count": result["comment_count"]
                 })
             
@@ -245,17 +278,12 @@ class CommentService:
             replies = list(collection.find({"parent_comment_id": parent_comment_id})
                          .sort("created_at", 1))  # 回复按时间正序排列
 
-            # 转换ObjectId为字符串并添加作者信息
+            # 转换主键为响应格式并添加作者信息
             for reply in replies:
-                reply['_id'] = str(reply['_id'])
+                primary_key.to_public(reply)
 
                 # 获取作者信息
-                try:
-                    artist_response = ArtistService.get_by_id(reply['author_id'])
-                    if artist_response.success and artist_response.data:
-                        reply['author_name'] = artist_response.data.name
-                except Exception:
-                    reply['author_name'] = f"AI Artist {reply['author_id']}"
+                reply['author_name'] = cls._resolve_author_name(reply['author_id'])
 
             return replies
 
@@ -284,15 +312,10 @@ class CommentService:
 
             # 为每个顶级评论添加回复
             for comment in top_level_comments:
-                comment['_id'] = str(comment['_id'])
+                primary_key.to_public(comment)
 
                 # 获取作者信息
-                try:
-                    artist_response = ArtistService.get_by_id(comment['author_id'])
-                    if artist_response.success and artist_response.data:
-                        comment['author_name'] = artist_response.data.name
-                except Exception:
-                    comment['author_name'] = f"AI Artist {comment['author_id']}"
+                comment['author_name'] = cls._resolve_author_name(comment['author_id'])
 
                 # 获取回复
                 comment['replies'] = cls.get_comment_replies(comment['id'])
@@ -318,13 +341,14 @@ class CommentService:
                 max_comments=max_comments
             )
 
-            thread_dict = thread.to_dict()
+            thread_dict = thread.to_document()
             thread_dict['id'] = str(uuid.uuid4())
+            thread_dict = primary_key.prepare_document(thread_dict)
 
             result = threads_collection.insert_one(thread_dict)
 
             if result.inserted_id:
-                thread_dict['_id'] = str(result.inserted_id)
+                primary_key.to_public(thread_dict)
                 logger.info(f"Created comment thread {thread_dict['id']}")
                 return thread_dict
             else:
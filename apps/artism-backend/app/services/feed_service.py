@@ -0,0 +1,383 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from app.db.mongodb import get_collection
+from app.core.config import (
+    ARTISTS_COLLECTION, POSTS_COLLECTION, POST_FEED_COLLECTION, FEED_MAX_ENTRIES, FEED_TRIM_EVERY
+)
+from app.utils import primary_key
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FeedService:
+    """
+    首页动态流服务类
+
+    post_feed 集合是帖子的物化时间线：在帖子写入时保存一份带有作者名称、头像和用户名的副本，
+    并生成按时间排序的 feed_key。读取时只需要在 feed_key 索引上做一次范围扫描，
+    不再对每条帖子查询作者信息。作者资料变更由 ArtistService 在后台扇出到动态流。
+    """
+
+    _writes_since_trim = 0
+    _backfill_checked = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_collection():
+        """获取动态流集合"""
+        return get_collection(POST_FEED_COLLECTION)
+
+    @staticmethod
+    def to_datetime(value: Any) -> datetime:
+        """
+        将存储的时间值统一转换为不带时区的 UTC datetime
+
+        历史数据中 created_at 可能是 datetime，也可能是 ISO 字符串。
+
+        Args:
+            value: datetime 或 ISO 格式字符串
+
+        Returns:
+            datetime: UTC 时间
+        """
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if not isinstance(value, datetime):
+            return datetime.utcnow()
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @classmethod
+    def make_feed_key(cls, created_at: Any, post_id: str) -> str:
+        """
+        生成动态流排序键
+
+        固定宽度的时间戳加上帖子 ID，按字符串排序即为时间顺序，同一时刻的帖子也有确定顺序。
+        时间截断到毫秒（数据库中日期的精度），与 posts 集合按 (created_at, id) 排序一致。
+        该键同时作为分页游标返回给客户端。
+        """
+        created_at = cls.to_datetime(created_at)
+        created_at = created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+        return f"{created_at.strftime('%Y%m%d%H%M%S%f')}:{post_id}"
+
+    @staticmethod
+    def author_fields(artist: Optional[Dict[str, Any]], author_id: str) -> Dict[str, Any]:
+        """
+        生成冗余保存的作者字段
+
+        Args:
+            artist: 艺术家记录，找不到时为 None
+            author_id: 作者 ID
+
+        Returns:
+            Dict[str, Any]: 作者字段
+        """
+        if artist and artist.get("name"):
+            return {
+                "author_name": artist["name"],
+                "author_avatar": artist.get("avatar_url"),
+                "author_username": artist["name"].lower().replace(" ", "_"),
+                "is_verified": True  # AI艺术家都是认证的
+            }
+        return {
+            "author_name": f"AI Artist {author_id}",
+            "author_avatar": None,
+            "author_username": f"ai_artist_{author_id}",
+            "is_verified": True
+        }
+
+    @classmethod
+    def _build_entry(cls, post: Dict[str, Any], artist: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """根据帖子和作者记录构建动态流条目"""
+        entry = {key: value for key, value in post.items() if key != "_id"}
+        if "_id" in post:
+            entry["post_oid"] = str(post["_id"])
+        entry.update(cls.author_fields(artist, post["author_id"]))
+        entry["feed_key"] = cls.make_feed_key(post.get("created_at"), post["id"])
+        return entry
+
+    @classmethod
+    def add_post(cls, post: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        写入动态流条目（在帖子创建时调用）
+
+        Args:
+            post: 已写入 posts 集合的帖子
+
+        Returns:
+            Dict[str, Any]: 冗余的作者字段
+        """
+        artist = get_collection(ARTISTS_COLLECTION).find_one(
+            {"id": post["author_id"]}, {"_id": 0, "name": 1, "avatar_url": 1}
+        )
+        entry = cls._build_entry(post, artist)
+        cls.get_collection().update_one({"id": post["id"]}, {"$set": entry}, upsert=True)
+        cls._maybe_trim()
+        return cls.author_fields(artist, post["author_id"])
+
+    @classmethod
+    def update_post(cls, post_id: str, fields: Dict[str, Any]) -> None:
+        """同步帖子字段变更"""
+        cls.get_collection().update_one({"id": post_id}, {"$set": fields})
+
+    @classmethod
+    def increment(cls, post_id: str, field: str, amount: int = 1) -> None:
+        """同步帖子计数器变更"""
+        cls.get_collection().update_one({"id": post_id}, {"$inc": {field: amount}})
+
+    @classmethod
+    def remove_post(cls, post_id: str) -> None:
+        """删除动态流条目"""
+        cls.get_collection().delete_one({"id": post_id})
+
+    @classmethod
+    def get_feed(cls, limit: int = 20, cursor: Optional[str] = None, skip: int = 0) -> Dict[str, Any]:
+        """
+        读取动态流
+
+        动态流只保留最新的 FEED_MAX_ENTRIES 条；游标或偏移超出保留范围时，不足的部分从 posts 集合按时间倒序读取，
+        因此更早的帖子仍可翻页访问（没有冗余的作者信息可用，逐批查询作者）。
+
+        Args:
+            limit: 返回数量
+            cursor: 上一页返回的 next_cursor，为空时从最新的帖子开始
+            skip: 兼容旧的偏移分页（建议使用 cursor）
+
+        Returns:
+            Dict[str, Any]: {"posts": 帖子列表, "next_cursor": 下一页游标（没有更多时为 None）}
+        """
+        cls._ensure_backfilled()
+
+        query = {"feed_key": {"$lt": cursor}} if cursor else {}
+        entries = list(cls.get_collection()
+                       .find(query, {"_id": 0})
+                       .sort("feed_key", -1)
+                       .skip(skip)
+                       .limit(limit))
+
+        if len(entries) < limit:
+            # 有结果时从最后一条之后继续；没有结果说明偏移已超出动态流，posts 中同样按偏移跳过
+            if entries:
+                boundary, remaining_skip = entries[-1]["feed_key"], 0
+            else:
+                boundary, remaining_skip = cursor, skip
+            entries.extend(cls._entries_before(boundary, remaining_skip, limit - len(entries)))
+
+        next_cursor = entries[-1]["feed_key"] if len(entries) == limit else None
+        return {"posts": [cls._to_post(entry) for entry in entries], "next_cursor": next_cursor}
+
+    @classmethod
+    def _entries_before(cls, feed_key: Optional[str], skip: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        从 posts 集合读取排在 feed_key 之后的帖子，构建为动态流条目（不写入动态流）
+
+        顺序与动态流一致：按 (created_at, id) 倒序。数据库中的时间只精确到毫秒，
+        与边界同一毫秒的帖子单独读取后按排序键排除边界及之前的帖子；
+        结果末尾同一毫秒的帖子也整组读取后按排序键截断，保证下一页从正确位置继续。
+        两种查询都只使用 created_at 索引。
+
+        Args:
+            feed_key: 动态流排序键，为空时从最新的帖子开始
+            skip: 跳过的帖子数量
+            limit: 返回数量
+
+        Returns:
+            List[Dict[str, Any]]: 动态流条目，按时间倒序
+        """
+        posts: List[Dict[str, Any]] = []
+        query: Dict[str, Any] = {}
+        if feed_key:
+            timestamp, post_id = feed_key.split(":", 1)
+            boundary = datetime.strptime(timestamp, "%Y%m%d%H%M%S%f")
+            boundary = boundary.replace(microsecond=boundary.microsecond // 1000 * 1000)
+            # 旧的动态流条目的键可能带有微秒，按毫秒精度的键比较
+            boundary_key = cls.make_feed_key(boundary, post_id)
+            posts = [post for post in cls._posts_at(boundary) if cls._post_key(post) < boundary_key]
+            query["created_at"] = {"$lt": boundary}
+            consumed = min(skip, len(posts))
+            posts, skip = posts[consumed:], skip - consumed
+
+        remaining = limit - len(posts)
+        if remaining > 0:
+            older = [primary_key.to_public(post) for post in
+                     get_collection(POSTS_COLLECTION).find(query).sort("created_at", -1).skip(skip).limit(remaining)]
+            if len(older) == remaining:
+                # 最后一毫秒的帖子可能只取到一部分，整组读取后按排序键补齐
+                last = older[-1].get("created_at")
+                older = [post for post in older if post.get("created_at") != last]
+                older.extend(cls._posts_at(last)[:remaining - len(older)])
+            posts.extend(sorted(older, key=cls._post_key, reverse=True))
+        posts = posts[:limit]
+        if not posts:
+            return []
+
+        artists = {
+            artist["id"]: artist
+            for artist in get_collection(ARTISTS_COLLECTION).find(
+                {"id": {"$in": list({post["author_id"] for post in posts})}},
+                {"_id": 0, "id": 1, "name": 1, "avatar_url": 1}
+            )
+        }
+        return [cls._build_entry(post, artists.get(post["author_id"])) for post in posts]
+
+    @classmethod
+    def _posts_at(cls, created_at: Any) -> List[Dict[str, Any]]:
+        """读取创建时间等于 created_at 的帖子，按动态流排序键倒序"""
+        posts = [primary_key.to_public(post) for post in
+                 get_collection(POSTS_COLLECTION).find({"created_at": created_at})]
+        return sorted(posts, key=cls._post_key, reverse=True)
+
+    @classmethod
+    def _post_key(cls, post: Dict[str, Any]) -> str:
+        """帖子的动态流排序键"""
+        return cls.make_feed_key(post.get("created_at"), post["id"])
+
+    @classmethod
+    def _to_post(cls, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """将动态流条目还原为帖子响应格式"""
+        entry.pop("feed_key", None)
+        if "post_oid" in entry:
+            entry["_id"] = entry.pop("post_oid")
+        if entry.get("created_at") is not None:
+            entry["timestamp_display"] = cls.get_display_timestamp(entry["created_at"])
+        return entry
+
+    @classmethod
+    def update_author(cls, artist_id: str) -> int:
+        """
+        将作者资料变更扇出到该作者的所有动态流条目
+
+        Args:
+            artist_id: 艺术家 ID
+
+        Returns:
+            int: 更新的条目数量
+        """
+        artist = get_collection(ARTISTS_COLLECTION).find_one(
+            {"id": artist_id}, {"_id": 0, "name": 1, "avatar_url": 1}
+        )
+        result = cls.get_collection().update_many(
+            {"author_id": artist_id},
+            {"$set": cls.author_fields(artist, artist_id)}
+        )
+        logger.info(f"Fanned out profile of artist {artist_id} to {result.modified_count} feed entries")
+        return result.modified_count
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 500) -> int:
+        """
+        从 posts 集合重建动态流（保留最新的 FEED_MAX_ENTRIES 条）
+
+        作者信息按批次用一次 $in 查询获取。
+
+        Args:
+            batch_size: 每批处理的帖子数量
+
+        Returns:
+            int: 写入的条目数量
+        """
+        posts_collection = get_collection(POSTS_COLLECTION)
+        cursor = posts_collection.find().sort("created_at", -1).limit(FEED_MAX_ENTRIES)
+
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for post in cursor:
+            batch.append(primary_key.to_public(post))
+            if len(batch) >= batch_size:
+                written += cls._write_batch(batch)
+                batch = []
+        if batch:
+            written += cls._write_batch(batch)
+
+        logger.info(f"Rebuilt post feed with {written} entries")
+        return written
+
+    @classmethod
+    def _write_batch(cls, posts: List[Dict[str, Any]]) -> int:
+        """批量写入动态流条目"""
+        author_ids = list({post["author_id"] for post in posts})
+        artists = {
+            artist["id"]: artist
+            for artist in get_collection(ARTISTS_COLLECTION).find(
+                {"id": {"$in": author_ids}}, {"_id": 0, "id": 1, "name": 1, "avatar_url": 1}
+            )
+        }
+        operations = [
+            UpdateOne({"id": post["id"]}, {"$set": cls._build_entry(post, artists.get(post["author_id"]))}, upsert=True)
+            for post in posts
+        ]
+        cls.get_collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    @classmethod
+    def _ensure_backfilled(cls) -> None:
+        """
+        首次读取时检查动态流是否落后于 posts 集合，落后则从 posts 回填
+
+        动态流条目少于 min(帖子数量, FEED_MAX_ENTRIES) 时说明有帖子没有写入动态流
+        （例如直接写入 posts 集合的导入数据），重建会以 upsert 补齐缺少的条目。
+        两边都使用估算数量，每个进程只检查一次。
+        """
+        if cls._backfill_checked:
+            return
+        with cls._lock:
+            if cls._backfill_checked:
+                return
+            expected = min(get_collection(POSTS_COLLECTION).estimated_document_count(), FEED_MAX_ENTRIES)
+            if cls.get_collection().estimated_document_count() < expected:
+                cls.rebuild()
+            cls._backfill_checked = True
+
+    @classmethod
+    def _maybe_trim(cls) -> None:
+        """每写入 FEED_TRIM_EVERY 条后裁剪动态流，只保留最新的 FEED_MAX_ENTRIES 条"""
+        with cls._lock:
+            cls._writes_since_trim += 1
+            if cls._writes_since_trim < FEED_TRIM_EVERY:
+                return
+            cls._writes_since_trim = 0
+        cls.trim()
+
+    @classmethod
+    def trim(cls, max_entries: int = FEED_MAX_ENTRIES) -> int:
+        """
+        裁剪动态流
+
+        Args:
+            max_entries: 保留的条目数量
+
+        Returns:
+            int: 删除的条目数量
+        """
+        collection = cls.get_collection()
+        boundary = list(collection.find({}, {"feed_key": 1}).sort("feed_key", -1).skip(max_entries).limit(1))
+        if not boundary:
+            return 0
+        result = collection.delete_many({"feed_key": {"$lte": boundary[0]["feed_key"]}})
+        return result.deleted_count
+
+    @classmethod
+    def get_display_timestamp(cls, created_at: Any) -> str:
+        """获取显示用的时间戳"""
+        diff = datetime.utcnow() - cls.to_datetime(created_at)
+
+        if diff.days > 0:
+            return f"{diff.days} days ago"
+        elif diff.seconds > 3600:
+            hours = diff.seconds // 3600
+            return f"{hours} hours ago"
+        elif diff.seconds > 60:
+            minutes = diff.seconds // 60
+            return f"{minutes} minutes ago"
+        else:
+            return "Just now"
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """重置进程内状态（切换数据库或测试时使用）"""
+        with cls._lock:
+            cls._writes_since_trim = 0
+            cls._backfill_checked = False
@@ -0,0 +1,298 @@
+from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.db.mongodb import get_collection
+from app.core.config import (
+    POSTS_COLLECTION, POST_FEED_COLLECTION, POST_LIKE_SHARDS_COLLECTION,
+    LIKE_BUFFER_ENABLED, LIKE_FLUSH_INTERVAL_SECONDS, LIKE_FLUSH_MAX_PENDING, LIKE_COUNTER_SHARDS
+)
+from app.utils.background import run_in_background
+from app.utils import primary_key
+import atexit
+import random
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LikeCounterService:
+    """
+    点赞计数服务类
+
+    点赞请求只在内存中累加增量并立即返回，由后台线程每隔 LIKE_FLUSH_INTERVAL_SECONDS 秒
+    （或累计 LIKE_FLUSH_MAX_PENDING 次后）用一次 bulk_write 合并写入，热门帖子的连续点赞
+    只产生一次文档更新。
+
+    LIKE_COUNTER_SHARDS > 1 时，增量写入 post_like_shards 集合中随机选择的分片文档，
+    posts.likes_count 保留分片启用前的基数，读取时再加上分片之和，避免多个进程同时更新同一文档。
+
+    未写入的增量会在应用关闭（lifespan）和进程退出（atexit）时刷新。写入失败时只把未生效的操作放回缓冲区，
+    避免已写入的增量在下次刷新时重复计入；动态流中的 likes_count 是冗余副本，写入失败只记录日志。
+    """
+
+    # 已确认存在的帖子 ID（避免每次点赞都查询帖子是否存在）
+    KNOWN_POSTS_MAX = 10000
+
+    _pending: Dict[str, int] = {}
+    _pending_total = 0
+    _known_posts: "OrderedDict[str, None]" = OrderedDict()
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _flusher: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    stats = {"buffered": 0, "flushed": 0, "flushes": 0, "flush_errors": 0}
+
+    @classmethod
+    def add(cls, post_id: str, count: int = 1) -> bool:
+        """
+        记录点赞
+
+        Args:
+            post_id: 帖子 ID
+            count: 点赞次数
+
+        Returns:
+            bool: 帖子是否存在
+        """
+        if not cls._post_exists(post_id):
+            return False
+
+        if not LIKE_BUFFER_ENABLED:
+            if cls._write({post_id: count}):
+                raise RuntimeError(f"Failed to write like for post {post_id}")
+            return True
+
+        with cls._lock:
+            cls._pending[post_id] = cls._pending.get(post_id, 0) + count
+            cls._pending_total += count
+            cls.stats["buffered"] += count
+            should_flush = cls._pending_total >= LIKE_FLUSH_MAX_PENDING
+
+        cls._ensure_flusher()
+        if should_flush:
+            run_in_background(cls.flush)
+        return True
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        将缓冲的点赞写入数据库
+
+        Returns:
+            int: 写入的点赞数
+        """
+        with cls._flush_lock:
+            with cls._lock:
+                batch, cls._pending = cls._pending, {}
+                cls._pending_total = 0
+            if not batch:
+                return 0
+
+            try:
+                unapplied = cls._write(batch)
+            except Exception as e:
+                # 无法确定哪些操作生效（例如连接失败），整批放回缓冲区，下次刷新重试
+                cls._requeue(batch)
+                cls.stats["flush_errors"] += 1
+                logger.error(f"Error flushing like counters: {e}")
+                return 0
+
+            if unapplied:
+                cls._requeue(unapplied)
+                cls.stats["flush_errors"] += 1
+            flushed = sum(batch.values()) - sum(unapplied.values())
+            cls.stats["flushes"] += 1
+            cls.stats["flushed"] += flushed
+            return flushed
+
+    @classmethod
+    def _requeue(cls, counts: Dict[str, int]) -> None:
+        """将未写入的增量放回缓冲区"""
+        with cls._lock:
+            for post_id, count in counts.items():
+                cls._pending[post_id] = cls._pending.get(post_id, 0) + count
+                cls._pending_total += count
+
+    @classmethod
+    def _write(cls, batch: Dict[str, int]) -> Dict[str, int]:
+        """
+        批量写入点赞增量
+
+        计数以 posts（或计数分片）为准，只有其中失败的操作需要重试；动态流的 likes_count 尽力同步，
+        失败时记录日志，由下次重建动态流修正。
+
+        Args:
+            batch: 帖子 ID -> 点赞增量
+
+        Returns:
+            Dict[str, int]: 未生效的增量（批量写入中报错的操作）
+        """
+        now = datetime.utcnow()
+        items = list(batch.items())
+
+        if LIKE_COUNTER_SHARDS > 1:
+            collection = get_collection(POST_LIKE_SHARDS_COLLECTION)
+            operations = [
+                UpdateOne(
+                    {"post_id": post_id, "shard": random.randrange(LIKE_COUNTER_SHARDS)},
+                    {"$inc": {"count": count}, "$set": {"updated_at": now}},
+                    upsert=True
+                )
+                for post_id, count in items
+            ]
+        else:
+            collection = get_collection(POSTS_COLLECTION)
+            operations = [
+                UpdateOne(primary_key.id_filter(post_id), {"$inc": {"likes_count": count}, "$set": {"updated_at": now}})
+                for post_id, count in items
+            ]
+
+        unapplied: Dict[str, int] = {}
+        try:
+            collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # 无序写入中未报错的操作都已生效，只返回报错的操作
+            unapplied = dict(items[error["index"]] for error in e.details.get("writeErrors", []))
+            logger.error(f"{len(unapplied)} of {len(items)} like counter writes failed: {e}")
+
+        if LIKE_COUNTER_SHARDS > 1:
+            return unapplied
+
+        applied = [(post_id, count) for post_id, count in items if post_id not in unapplied]
+        if applied:
+            try:
+                get_collection(POST_FEED_COLLECTION).bulk_write([
+                    UpdateOne({"id": post_id}, {"$inc": {"likes_count": count}})
+                    for post_id, count in applied
+                ], ordered=False)
+            except Exception as e:
+                logger.warning(f"Error syncing like counters to post feed: {e}")
+        return unapplied
+
+    @classmethod
+    def get_unflushed_counts(cls, post_ids: List[str]) -> Dict[str, int]:
+        """
+        获取尚未计入帖子文档的点赞数（内存缓冲 + 计数分片）
+
+        Args:
+            post_ids: 帖子 ID 列表
+
+        Returns:
+            Dict[str, int]: 帖子 ID -> 点赞增量
+        """
+        with cls._lock:
+            counts = {post_id: cls._pending[post_id] for post_id in post_ids if post_id in cls._pending}
+
+        if LIKE_COUNTER_SHARDS > 1 and post_ids:
+            pipeline = [
+                {"$match": {"post_id": {"$in": post_ids}}},
+                {"$group": {"_id": "$post_id", "count": {"$sum": "$count"}}}
+            ]
+            for row in get_collection(POST_LIKE_SHARDS_COLLECTION).aggregate(pipeline):
+                counts[row["_id"]] = counts.get(row["_id"], 0) + row["count"]
+        return counts
+
+    @classmethod
+    def get_unflushed_total(cls) -> int:
+        """获取所有帖子尚未计入帖子文档的点赞总数"""
+        with cls._lock:
+            total = cls._pending_total
+
+        if LIKE_COUNTER_SHARDS > 1:
+            pipeline = [{"$group": {"_id": None, "count": {"$sum": "$count"}}}]
+            rows = list(get_collection(POST_LIKE_SHARDS_COLLECTION).aggregate(pipeline))
+            total += rows[0]["count"] if rows else 0
+        return total
+
+    @classmethod
+    def overlay(cls, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        将未写入帖子文档的点赞数叠加到帖子的 likes_count 上（原地修改）
+
+        Args:
+            posts: 帖子列表
+
+        Returns:
+            List[Dict[str, Any]]: 同一个帖子列表
+        """
+        if not posts:
+            return posts
+        counts = cls.get_unflushed_counts([post["id"] for post in posts if "id" in post])
+        for post in posts:
+            extra = counts.get(post.get("id"))
+            if extra:
+                post["likes_count"] = (post.get("likes_count") or 0) + extra
+        return posts
+
+    @classmethod
+    def _post_exists(cls, post_id: str) -> bool:
+        """检查帖子是否存在（命中缓存时不查询数据库）"""
+        with cls._lock:
+            if post_id in cls._known_posts:
+                cls._known_posts.move_to_end(post_id)
+                return True
+
+        if get_collection(POSTS_COLLECTION).find_one(primary_key.id_filter(post_id), {"_id": 1}) is None:
+            return False
+
+        with cls._lock:
+            cls._known_posts[post_id] = None
+            while len(cls._known_posts) > cls.KNOWN_POSTS_MAX:
+                cls._known_posts.popitem(last=False)
+        return True
+
+    @classmethod
+    def forget(cls, post_id: str) -> None:
+        """帖子删除后清理缓冲区和存在性缓存"""
+        with cls._lock:
+            cls._known_posts.pop(post_id, None)
+            cls._pending_total -= cls._pending.pop(post_id, 0)
+        if LIKE_COUNTER_SHARDS > 1:
+            get_collection(POST_LIKE_SHARDS_COLLECTION).delete_many({"post_id": post_id})
+
+    @classmethod
+    def _ensure_flusher(cls) -> None:
+        """启动后台刷新线程（首次点赞时）"""
+        if cls._flusher is not None and cls._flusher.is_alive():
+            return
+        with cls._lock:
+            if cls._flusher is not None and cls._flusher.is_alive():
+                return
+            cls._stop.clear()
+            cls._flusher = threading.Thread(target=cls._run_flusher, name="like-counter-flusher", daemon=True)
+            cls._flusher.start()
+
+    @classmethod
+    def _run_flusher(cls) -> None:
+        """后台刷新循环"""
+        while not cls._stop.wait(LIKE_FLUSH_INTERVAL_SECONDS):
+            cls.flush()
+
+    @classmethod
+    def shutdown(cls) -> int:
+        """
+        停止后台刷新并写入剩余的点赞（应用关闭时调用）
+
+        Returns:
+            int: 最后一次写入的点赞数
+        """
+        cls._stop.set()
+        flusher = cls._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout=LIKE_FLUSH_INTERVAL_SECONDS + 1)
+        cls._flusher = None
+        return cls.flush()
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """丢弃缓冲区和缓存（切换数据库或测试时使用）"""
+        with cls._lock:
+            cls._pending = {}
+            cls._pending_total = 0
+            cls._known_posts = OrderedDict()
+
+
+# 进程正常退出时写入剩余的点赞
+atexit.register(LikeCounterService.shutdown)
@@ -0,0 +1,567 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Set
+import logging
+
+from app.core.config import (
+    LLM_BACKEND, LLM_BASE_URL, LLM_MODEL, OPENAI_API_KEY,
+    LLM_MAX_CONCURRENCY, LLM_BATCH_SIZE, LLM_BATCH_WINDOW_MS,
+    LLM_MAX_RETRIES, LLM_RETRY_BACKOFF_SECONDS, LLM_REQUEST_TIMEOUT_SECONDS,
+    LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES, LLM_MAX_TOKENS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackendError(Exception):
+    """LLM 后端调用失败"""
+
+
+class LLMTransientError(LLMBackendError):
+    """可重试的 LLM 后端错误（超时、限流、5xx 等）"""
+
+
+class LLMBackend:
+    """
+    LLM 生成后端基类
+
+    对具体模型调用做统一封装，提供：
+    - 有界并发（信号量）
+    - 请求合批（在短时间窗口内聚合提示词，一次调用完成）
+    - 指数退避重试
+    - 基于提示词哈希、带 TTL 的响应缓存
+    - 流式 token 输出
+
+    子类只需实现 _complete_batch 与 _stream_tokens。
+    """
+
+    name: str = "base"
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        batch_size: int = LLM_BATCH_SIZE,
+        batch_window_ms: float = LLM_BATCH_WINDOW_MS,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_backoff: float = LLM_RETRY_BACKOFF_SECONDS,
+        request_timeout: float = LLM_REQUEST_TIMEOUT_SECONDS,
+        cache_ttl: float = LLM_CACHE_TTL_SECONDS,
+        cache_max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_tokens: int = LLM_MAX_TOKENS
+    ):
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.batch_window = max(0.0, batch_window_ms) / 1000.0
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.request_timeout = request_timeout
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.max_tokens = max_tokens
+
+        # 信号量与合批状态需绑定到事件循环，延迟创建
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 已发出、尚未完成的批次任务（事件循环只保留弱引用，需在此持有）
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "batches": 0,
+            "batched_prompts": 0,
+            "retries": 0,
+            "errors": 0
+        }
+
+    # ------------------------------------------------------------------
+    # 公共接口
+    # ------------------------------------------------------------------
+
+    async def generate(self, prompt: str, temperature: float = 0.8, max_tokens: Optional[int] = None) -> str:
+        """
+        生成单条文本
+
+        Args:
+            prompt: 提示词
+            temperature: 采样温度
+            max_tokens: 最大生成 token 数
+
+        Returns:
+            str: 生成的文本
+        """
+        self._bind_loop()
+        self.stats["requests"] += 1
+        options = self._normalize_options(temperature, max_tokens)
+        cache_key = self._cache_key(prompt, options)
+
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        # 相同提示词的并发请求共享同一个结果
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        # 结果由完成回调写入缓存并移出 _inflight：发起请求的调用被取消时，
+        # 其他等待者仍共享同一个结果，完成前到达的相同请求也不会重复生成
+        future = self._loop.create_future()
+        self._inflight[cache_key] = future
+        future.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        self._enqueue(prompt, options, future)
+        return await asyncio.shield(future)
+
+    def _finish_inflight(self, cache_key: str, future: asyncio.Future):
+        """共享的生成结果完成后写入缓存并移出 _inflight"""
+        if self._inflight.get(cache_key) is future:
+            del self._inflight[cache_key]
+        if not future.cancelled() and future.exception() is None:
+            self._cache_set(cache_key, future.result())
+
+    async def generate_many(self, prompts: List[str], temperature: float = 0.8,
+                            max_tokens: Optional[int] = None) -> List[str]:
+        """
+        并发生成多条文本（自动合批）
+
+        Args:
+            prompts: 提示词列表
+            temperature: 采样温度
+            max_tokens: 最大生成 token 数
+
+        Returns:
+            List[str]: 与提示词一一对应的生成结果
+        """
+        return list(await asyncio.gather(
+            *(self.generate(prompt, temperature, max_tokens) for prompt in prompts)
+        ))
+
+    async def stream(self, prompt: str, temperature: float = 0.8,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        流式生成文本，逐个返回 token
+
+        Args:
+            prompt: 提示词
+            temperature: 采样温度
+            max_tokens: 最大生成 token 数
+
+        Yields:
+            str: 生成的 token 片段
+        """
+        self.stats["requests"] += 1
+        options = self._normalize_options(temperature, max_tokens)
+        cache_key = self._cache_key(prompt, options)
+
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            for token in self._split_tokens(cached):
+                yield token
+            return
+
+        self._bind_loop()
+        chunks: List[str] = []
+        async with self._semaphore:
+            # 第一个 token 之前的瞬时错误与超时按退避策略重试；已输出内容后无法重试，错误直接抛出
+            attempt = 0
+            while True:
+                tokens = self._stream_tokens(prompt, options)
+                try:
+                    first = await asyncio.wait_for(tokens.__anext__(), timeout=self.request_timeout)
+                except StopAsyncIteration:
+                    first = None
+                except (LLMTransientError, asyncio.TimeoutError) as e:
+                    await tokens.aclose()
+                    try:
+                        await self._backoff(attempt, e)
+                    except LLMBackendError:
+                        self.stats["errors"] += 1
+                        raise
+                    attempt += 1
+                    continue
+                break
+
+            try:
+                if first is not None:
+                    chunks.append(first)
+                    yield first
+                    async for token in tokens:
+                        chunks.append(token)
+                        yield token
+            finally:
+                await tokens.aclose()
+        self._cache_set(cache_key, "".join(chunks))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取后端运行统计
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        return {
+            "backend": self.name,
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "batch_size": self.batch_size,
+            "cache_entries": len(self._cache),
+            **self.stats
+        }
+
+    def clear_cache(self):
+        """清空响应缓存"""
+        self._cache.clear()
+
+    async def aclose(self):
+        """释放后端持有的资源"""
+
+    # ------------------------------------------------------------------
+    # 子类实现
+    # ------------------------------------------------------------------
+
+    async def _complete_batch(self, prompts: List[str], options: Dict[str, Any]) -> List[str]:
+        """
+        一次调用完成一批提示词的生成
+
+        Args:
+            prompts: 提示词列表
+            options: 生成参数
+
+        Returns:
+            List[str]: 与提示词一一对应的生成结果
+        """
+        raise NotImplementedError
+
+    async def _stream_tokens(self, prompt: str, options: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        流式生成单条提示词
+
+        默认实现：完整生成后按 token 切分返回
+        """
+        results = await self._call_with_retry([prompt], options)
+        for token in self._split_tokens(results[0]):
+            yield token
+
+    # ------------------------------------------------------------------
+    # 合批、并发与重试
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self):
+        """将并发控制绑定到当前事件循环"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._pending = {}
+            self._flush_handles = {}
+            self._inflight = {}
+            self._batch_tasks = set()
+
+    def _enqueue(self, prompt: str, options: Dict[str, Any], future: asyncio.Future):
+        """将提示词加入待合批队列"""
+        batch_key = json.dumps(options, sort_keys=True)
+        queue = self._pending.setdefault(batch_key, [])
+        queue.append((prompt, future))
+
+        if len(queue) >= self.batch_size:
+            self._flush(batch_key, options)
+        elif batch_key not in self._flush_handles:
+            self._flush_handles[batch_key] = self._loop.call_later(
+                self.batch_window, self._flush, batch_key, options
+            )
+
+    def _flush(self, batch_key: str, options: Dict[str, Any]):
+        """把待合批队列中的提示词作为一个批次发出"""
+        handle = self._flush_handles.pop(batch_key, None)
+        if handle is not None:
+            handle.cancel()
+
+        queue = self._pending.pop(batch_key, [])
+        if queue:
+            task = self._loop.create_task(self._run_batch(queue, options))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, queue: List[Tuple[str, asyncio.Future]], options: Dict[str, Any]):
+        """执行一个批次并分发结果"""
+        prompts = [prompt for prompt, _ in queue]
+        self.stats["batches"] += 1
+        self.stats["batched_prompts"] += len(prompts)
+
+        try:
+            async with self._semaphore:
+                results = await self._call_with_retry(prompts, options)
+            if len(results) != len(prompts):
+                raise LLMBackendError(
+                    f"Backend returned {len(results)} results for {len(prompts)} prompts"
+                )
+        except Exception as e:
+            self.stats["errors"] += 1
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), text in zip(queue, results):
+            if not future.done():
+                future.set_result(text)
+
+    async def _call_with_retry(self, prompts: List[str], options: Dict[str, Any]) -> List[str]:
+        """带超时与指数退避重试的批量调用"""
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.wait_for(
+                    self._complete_batch(prompts, options),
+                    timeout=self.request_timeout
+                )
+            except (LLMTransientError, asyncio.TimeoutError) as e:
+                await self._backoff(attempt, e)
+                attempt += 1
+
+    async def _backoff(self, attempt: int, error: Exception):
+        """
+        第 attempt 次尝试失败后按指数退避等待；已用完重试次数时抛出 LLMBackendError
+
+        Args:
+            attempt: 已重试的次数
+            error: 本次失败的错误
+        """
+        if attempt >= self.max_retries:
+            raise LLMBackendError(f"LLM request failed after {attempt + 1} attempts: {error}") from error
+        delay = self.retry_backoff * (2 ** attempt) * (0.5 + random.random())
+        self.stats["retries"] += 1
+        logger.warning(f"LLM request failed ({error}), retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})")
+        await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # 缓存
+    # ------------------------------------------------------------------
+
+    def _normalize_options(self, temperature: float, max_tokens: Optional[int]) -> Dict[str, Any]:
+        return {
+            "temperature": round(float(temperature), 3),
+            "max_tokens": int(max_tokens or self.max_tokens)
+        }
+
+    def _cache_key(self, prompt: str, options: Dict[str, Any]) -> str:
+        raw = json.dumps({"model": self.model, "prompt": prompt, **options}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if self.cache_ttl <= 0:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return None
+        self._cache.move_to_end(key)
+        return text
+
+    def _cache_set(self, key: str, text: str):
+        if self.cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _split_tokens(text: str) -> List[str]:
+        """把文本切分为近似 token 的片段（按空格保留分隔符，中文按字符）"""
+        tokens: List[str] = []
+        buffer = ""
+        for char in text:
+            if char.isspace():
+                buffer += char
+                tokens.append(buffer)
+                buffer = ""
+            elif ord(char) > 0x2E7F:
+                if buffer:
+                    tokens.append(buffer)
+                    buffer = ""
+                tokens.append(char)
+            else:
+                buffer += char
+        if buffer:
+            tokens.append(buffer)
+        return tokens
+
+
+class StubLLMBackend(LLMBackend):
+    """
+    本地桩后端
+
+    不访问网络，按配置模拟请求延迟、逐 token 延迟和瞬时故障，
+    用于离线测试与基准测试。
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.05, token_latency: float = 0.0,
+                 failure_rate: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    @staticmethod
+    def render(prompt: str) -> str:
+        """根据提示词生成确定性的回复文本"""
+        digest = hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8]
+        summary = prompt.strip().splitlines()[-1] if prompt.strip() else ""
+        return f"[stub:{digest}] {summary}"
+
+    async def _complete_batch(self, prompts: List[str], options: Dict[str, Any]) -> List[str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise LLMTransientError("stub backend simulated failure")
+        return [self.render(prompt) for prompt in prompts]
+
+    async def _stream_tokens(self, prompt: str, options: Dict[str, Any]) -> AsyncIterator[str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        for token in self._split_tokens(self.render(prompt))[:options["max_tokens"]]:
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield token
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    OpenAI 兼容接口后端
+
+    使用 /completions 接口（prompt 支持数组，一次请求完成一批生成），
+    流式输出使用 SSE。也可指向本地桩服务器 app.services.llm_stub_server。
+    """
+
+    name = "openai"
+
+    def __init__(self, base_url: str = LLM_BASE_URL, api_key: str = OPENAI_API_KEY,
+                 transport: Any = None, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._transport = transport
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.request_timeout,
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=self.max_concurrency)
+            )
+        return self._client
+
+    async def _complete_batch(self, prompts: List[str], options: Dict[str, Any]) -> List[str]:
+        import httpx
+        payload = {"model": self.model, "prompt": prompts, **options}
+        try:
+            response = await self._get_client().post("/completions", json=payload)
+        except httpx.TransportError as e:
+            raise LLMTransientError(str(e)) from e
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise LLMTransientError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise LLMBackendError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        results = [""] * len(prompts)
+        for choice in response.json().get("choices", []):
+            index = choice.get("index", 0)
+            if 0 <= index < len(results):
+                results[index] = choice.get("text", "").strip()
+        return results
+
+    async def _stream_tokens(self, prompt: str, options: Dict[str, Any]) -> AsyncIterator[str]:
+        import httpx
+        payload = {"model": self.model, "prompt": prompt, "stream": True, **options}
+        try:
+            async with self._get_client().stream("POST", "/completions", json=payload) as response:
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise LLMTransientError(f"HTTP {response.status_code}")
+                if response.status_code >= 400:
+                    raise LLMBackendError(f"HTTP {response.status_code}")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    for choice in json.loads(data).get("choices", []):
+                        if choice.get("text"):
+                            yield choice["text"]
+        except httpx.TransportError as e:
+            raise LLMTransientError(str(e)) from e
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 全局后端实例
+_backend: Optional[LLMBackend] = None
+
+
+def create_llm_backend(kind: str = LLM_BACKEND, **kwargs) -> Optional[LLMBackend]:
+    """
+    根据配置创建 LLM 后端
+
+    Args:
+        kind: 后端类型（"stub"、"openai"，留空表示禁用）
+
+    Returns:
+        Optional[LLMBackend]: 后端实例，禁用时返回 None
+    """
+    if not kind:
+        return None
+    if kind == "stub":
+        return StubLLMBackend(**kwargs)
+    if kind == "openai":
+        return OpenAICompatibleBackend(**kwargs)
+    raise ValueError(f"Unknown LLM backend: {kind}")
+
+
+def get_llm_backend() -> Optional[LLMBackend]:
+    """
+    获取 LLM 后端实例（单例模式）
+    未配置 LLM_BACKEND 时返回 None，调用方应回退到模板生成
+    """
+    global _backend
+    if _backend is None and LLM_BACKEND:
+        _backend = create_llm_backend(LLM_BACKEND)
+    return _backend
+
+
+def set_llm_backend(backend: Optional[LLMBackend]):
+    """
+    替换全局 LLM 后端（用于测试与基准测试）
+
+    Args:
+        backend: 新的后端实例，None 表示禁用
+    """
+    global _backend
+    _backend = backend
@@ -0,0 +1,81 @@
+"""
+本地 LLM 桩服务器
+
+实现 OpenAI 兼容的 /v1/completions 接口（支持 prompt 数组与 SSE 流式输出），
+用于在不访问外部模型的情况下测试和压测 OpenAICompatibleBackend。
+
+启动方式：
+    uvicorn app.services.llm_stub_server:app --port 8100
+
+也可以不启动进程，直接通过 httpx.ASGITransport(app=app) 在进程内调用。
+"""
+
+import asyncio
+import json
+import os
+from typing import List, Union, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.services.llm_backend import StubLLMBackend
+
+
+class CompletionRequest(BaseModel):
+    """补全请求"""
+    model: str = "stub"
+    prompt: Union[str, List[str]]
+    max_tokens: int = 256
+    temperature: float = 0.8
+    stream: bool = False
+
+
+def create_stub_server_app(latency: Optional[float] = None, token_latency: Optional[float] = None) -> FastAPI:
+    """
+    创建桩服务器应用
+
+    Args:
+        latency: 每个请求的模拟延迟（秒），默认读取 LLM_STUB_LATENCY
+        token_latency: 流式输出时每个 token 的模拟延迟（秒），默认读取 LLM_STUB_TOKEN_LATENCY
+
+    Returns:
+        FastAPI: 桩服务器应用
+    """
+    request_latency = latency if latency is not None else float(os.getenv("LLM_STUB_LATENCY", "0.05"))
+    per_token_latency = token_latency if token_latency is not None else float(os.getenv("LLM_STUB_TOKEN_LATENCY", "0"))
+
+    stub_app = FastAPI(title="LLM Stub Server")
+    stub_app.state.requests = 0
+
+    @stub_app.post("/v1/completions")
+    async def completions(request: CompletionRequest):
+        stub_app.state.requests += 1
+        prompts = request.prompt if isinstance(request.prompt, list) else [request.prompt]
+        await asyncio.sleep(request_latency)
+
+        if not request.stream:
+            return {
+                "object": "text_completion",
+                "model": request.model,
+                "choices": [
+                    {"index": index, "text": StubLLMBackend.render(prompt), "finish_reason": "stop"}
+                    for index, prompt in enumerate(prompts)
+                ]
+            }
+
+        async def event_stream():
+            tokens = StubLLMBackend._split_tokens(StubLLMBackend.render(prompts[0]))
+            for token in tokens[:request.max_tokens]:
+                if per_token_latency:
+                    await asyncio.sleep(per_token_latency)
+                chunk = {"choices": [{"index": 0, "text": token}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    return stub_app
+
+
+app = create_stub_server_app()
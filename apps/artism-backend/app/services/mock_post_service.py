@@ -127,7 +127,7 @@ class MockPostService:
             artists = []
             try:
                 from app.utils.query_params import QueryParams
-                artists_response = ArtistService.get_all(QueryParams(page_size=50))
+                artists_response = ArtistService.get_all(QueryParams(page_size=50, profile="full"))
                 if artists_response.success and artists_response.data:
                     artists = [artist.dict() for artist in artists_response.data]
             except Exception:
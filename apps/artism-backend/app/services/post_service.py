@@ -3,7 +3,11 @@ from datetime import datetime, timedelta
 from app.db.mongodb import get_collection
 from app.models.post import Post
 from app.schemas.post import PostCreate, PostUpdate, PostStats
-from app.services.artist_service import ArtistService
+from app.services.feed_service import FeedService
+from app.services.trending_service import TrendingService
+from app.services.like_counter_service import LikeCounterService
+from app.utils.singleflight import singleflight
+from app.utils import primary_key
 import uuid
 import logging
 
@@ -35,12 +39,19 @@ class PostService:
             )
             
             # 转换为字典并插入数据库
-            post_dict = post.to_dict()
+            post_dict = primary_key.prepare_document(post.to_document())
             result = collection.insert_one(post_dict)
             
             if result.inserted_id:
-                post_dict['_id'] = str(result.inserted_id)
+                primary_key.to_public(post_dict)
                 logger.info(f"Created post {post.id}")
+
+                # 写入首页动态流（冗余保存作者信息）
+                try:
+                    post_dict.update(FeedService.add_post(post_dict))
+                except Exception as e:
+                    logger.error(f"Error adding post {post.id} to feed: {e}")
+                TrendingService.record(post.id, "post")
                 return post_dict
             else:
                 raise Exception("Failed to insert post")
@@ -54,16 +65,19 @@ class PostService:
         """根据ID获取帖子"""
         try:
             collection = cls.get_collection()
-            post = collection.find_one({"id": post_id})
+            post = collection.find_one(primary_key.id_filter(post_id))
             
             if post:
-                post['_id'] = str(post['_id'])
+                primary_key.to_public(post)
                 # 增加浏览数
                 collection.update_one(
-                    {"id": post_id},
+                    primary_key.id_filter(post_id),
                     {"$inc": {"views_count": 1}, "$set": {"updated_at": datetime.utcnow()}}
                 )
+                FeedService.increment(post_id, "views_count")
+                TrendingService.record(post_id, "view")
                 post['views_count'] = post.get('views_count', 0) + 1
+                LikeCounterService.overlay([post])
                 return post
             return None
             
@@ -73,41 +87,40 @@ class PostService:
     
     @classmethod
     def get_recent_posts(cls, limit: int = 20, skip: int = 0) -> List[Dict[str, Any]]:
-        """获取最近的帖子"""
+        """获取最近的帖子（读取首页动态流）"""
         try:
-            collection = cls.get_collection()
-            
-            posts = list(collection.find()
-                        .sort("created_at", -1)
-                        .skip(skip)
-                        .limit(limit))
-            
-            # 转换ObjectId为字符串并添加作者信息
-            for post in posts:
-                post['_id'] = str(post['_id'])
-                
-                # 获取作者信息
-                try:
-                    artist_response = ArtistService.get_by_id(post['author_id'])
-                    if artist_response.success and artist_response.data:
-                        post['author_name'] = artist_response.data.name
-                        post['author_avatar'] = artist_response.data.avatar_url
-                        post['author_username'] = artist_response.data.name.lower().replace(' ', '_')
-                        post['is_verified'] = True  # AI艺术家都是认证的
-                except Exception:
-                    post['author_name'] = f"AI Artist {post['author_id']}"
-                    post['author_username'] = f"ai_artist_{post['author_id']}"
-                    post['is_verified'] = True
-                
-                # 添加显示时间
-                if 'created_at' in post:
-                    post['timestamp_display'] = cls._get_display_timestamp(post['created_at'])
-            
-            return posts
-            
+            return LikeCounterService.overlay(FeedService.get_feed(limit=limit, skip=skip)["posts"])
+
         except Exception as e:
             logger.error(f"Error getting recent posts: {e}")
             return []
+
+    @classmethod
+    def get_trending_posts(cls, limit: int = 10) -> List[Dict[str, Any]]:
+        """获取热门帖子（按时间衰减的热度排序）"""
+        try:
+            return LikeCounterService.overlay(TrendingService.get_trending_posts(limit=limit))
+
+        except Exception as e:
+            logger.error(f"Error getting trending posts: {e}")
+            return []
+
+    @classmethod
+    def get_feed_page(cls, limit: int = 20, cursor: Optional[str] = None, skip: int = 0) -> Dict[str, Any]:
+        """
+        按游标分页获取首页动态流
+
+        Args:
+            limit: 返回数量
+            cursor: 上一页返回的 next_cursor
+            skip: 跳过的帖子数（兼容旧的偏移分页）
+
+        Returns:
+            Dict[str, Any]: {"posts": 帖子列表, "next_cursor": 下一页游标}
+        """
+        page = FeedService.get_feed(limit=limit, cursor=cursor, skip=skip)
+        LikeCounterService.overlay(page["posts"])
+        return page
     
     @classmethod
     def update_post(cls, post_id: str, update_data: PostUpdate) -> Optional[Dict[str, Any]]:
@@ -131,11 +144,12 @@ class PostService:
             update_dict['updated_at'] = datetime.utcnow()
             
             result = collection.update_one(
-                {"id": post_id},
+                primary_key.id_filter(post_id),
                 {"$set": update_dict}
             )
             
             if result.modified_count > 0:
+                FeedService.update_post(post_id, update_dict)
                 return cls.get_post_by_id(post_id)
             return None
             
@@ -148,7 +162,10 @@ class PostService:
         """删除帖子"""
         try:
             collection = cls.get_collection()
-            result = collection.delete_one({"id": post_id})
+            result = collection.delete_one(primary_key.id_filter(post_id))
+            FeedService.remove_post(post_id)
+            TrendingService.remove(post_id)
+            LikeCounterService.forget(post_id)
             return result.deleted_count > 0
             
         except Exception as e:
@@ -157,14 +174,12 @@ class PostService:
     
     @classmethod
     def increment_likes(cls, post_id: str) -> bool:
-        """增加帖子点赞数"""
+        """增加帖子点赞数（先写入内存缓冲，由 LikeCounterService 批量落库）"""
         try:
-            collection = cls.get_collection()
-            result = collection.update_one(
-                {"id": post_id},
-                {"$inc": {"likes_count": 1}, "$set": {"updated_at": datetime.utcnow()}}
-            )
-            return result.modified_count > 0
+            if not LikeCounterService.add(post_id):
+                return False
+            TrendingService.record(post_id, "like")
+            return True
             
         except Exception as e:
             logger.error(f"Error incrementing likes for post {post_id}: {e}")
@@ -176,9 +191,12 @@ class PostService:
         try:
             collection = cls.get_collection()
             result = collection.update_one(
-                {"id": post_id},
+                primary_key.id_filter(post_id),
                 {"$inc": {"comments_count": 1}, "$set": {"updated_at": datetime.utcnow()}}
             )
+            FeedService.increment(post_id, "comments_count")
+            if result.modified_count > 0:
+                TrendingService.record(post_id, "comment")
             return result.modified_count > 0
             
         except Exception as e:
@@ -186,8 +204,9 @@ class PostService:
             return False
     
     @classmethod
+    @singleflight
     def get_post_stats(cls) -> PostStats:
-        """获取帖子统计"""
+        """获取帖子统计（并发调用合并为一次聚合）"""
         try:
             collection = cls.get_collection()
             
@@ -204,15 +223,11 @@ class PostService:
             ]
             stats_result = list(collection.aggregate(pipeline))
             total_likes = stats_result[0]["total_likes"] if stats_result else 0
+            total_likes += LikeCounterService.get_unflushed_total()
             total_comments = stats_result[0]["total_comments"] if stats_result else 0
             
-            # 最活跃帖子
-            most_active_posts = list(collection.find()
-                                   .sort("comments_count", -1)
-                                   .limit(5))
-            
-            for post in most_active_posts:
-                post['_id'] = str(post['_id'])
+            # 最活跃帖子（取自热度排行，不再对整个集合排序）
+            most_active_posts = cls.get_trending_posts(limit=5)
             
             # 最近帖子
             recent_posts = cls.get_recent_posts(limit=5)
@@ -230,18 +245,6 @@ class PostService:
             return PostStats()
     
     @staticmethod
-    def _get_display_timestamp(created_at: datetime) -> str:
-        """获取显示用的时间戳"""
-        now = datetime.utcnow()
-        diff = now - created_at
-        
-        if diff.days > 0:
-            return f"{diff.days} days ago"
-        elif diff.seconds > 3600:
-            hours = diff.seconds // 3600
-            return f"{hours} hours ago"
-        elif diff.seconds > 60:
-            minutes = diff.seconds // 60
-            return f"{minutes} minutes ago"
-        else:
-            return "Just now"
+    def _get_display_timestamp(created_at: Any) -> str:
+        """获取显示用的时间戳（兼容 datetime 与 ISO 字符串）"""
+        return FeedService.get_display_timestamp(created_at)
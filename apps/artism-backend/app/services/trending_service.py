@@ -0,0 +1,213 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+from app.db.mongodb import get_collection
+from app.core.config import (
+    POSTS_COLLECTION, TRENDING_HALF_LIFE_HOURS, TRENDING_MAX_POSTS, TRENDING_LOAD_HALF_LIVES,
+    TRENDING_WEIGHT_POST, TRENDING_WEIGHT_LIKE, TRENDING_WEIGHT_COMMENT, TRENDING_WEIGHT_VIEW
+)
+from app.services.feed_service import FeedService
+from app.services.like_counter_service import LikeCounterService
+from app.utils import primary_key
+import math
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TrendingService:
+    """
+    热门帖子排行服务类
+
+    每个帖子的热度为各互动事件按时间指数衰减后的加权和：
+        score(t) = Σ w_i × 2^(-(t - t_i) / 半衰期)
+
+    所有帖子的衰减因子相同，因此排序只取决于 Σ w_i × 2^((t_i - t0) / 半衰期)，与查询时间无关。
+    这里保存其以 2 为底的对数（避免数值溢出），放在按分数排序的列表中：
+    互动事件到来时 O(log n) 定位并更新，读取前 K 名只需切片 O(K)，不需要定期重新计算。
+
+    排行数据保存在进程内存中，首次使用时从 posts 集合的计数器和尚未落库的点赞数初始化；
+    初始化失败时下次使用会重试。
+    """
+
+    # 对数分数的时间零点
+    EPOCH = datetime(2024, 1, 1)
+
+    EVENT_WEIGHTS = {
+        "post": TRENDING_WEIGHT_POST,
+        "like": TRENDING_WEIGHT_LIKE,
+        "comment": TRENDING_WEIGHT_COMMENT,
+        "view": TRENDING_WEIGHT_VIEW,
+    }
+
+    _half_life_seconds = TRENDING_HALF_LIFE_HOURS * 3600
+    _max_posts = TRENDING_MAX_POSTS
+    # 按 (-对数分数, 帖子ID) 升序排列，即热度从高到低
+    _ranking: List[Tuple[float, str]] = []
+    _scores: Dict[str, float] = {}
+    _loaded = False
+    _lock = threading.RLock()
+
+    @classmethod
+    def _log_weight(cls, weight: float, at: Optional[datetime] = None) -> float:
+        """事件对数分数：log2(w) + (t - t0) / 半衰期"""
+        at = at or datetime.utcnow()
+        return math.log2(weight) + (at - cls.EPOCH).total_seconds() / cls._half_life_seconds
+
+    @staticmethod
+    def _log_add(a: float, b: float) -> float:
+        """log2(2^a + 2^b)"""
+        high, low = (a, b) if a >= b else (b, a)
+        return high + math.log2(1 + 2 ** (low - high))
+
+    @classmethod
+    def record(cls, post_id: str, event: str, count: int = 1, at: Optional[datetime] = None) -> None:
+        """
+        记录一次互动事件
+
+        Args:
+            post_id: 帖子 ID
+            event: 事件类型（post / like / comment / view）
+            count: 事件次数
+            at: 事件时间，默认为当前时间
+        """
+        weight = cls.EVENT_WEIGHTS.get(event, 0) * count
+        if weight <= 0:
+            return
+        # 调用方先写入计数再记录事件：初始化时从该帖子的计数中扣除本次事件，再按事件时间计入。
+        # 初始化失败时不单独计入：该事件已在计数中，重试初始化时会一并读取
+        if not cls._loaded and not cls._ensure_loaded(exclude=(post_id, weight)):
+            return
+        cls._add(post_id, cls._log_weight(weight, at))
+
+    @classmethod
+    def _add(cls, post_id: str, log_weight: float) -> None:
+        """将对数权重累加到帖子分数并维护有序列表"""
+        with cls._lock:
+            old = cls._scores.get(post_id)
+            if old is not None:
+                index = bisect_left(cls._ranking, (-old, post_id))
+                del cls._ranking[index]
+                new = cls._log_add(old, log_weight)
+            else:
+                new = log_weight
+
+            cls._scores[post_id] = new
+            insort(cls._ranking, (-new, post_id))
+
+            # 超出容量时淘汰热度最低的帖子
+            while len(cls._ranking) > cls._max_posts:
+                _, evicted = cls._ranking.pop()
+                del cls._scores[evicted]
+
+    @classmethod
+    def remove(cls, post_id: str) -> None:
+        """从排行中移除帖子"""
+        with cls._lock:
+            old = cls._scores.pop(post_id, None)
+            if old is not None:
+                index = bisect_left(cls._ranking, (-old, post_id))
+                del cls._ranking[index]
+
+    @classmethod
+    def top(cls, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        获取热度最高的 K 个帖子
+
+        Args:
+            k: 数量
+
+        Returns:
+            List[Tuple[str, float]]: (帖子ID, 当前热度) 列表，按热度从高到低
+        """
+        cls._ensure_loaded()
+        now_offset = cls._log_weight(1.0)
+        with cls._lock:
+            head = cls._ranking[:k]
+        return [(post_id, 2 ** (-neg_score - now_offset)) for neg_score, post_id in head]
+
+    @classmethod
+    def get_trending_posts(cls, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取热门帖子（按排行顺序，附带 trending_score）
+
+        帖子内容从动态流中用一次 $in 查询取出。
+
+        Args:
+            limit: 返回数量
+
+        Returns:
+            List[Dict[str, Any]]: 帖子列表
+        """
+        ranked = cls.top(limit)
+        if not ranked:
+            return []
+
+        FeedService._ensure_backfilled()
+        ids = [post_id for post_id, _ in ranked]
+        entries = FeedService.get_collection().find({"id": {"$in": ids}}, {"_id": 0})
+        posts_by_id = {entry["id"]: FeedService._to_post(entry) for entry in entries}
+
+        posts = []
+        for post_id, score in ranked:
+            post = posts_by_id.get(post_id)
+            if post is not None:
+                post["trending_score"] = score
+                posts.append(post)
+        return posts
+
+    @classmethod
+    def _ensure_loaded(cls, exclude: Optional[Tuple[str, float]] = None) -> bool:
+        """
+        首次使用时根据 posts 集合中的计数器初始化排行（计数按帖子创建时间近似计入）
+
+        只读取最近 TRENDING_LOAD_HALF_LIVES 个半衰期内创建的帖子，更早帖子的热度已衰减到可忽略。
+        点赞先写入 LikeCounterService 的缓冲和计数分片，尚未计入帖子文档的部分一并计入。
+        初始化成功后才标记为已加载，失败时清空部分结果，下次使用时重试。
+
+        Args:
+            exclude: (帖子ID, 权重)，从该帖子的初始权重中扣除（触发初始化的事件由调用方单独计入）
+
+        Returns:
+            bool: 排行是否已初始化
+        """
+        if cls._loaded:
+            return True
+        with cls._lock:
+            if cls._loaded:
+                return True
+            try:
+                horizon = datetime.utcnow() - timedelta(seconds=cls._half_life_seconds * TRENDING_LOAD_HALF_LIVES)
+                projection = {"_id": 1, "id": 1, "created_at": 1, "likes_count": 1,
+                              "comments_count": 1, "views_count": 1}
+                # 尚未迁移为 BSON 日期的旧数据保存的是 ISO 字符串，按字符串比较同样是时间顺序
+                query = {"$or": [{"created_at": {"$gte": horizon}}, {"created_at": {"$gte": horizon.isoformat()}}]}
+                posts = [primary_key.to_public(post) for post in
+                         get_collection(POSTS_COLLECTION).find(query, projection)]
+                unflushed = LikeCounterService.get_unflushed_counts([post["id"] for post in posts])
+                for post in posts:
+                    likes = (post.get("likes_count") or 0) + unflushed.get(post["id"], 0)
+                    weight = (TRENDING_WEIGHT_POST
+                              + TRENDING_WEIGHT_LIKE * likes
+                              + TRENDING_WEIGHT_COMMENT * (post.get("comments_count") or 0)
+                              + TRENDING_WEIGHT_VIEW * (post.get("views_count") or 0))
+                    if exclude and post["id"] == exclude[0]:
+                        weight -= exclude[1]
+                    if weight > 0:
+                        at = FeedService.to_datetime(post.get("created_at"))
+                        cls._add(post["id"], cls._log_weight(weight, at))
+                cls._loaded = True
+                logger.info(f"Loaded trending ranking with {len(cls._ranking)} posts")
+            except Exception as e:
+                logger.error(f"Error loading trending ranking: {e}")
+                cls._ranking = []
+                cls._scores = {}
+            return cls._loaded
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """清空排行（切换数据库或测试时使用）"""
+        with cls._lock:
+            cls._ranking = []
+            cls._scores = {}
+            cls._loaded = False
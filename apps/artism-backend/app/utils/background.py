@@ -0,0 +1,39 @@
+"""
+后台任务工具
+
+用于把不影响响应结果的写操作（例如作者资料变更后的动态流扇出）
+移出请求路径，在独立的线程池中异步执行。
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 后台线程池（数据库驱动是同步的，因此使用线程而不是协程）
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="artism-bg")
+
+
+def _log_failure(future: Future) -> None:
+    """记录后台任务异常"""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background task failed: {error}")
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    在后台线程池中执行函数
+
+    Args:
+        func: 要执行的函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        Future: 任务句柄（调用方通常不需要等待）
+    """
+    future = _executor.submit(func, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
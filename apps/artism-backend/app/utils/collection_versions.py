@@ -0,0 +1,126 @@
+"""
+集合版本号
+
+每个集合在元数据集合（COLLECTION_META_COLLECTION）中有一个 version 计数器，BaseService 的每次写入都会递增。
+列表端点用版本号生成 ETag，不必执行查询就能判断结果是否变化。
+
+计数器保存在数据库中，多个 worker 之间一致；COLLECTION_VERSION_CACHE_SECONDS > 0 时（默认 1 秒）在进程内缓存读取结果，
+本进程的写入会立即更新缓存，其他 worker 的写入最多延迟该时长可见。与写入并发的读取
+不会用旧值覆盖读取开始之后才缓存的版本号。
+"""
+
+from typing import Dict, Iterable, Tuple
+import threading
+import time
+
+from pymongo import ReturnDocument
+
+from app.core.config import COLLECTION_META_COLLECTION, COLLECTION_VERSION_CACHE_SECONDS
+from app.db.mongodb import get_collection
+
+
+class CollectionVersions:
+    """集合版本号读写"""
+
+    # 集合名称 -> (读取时间, 版本号)
+    _cache: Dict[str, Tuple[float, int]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def bump(cls, collection_name: str) -> int:
+        """
+        递增集合版本号
+
+        Args:
+            collection_name: 集合名称
+
+        Returns:
+            int: 新的版本号
+        """
+        started = time.monotonic()
+        meta = get_collection(COLLECTION_META_COLLECTION).find_one_and_update(
+            {"_id": collection_name},
+            {"$inc": {"version": 1}},
+            projection={"version": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        version = int(meta.get("version", 0)) if meta else 0
+        cls._remember({collection_name: version}, started)
+        return version
+
+    @classmethod
+    def get(cls, collection_name: str) -> int:
+        """
+        获取集合版本号
+
+        Args:
+            collection_name: 集合名称
+
+        Returns:
+            int: 版本号，从未写入过的集合为 0
+        """
+        return cls.get_many([collection_name])[collection_name]
+
+    @classmethod
+    def get_many(cls, collection_names: Iterable[str]) -> Dict[str, int]:
+        """
+        一次读取多个集合的版本号
+
+        Args:
+            collection_names: 集合名称
+
+        Returns:
+            Dict[str, int]: 集合名称 -> 版本号
+        """
+        names = list(dict.fromkeys(collection_names))
+        versions: Dict[str, int] = {}
+        now = time.monotonic()
+
+        if COLLECTION_VERSION_CACHE_SECONDS > 0:
+            with cls._lock:
+                for name in names:
+                    cached = cls._cache.get(name)
+                    if cached and now - cached[0] < COLLECTION_VERSION_CACHE_SECONDS:
+                        versions[name] = cached[1]
+
+        missing = [name for name in names if name not in versions]
+        if missing:
+            found = {
+                meta["_id"]: int(meta.get("version", 0))
+                for meta in get_collection(COLLECTION_META_COLLECTION).find(
+                    {"_id": {"$in": missing}}, {"version": 1}
+                )
+            }
+            versions.update(cls._remember({name: found.get(name, 0) for name in missing}, now))
+
+        return versions
+
+    @classmethod
+    def _remember(cls, versions: Dict[str, int], started: float) -> Dict[str, int]:
+        """
+        写入进程内缓存
+
+        缓存时间记为读写开始的时间；在此之后其他线程缓存了更大的版本号时（并发的写入），保留该版本号。
+
+        Args:
+            versions: 集合名称 -> 版本号
+            started: 本次读写开始的时间
+
+        Returns:
+            Dict[str, int]: 缓存后的版本号
+        """
+        with cls._lock:
+            for name, version in versions.items():
+                cached = cls._cache.get(name)
+                if cached and cached[0] > started and cached[1] > version:
+                    versions[name] = cached[1]
+                else:
+                    cls._cache[name] = (started, version)
+        return versions
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """清空进程内缓存（切换数据库或测试时使用）"""
+        with cls._lock:
+            cls._cache = {}
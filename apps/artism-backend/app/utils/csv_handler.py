@@ -1,9 +1,22 @@
 import os
-import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from fastapi import UploadFile
 from app.core.config import DATA_DIR
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _pandas():
+    """
+    按需导入 pandas
+
+    pandas 只在 CSV 导入导出时使用，延迟到第一次调用时再加载，
+    避免拖慢应用启动并增加每个 worker 的内存占用。
+    """
+    import pandas
+    return pandas
+
 class CSVHandler:
     """
     CSV 处理工具类
@@ -35,7 +48,7 @@ class CSVHandler:
         return file_path
     
     @staticmethod
-    def read_csv(file_path: str) -> pd.DataFrame:
+    def read_csv(file_path: str) -> "pd.DataFrame":
         """
         读取 CSV 文件
         
@@ -45,10 +58,10 @@ class CSVHandler:
         Returns:
             pd.DataFrame: 包含 CSV 数据的 DataFrame
         """
-        return pd.read_csv(file_path)
+        return _pandas().read_csv(file_path)
     
     @staticmethod
-    def validate_csv_structure(df: pd.DataFrame, required_columns: List[str]) -> List[str]:
+    def validate_csv_structure(df: "pd.DataFrame", required_columns: List[str]) -> List[str]:
         """
         验证 CSV 结构
         
@@ -69,7 +82,7 @@ class CSVHandler:
         return errors
     
     @staticmethod
-    def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(df: "pd.DataFrame") -> "pd.DataFrame":
         """
         清理数据
         
@@ -79,6 +92,8 @@ class CSVHandler:
         Returns:
             pd.DataFrame: 清理后的 DataFrame
         """
+        pd = _pandas()
+
         # 复制 DataFrame 以避免修改原始数据
         cleaned_df = df.copy()
         
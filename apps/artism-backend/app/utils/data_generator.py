@@ -1,12 +1,14 @@
 from typing import List, Dict, Any, Optional
 import random
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 
 from app.models.artist import Artist
 from app.models.artwork import Artwork
 from app.models.art_movement import ArtMovement
+from app.models.comment import Comment
+from app.models.post import Post
 
 
 class DataGenerator:
@@ -327,6 +329,121 @@ class ArtMovementDataGenerator(DataGenerator):
         return movements
 
 
+class PostDataGenerator(DataGenerator):
+    """
+    帖子数据生成器
+    """
+    
+    POST_TITLES = [
+        "Studio Notes", "Work in Progress", "New Series", "Color Study", "Sketchbook",
+        "Exhibition Day", "Morning Light", "Experiment", "Behind the Canvas", "Finished Piece"
+    ]
+    
+    @classmethod
+    def generate_posts(
+        cls,
+        author_ids: List[str],
+        count: int = 10,
+        newest: Optional[datetime] = None,
+        interval: timedelta = timedelta(minutes=1)
+    ) -> List[Dict[str, Any]]:
+        """
+        生成帖子数据（写入数据库的文档格式，时间戳为 datetime）
+        
+        Args:
+            author_ids: 作者（艺术家）ID列表
+            count: 生成数量
+            newest: 第一条帖子的创建时间，默认当前时间
+            interval: 相邻帖子的创建时间间隔，帖子按时间从新到旧排列
+            
+        Returns:
+            List[Dict[str, Any]]: 帖子数据列表
+        """
+        newest = newest or datetime.utcnow()
+        posts = []
+        
+        for i in range(count):
+            created_at = newest - interval * i
+            post = Post(
+                title=f"{random.choice(cls.POST_TITLES)} #{i+1:03d}",
+                content="Sharing my latest work with the community.",
+                author_id=random.choice(author_ids),
+                tags=cls.generate_tags(ArtistDataGenerator.FICTIONAL_STYLES, 2),
+                likes_count=random.randint(0, 50),
+                comments_count=random.randint(0, 10),
+                views_count=random.randint(0, 500),
+                created_at=created_at,
+                updated_at=created_at
+            )
+            posts.append(post.to_document())
+        
+        return posts
+
+
+class CommentDataGenerator(DataGenerator):
+    """
+    评论数据生成器
+    """
+    
+    COMMENT_CONTENTS = ["Nice work", "Love the colors", "Beautiful composition", "Very inspiring"]
+    REPLY_CONTENTS = ["Agreed", "Thank you!", "Glad you like it"]
+    
+    @classmethod
+    def generate_comments(
+        cls,
+        author_ids: List[str],
+        target_ids: List[str],
+        count: int = 10,
+        target_type: str = "post",
+        newest: Optional[datetime] = None,
+        with_replies: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        生成评论数据（写入数据库的文档格式，时间戳为 datetime）
+        
+        Args:
+            author_ids: 作者（艺术家）ID列表
+            target_ids: 评论对象ID列表，按顺序循环使用
+            count: 顶级评论数量
+            target_type: 评论对象类型
+            newest: 第一条评论的创建时间，默认当前时间，之后每条早 1 秒
+            with_replies: 是否为每条顶级评论生成一条回复（晚 1 秒）
+            
+        Returns:
+            List[Dict[str, Any]]: 评论数据列表
+        """
+        newest = newest or datetime.utcnow()
+        comments = []
+        
+        for i in range(count):
+            created_at = newest - timedelta(seconds=i)
+            comment = Comment(
+                content=random.choice(cls.COMMENT_CONTENTS),
+                author_id=random.choice(author_ids),
+                target_type=target_type,
+                target_id=target_ids[i % len(target_ids)],
+                sentiment="positive",
+                created_at=created_at,
+                updated_at=created_at
+            )
+            comments.append(comment.to_document())
+            if with_replies:
+                replied_at = created_at + timedelta(seconds=1)
+                reply = Comment(
+                    content=random.choice(cls.REPLY_CONTENTS),
+                    author_id=random.choice(author_ids),
+                    target_type=target_type,
+                    target_id=comment.target_id,
+                    parent_comment_id=comment.id,
+                    sentiment="neutral",
+                    created_at=replied_at,
+                    updated_at=replied_at
+                )
+                comments.append(reply.to_document())
+        
+        return comments
+
+
 class FullDatasetGenerator:
     """
     完整数据集生成器
@@ -1,9 +1,42 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import pymongo
-from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo import IndexModel, ReplaceOne, UpdateOne, ASCENDING, DESCENDING, TEXT
 
 from app.db.mongodb import get_database
-from app.core.config import ARTISTS_COLLECTION, ARTWORKS_COLLECTION, ART_MOVEMENTS_COLLECTION
+from app.utils import primary_key
+from app.utils.collection_versions import CollectionVersions
+from app.core.config import (
+    ARTISTS_COLLECTION, ARTWORKS_COLLECTION, ART_MOVEMENTS_COLLECTION, POSTS_COLLECTION, POST_FEED_COLLECTION,
+    POST_LIKE_SHARDS_COLLECTION, MIGRATION_BATCH_SIZE
+)
+
+
+# 评论和帖子集合的索引，按服务层的查询形状声明（tests/test_query_plans.py 用 explain 校验）
+# id 索引取决于主键存储方式，由 primary_key.ensure_id_index 创建
+INTERACTION_INDEXES: Dict[str, List[IndexModel]] = {
+    "comments": [
+        # get_comments_by_target：按目标过滤、按时间倒序
+        IndexModel([("target_type", ASCENDING), ("target_id", ASCENDING), ("created_at", DESCENDING)]),
+        # get_comments_with_replies：只取目标下的顶级评论
+        IndexModel([("target_type", ASCENDING), ("target_id", ASCENDING), ("parent_comment_id", ASCENDING),
+                    ("created_at", DESCENDING)]),
+        # get_comment_replies：回复按时间正序
+        IndexModel([("parent_comment_id", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("author_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("ai_generated", ASCENDING)]),
+        # get_recent_comments
+        IndexModel([("created_at", DESCENDING)])
+    ],
+    "comment_threads": [
+        IndexModel([("participants", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING)])
+    ],
+    POSTS_COLLECTION: [
+        IndexModel([("author_id", ASCENDING), ("created_at", DESCENDING)]),
+        # 动态流重建按时间倒序读取最近的帖子
+        IndexModel([("created_at", DESCENDING)])
+    ]
+}
 
 
 class DatabaseSetup:
@@ -83,6 +116,38 @@ class DatabaseSetup:
             print(f"Created {len(movement_indexes)} indexes for {ART_MOVEMENTS_COLLECTION}")
         except Exception as e:
             print(f"Error creating indexes for {ART_MOVEMENTS_COLLECTION}: {e}")
+
+        # 首页动态流索引：feed_key 用于时间线范围扫描，author_id 用于作者资料扇出
+        feed_collection = db[POST_FEED_COLLECTION]
+        feed_indexes = [
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel([("feed_key", DESCENDING)], unique=True),
+            IndexModel([("author_id", ASCENDING)])
+        ]
+
+        try:
+            feed_collection.create_indexes(feed_indexes)
+            print(f"Created {len(feed_indexes)} indexes for {POST_FEED_COLLECTION}")
+        except Exception as e:
+            print(f"Error creating indexes for {POST_FEED_COLLECTION}: {e}")
+
+        # 点赞计数分片索引
+        try:
+            db[POST_LIKE_SHARDS_COLLECTION].create_indexes([
+                IndexModel([("post_id", ASCENDING), ("shard", ASCENDING)], unique=True)
+            ])
+            print(f"Created 1 indexes for {POST_LIKE_SHARDS_COLLECTION}")
+        except Exception as e:
+            print(f"Error creating indexes for {POST_LIKE_SHARDS_COLLECTION}: {e}")
+
+        # 评论、评论线程和帖子集合索引
+        for collection_name, indexes in INTERACTION_INDEXES.items():
+            try:
+                primary_key.ensure_id_index(db[collection_name])
+                db[collection_name].create_indexes(indexes)
+                print(f"Created {len(indexes) + 1} indexes for {collection_name}")
+            except Exception as e:
+                print(f"Error creating indexes for {collection_name}: {e}")
     
     @staticmethod
     def drop_indexes():
@@ -100,6 +165,10 @@ class DatabaseSetup:
                 print(f"Dropped indexes for {collection_name}")
             except Exception as e:
                 print(f"Error dropping indexes for {collection_name}: {e}")
+
+        # BaseService 按进程记录已创建 id 唯一索引的集合，清空后下次写入时重新创建
+        from app.services.base_service import BaseService
+        BaseService.reset_state()
     
     @staticmethod
     def list_indexes():
@@ -189,6 +258,23 @@ class DatabaseSetup:
         
         print("\nDatabase setup completed!")
     
+    @staticmethod
+    def invalidate_collections(collection_names: Iterable[str]) -> None:
+        """
+        绕过 BaseService 改写集合后，递增集合版本号并清空进程内缓存
+
+        查询缓存和 ETag 都以集合版本号判断数据是否变化，直接 drop / update_many 不会递增版本号，
+        写入完成后必须调用，否则列表和条件请求会继续返回旧数据。
+
+        Args:
+            collection_names: 被改写的集合名称
+        """
+        from app.services.base_service import BaseService
+
+        BaseService.reset_state()
+        for collection_name in collection_names:
+            CollectionVersions.bump(collection_name)
+
     @staticmethod
     def reset_database():
         """
@@ -209,6 +295,7 @@ class DatabaseSetup:
         
         # 重新设置数据库
         DatabaseSetup.setup_database()
+        DatabaseSetup.invalidate_collections(collections)
 
 
 class DatabaseMigration:
@@ -267,6 +354,7 @@ class DatabaseMigration:
             {"$set": {"style_vector": []}}
         )
         
+        DatabaseSetup.invalidate_collections([ARTISTS_COLLECTION, ARTWORKS_COLLECTION])
         print("Migration completed!")
     
     @staticmethod
@@ -298,6 +386,147 @@ class DatabaseMigration:
             
             print(f"Added timestamps to {collection_name}")
 
+        DatabaseSetup.invalidate_collections(collections)
+
+    @staticmethod
+    def repair_nan_values():
+        """
+        清理早期 CSV 导入遗留的 NaN 字段
+
+        每个集合清理一次后记录标记，之后读取记录时跳过 NaN 检查。
+        """
+        from app.services.artist_service import ArtistService
+        from app.services.artwork_service import ArtworkService
+        from app.services.art_movement_service import ArtMovementService
+
+        repaired_collections = []
+        for service in (ArtistService, ArtworkService, ArtMovementService):
+            repaired = service.repair_nan_values()
+            if repaired:
+                repaired_collections.append(service.COLLECTION_NAME)
+                print(f"Repaired NaN values in {repaired} {service.COLLECTION_NAME} records")
+        if repaired_collections:
+            DatabaseSetup.invalidate_collections(repaired_collections)
+
+
+    @staticmethod
+    def convert_timestamps_to_dates(batch_size: Optional[int] = None) -> int:
+        """
+        将评论、评论线程、帖子和动态流中以 ISO 字符串保存的 created_at / updated_at 转换为 BSON 日期
+
+        只选取仍有字符串时间戳的文档，按 _id 顺序逐批转换并批量写回。中途中断后再次执行时，
+        已转换的文档不再被选中，相当于从断点继续；无法解析的值保持原样，不会被反复读取。
+
+        Args:
+            batch_size: 每批处理的文档数，默认 MIGRATION_BATCH_SIZE
+
+        Returns:
+            int: 转换的文档数
+        """
+        from app.services.feed_service import FeedService
+
+        db = get_database()
+        batch_size = batch_size or MIGRATION_BATCH_SIZE
+        fields = ("created_at", "updated_at")
+        string_filter = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        total = 0
+        changed = []
+
+        for collection_name in ("comments", "comment_threads", POSTS_COLLECTION, POST_FEED_COLLECTION):
+            collection = db[collection_name]
+            last_id = None
+            converted = 0
+            while True:
+                query = string_filter if last_id is None else {"$and": [string_filter, {"_id": {"$gt": last_id}}]}
+                batch = list(collection.find(query, {"_id": 1, **{field: 1 for field in fields}})
+                             .sort("_id", 1)
+                             .limit(batch_size))
+                if not batch:
+                    break
+                last_id = batch[-1]["_id"]
+
+                updates = []
+                for document in batch:
+                    values = {}
+                    for field in fields:
+                        if isinstance(document.get(field), str):
+                            try:
+                                values[field] = FeedService.to_datetime(document[field])
+                            except ValueError:
+                                print(f"Skipping unparseable {field} in {collection_name} {document['_id']}")
+                    if values:
+                        updates.append(UpdateOne({"_id": document["_id"]}, {"$set": values}))
+                if updates:
+                    collection.bulk_write(updates, ordered=False)
+                    converted += len(updates)
+
+            if converted:
+                changed.append(collection_name)
+                print(f"Converted timestamps of {converted} {collection_name} documents")
+            total += converted
+
+        if changed:
+            DatabaseSetup.invalidate_collections(changed)
+        return total
+
+
+    @staticmethod
+    def migrate_uuid_primary_keys(batch_size: Optional[int] = None) -> int:
+        """
+        将评论、评论线程和帖子改写为以二进制 UUID 作为 _id 的格式（UUID_PRIMARY_KEYS 模式）
+
+        _id 不能原地修改，每批先按新 _id upsert 新文档，再删除旧文档。中途中断时新旧文档可能同时存在，
+        两者内容相同，读取不受影响；再次执行会重新写入（幂等）并删除剩余的旧文档。
+        id 不是 UUID 的文档保持原格式。动态流条目中冗余保存的 post_oid 同步更新。
+
+        Args:
+            batch_size: 每批处理的文档数，默认 MIGRATION_BATCH_SIZE
+
+        Returns:
+            int: 改写的文档数
+        """
+        db = get_database()
+        batch_size = batch_size or MIGRATION_BATCH_SIZE
+        legacy_filter = {"id": {"$type": "string"}, "_id": {"$not": {"$type": "binData"}}}
+        total = 0
+        changed = []
+
+        for collection_name in primary_key.PRIMARY_KEY_COLLECTIONS:
+            collection = db[collection_name]
+            primary_key.ensure_id_index(collection)
+            last_id = None
+            converted = 0
+            while True:
+                query = legacy_filter if last_id is None else {"$and": [legacy_filter, {"_id": {"$gt": last_id}}]}
+                batch = list(collection.find(query).sort("_id", 1).limit(batch_size))
+                if not batch:
+                    break
+                last_id = batch[-1]["_id"]
+
+                documents = [primary_key.prepare_document(document) for document in batch]
+                migrated = [(old, new) for old, new in zip(batch, documents) if "id" not in new]
+                if not migrated:
+                    continue
+                collection.bulk_write([ReplaceOne({"_id": new["_id"]}, new, upsert=True) for _, new in migrated],
+                                      ordered=False)
+                collection.delete_many({"_id": {"$in": [old["_id"] for old, _ in migrated]}})
+                if collection_name == POSTS_COLLECTION:
+                    db[POST_FEED_COLLECTION].bulk_write([
+                        UpdateOne({"id": old["id"]}, {"$set": {"post_oid": old["id"]}}) for old, _ in migrated
+                    ], ordered=False)
+                converted += len(migrated)
+
+            if converted:
+                changed.append(collection_name)
+                if collection_name == POSTS_COLLECTION:
+                    changed.append(POST_FEED_COLLECTION)
+                print(f"Migrated {converted} {collection_name} documents to UUID primary keys")
+            total += converted
+
+        if changed:
+            DatabaseSetup.invalidate_collections(changed)
+        return total
+
 
 if __name__ == "__main__":
     # 运行数据库设置
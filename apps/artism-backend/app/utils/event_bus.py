@@ -0,0 +1,166 @@
+"""
+进程内发布/订阅事件总线
+
+服务层（例如 CommentService.create_comment）在写入成功后调用 publish，
+SSE 端点为每个连接注册一个订阅，通过 asyncio.Queue 接收事件。
+
+- 每个事件带有单调递增的 id，最近的事件保存在环形回放缓冲区中，
+  客户端可以通过 Last-Event-ID 断线续传；
+- 订阅可以限定主题（例如只订阅某个帖子的评论）；
+- publish 是线程安全的，可以在线程池中的同步代码里调用；
+- 空闲订阅者只占用一个队列，不产生任何数据库查询。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import logging
+
+from app.core.config import EVENT_BUS_REPLAY_SIZE, EVENT_BUS_SUBSCRIBER_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """总线事件"""
+    id: int
+    event: str
+    data: Dict[str, Any]
+    topics: FrozenSet[str]
+    created_at: float = field(default_factory=time.time)
+
+
+class Subscription:
+    """
+    单个订阅者
+
+    事件由发布线程通过 loop.call_soon_threadsafe 投递到订阅者所在事件循环的队列中。
+    队列满时不阻塞发布方，而是标记 overflowed，由消费方决定如何重新同步。
+    """
+
+    def __init__(self, topics: Optional[Iterable[str]], loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.topics: Optional[FrozenSet[str]] = frozenset(topics) if topics else None
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def matches(self, event: Event) -> bool:
+        """判断事件是否属于订阅的主题"""
+        return self.topics is None or not self.topics.isdisjoint(event.topics)
+
+    def _deliver(self, event: Event) -> None:
+        """在订阅者的事件循环中执行：放入队列"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        等待下一个事件
+
+        Args:
+            timeout: 超时时间（秒），超时返回 None
+
+        Returns:
+            Optional[Event]: 事件，超时返回 None
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """进程内事件总线"""
+
+    def __init__(self, replay_size: int = EVENT_BUS_REPLAY_SIZE,
+                 subscriber_queue_size: int = EVENT_BUS_SUBSCRIBER_QUEUE_SIZE):
+        self._lock = threading.Lock()
+        self._buffer: Deque[Event] = deque(maxlen=max(replay_size, 0))
+        self._subscribers: Set[Subscription] = set()
+        self._last_id = 0
+        self._subscriber_queue_size = subscriber_queue_size
+        self.stats = {"published": 0, "delivered": 0, "dropped_subscribers": 0}
+
+    @property
+    def last_event_id(self) -> int:
+        """最近一次发布的事件 id"""
+        return self._last_id
+
+    @property
+    def subscriber_count(self) -> int:
+        """当前订阅者数量"""
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any], topics: Iterable[str] = ()) -> Event:
+        """
+        发布事件（线程安全）
+
+        Args:
+            event: 事件类型，例如 "comment.created"
+            data: 事件数据（需可 JSON 序列化）
+            topics: 事件所属的主题
+
+        Returns:
+            Event: 已发布的事件
+        """
+        with self._lock:
+            self._last_id += 1
+            published = Event(id=self._last_id, event=event, data=data, topics=frozenset(topics))
+            self._buffer.append(published)
+            targets = [sub for sub in self._subscribers if sub.matches(published)]
+            self.stats["published"] += 1
+
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, published)
+                self.stats["delivered"] += 1
+            except RuntimeError:
+                # 订阅者的事件循环已关闭
+                self.unsubscribe(sub)
+                self.stats["dropped_subscribers"] += 1
+        return published
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None,
+                  last_event_id: Optional[int] = None) -> Tuple[Subscription, List[Event], bool]:
+        """
+        注册订阅（需在事件循环中调用）
+
+        注册与回放在同一把锁内完成，保证回放事件与后续推送之间既不重复也不遗漏。
+
+        Args:
+            topics: 订阅的主题，None 表示全部
+            last_event_id: 客户端已收到的最后一个事件 id，用于断线续传
+
+        Returns:
+            Tuple[Subscription, List[Event], bool]: (订阅, 需要回放的事件, 是否存在缺口)
+            存在缺口表示请求的事件已不在回放缓冲区内（或服务已重启），客户端需要全量刷新
+        """
+        sub = Subscription(topics, asyncio.get_running_loop(), self._subscriber_queue_size)
+        with self._lock:
+            self._subscribers.add(sub)
+            if last_event_id is None:
+                return sub, [], False
+            replay, gap = self._replay_locked(sub, last_event_id)
+        return sub, replay, gap
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """取消订阅"""
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def _replay_locked(self, sub: Subscription, last_event_id: int) -> Tuple[List[Event], bool]:
+        """计算需要回放的事件（调用方需持有锁）"""
+        oldest = self._buffer[0].id if self._buffer else self._last_id + 1
+        gap = last_event_id > self._last_id or last_event_id < oldest - 1
+        replay = [event for event in self._buffer if event.id > last_event_id and sub.matches(event)]
+        return replay, gap
+
+
+# 全局事件总线实例
+event_bus = EventBus()
@@ -0,0 +1,190 @@
+"""
+HTTP 条件请求（ETag / If-None-Match）
+
+- 详情端点：ETag 由集合、记录 ID 和 updated_at 生成。请求带 If-None-Match 时先只读取 updated_at，
+  命中则直接返回 304，不读取完整记录、不序列化；
+- 列表端点：ETag 由集合版本号（BaseService 每次写入递增，见 CollectionVersions）和查询参数生成，
+  命中时不执行查询。
+
+使用 include 填充关联时，关联集合的版本号也参与 ETag。
+
+ETag 使用弱校验（W/"..."），并包含 PROJECT_VERSION，部署新版本后旧 ETag 自动失效。
+updated_at 在数据库中精确到毫秒，同一毫秒内的两次写入会得到相同的详情 ETag。
+"""
+
+from typing import Any, Iterable, Optional, Type
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.config import (
+    PROJECT_VERSION, HTTP_ETAGS_ENABLED, HTTP_CACHE_CONTROL_DETAIL, HTTP_CACHE_CONTROL_LIST
+)
+from app.utils.collection_versions import CollectionVersions
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    由若干部分生成弱 ETag
+
+    Returns:
+        str: 形如 W/"0123456789abcdef" 的 ETag
+    """
+    digest = hashlib.blake2b("\x1f".join(map(str, (PROJECT_VERSION, *parts))).encode(), digest_size=8)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    判断 If-None-Match 是否命中（弱比较）
+
+    Args:
+        request: 请求
+        etag: 当前资源的 ETag
+
+    Returns:
+        bool: 是否命中
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """构造 304 响应"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def with_cache_headers(result: Any, response: Response, etag: str, cache_control: str) -> Any:
+    """
+    为成功响应设置 ETag 和 Cache-Control
+
+    端点返回 Response 对象（快速 JSON 路径）时直接写入该对象，否则写入 FastAPI 注入的 response。
+
+    Args:
+        result: 端点返回值
+        response: FastAPI 注入的响应对象
+        etag: ETag
+        cache_control: Cache-Control 策略
+
+    Returns:
+        Any: 原样返回 result
+    """
+    target = result if isinstance(result, Response) else response
+    target.headers["ETag"] = etag
+    target.headers["Cache-Control"] = cache_control
+    return result
+
+
+def list_etag(request: Request, collections: Iterable[str]) -> str:
+    """
+    列表 ETag：集合版本号 + 规范化的查询参数
+
+    Args:
+        request: 请求
+        collections: 结果依赖的集合
+
+    Returns:
+        str: ETag
+    """
+    versions = CollectionVersions.get_many(collections)
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    return weak_etag(request.url.path, query, *(f"{name}:{version}" for name, version in sorted(versions.items())))
+
+
+def record_etag(collection: str, record_id: str, stamp: str, related: Iterable[str] = ()) -> str:
+    """
+    详情 ETag
+
+    Args:
+        collection: 集合名称
+        record_id: 记录 ID
+        stamp: 记录的 updated_at；为空时使用集合版本号
+        related: 填充的关联集合，其版本号参与 ETag
+
+    Returns:
+        str: ETag
+    """
+    if not stamp:
+        stamp = f"v{CollectionVersions.get(collection)}"
+    related = list(related)
+    versions = CollectionVersions.get_many(related) if related else {}
+    return weak_etag(collection, record_id, stamp, *(f"{name}:{versions[name]}" for name in sorted(versions)))
+
+
+def _record_stamp(record: Any) -> str:
+    updated_at = record.get("updated_at") if isinstance(record, dict) else None
+    return updated_at.isoformat() if hasattr(updated_at, "isoformat") else str(updated_at or "")
+
+
+def cached_list(request: Request, response: Response, fetch, collections: Iterable[str],
+                cache_control: Optional[str] = None) -> Any:
+    """
+    带条件请求的列表端点
+
+    Args:
+        request: 请求
+        response: FastAPI 注入的响应对象
+        fetch: 无参函数，执行查询并返回端点结果（ETag 命中时不调用）
+        collections: 结果依赖的集合
+        cache_control: Cache-Control 策略，默认 HTTP_CACHE_CONTROL_LIST
+
+    Returns:
+        Any: 304 响应或 fetch() 的结果
+    """
+    if not HTTP_ETAGS_ENABLED:
+        return fetch()
+    cache_control = cache_control or HTTP_CACHE_CONTROL_LIST
+    etag = list_etag(request, collections)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return with_cache_headers(fetch(), response, etag, cache_control)
+
+
+def cached_record(request: Request, response: Response, service: Type, record_id: str,
+                  include: Optional[str] = None, cache_control: Optional[str] = None) -> Any:
+    """
+    带条件请求的详情端点
+
+    Args:
+        request: 请求
+        response: FastAPI 注入的响应对象
+        service: BaseService 子类
+        record_id: 记录 ID
+        include: 要填充的关联，逗号分隔
+        cache_control: Cache-Control 策略，默认 HTTP_CACHE_CONTROL_DETAIL
+
+    Returns:
+        Any: 304 响应或 service.get_by_id 的结果（经过 render_response）
+    """
+    from app.utils.json_response import render_response
+
+    if not HTTP_ETAGS_ENABLED:
+        return render_response(service.get_by_id(record_id, include))
+    cache_control = cache_control or HTTP_CACHE_CONTROL_DETAIL
+    related = service.dependent_collections(include)[1:]
+
+    if request.headers.get("if-none-match"):
+        stamp = service.get_record_stamp(record_id)
+        if stamp is not None:
+            etag = record_etag(service.COLLECTION_NAME, record_id, stamp, related)
+            if etag_matches(request, etag):
+                return not_modified(etag, cache_control)
+
+    result = service.get_by_id(record_id, include)
+    rendered = render_response(result)
+    if getattr(result, "success", False):
+        etag = record_etag(service.COLLECTION_NAME, record_id, _record_stamp(result.data), related)
+        with_cache_headers(rendered, response, etag, cache_control)
+    return rendered
@@ -0,0 +1,91 @@
+"""
+快速 JSON 响应
+
+默认情况下，端点返回的 APIResponse / PaginatedResponse 会被 FastAPI 按 response_model
+（例如 PaginatedResponse[Artist]）重新校验一遍，再经过 jsonable_encoder 和 json.dumps。
+对于服务层自己构建的数据，这一轮校验是多余的。
+
+FAST_JSON_RESPONSES=True 时，render_response 直接把响应模型的字段交给 FastJSONResponse 编码：
+- 不再按 response_model 重新校验（返回 Response 对象时 FastAPI 会跳过 response_model）；
+- 安装了 orjson 时用 orjson 编码，否则回退到标准库 json；
+- datetime / ObjectId 等类型直接编码，不经过 json_encoders。
+
+response_model 仍然保留在路由上，用于生成 OpenAPI 文档。
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+import json
+
+from bson import ObjectId
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.core.config import FAST_JSON_RESPONSES
+from app.utils.metrics import phase
+
+try:
+    import orjson
+except ImportError:  # orjson 是可选依赖
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """编码 JSON 不直接支持的类型"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    将内容编码为 JSON 字节串
+
+    Args:
+        content: 要编码的内容
+
+    Returns:
+        bytes: UTF-8 编码的 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """使用 orjson（或标准库 json）编码的 JSON 响应"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with phase("serialize"):
+            return dumps(content)
+
+
+def render_response(response: Any, enabled: Optional[bool] = None) -> Any:
+    """
+    按配置返回快速 JSON 响应
+
+    Args:
+        response: 服务层返回的 APIResponse / PaginatedResponse / ErrorResponse
+        enabled: 是否启用，默认读取 FAST_JSON_RESPONSES
+
+    Returns:
+        Any: 启用时为 FastJSONResponse，否则原样返回交给 FastAPI 处理
+    """
+    if enabled is None:
+        enabled = FAST_JSON_RESPONSES
+    if not enabled or not isinstance(response, BaseModel) or not getattr(response, "success", False):
+        # 错误响应较少，仍交给 FastAPI 按 response_model 处理，保持输出字段一致
+        return response
+    # 按字段浅拷贝，data 中的记录原样交给编码器
+    return FastJSONResponse(content=dict(response))
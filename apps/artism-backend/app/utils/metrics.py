@@ -0,0 +1,305 @@
+"""
+请求指标
+
+MetricsMiddleware 是一个纯 ASGI 中间件，按路由模板（例如 /api/v1/posts/{post_id}）记录：
+- 请求延迟直方图 http_request_duration_seconds；
+- 进行中的请求数 http_requests_in_flight；
+- 按状态码统计的请求数 http_requests_total；
+- 请求内各阶段（db、serialize 等）的耗时 http_request_phase_seconds；
+- 请求内的计数（例如数据库往返次数 db_round_trips）http_request_operations。
+
+阶段耗时通过上下文变量累加：代码中用 `with phase("db"):` 或 record_phase("db", seconds) 记录，
+计数用 record_count(name) 记录，请求结束时由中间件汇总到对应路由。
+不在请求中调用时只是一次上下文变量读取。
+
+指标在 /metrics 端点以 Prometheus 文本格式导出。
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+import threading
+import time
+
+from app.core.config import METRICS_LATENCY_BUCKETS, DB_ROUND_TRIPS_HEADER
+
+# 当前请求的阶段耗时（秒），不在请求中时为 None
+_current_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_phases", default=None)
+# 当前请求的计数，不在请求中时为 None
+_current_counts: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_counts", default=None)
+
+# 未匹配到路由的请求（404、静态文件等）统一使用的标签，避免路径本身成为标签值
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    将耗时累加到当前请求的阶段
+
+    Args:
+        name: 阶段名称
+        seconds: 耗时（秒）
+    """
+    phases = _current_phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    记录代码块耗时到当前请求的阶段
+
+    Args:
+        name: 阶段名称
+    """
+    if _current_phases.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def current_phases() -> Optional[Dict[str, float]]:
+    """获取当前请求已记录的阶段耗时"""
+    return _current_phases.get()
+
+
+def record_count(name: str, count: int = 1) -> None:
+    """
+    累加当前请求的计数
+
+    Args:
+        name: 计数名称
+        count: 增量
+    """
+    counts = _current_counts.get()
+    if counts is not None:
+        counts[name] = counts.get(name, 0) + count
+
+
+def current_counts() -> Optional[Dict[str, int]]:
+    """获取当前请求已记录的计数"""
+    return _current_counts.get()
+
+
+class MetricsRegistry:
+    """
+    指标存储
+
+    直方图按 (方法, 路由) 保存每个桶的非累计计数，导出时再累加，记录时只需一次二分查找。
+    """
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = sorted(buckets or METRICS_LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        with self._lock:
+            # (方法, 路由) -> [各桶计数..., +Inf 桶计数]、总耗时、请求数
+            self._histograms: Dict[Tuple[str, str], List[int]] = {}
+            self._sums: Dict[Tuple[str, str], float] = {}
+            self._status: Dict[Tuple[str, str, int], int] = {}
+            self._phases: Dict[Tuple[str, str, str], List[float]] = {}
+            self._counts: Dict[Tuple[str, str, str], List[int]] = {}
+            self._in_flight: Dict[str, int] = {}
+
+    def request_started(self, method: str) -> None:
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 0) + 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float,
+                         phases: Optional[Dict[str, float]] = None,
+                         counts: Optional[Dict[str, int]] = None) -> None:
+        """
+        记录一个完成的请求
+
+        Args:
+            method: HTTP 方法
+            route: 路由模板
+            status: 状态码
+            seconds: 总耗时
+            phases: 各阶段耗时
+            counts: 请求内的计数
+        """
+        key = (method, route)
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 1) - 1
+
+            bucket_counts = self._histograms.get(key)
+            if bucket_counts is None:
+                bucket_counts = self._histograms[key] = [0] * (len(self.buckets) + 1)
+            bucket_counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + seconds
+
+            status_key = (method, route, status)
+            self._status[status_key] = self._status.get(status_key, 0) + 1
+
+            if phases:
+                for name, value in phases.items():
+                    phase_key = (method, route, name)
+                    totals = self._phases.get(phase_key)
+                    if totals is None:
+                        totals = self._phases[phase_key] = [0.0, 0]
+                    totals[0] += value
+                    totals[1] += 1
+
+            if counts:
+                for name, value in counts.items():
+                    count_key = (method, route, name)
+                    totals = self._counts.get(count_key)
+                    if totals is None:
+                        totals = self._counts[count_key] = [0, 0]
+                    totals[0] += value
+                    totals[1] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """获取指标副本"""
+        with self._lock:
+            return {
+                "histograms": {key: list(counts) for key, counts in self._histograms.items()},
+                "sums": dict(self._sums),
+                "status": dict(self._status),
+                "phases": {key: list(totals) for key, totals in self._phases.items()},
+                "counts": {key: list(totals) for key, totals in self._counts.items()},
+                "in_flight": dict(self._in_flight),
+            }
+
+    def render_prometheus(self) -> str:
+        """
+        以 Prometheus 文本格式导出
+
+        Returns:
+            str: 指标文本
+        """
+        data = self.snapshot()
+        lines = [
+            "# HELP http_request_duration_seconds HTTP request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), counts in sorted(data["histograms"].items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{_format(bound)}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {_format(data['sums'][(method, route)])}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        lines += [
+            "# HELP http_requests_total HTTP requests by route template and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(data["status"].items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being processed.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, count in sorted(data["in_flight"].items()):
+            lines.append(f'http_requests_in_flight{{method="{method}"}} {count}')
+
+        lines += [
+            "# HELP http_request_phase_seconds Time spent in each request phase (db, serialize, ...).",
+            "# TYPE http_request_phase_seconds summary",
+        ]
+        for (method, route, name), (total, count) in sorted(data["phases"].items()):
+            labels = f'method="{method}",route="{_escape(route)}",phase="{name}"'
+            lines.append(f"http_request_phase_seconds_sum{{{labels}}} {_format(total)}")
+            lines.append(f"http_request_phase_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            "# HELP http_request_operations Per-request operation counts (db_round_trips, ...).",
+            "# TYPE http_request_operations summary",
+        ]
+        for (method, route, name), (total, count) in sorted(data["counts"].items()):
+            labels = f'method="{method}",route="{_escape(route)}",operation="{name}"'
+            lines.append(f"http_request_operations_sum{{{labels}}} {total}")
+            lines.append(f"http_request_operations_count{{{labels}}} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    """格式化数值"""
+    return repr(float(value))
+
+
+class MetricsMiddleware:
+    """
+    请求计时 ASGI 中间件
+
+    路由模板在路由匹配后从 scope 中读取，请求结束时连同状态码和阶段耗时一起写入注册表。
+    DB_ROUND_TRIPS_HEADER=True 时在响应头 X-DB-Round-Trips 中返回本次请求的数据库往返次数
+    （响应开始前的命令数；流式响应之后的查询不计入）。
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None,
+                 round_trips_header: Optional[bool] = None):
+        self.app = app
+        self.registry = registry or metrics
+        self.round_trips_header = DB_ROUND_TRIPS_HEADER if round_trips_header is None else round_trips_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        token = _current_phases.set({})
+        counts = {}
+        counts_token = _current_counts.set(counts)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.round_trips_header:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-round-trips", str(counts.get("db_round_trips", 0)).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        self.registry.request_started(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route_path = _route_template(scope)
+            self.registry.request_finished(method, route_path, status_code, elapsed,
+                                           _current_phases.get(), counts)
+            _current_phases.reset(token)
+            _current_counts.reset(counts_token)
+
+
+def _route_template(scope) -> str:
+    """
+    获取请求匹配到的路由模板
+
+    新版 FastAPI 的 include_router 不再展开子路由，scope["route"].path 只是子路由内的相对路径，
+    完整路径在 scope["fastapi"]["effective_route_context"] 中；旧版本直接使用 scope["route"].path。
+    """
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
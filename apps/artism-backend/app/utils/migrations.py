@@ -0,0 +1,165 @@
+"""
+版本化数据库迁移
+
+迁移按版本号注册，执行成功后记录到 _migrations 集合，之后启动时直接跳过，
+避免每次启动都对全部文档执行 update_many。
+
+多个进程同时启动时，先插入以版本号为 _id 的记录占用迁移，插入失败（DuplicateKeyError）
+说明其他进程已经执行或正在执行，当前进程跳过。迁移失败时删除占用记录，下次启动重试；
+进程在迁移中途退出留下的占用记录超过 STALE_CLAIM_SECONDS 后会被重新占用。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import logging
+import time
+
+from pymongo.errors import DuplicateKeyError
+
+from app.db.mongodb import get_collection
+from app.core.config import MIGRATIONS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """一个数据库迁移"""
+
+    version: int
+    name: str
+    func: Callable[[], None]
+
+
+# 占用记录超过该时长仍未完成，视为执行迁移的进程已退出
+STALE_CLAIM_SECONDS = 3600
+
+_registry: Dict[int, Migration] = {}
+
+
+def migration(version: int, name: str) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    """
+    注册迁移的装饰器
+
+    Args:
+        version: 版本号（唯一，按从小到大顺序执行）
+        name: 迁移名称
+
+    Returns:
+        Callable: 装饰器
+    """
+    def decorator(func: Callable[[], None]) -> Callable[[], None]:
+        existing = _registry.get(version)
+        if existing is not None and existing.name != name:
+            raise ValueError(f"Migration version {version} already registered as '{existing.name}'")
+        _registry[version] = Migration(version=version, name=name, func=func)
+        return func
+    return decorator
+
+
+def get_migrations() -> List[Migration]:
+    """获取所有已注册的迁移（按版本排序）"""
+    _load_builtin_migrations()
+    return [_registry[version] for version in sorted(_registry)]
+
+
+def get_applied_versions() -> Dict[int, Dict]:
+    """
+    获取已执行的迁移记录
+
+    Returns:
+        Dict[int, Dict]: 版本号 -> 迁移记录
+    """
+    return {
+        record["_id"]: record
+        for record in get_collection(MIGRATIONS_COLLECTION).find({"status": "applied"})
+    }
+
+
+def run_pending_migrations(target_version: Optional[int] = None) -> List[str]:
+    """
+    执行尚未执行的迁移
+
+    Args:
+        target_version: 最多执行到该版本，默认全部
+
+    Returns:
+        List[str]: 本次执行的迁移名称
+    """
+    collection = get_collection(MIGRATIONS_COLLECTION)
+    applied = set(get_applied_versions())
+    executed = []
+
+    for item in get_migrations():
+        if item.version in applied:
+            continue
+        if target_version is not None and item.version > target_version:
+            break
+
+        if not _claim(item):
+            logger.info(f"Migration {item.version} ({item.name}) claimed by another process, skipping")
+            continue
+
+        started = time.perf_counter()
+        try:
+            item.func()
+        except Exception:
+            collection.delete_one({"_id": item.version, "status": "running"})
+            logger.exception(f"Migration {item.version} ({item.name}) failed")
+            raise
+
+        collection.update_one({"_id": item.version}, {"$set": {
+            "status": "applied",
+            "applied_at": datetime.utcnow(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }})
+        executed.append(item.name)
+        logger.info(f"Applied migration {item.version} ({item.name})")
+
+    return executed
+
+
+def _claim(item: Migration) -> bool:
+    """
+    占用迁移
+
+    Args:
+        item: 迁移
+
+    Returns:
+        bool: 是否由当前进程执行
+    """
+    collection = get_collection(MIGRATIONS_COLLECTION)
+    now = datetime.utcnow()
+    record = {"_id": item.version, "name": item.name, "status": "running", "started_at": now}
+    try:
+        collection.insert_one(record)
+        return True
+    except DuplicateKeyError:
+        pass
+
+    # 接管过期的占用记录
+    stale_before = now - timedelta(seconds=STALE_CLAIM_SECONDS)
+    result = collection.update_one(
+        {"_id": item.version, "status": "running", "started_at": {"$lt": stale_before}},
+        {"$set": {"started_at": now}}
+    )
+    return result.modified_count == 1
+
+
+def _load_builtin_migrations() -> None:
+    """导入内置迁移，完成注册"""
+    from app.utils import primary_key
+    from app.utils.database_setup import DatabaseMigration
+
+    migration(1, "add_timestamps")(DatabaseMigration.add_timestamps)
+    migration(2, "migrate_to_new_schema")(DatabaseMigration.migrate_to_new_schema)
+    migration(3, "repair_nan_values")(DatabaseMigration.repair_nan_values)
+    migration(4, "convert_timestamps_to_dates")(DatabaseMigration.convert_timestamps_to_dates)
+
+    # 主键格式迁移只在开启 UUID_PRIMARY_KEYS 时注册，之后开启时仍会作为未执行的迁移运行
+    if primary_key.UUID_PRIMARY_KEYS:
+        migration(5, "migrate_uuid_primary_keys")(DatabaseMigration.migrate_uuid_primary_keys)
+    else:
+        _registry.pop(5, None)
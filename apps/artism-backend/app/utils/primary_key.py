@@ -0,0 +1,132 @@
+"""
+评论和帖子的主键存储方式
+
+默认情况下，评论、评论线程和帖子文档同时保存 MongoDB 生成的 ObjectId `_id` 和 uuid4 字符串 `id`，
+两者各有一个唯一索引，服务层按 `id` 查询，并在返回前把 `_id` 转换为字符串。
+
+UUID_PRIMARY_KEYS=True 时，新文档直接以 `id` 对应的二进制 UUID（subtype 4）作为 `_id`，不再单独保存 `id`：
+查询走 `_id` 索引，`id` 索引改为只包含旧文档的稀疏索引（迁移完成后为空），文档也更小。
+对外的 `id` 不变，响应中的 `_id` 与 `id` 相同。
+
+读取兼容两种文档：按 ID 查询的条件同时匹配 `_id` 和旧的 `id` 字段，两个分支都走索引。
+迁移 5（migrate_uuid_primary_keys，只在开启该模式时注册）把已有文档改写为新格式。
+开启后不支持再关闭。
+"""
+
+from typing import Any, Dict, Optional
+import uuid
+
+from bson.binary import Binary, UUID_SUBTYPE
+from pymongo import IndexModel, ASCENDING
+
+from app.core.config import UUID_PRIMARY_KEYS, POSTS_COLLECTION
+
+# 使用该存储方式的集合
+PRIMARY_KEY_COLLECTIONS = ("comments", "comment_threads", POSTS_COLLECTION)
+
+# 旧文档 id 字段的稀疏唯一索引名称（与默认的 id_1 区分，避免索引选项冲突）
+LEGACY_ID_INDEX = "id_legacy"
+
+
+def storage_key(record_id: Any) -> Optional[Binary]:
+    """
+    将对外的 ID 转换为存储用的二进制 UUID
+
+    Args:
+        record_id: 对外的 ID
+
+    Returns:
+        Optional[Binary]: subtype 4 的二进制 UUID；ID 不是 UUID 时为 None
+    """
+    if not isinstance(record_id, str):
+        return None
+    try:
+        return Binary.from_uuid(uuid.UUID(record_id))
+    except ValueError:
+        return None
+
+
+def prepare_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    生成写入数据库的文档
+
+    开启 UUID_PRIMARY_KEYS 时以 id 对应的二进制 UUID 作为 `_id` 并移除 `id` 字段；
+    否则（或 id 不是 UUID 时）原样返回。
+
+    Args:
+        document: 包含 id 的文档
+
+    Returns:
+        Dict[str, Any]: 待写入的文档
+    """
+    key = storage_key(document.get("id")) if UUID_PRIMARY_KEYS else None
+    if key is None:
+        return document
+    stored = {name: value for name, value in document.items() if name != "id"}
+    stored["_id"] = key
+    return stored
+
+
+def id_filter(record_id: str) -> Dict[str, Any]:
+    """
+    按对外 ID 查询单个文档的条件
+
+    Args:
+        record_id: 对外的 ID
+
+    Returns:
+        Dict[str, Any]: 查询条件
+    """
+    key = storage_key(record_id) if UUID_PRIMARY_KEYS else None
+    if key is None:
+        return {"id": record_id}
+    return {"$or": [{"_id": key}, {"id": record_id}]}
+
+
+def to_public(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将文档的主键转换为响应格式（原地修改）
+
+    二进制 UUID 主键还原为 id 字符串，`_id` 与 id 相同；ObjectId 主键转换为字符串。
+
+    Args:
+        document: 数据库文档
+
+    Returns:
+        Dict[str, Any]: 同一个文档
+    """
+    key = document.get("_id")
+    if isinstance(key, Binary) and key.subtype == UUID_SUBTYPE:
+        key = key.as_uuid()
+    if isinstance(key, uuid.UUID):
+        document["id"] = str(key)
+        document["_id"] = document["id"]
+    elif key is not None:
+        document["_id"] = str(key)
+    return document
+
+
+def id_index() -> IndexModel:
+    """
+    id 字段的唯一索引
+
+    默认模式下是普通唯一索引；UUID_PRIMARY_KEYS 模式下新文档没有 id 字段，改为稀疏索引，
+    只包含迁移前的旧文档。
+    """
+    if UUID_PRIMARY_KEYS:
+        return IndexModel([("id", ASCENDING)], unique=True, sparse=True, name=LEGACY_ID_INDEX)
+    return IndexModel([("id", ASCENDING)], unique=True)
+
+
+def ensure_id_index(collection) -> None:
+    """
+    创建 id 索引；UUID_PRIMARY_KEYS 模式下先删除默认的非稀疏 id_1 索引
+
+    非稀疏的唯一索引把缺少 id 的文档都视为 null，新格式的第二个文档就会违反唯一约束。
+
+    Args:
+        collection: 集合
+    """
+    if UUID_PRIMARY_KEYS and "id_1" in collection.index_information():
+        collection.drop_index("id_1")
+    collection.create_indexes([id_index()])
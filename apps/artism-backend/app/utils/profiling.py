@@ -0,0 +1,295 @@
+"""
+运行时诊断工具
+
+- SamplingProfiler：后台线程按固定间隔采样所有线程的调用栈，输出 collapsed stack 格式
+  （每行 "帧1;帧2;...;帧N 次数"），可直接交给 flamegraph.pl / speedscope 生成火焰图；
+- MemoryTracer：基于 tracemalloc 的快照和差异对比，用于定位内存泄漏；
+- dump_asyncio_tasks / dump_thread_stacks：导出当前事件循环的任务栈和所有线程的调用栈。
+
+这些工具只在调用时启动，未启动时不产生任何开销。
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    """调用栈中单个帧的标签：函数名 (文件名:定义行)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    采样分析器
+
+    同一时间只允许一次采样；采样在指定时长后自动结束，也可以提前停止。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._duration = 0.0
+        self._interval = 0.0
+
+    def is_running(self) -> bool:
+        """是否正在采样"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval: float) -> bool:
+        """
+        开始采样
+
+        Args:
+            seconds: 采样时长（秒）
+            interval: 采样间隔（秒）
+
+        Returns:
+            bool: 是否成功开始，已有采样在运行时返回 False
+        """
+        with self._lock:
+            if self.is_running():
+                return False
+            self._stop_event.clear()
+            self._stacks = Counter()
+            self._samples = 0
+            self._duration = seconds
+            self._interval = interval
+            self._started_at = time.time()
+            self._finished_at = None
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info("Sampling profiler started for %.1fs (interval %.1f ms)", seconds, interval * 1000)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        停止采样并等待采样线程退出
+
+        Args:
+            timeout: 等待时间（秒）
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待采样结束
+
+        Args:
+            timeout: 等待时间（秒）
+
+        Returns:
+            bool: 采样是否已结束
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self._duration
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self._stacks[";".join(reversed(stack))] += 1
+            self._samples += 1
+            self._stop_event.wait(self._interval)
+        self._finished_at = time.time()
+        logger.info("Sampling profiler finished with %d samples", self._samples)
+
+    def collapsed(self) -> str:
+        """
+        获取 collapsed stack 格式的采样结果
+
+        Returns:
+            str: 每行一个调用栈及其采样次数，按次数降序
+        """
+        stacks = dict(self._stacks)
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+    def status(self) -> Dict[str, Any]:
+        """获取采样状态"""
+        return {
+            "running": self.is_running(),
+            "samples": self._samples,
+            "stacks": len(self._stacks),
+            "duration_seconds": self._duration,
+            "interval_ms": round(self._interval * 1000, 3),
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+        }
+
+
+class MemoryTracer:
+    """
+    tracemalloc 快照管理
+
+    第一次快照作为基线，之后的快照与基线和上一次快照对比，按行号汇总内存增长最多的位置。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def start(self, frames: int = 10) -> bool:
+        """
+        开始跟踪内存分配
+
+        Args:
+            frames: 每次分配保留的调用栈深度
+
+        Returns:
+            bool: 是否新开始跟踪，已在跟踪时返回 False
+        """
+        with self._lock:
+            if tracemalloc.is_tracing():
+                return False
+            tracemalloc.start(frames)
+            self._baseline = self._previous = None
+            return True
+
+    def stop(self) -> None:
+        """停止跟踪并丢弃快照"""
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = self._previous = None
+
+    def snapshot(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        拍摄快照并与基线、上一次快照对比
+
+        Args:
+            limit: 每个列表返回的条目数
+
+        Returns:
+            Dict[str, Any]: 当前占用最多的位置以及相对基线、上一次快照的增长
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not tracing")
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ))
+            baseline, previous = self._baseline, self._previous
+            if baseline is None:
+                self._baseline = snapshot
+            self._previous = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        result = {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [_stat(stat) for stat in snapshot.statistics("lineno")[:limit]],
+            "since_baseline": None,
+            "since_previous": None,
+        }
+        if baseline is not None:
+            result["since_baseline"] = [_diff(stat) for stat in snapshot.compare_to(baseline, "lineno")[:limit]]
+        if previous is not None and previous is not baseline:
+            result["since_previous"] = [_diff(stat) for stat in snapshot.compare_to(previous, "lineno")[:limit]]
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        """获取跟踪状态"""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "has_baseline": self._baseline is not None,
+        }
+
+
+def _location(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _stat(stat: tracemalloc.Statistic) -> Dict[str, Any]:
+    return {"location": _location(stat), "size_bytes": stat.size, "count": stat.count}
+
+
+def _diff(stat: tracemalloc.StatisticDiff) -> Dict[str, Any]:
+    return {
+        "location": _location(stat),
+        "size_bytes": stat.size,
+        "size_diff_bytes": stat.size_diff,
+        "count": stat.count,
+        "count_diff": stat.count_diff,
+    }
+
+
+def dump_asyncio_tasks(limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    导出当前事件循环中所有任务的调用栈（需在事件循环中调用）
+
+    Args:
+        limit: 每个任务最多返回的帧数
+
+    Returns:
+        List[Dict[str, Any]]: 任务列表
+    """
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": getattr(coro, "__qualname__", repr(coro)),
+            "done": task.done(),
+            "stack": [
+                f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+                for frame in task.get_stack(limit=limit)
+            ],
+        })
+    return sorted(tasks, key=lambda item: item["name"])
+
+
+def dump_thread_stacks() -> Dict[str, List[str]]:
+    """
+    导出所有线程当前的调用栈
+
+    Returns:
+        Dict[str, List[str]]: 线程名称 -> 调用栈（由外到内）
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    return {
+        f"{names.get(thread_id, 'unknown')} ({thread_id})": [
+            line.rstrip("\n") for line in traceback.format_stack(frame)
+        ]
+        for thread_id, frame in sys._current_frames().items()
+    }
+
+
+# 全局诊断工具实例
+profiler = SamplingProfiler()
+memory_tracer = MemoryTracer()
@@ -0,0 +1,209 @@
+"""
+查询结果缓存
+
+BaseService.get_all 的结果按 (集合, 规范化的 QueryParams) 缓存，热门列表查询不再重复执行
+count_documents + find：
+
+- 失效：每个条目记录生成时各相关集合的版本号（CollectionVersions，BaseService 每次写入递增），
+  读取时版本号不一致即视为未命中，写入后立即生效。绕过 BaseService 直接改写集合的代码
+  （数据库重置、迁移等）必须自己递增版本号（DatabaseSetup.invalidate_collections），
+  否则版本号不变，旧结果会一直返回到 TTL + QUERY_CACHE_STALE_SECONDS 过期。版本号在进程内缓存
+  COLLECTION_VERSION_CACHE_SECONDS，该时长内的命中不访问数据库，其他 worker 的写入最多延迟该时长可见；
+- 容量：按条目编码后的字节数限制总大小（QUERY_CACHE_MAX_BYTES），超出时淘汰最久未使用的条目；
+- stale-while-revalidate：条目超过 QUERY_CACHE_TTL_SECONDS 但未超过 TTL + QUERY_CACHE_STALE_SECONDS 时
+  直接返回旧结果，同时在后台刷新，避免热门查询在条目过期时集中重新计算。
+
+命中率、条目数和占用字节数在 /metrics 导出。缓存的结果由多个请求共享，调用方不应修改。
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+
+from app.core.config import (
+    QUERY_CACHE_ENABLED, QUERY_CACHE_MAX_BYTES, QUERY_CACHE_TTL_SECONDS, QUERY_CACHE_STALE_SECONDS
+)
+from app.utils.background import run_in_background
+from app.utils.collection_versions import CollectionVersions
+from app.utils.json_response import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+
+    value: Any
+    size: int
+    created_at: float
+    # 生成时各相关集合的版本号
+    generation: Tuple[int, ...]
+    refreshing: bool = False
+
+
+def _estimate_size(value: Any) -> int:
+    """按 JSON 编码后的长度估算条目大小"""
+    try:
+        return len(dumps(value))
+    except TypeError:
+        return len(repr(value))
+
+
+class QueryCache:
+    """
+    按字节数限制大小的 LRU 查询缓存
+    """
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_MAX_BYTES, ttl: float = QUERY_CACHE_TTL_SECONDS,
+                 stale: float = QUERY_CACHE_STALE_SECONDS, enabled: bool = QUERY_CACHE_ENABLED):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale = stale
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset_state()
+
+    def reset_state(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+            self._bytes = 0
+            self._stats = {"hits": 0, "misses": 0, "stale_hits": 0, "evictions": 0, "invalidations": 0}
+
+    def get_or_compute(self, collections: Sequence[str], key: str, compute: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时计算并写入
+
+        Args:
+            collections: 结果依赖的集合，第一个为主集合
+            key: 规范化的查询键
+            compute: 计算结果的函数
+
+        Returns:
+            Any: 查询结果
+        """
+        if not self.enabled:
+            return compute()
+
+        cache_key = (collections[0], key)
+        versions = CollectionVersions.get_many(collections)
+        generation = tuple(versions[name] for name in collections)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry.generation != generation:
+                    self._remove(cache_key)
+                    self._stats["invalidations"] += 1
+                    entry = None
+                else:
+                    age = now - entry.created_at
+                    if age < self.ttl:
+                        self._entries.move_to_end(cache_key)
+                        self._stats["hits"] += 1
+                        return entry.value
+                    if age < self.ttl + self.stale:
+                        self._entries.move_to_end(cache_key)
+                        self._stats["stale_hits"] += 1
+                        if not entry.refreshing:
+                            entry.refreshing = True
+                            run_in_background(self._refresh, cache_key, collections, compute)
+                        return entry.value
+            self._stats["misses"] += 1
+
+        value = compute()
+        self._store(cache_key, value, generation)
+        return value
+
+    def _refresh(self, cache_key: Tuple[str, str], collections: Sequence[str], compute: Callable[[], Any]) -> None:
+        """后台刷新过期条目"""
+        try:
+            versions = CollectionVersions.get_many(collections)
+            generation = tuple(versions[name] for name in collections)
+            self._store(cache_key, compute(), generation)
+        except Exception:
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry is not None:
+                    entry.refreshing = False
+            raise
+
+    def _store(self, cache_key: Tuple[str, str], value: Any, generation: Tuple[int, ...]) -> None:
+        """写入条目并按字节数淘汰"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(cache_key)
+            self._entries[cache_key] = CacheEntry(value=value, size=size, created_at=time.monotonic(),
+                                                  generation=generation)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def _remove(self, cache_key: Tuple[str, str]) -> None:
+        """删除条目（调用方持有锁）"""
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """
+        删除某个集合（或全部）的缓存条目
+
+        Args:
+            collection_name: 集合名称，None 表示全部
+        """
+        with self._lock:
+            for cache_key in [k for k in self._entries if collection_name is None or k[0] == collection_name]:
+                self._remove(cache_key)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取命中率、条目数和占用字节数"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["invalidations"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def render_prometheus(self) -> str:
+        """
+        以 Prometheus 文本格式导出统计
+
+        Returns:
+            str: 指标文本
+        """
+        stats = self.stats()
+        lines = [
+            "# HELP query_cache_requests_total Query cache lookups by result.",
+            "# TYPE query_cache_requests_total counter",
+        ]
+        for result, name in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses"),
+                             ("invalidated", "invalidations")):
+            lines.append(f'query_cache_requests_total{{result="{result}"}} {stats[name]}')
+        lines += [
+            "# HELP query_cache_evictions_total Entries evicted to stay under QUERY_CACHE_MAX_BYTES.",
+            "# TYPE query_cache_evictions_total counter",
+            f"query_cache_evictions_total {stats['evictions']}",
+            "# HELP query_cache_entries Entries currently cached.",
+            "# TYPE query_cache_entries gauge",
+            f"query_cache_entries {stats['entries']}",
+            "# HELP query_cache_bytes Estimated size of cached results.",
+            "# TYPE query_cache_bytes gauge",
+            f"query_cache_bytes {stats['bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# 全局查询缓存
+query_cache = QueryCache()
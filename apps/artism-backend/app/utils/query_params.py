@@ -1,9 +1,14 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Literal
 from pydantic import BaseModel, Field
 from fastapi import Query
+import json
 import re
 
 
+# 列表投影配置名称
+ProjectionProfile = Literal["summary", "card", "full"]
+
+
 class QueryParams(BaseModel):
     """
     通用查询参数模型
@@ -14,6 +19,7 @@ class QueryParams(BaseModel):
     # 字段控制
     fields: Optional[str] = Field(None, description="限定返回字段，用逗号分隔，如 'name,avatarUrl'")
     include: Optional[str] = Field(None, description="填充关联字段，用逗号分隔，如 'notableWorks,associatedMovements'")
+    profile: Optional[ProjectionProfile] = Field(None, description="投影配置，未指定 fields 时生效，默认 card")
     
     # 搜索和筛选
     search: Optional[str] = Field(None, description="模糊搜索关键词")
@@ -205,3 +211,39 @@ class QueryParamsParser:
             bool: 是否允许
         """
         return sort_by in allowed_fields
+    
+    @staticmethod
+    def build_cache_key(params: Optional[QueryParams]) -> str:
+        """
+        构建规范化的查询缓存键
+        
+        结果相同的查询得到相同的键：字段、关联字段和标签排序去重，未指定排序字段时忽略排序方向。
+        
+        Args:
+            params: 查询参数
+            
+        Returns:
+            str: 缓存键
+        """
+        params = params or QueryParams()
+        
+        def normalized(values: Optional[List[str]]) -> Optional[List[str]]:
+            return sorted(set(values)) if values else None
+        
+        fields = normalized(QueryParamsParser.parse_fields(params.fields))
+        key = {
+            "project": params.project,
+            "fields": fields,
+            # 指定 fields 时投影配置不生效
+            "profile": None if fields else params.profile,
+            "include": normalized(QueryParamsParser.parse_include(params.include)),
+            "search": params.search or None,
+            "tags": normalized(QueryParamsParser.parse_tags(params.tags)),
+            "year_from": params.year_from,
+            "year_to": params.year_to,
+            "sort": QueryParamsParser.build_mongo_sort(params),
+            "page": params.page,
+            "page_size": params.page_size,
+            "is_fictional": params.is_fictional,
+        }
+        return json.dumps(key, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
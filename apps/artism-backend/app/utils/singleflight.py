@@ -0,0 +1,168 @@
+"""
+请求合并（singleflight）
+
+同一时刻对同一函数、同一参数的多次调用只执行一次，其余调用等待并共享结果（或异常）。
+用于统计、时间线等开销大且结果与调用方无关的读取：突发流量下并发请求不再各自重复执行相同的聚合。
+
+只合并正在执行的调用，不缓存结果；共享的结果对象由多个调用方同时使用，不应修改。
+服务层是同步的，合并基于线程：端点需要在线程池中调用（run_in_threadpool）才会并发执行。
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import functools
+import logging
+import threading
+
+from app.core.config import REQUEST_COALESCING_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """正在执行的调用"""
+
+    __slots__ = ("event", "owner", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.owner = threading.get_ident()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    按键合并并发调用
+    """
+
+    def __init__(self, enabled: bool = REQUEST_COALESCING_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # 名称 -> [调用次数, 实际执行次数, 被合并次数]
+        self._stats: Dict[str, List[int]] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any], name: str = "") -> Any:
+        """
+        执行函数；相同键的调用正在执行时等待其结果
+
+        Args:
+            key: 合并键
+            func: 无参函数
+            name: 指标中的名称
+
+        Returns:
+            Any: 函数结果（合并的调用共享同一对象）
+        """
+        if not self.enabled:
+            return func()
+
+        with self._lock:
+            stats = self._stats.setdefault(name, [0, 0, 0])
+            stats[0] += 1
+            call = self._calls.get(key)
+            if call is not None and call.owner != threading.get_ident():
+                stats[2] += 1
+                leader = False
+            else:
+                stats[1] += 1
+                # 同一线程内的递归调用直接执行，避免等待自己
+                leader = call is None
+                if leader:
+                    call = _Call()
+                    self._calls[key] = call
+                else:
+                    call = None
+
+        if call is None:
+            return func()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """获取按名称的调用、执行和合并次数"""
+        with self._lock:
+            return {
+                name: {"calls": calls, "executions": executions, "deduplicated": deduplicated}
+                for name, (calls, executions, deduplicated) in sorted(self._stats.items())
+            }
+
+    def in_flight(self) -> int:
+        """正在执行的调用数"""
+        with self._lock:
+            return len(self._calls)
+
+    def reset(self) -> None:
+        """清空统计（不影响正在执行的调用）"""
+        with self._lock:
+            self._stats = {}
+
+    def render_prometheus(self) -> str:
+        """
+        以 Prometheus 文本格式导出统计
+
+        Returns:
+            str: 指标文本
+        """
+        stats = self.stats()
+        lines = [
+            "# HELP singleflight_calls_total Calls to coalesced functions.",
+            "# TYPE singleflight_calls_total counter",
+        ]
+        lines += [f'singleflight_calls_total{{function="{name}"}} {item["calls"]}' for name, item in stats.items()]
+        lines += [
+            "# HELP singleflight_deduplicated_total Calls that waited for an identical in-flight call.",
+            "# TYPE singleflight_deduplicated_total counter",
+        ]
+        lines += [
+            f'singleflight_deduplicated_total{{function="{name}"}} {item["deduplicated"]}'
+            for name, item in stats.items()
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# 全局合并组
+singleflight_group = SingleFlight()
+
+
+def singleflight(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    装饰器：按函数和参数合并并发调用
+
+    用于类方法时放在 @classmethod 之下，cls 作为参数的一部分参与合并键。
+    参数不可哈希时不合并，直接执行。
+
+    Args:
+        func: 被装饰的函数
+
+    Returns:
+        Callable[..., Any]: 包装后的函数
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (func.__module__, name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        return singleflight_group.do(key, lambda: func(*args, **kwargs), name)
+
+    return wrapper
@@ -1,35 +1,134 @@
 """
 应用启动时的初始化脚本
+
+应用通过 lifespan 调用 start_background_initialization，在后台线程中依次执行
+集合检查、版本化迁移和索引创建，服务在此期间已经可以响应请求（包括健康检查）。
+初始化进度由 StartupState 记录，可通过 get_startup_status 查询。
 """
 
 import asyncio
-from typing import Optional
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.utils.database_setup import DatabaseSetup
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """
+    启动初始化状态
 
-from app.utils.database_setup import DatabaseSetup, DatabaseMigration
+    status: pending（未开始）/ running / ready / failed
+    steps: 各步骤状态及耗时
+    """
+
+    STEPS = ("collections", "migrations", "indexes", "stats")
+
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    status = "pending"
+    steps: Dict[str, Dict[str, Any]] = {}
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def begin(cls) -> None:
+        """标记初始化开始"""
+        with cls._lock:
+            cls.status = "running"
+            cls.steps = {step: {"status": "pending"} for step in cls.STEPS}
+            cls.started_at = datetime.utcnow()
+            cls.finished_at = None
+            cls.error = None
+
+    @classmethod
+    def run_step(cls, name: str, func, *args) -> Any:
+        """
+        执行一个初始化步骤并记录状态和耗时
+
+        Args:
+            name: 步骤名称
+            func: 步骤函数
+
+        Returns:
+            Any: 步骤函数的返回值
+        """
+        with cls._lock:
+            cls.steps[name] = {"status": "running"}
+        started = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            with cls._lock:
+                cls.steps[name] = {"status": "failed", "error": str(e),
+                                   "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+            raise
+        with cls._lock:
+            cls.steps[name] = {"status": "done",
+                               "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+        return result
+
+    @classmethod
+    def finish(cls, error: Optional[str] = None) -> None:
+        """标记初始化结束"""
+        with cls._lock:
+            cls.status = "failed" if error else "ready"
+            cls.error = error
+            cls.finished_at = datetime.utcnow()
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """获取当前状态"""
+        with cls._lock:
+            return {
+                "status": cls.status,
+                "ready": cls.status == "ready",
+                "steps": {name: dict(step) for name, step in cls.steps.items()},
+                "started_at": cls.started_at.isoformat() if cls.started_at else None,
+                "finished_at": cls.finished_at.isoformat() if cls.finished_at else None,
+                "error": cls.error,
+            }
+
+    @classmethod
+    def reset_state(cls) -> None:
+        """重置状态（测试时使用）"""
+        with cls._lock:
+            cls._thread = None
+            cls.status = "pending"
+            cls.steps = {}
+            cls.started_at = None
+            cls.finished_at = None
+            cls.error = None
 
 
 async def initialize_database():
     """
     初始化数据库
     """
+    from app.utils.migrations import run_pending_migrations
+
+    StartupState.begin()
     try:
         print("Initializing database...")
-        
+
         # 1. 确保集合存在
-        DatabaseSetup.ensure_collections_exist()
-        
-        # 2. 创建索引
-        DatabaseSetup.create_indexes()
-        
-        # 3. 执行迁移（如果需要）
-        try:
-            DatabaseMigration.add_timestamps()
-            DatabaseMigration.migrate_to_new_schema()
-        except Exception as e:
-            print(f"Migration warning (this is normal for new databases): {e}")
-        
+        StartupState.run_step("collections", DatabaseSetup.ensure_collections_exist)
+
+        # 2. 执行尚未执行过的迁移（已执行的记录在 _migrations 集合中）
+        applied = StartupState.run_step("migrations", run_pending_migrations)
+        if applied:
+            print(f"Applied migrations: {', '.join(applied)}")
+
+        # 3. 创建索引
+        StartupState.run_step("indexes", DatabaseSetup.create_indexes)
+
         # 4. 显示统计信息
-        stats = DatabaseSetup.get_collection_stats()
+        stats = StartupState.run_step("stats", DatabaseSetup.get_collection_stats)
         print("Database initialization completed!")
         print("Collection statistics:")
         for collection, stat in stats.items():
@@ -37,11 +136,13 @@ async def initialize_database():
                 print(f"  {collection}: Error - {stat['error']}")
             else:
                 print(f"  {collection}: {stat['document_count']} documents, {stat['indexes']} indexes")
-        
+
+        StartupState.finish()
         return True
-        
+
     except Exception as e:
         print(f"Database initialization failed: {e}")
+        StartupState.finish(error=str(e))
         return False
 
 
@@ -50,19 +151,65 @@ async def startup_sequence():
     完整的启动序列
     """
     print("Starting AIDA backend initialization...")
-    
+
     # 初始化数据库
     db_success = await initialize_database()
-    
+
     if db_success:
         print("✅ Database initialization successful")
     else:
         print("❌ Database initialization failed")
-    
+
     print("AIDA backend initialization completed!")
     return db_success
 
 
+def start_background_initialization() -> bool:
+    """
+    在后台线程中执行启动序列（应用 lifespan 中调用，立即返回）
+
+    Returns:
+        bool: 是否启动了新的初始化线程（已在运行或已完成时返回 False）
+    """
+    with StartupState._lock:
+        if StartupState._thread is not None:
+            return False
+        StartupState._thread = threading.Thread(
+            target=lambda: asyncio.run(startup_sequence()),
+            name="startup-initialization",
+            daemon=True
+        )
+        thread = StartupState._thread
+    thread.start()
+    return True
+
+
+def wait_for_startup(timeout: Optional[float] = None) -> bool:
+    """
+    等待后台初始化完成
+
+    Args:
+        timeout: 超时时间（秒）
+
+    Returns:
+        bool: 是否初始化成功
+    """
+    thread = StartupState._thread
+    if thread is not None:
+        thread.join(timeout)
+    return StartupState.status == "ready"
+
+
+def get_startup_status() -> Dict[str, Any]:
+    """
+    获取启动初始化状态
+
+    Returns:
+        Dict[str, Any]: 状态信息
+    """
+    return StartupState.snapshot()
+
+
 def run_startup():
     """
     运行启动序列（同步版本）
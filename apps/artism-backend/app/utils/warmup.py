@@ -0,0 +1,203 @@
+"""
+新 worker 预热
+
+刚启动的 worker 处理首批请求时，数据库连接尚未建立，艺术家资料缓存、风格向量索引、
+动态流和热门排行都需要在请求中初始化。预热阶段在应用 lifespan 中并行执行这些加载，
+/health/ready 在所有组件就绪前返回 503，负载均衡器只把流量分给已预热的 worker。
+
+组件通过 warmup.register 注册，WARMUP_COMPONENTS 可以只启用其中一部分。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import threading
+import time
+
+from app.core.config import WARMUP_COMPONENTS, WARMUP_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupComponent:
+    """预热组件"""
+
+    name: str
+    func: Callable[[], Any]
+    # 非必需组件失败时不影响就绪状态
+    required: bool = True
+
+
+class Warmup:
+    """
+    预热组件注册表
+
+    status: pending（未开始）/ running / done
+    各组件状态：pending / running / ready / failed，附带耗时和加载结果
+    """
+
+    def __init__(self, max_workers: int = WARMUP_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._components: Dict[str, WarmupComponent] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.status = "pending"
+
+    def register(self, name: str, func: Callable[[], Any], required: bool = True) -> None:
+        """
+        注册预热组件
+
+        Args:
+            name: 组件名称
+            func: 加载函数，返回值会记录在组件状态中（例如加载的条目数）
+            required: 是否为就绪的必要条件
+        """
+        self._components[name] = WarmupComponent(name=name, func=func, required=required)
+
+    def enabled_components(self, names: Optional[List[str]] = None) -> List[WarmupComponent]:
+        """
+        获取启用的组件
+
+        Args:
+            names: 组件名称列表，默认读取 WARMUP_COMPONENTS（为空时启用全部）
+
+        Returns:
+            List[WarmupComponent]: 组件列表
+        """
+        names = names if names is not None else WARMUP_COMPONENTS
+        if not names:
+            return list(self._components.values())
+        unknown = [name for name in names if name not in self._components]
+        if unknown:
+            logger.warning(f"Unknown warm-up components ignored: {', '.join(unknown)}")
+        return [self._components[name] for name in names if name in self._components]
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        并行执行预热（阻塞直到全部完成）
+
+        Args:
+            names: 要执行的组件名称，默认读取 WARMUP_COMPONENTS
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 各组件状态
+        """
+        components = self.enabled_components(names)
+        with self._lock:
+            self.status = "running"
+            self._results = {c.name: {"status": "pending", "required": c.required} for c in components}
+
+        if components:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="warmup") as executor:
+                list(executor.map(self._run_component, components))
+
+        with self._lock:
+            self.status = "done"
+        return self.components()
+
+    def _run_component(self, component: WarmupComponent) -> None:
+        """执行单个组件并记录结果"""
+        with self._lock:
+            self._results[component.name]["status"] = "running"
+        started = time.perf_counter()
+        try:
+            result = component.func()
+            update = {"status": "ready", "result": result}
+        except Exception as e:
+            logger.warning(f"Warm-up component {component.name} failed: {e}")
+            update = {"status": "failed", "error": str(e)}
+        update["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self._results[component.name].update(update)
+
+    def start_background(self, names: Optional[List[str]] = None) -> bool:
+        """
+        在后台线程中执行预热（应用 lifespan 中调用，立即返回）
+
+        Returns:
+            bool: 是否启动了新的预热线程
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.status = "running"
+            self._thread = threading.Thread(target=self.run, args=(names,), name="warmup", daemon=True)
+            thread = self._thread
+        thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待后台预热完成
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 是否已就绪
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.is_ready()
+
+    def components(self) -> Dict[str, Dict[str, Any]]:
+        """获取各组件状态"""
+        with self._lock:
+            return {name: dict(result) for name, result in self._results.items()}
+
+    def is_ready(self) -> bool:
+        """预热已完成且所有必需组件就绪"""
+        with self._lock:
+            if self.status != "done":
+                return False
+            return all(result["status"] == "ready"
+                       for result in self._results.values() if result["required"])
+
+    def reset_state(self) -> None:
+        """重置预热状态（测试时使用）"""
+        with self._lock:
+            self._thread = None
+            self._results = {}
+            self.status = "pending"
+
+
+def _ping_mongodb() -> bool:
+    """建立数据库连接"""
+    from app.db.mongodb import get_database
+    get_database().command("ping")
+    return True
+
+
+def _preload_artist_profiles() -> int:
+    from app.services.artist_service import ArtistService
+    return ArtistService.preload_profiles()
+
+
+def _build_style_index() -> int:
+    from app.services.artwork_service import ArtworkService
+    return ArtworkService.build_style_index()
+
+
+def _backfill_feed() -> bool:
+    from app.services.feed_service import FeedService
+    FeedService._ensure_backfilled()
+    return True
+
+
+def _load_trending() -> int:
+    from app.services.trending_service import TrendingService
+    TrendingService._ensure_loaded()
+    return len(TrendingService._ranking)
+
+
+# 全局预热注册表
+warmup = Warmup()
+warmup.register("mongodb", _ping_mongodb)
+warmup.register("artist_profiles", _preload_artist_profiles)
+warmup.register("style_vectors", _build_style_index)
+warmup.register("feed", _backfill_feed)
+warmup.register("trending", _load_trending)
@@ -0,0 +1,322 @@
+"""
+端到端负载测试
+
+用数据生成器按规模（1k / 100k / 1m 件艺术品，其他集合按比例）写入数据，
+然后通过 httpx 的 ASGI transport 在进程内驱动真实应用，由多个并发客户端按权重请求：
+
+- artworks_list：艺术品分页列表；
+- artists_search：艺术家搜索；
+- similar_artworks：相似艺术品；
+- comments_with_replies：帖子评论及回复；
+- post_feed：首页动态流。
+
+输出每个场景以及整体的吞吐量（请求/秒）和 p50 / p95 / p99 延迟，可写入 JSON。
+指定 --baseline 时与保存的结果对比，p95 变慢或吞吐量下降超过 --tolerance 的场景标记为回归，退出码为 1。
+
+默认使用进程内的 mongomock；指定 --mongodb-uri 时使用真实 MongoDB（写入 --database 指定的库，
+运行前会清空该库）。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.bench_load --scale 1k --concurrency 16 --requests 2000 --json load.json
+    python -m benchmarks.bench_load --scale 100k --baseline load.json --tolerance 0.15
+    python -m benchmarks.bench_load --scale 1m --mongodb-uri mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import mongomock
+
+import app.db.mongodb as mongodb
+from app.utils import primary_key
+from app.utils.data_generator import (
+    ArtistDataGenerator, ArtworkDataGenerator, CommentDataGenerator, PostDataGenerator
+)
+
+# 规模名称 -> 艺术品数量
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# 每批写入的文档数，避免一次性在内存中生成全部数据
+BATCH_SIZE = 10_000
+
+# 场景名称 -> 权重
+SCENARIO_WEIGHTS = {
+    "artworks_list": 3,
+    "artists_search": 2,
+    "similar_artworks": 1,
+    "comments_with_replies": 2,
+    "post_feed": 3,
+}
+
+SEARCH_TERMS = ["van", "mon", "art", "Ada", "picasso", "digital", "e"]
+
+
+def connect(mongodb_uri: Optional[str], database: str) -> None:
+    """选择数据库：默认 mongomock，指定 URI 时连接真实 MongoDB"""
+    if mongodb_uri:
+        import pymongo
+        from app.db.monitoring import command_listener
+        mongodb._client = pymongo.MongoClient(mongodb_uri, event_listeners=[command_listener])
+        mongodb.DATABASE_NAME = database
+    else:
+        mongodb._client = mongomock.MongoClient()
+
+
+def _batches(total: int):
+    for start in range(0, total, BATCH_SIZE):
+        yield min(BATCH_SIZE, total - start)
+
+
+def seed(artwork_count: int) -> Dict[str, List[str]]:
+    """
+    按规模写入测试数据
+
+    艺术家为艺术品的 1%（至少 50 个），帖子和顶级评论各为 10%，每条顶级评论 1 条回复；
+    帖子和评论同样由数据生成器生成（时间戳为 BSON 日期，与服务层写入的格式一致）。
+    写入前清空整个库并重置进程内状态，重复运行时不会沿用上次的动态流、点赞分片和集合版本号。
+
+    Returns:
+        Dict[str, List[str]]: 用于构造请求的部分 ID
+    """
+    mongodb._client.drop_database(mongodb.DATABASE_NAME)
+    reset_process_state()
+    db = mongodb.get_database()
+
+    artist_count = max(50, artwork_count // 100)
+    templates = (ArtistDataGenerator.generate_real_artists(5)
+                 + ArtistDataGenerator.generate_fictional_artists(10))
+    artists = []
+    for i in range(artist_count):
+        artist = dict(templates[i % len(templates)])
+        artist["id"] = ArtistDataGenerator.generate_id()
+        artist["name"] = f"{artist['name']} {i}"
+        artists.append(artist)
+    db["artists"].insert_many(artists)
+    artist_ids = [artist["id"] for artist in artists]
+
+    artwork_ids = []
+    for size in _batches(artwork_count):
+        artworks = ArtworkDataGenerator.generate_artworks(artist_ids, count=size)
+        db["artworks"].insert_many(artworks)
+        if len(artwork_ids) < 100:
+            artwork_ids += [artwork["id"] for artwork in artworks[:100 - len(artwork_ids)]]
+
+    now = datetime.utcnow()
+    all_post_ids = []
+    for size in _batches(max(100, artwork_count // 10)):
+        posts = PostDataGenerator.generate_posts(
+            artist_ids, count=size, newest=now - timedelta(minutes=len(all_post_ids))
+        )
+        all_post_ids += [post["id"] for post in posts]
+        db["posts"].insert_many([primary_key.prepare_document(post) for post in posts])
+    # 请求集中在最新的 100 个帖子上，一半评论也落在这些帖子上
+    post_ids = all_post_ids[:100]
+
+    written = 0
+    for size in _batches(max(100, artwork_count // 10)):
+        targets = [random.choice(post_ids) if random.random() < 0.5 else random.choice(all_post_ids)
+                   for _ in range(size)]
+        comments = CommentDataGenerator.generate_comments(
+            artist_ids, targets, count=size, newest=now - timedelta(seconds=written)
+        )
+        db["comments"].insert_many([primary_key.prepare_document(comment) for comment in comments])
+        written += size
+
+    from app.utils.database_setup import DatabaseSetup
+    DatabaseSetup.create_indexes()
+
+    return {"artworks": artwork_ids, "posts": post_ids}
+
+
+def reset_process_state() -> None:
+    """重置各服务的进程内状态（缓存、集合版本号、动态流、排行和点赞缓冲）"""
+    from app.services.artist_service import ArtistService
+    from app.services.artwork_service import ArtworkService
+    from app.services.feed_service import FeedService
+    from app.services.like_counter_service import LikeCounterService
+    from app.services.trending_service import TrendingService
+
+    for service in (ArtistService, ArtworkService, FeedService, LikeCounterService, TrendingService):
+        service.reset_state()
+
+
+def build_requests(count: int, ids: Dict[str, List[str]], rng: random.Random) -> List[Tuple[str, str]]:
+    """
+    按权重生成请求序列
+
+    Returns:
+        List[Tuple[str, str]]: (场景, 路径) 列表
+    """
+    scenarios = list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[name] for name in scenarios]
+    paths = {
+        "artworks_list": lambda: f"/api/v1/artworks/?page={rng.randint(1, 20)}&pageSize=20",
+        "artists_search": lambda: f"/api/v1/artists/search/?query={rng.choice(SEARCH_TERMS)}&limit=10",
+        "similar_artworks": lambda: (f"/api/v1/artworks/{rng.choice(ids['artworks'])}/similar"
+                                     "?threshold=0.75&limit=10"),
+        "comments_with_replies": lambda: f"/api/v1/ai-comments/with-replies/post/{rng.choice(ids['posts'])}?limit=10",
+        "post_feed": lambda: f"/api/v1/posts/?skip={rng.choice([0, 0, 0, 20, 40])}&limit=20",
+    }
+    return [(name, paths[name]()) for name in rng.choices(scenarios, weights=weights, k=count)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数（线性插值）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """汇总一组延迟（毫秒）"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def run_load(requests: List[Tuple[str, str]], concurrency: int) -> Dict[str, Any]:
+    """
+    并发执行请求序列
+
+    Args:
+        requests: (场景, 路径) 列表
+        concurrency: 并发客户端数
+
+    Returns:
+        Dict[str, Any]: 整体和各场景的统计
+    """
+    from app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    latencies: Dict[str, List[float]] = {name: [] for name in SCENARIO_WEIGHTS}
+    errors: Dict[str, int] = {name: 0 for name in SCENARIO_WEIGHTS}
+    queue = iter(requests)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for scenario, path in queue:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies[scenario].append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors[scenario] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: summarize(values, errors[name], elapsed)
+            for name, values in latencies.items() if values
+        },
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    与基线对比
+
+    Args:
+        result: 本次结果
+        baseline: 基线结果
+        tolerance: 允许的相对变化
+
+    Returns:
+        List[str]: 回归描述，为空表示没有回归
+    """
+    regressions = []
+    current = {"overall": result["overall"], **result["scenarios"]}
+    previous = {"overall": baseline["overall"], **baseline["scenarios"]}
+    for name, stats in current.items():
+        base = previous.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} ms -> {stats['p95_ms']} ms")
+        if base["throughput_rps"] and stats["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {stats['throughput_rps']} req/s")
+        if stats["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {stats['errors']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-process load test against the ASGI app")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k", help="数据规模（艺术品数量）")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup-requests", type=int, default=100, help="正式计时前丢弃的请求数")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mongodb-uri", help="使用真实 MongoDB 而不是 mongomock")
+    parser.add_argument("--database", default="artism_bench", help="使用真实 MongoDB 时的库名（会被清空）")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之对比的基线 JSON 文件")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的相对变化，默认 20%%")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    connect(args.mongodb_uri, args.database)
+
+    started = time.perf_counter()
+    ids = seed(SCALES[args.scale])
+    seed_seconds = round(time.perf_counter() - started, 2)
+
+    if args.warmup_requests:
+        asyncio.run(run_load(build_requests(args.warmup_requests, ids, rng), args.concurrency))
+    load = asyncio.run(run_load(build_requests(args.requests, ids, rng), args.concurrency))
+
+    result = {
+        "scale": args.scale,
+        "backend": "mongodb" if args.mongodb_uri else "mongomock",
+        "concurrency": args.concurrency,
+        "seed_seconds": seed_seconds,
+        "python": sys.version.split()[0],
+        **load,
+    }
+
+    print(f"scale={args.scale} backend={result['backend']} concurrency={args.concurrency} seed={seed_seconds}s")
+    print(f"{'scenario':<24} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in [("overall", result["overall"]), *result["scenarios"].items()]:
+        print(f"{name:<24} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput_rps']:>9} "
+              f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != args.scale:
+            print(f"warning: baseline scale {baseline.get('scale')} differs from {args.scale}")
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+帖子主键存储方式对比
+
+分别以默认模式（ObjectId _id + 字符串 id）和 UUID_PRIMARY_KEYS 模式（二进制 UUID _id）向 posts 集合写入
+同样数量的帖子并创建索引，比较：
+
+- 索引总大小、各索引大小和平均文档大小（collStats）；
+- 按 id 查询单个帖子（PostService 使用的查询条件）的 p50 / p95 / p99 延迟。
+
+索引大小只有真实 MongoDB 才能统计，需要通过 --mongodb-uri 或环境变量 MONGODB_TEST_URI 指定；
+每种模式写入 --database 加模式后缀的库，运行前后清空。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.bench_primary_key --mongodb-uri mongodb://localhost:27017
+    python -m benchmarks.bench_primary_key --posts 200000 --lookups 20000 --json primary_key.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import pymongo
+
+import app.db.mongodb as mongodb
+from app.models.post import Post
+from app.utils import primary_key
+from app.utils.database_setup import DatabaseSetup
+from benchmarks.bench_load import percentile
+
+BATCH_SIZE = 1000
+
+MODES = {"objectid": False, "uuid": True}
+
+
+def seed(post_count: int) -> List[str]:
+    """按当前主键模式写入帖子，返回帖子 ID"""
+    collection = mongodb.get_collection("posts")
+    ids = []
+    for start in range(0, post_count, BATCH_SIZE):
+        documents = []
+        for index in range(start, min(start + BATCH_SIZE, post_count)):
+            post = Post(title=f"Post {index}", content="Body " * 20, author_id=f"artist_{index % 500}")
+            ids.append(post.id)
+            documents.append(primary_key.prepare_document(post.to_document()))
+        collection.insert_many(documents, ordered=False)
+    return ids
+
+
+def measure(client: pymongo.MongoClient, database: str, uuid_mode: bool,
+            post_count: int, lookups: int) -> Dict[str, Any]:
+    """在独立的库中写入数据并测量索引大小和按 id 查询的延迟"""
+    client.drop_database(database)
+    mongodb._client = client
+    mongodb.DATABASE_NAME = database
+    primary_key.UUID_PRIMARY_KEYS = uuid_mode
+
+    DatabaseSetup.create_indexes()
+    ids = seed(post_count)
+    db = client[database]
+    stats = db.command("collStats", "posts")
+
+    collection = db["posts"]
+    sample = random.Random(0).choices(ids, k=lookups)
+    for post_id in sample[:min(1000, lookups)]:  # 预热
+        collection.find_one(primary_key.id_filter(post_id))
+    latencies = []
+    for post_id in sample:
+        start = time.perf_counter()
+        collection.find_one(primary_key.id_filter(post_id))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    client.drop_database(database)
+    return {
+        "total_index_bytes": stats["totalIndexSize"],
+        "index_bytes": stats["indexSizes"],
+        "avg_document_bytes": stats.get("avgObjSize", 0),
+        "lookup_p50_ms": round(percentile(latencies, 50), 4),
+        "lookup_p95_ms": round(percentile(latencies, 95), 4),
+        "lookup_p99_ms": round(percentile(latencies, 99), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ObjectId vs binary UUID primary key benchmark for posts")
+    parser.add_argument("--mongodb-uri", default=os.getenv("MONGODB_TEST_URI"))
+    parser.add_argument("--database", default="artism_bench_primary_key")
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    if not args.mongodb_uri:
+        sys.exit("Index sizes need a real MongoDB: pass --mongodb-uri or set MONGODB_TEST_URI")
+
+    client = pymongo.MongoClient(args.mongodb_uri)
+    results = {
+        name: measure(client, f"{args.database}_{name}", uuid_mode, args.posts, args.lookups)
+        for name, uuid_mode in MODES.items()
+    }
+    client.close()
+
+    baseline, candidate = results["objectid"], results["uuid"]
+    print(f"{'mode':<10} {'index bytes':>12} {'doc bytes':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['total_index_bytes']:>12} {result['avg_document_bytes']:>10} "
+              f"{result['lookup_p50_ms']:>9} {result['lookup_p95_ms']:>9} {result['lookup_p99_ms']:>9}")
+    saved = baseline["total_index_bytes"] - candidate["total_index_bytes"]
+    print(f"\nIndex bytes saved: {saved} ({saved / baseline['total_index_bytes']:.1%})")
+    print(f"Lookup p50 change: {candidate['lookup_p50_ms'] - baseline['lookup_p50_ms']:+.4f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"posts": args.posts, "lookups": args.lookups, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
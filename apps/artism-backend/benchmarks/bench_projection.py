@@ -0,0 +1,93 @@
+"""
+列表投影配置的响应体积对比
+
+对艺术家、艺术品、艺术运动列表端点分别以 summary / card / full 投影配置请求同一页数据，
+比较响应字节数和请求耗时，输出相对 full 的体积缩减比例。
+
+数据写入进程内的 mongomock，不需要 MongoDB。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.bench_projection
+    python -m benchmarks.bench_projection --artists 500 --artworks 2000 --requests 50 --json result.json
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+
+from app.utils.data_generator import ArtMovementDataGenerator
+from app.utils.query_cache import query_cache
+from benchmarks.bench_serialization import seed
+
+
+ENDPOINTS = {
+    "artists": "/api/v1/artists/?pageSize=100&profile={profile}",
+    "artworks": "/api/v1/artworks/?pageSize=100&profile={profile}",
+    "art_movements": "/api/v1/art-movements/?pageSize=100&profile={profile}",
+}
+
+PROFILES = ("summary", "card", "full")
+
+
+def measure(client, path: str, requests: int) -> Dict[str, Any]:
+    """请求同一端点若干次（不经过查询缓存），统计响应体积和耗时"""
+    size = len(client.get(path).content)  # 预热
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        query_cache.reset_state()
+        client.get(path).raise_for_status()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "bytes": size,
+        "milliseconds_per_request": round(elapsed / requests * 1000, 3),
+    }
+
+
+def run(artist_count: int, artwork_count: int, requests: int) -> List[Dict[str, Any]]:
+    """写入数据并测量各端点、各投影配置"""
+    seed(artist_count, artwork_count)
+    from app.db.mongodb import get_database
+    get_database()["art_movements"].insert_many(ArtMovementDataGenerator.generate_movements()
+                                                + ArtMovementDataGenerator.generate_movements(fictional=True))
+
+    from app import create_app
+    client = TestClient(create_app())
+
+    results = []
+    for name, template in ENDPOINTS.items():
+        measured = {profile: measure(client, template.format(profile=profile), requests) for profile in PROFILES}
+        full_size = measured["full"]["bytes"]
+        for profile in PROFILES:
+            result = dict(measured[profile], endpoint=name, profile=profile)
+            result["reduction"] = round(1 - result["bytes"] / full_size, 3) if full_size else 0.0
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List projection profile payload benchmark")
+    parser.add_argument("--artists", type=int, default=300)
+    parser.add_argument("--artworks", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run(args.artists, args.artworks, args.requests)
+
+    print(f"{'endpoint':<14} {'profile':<8} {'bytes':>10} {'reduction':>10} {'ms/req':>10}")
+    for result in results:
+        print(f"{result['endpoint']:<14} {result['profile']:<8} {result['bytes']:>10} "
+              f"{result['reduction']:>10.1%} {result['milliseconds_per_request']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
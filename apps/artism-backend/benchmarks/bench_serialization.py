@@ -0,0 +1,168 @@
+"""
+API 响应序列化基准测试
+
+对比默认路径（response_model 校验 + jsonable_encoder + json.dumps）与
+FAST_JSON_RESPONSES 快速路径在艺术家、艺术品列表端点上的吞吐量（字节/秒）：
+
+- http：通过 TestClient 请求端点，包含查询时间；
+- encode：只对同一个服务层响应做序列化，排除数据库查询的影响。
+
+数据写入进程内的 mongomock，不需要 MongoDB。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --artists 500 --artworks 2000 --requests 200 --json result.json
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import mongomock
+
+import app.db.mongodb as mongodb
+from app.utils import json_response
+from app.utils.data_generator import ArtistDataGenerator, ArtworkDataGenerator
+
+
+ENDPOINTS = {
+    "artists": "/api/v1/artists/?pageSize=100",
+    "artworks": "/api/v1/artworks/?pageSize=100",
+}
+
+
+def seed(artist_count: int, artwork_count: int) -> None:
+    """向 mongomock 写入测试数据"""
+    mongodb._client = mongomock.MongoClient()
+    db = mongodb.get_database()
+
+    templates = (ArtistDataGenerator.generate_real_artists(5)
+                 + ArtistDataGenerator.generate_fictional_artists(10))
+    artists = []
+    for i in range(artist_count):
+        artist = dict(templates[i % len(templates)])
+        artist["id"] = ArtistDataGenerator.generate_id()
+        artist["name"] = f"{artist['name']} {i}"
+        artists.append(artist)
+    db["artists"].insert_many(artists)
+
+    artist_ids = [artist["id"] for artist in artists]
+    db["artworks"].insert_many(ArtworkDataGenerator.generate_artworks(artist_ids, count=artwork_count))
+
+
+def measure(client, path: str, requests: int) -> Dict[str, Any]:
+    """请求同一端点若干次，统计吞吐量"""
+    client.get(path)  # 预热
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path)
+        response.raise_for_status()
+        total_bytes += len(response.content)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "bytes": total_bytes,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(requests / elapsed, 1),
+        "megabytes_per_second": round(total_bytes / elapsed / 1e6, 3),
+    }
+
+
+def measure_encode(response, response_model, fast: bool, iterations: int) -> Dict[str, Any]:
+    """
+    只测量序列化
+
+    默认路径近似 FastAPI 的处理：按 response_model 校验，再经过 jsonable_encoder 和 json.dumps。
+    """
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    adapter = TypeAdapter(response_model)
+
+    def encode() -> bytes:
+        if fast:
+            return json_response.render_response(response, enabled=True).body
+        validated = adapter.validate_python(response.model_dump())
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False,
+                          allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    encode()  # 预热
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        total_bytes += len(encode())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": iterations,
+        "bytes": total_bytes,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(iterations / elapsed, 1),
+        "megabytes_per_second": round(total_bytes / elapsed / 1e6, 3),
+    }
+
+
+def run(artist_count: int, artwork_count: int, requests: int) -> List[Dict[str, Any]]:
+    """执行基准测试"""
+    from fastapi.testclient import TestClient
+    from app import create_app
+    from app.schemas.artist import Artist
+    from app.schemas.artwork import Artwork
+    from app.schemas.response import PaginatedResponse
+    from app.services.artist_service import ArtistService
+    from app.services.artwork_service import ArtworkService
+    from app.utils.query_params import QueryParams
+
+    seed(artist_count, artwork_count)
+    client = TestClient(create_app())
+
+    results = []
+    for name, path in ENDPOINTS.items():
+        for mode, enabled in (("default", False), ("fast", True)):
+            json_response.FAST_JSON_RESPONSES = enabled
+            result = measure(client, path, requests)
+            result.update({"endpoint": name, "mode": mode, "scope": "http"})
+            results.append(result)
+    json_response.FAST_JSON_RESPONSES = False
+
+    services = {
+        "artists": (ArtistService, PaginatedResponse[Artist]),
+        "artworks": (ArtworkService, PaginatedResponse[Artwork]),
+    }
+    for name, (service, response_model) in services.items():
+        response = service.get_all(QueryParams(pageSize=100))
+        for mode in ("default", "fast"):
+            result = measure_encode(response, response_model, mode == "fast", requests * 5)
+            result.update({"endpoint": name, "mode": mode, "scope": "encode"})
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API response serialization benchmark")
+    parser.add_argument("--artists", type=int, default=300)
+    parser.add_argument("--artworks", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run(args.artists, args.artworks, args.requests)
+
+    encoder = "orjson" if json_response.orjson is not None else "json"
+    print(f"fast path encoder: {encoder}")
+    print(f"{'scope':<8} {'endpoint':<10} {'mode':<8} {'req/s':>10} {'MB/s':>10}")
+    for result in results:
+        print(f"{result['scope']:<8} {result['endpoint']:<10} {result['mode']:<8} "
+              f"{result['requests_per_second']:>10} {result['megabytes_per_second']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"encoder": encoder, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
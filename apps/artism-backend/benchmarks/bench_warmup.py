@@ -0,0 +1,158 @@
+"""
+预热效果基准测试
+
+分别在冷启动和预热完成后，对新创建的应用发送前 N 个请求（默认 1000，按端点轮询），
+统计延迟的 p50 / p99 / 最大值以及第一个请求的延迟：
+
+- cold：清空所有进程内缓存后直接处理请求；
+- warm：先执行 warmup.run()（艺术家资料、风格向量索引、动态流、热门排行），再处理请求。
+
+数据写入进程内的 mongomock，不需要 MongoDB；连接建立的开销因此不在结果中。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.bench_warmup
+    python -m benchmarks.bench_warmup --requests 1000 --artworks 2000 --json result.json
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import mongomock
+
+import app.db.mongodb as mongodb
+from app.utils.data_generator import ArtistDataGenerator, ArtworkDataGenerator
+
+
+def seed(artist_count: int, artwork_count: int, post_count: int, comment_count: int) -> Dict[str, List[str]]:
+    """向 mongomock 写入测试数据"""
+    mongodb._client = mongomock.MongoClient()
+    db = mongodb.get_database()
+
+    templates = (ArtistDataGenerator.generate_real_artists(5)
+                 + ArtistDataGenerator.generate_fictional_artists(10))
+    artists = []
+    for i in range(artist_count):
+        artist = dict(templates[i % len(templates)])
+        artist["id"] = ArtistDataGenerator.generate_id()
+        artist["name"] = f"{artist['name']} {i}"
+        artists.append(artist)
+    db["artists"].insert_many(artists)
+    artist_ids = [artist["id"] for artist in artists]
+
+    artworks = ArtworkDataGenerator.generate_artworks(artist_ids, count=artwork_count)
+    db["artworks"].insert_many(artworks)
+
+    now = datetime.utcnow()
+    posts = [{
+        "id": f"post-{i}",
+        "title": f"Post {i}",
+        "content": "...",
+        "author_id": random.choice(artist_ids),
+        "likes_count": random.randint(0, 50),
+        "comments_count": random.randint(0, 10),
+        "views_count": random.randint(0, 500),
+        "created_at": (now - timedelta(minutes=i)).isoformat(),
+    } for i in range(post_count)]
+    db["posts"].insert_many(posts)
+
+    db["comments"].insert_many([{
+        "id": f"comment-{i}",
+        "content": "Nice work",
+        "author_id": random.choice(artist_ids),
+        "target_type": "post",
+        "target_id": random.choice(posts)["id"],
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(comment_count)])
+
+    return {"artworks": [artwork["id"] for artwork in artworks[:20]]}
+
+
+def reset_caches() -> None:
+    """清空所有进程内缓存，模拟新启动的 worker"""
+    from app.services.artist_service import ArtistService
+    from app.services.artwork_service import ArtworkService
+    from app.services.feed_service import FeedService
+    from app.services.trending_service import TrendingService
+    from app.utils.warmup import warmup
+
+    for service in (ArtistService, ArtworkService, FeedService, TrendingService):
+        service.reset_state()
+    warmup.reset_state()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(mode: str, requests: int, artwork_ids: List[str]) -> Dict[str, Any]:
+    """创建新应用并测量前 N 个请求的延迟"""
+    from fastapi.testclient import TestClient
+    from app import create_app
+    from app.utils.warmup import warmup
+
+    reset_caches()
+    client = TestClient(create_app())
+
+    warmup_ms = None
+    if mode == "warm":
+        started = time.perf_counter()
+        warmup.run()
+        warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    paths = [
+        "/api/v1/posts/?limit=20",
+        "/api/v1/posts/trending?limit=10",
+        "/api/v1/ai-comments/recent?limit=20",
+    ] + [f"/api/v1/artworks/{artwork_id}/similar?threshold=0.75&limit=10" for artwork_id in artwork_ids[:3]]
+
+    latencies = []
+    for i in range(requests):
+        path = paths[i % len(paths)]
+        started = time.perf_counter()
+        response = client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "warmup_ms": warmup_ms,
+        "first_ms": round(latencies[0], 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker warm-up latency benchmark")
+    parser.add_argument("--artists", type=int, default=300)
+    parser.add_argument("--artworks", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    ids = seed(args.artists, args.artworks, args.posts, args.comments)
+    results = [measure(mode, args.requests, ids["artworks"]) for mode in ("cold", "warm")]
+
+    print(f"{'mode':<6} {'warmup ms':>10} {'first ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for result in results:
+        print(f"{result['mode']:<6} {str(result['warmup_ms'] or '-'):>10} {result['first_ms']:>10} "
+              f"{result['p50_ms']:>10} {result['p99_ms']:>10} {result['max_ms']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
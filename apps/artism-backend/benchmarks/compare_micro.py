@@ -0,0 +1,99 @@
+"""
+微基准测试结果对比
+
+读取 pytest-benchmark 的 --benchmark-json 输出，与仓库中的基线
+benchmarks/baselines/micro_benchmarks.json 按中位数对比，变慢超过 --tolerance 的用例标记为回归，退出码为 1。
+基线只保存每个用例的中位数等少量字段，不包含机器信息。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m benchmarks.compare_micro micro.json
+    python -m benchmarks.compare_micro micro.json --tolerance 0.3
+    python -m benchmarks.compare_micro micro.json --update   # 用本次结果覆盖基线
+"""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro_benchmarks.json"
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    读取 pytest-benchmark 的 JSON 输出
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 用例名称 -> 中位数（纳秒）、每秒次数、轮数
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        bench["name"]: {
+            "median_ns": round(bench["stats"]["median"] * 1e9, 1),
+            "ops": round(bench["stats"]["ops"], 1),
+            "rounds": bench["stats"]["rounds"],
+        }
+        for bench in data["benchmarks"]
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """
+    按中位数对比
+
+    Returns:
+        List[str]: 回归描述，为空表示没有回归
+    """
+    regressions = []
+    for name, stats in sorted(results.items()):
+        base = baseline.get(name)
+        if base and stats["median_ns"] > base["median_ns"] * (1 + tolerance):
+            regressions.append(f"{name}: {base['median_ns']} ns -> {stats['median_ns']} ns")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare micro-benchmark results with the stored baseline")
+    parser.add_argument("results", help="pytest-benchmark --benchmark-json 输出文件")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的中位数变慢比例，默认 25%%")
+    parser.add_argument("--update", action="store_true", help="用本次结果覆盖基线")
+    args = parser.parse_args()
+
+    results = load_results(args.results)
+
+    if args.update:
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "benchmarks": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline updated: {args.baseline} ({len(results)} benchmarks)")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["benchmarks"]
+
+    print(f"{'benchmark':<48} {'baseline ns':>14} {'current ns':>14} {'change':>8}")
+    for name, stats in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>14} {stats['median_ns']:>14} {'new':>8}")
+            continue
+        change = stats["median_ns"] / base["median_ns"] - 1 if base["median_ns"] else 0.0
+        print(f"{name:<48} {base['median_ns']:>14} {stats['median_ns']:>14} {change:>+8.1%}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("REGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"no regressions (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
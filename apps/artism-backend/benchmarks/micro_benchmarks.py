@@ -0,0 +1,142 @@
+"""
+服务层热点路径微基准测试（pytest-benchmark）
+
+文件名不以 test_ 开头，默认的 pytest 运行不会收集，需要显式指定文件；未安装 pytest-benchmark 时整个模块跳过。
+
+用法（在 apps/artism-backend 目录下）：
+    python -m pytest benchmarks/micro_benchmarks.py --benchmark-only
+    # 生成结果并与仓库中的基线对比
+    python -m pytest benchmarks/micro_benchmarks.py --benchmark-only --benchmark-json=micro.json
+    python -m benchmarks.compare_micro micro.json
+    # 用本次结果更新基线
+    python -m benchmarks.compare_micro micro.json --update
+"""
+
+import copy
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.models.artist import Artist
+from app.models.artwork import Artwork
+from app.services.ai_comment_service import AICommentService
+from app.services.artist_service import ArtistService
+from app.services.base_service import BaseService
+from app.utils.data_generator import (
+    ArtistDataGenerator, ArtworkDataGenerator, ArtMovementDataGenerator, FullDatasetGenerator
+)
+from app.utils.query_params import QueryParams, QueryParamsParser
+
+# 固定随机种子，保证每次运行的数据相同
+SEED = 20240601
+
+# pedantic 模式（每轮需要新数据）的轮数
+ROUNDS = 50
+
+
+def _record(field_count: int, with_nan: bool = False):
+    record = {"_id": "ignored", "id": "a1", "name": "Ada", "bio": "..."}
+    for i in range(field_count):
+        record[f"field_{i}"] = float("nan") if with_nan and i % 10 == 0 else i
+    return record
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    random.seed(SEED)
+    yield
+    BaseService.reset_state()
+
+
+@pytest.mark.parametrize("dimensions", [16, 128, 1024])
+def test_calculate_style_similarity(benchmark, dimensions):
+    rng = random.Random(SEED)
+    first = [rng.random() for _ in range(dimensions)]
+    second = [rng.random() for _ in range(dimensions)]
+
+    score = benchmark(Artwork.calculate_style_similarity, first, second)
+
+    assert 0.0 <= score <= 1.0
+
+
+@pytest.mark.parametrize("scrub", [False, True], ids=["nan_free", "scrub"])
+@pytest.mark.parametrize("field_count", [10, 100])
+def test_process_record(benchmark, field_count, scrub):
+    # 直接设置 NaN 标记，避免访问数据库
+    BaseService._nan_flags[ArtistService.COLLECTION_NAME] = scrub
+    template = _record(field_count, with_nan=scrub)
+
+    result = benchmark.pedantic(ArtistService._process_record, setup=lambda: ((dict(template),), {}),
+                                rounds=ROUNDS * 10)
+
+    assert "_id" not in result
+
+
+@pytest.mark.parametrize("filters", ["empty", "search", "full"])
+def test_build_mongo_filter(benchmark, filters):
+    params = {
+        "empty": {},
+        "search": {"search": "monet"},
+        "full": {"search": "monet", "tags": "印象派,现代主义,抽象", "yearFrom": 1850, "yearTo": 1950,
+                 "isFictional": False},
+    }[filters]
+    query_params = QueryParams(**params)
+
+    benchmark(QueryParamsParser.build_mongo_filter, query_params)
+
+
+@pytest.mark.parametrize("field_count", [10, 100])
+def test_model_from_dict(benchmark, field_count):
+    template = _record(field_count)
+    template["created_at"] = "2024-01-01T00:00:00Z"
+
+    artist = benchmark.pedantic(Artist.from_dict, setup=lambda: ((dict(template),), {}), rounds=ROUNDS * 10)
+
+    assert artist.name == "Ada"
+
+
+@pytest.mark.parametrize("field_count", [10, 100])
+def test_model_to_dict(benchmark, field_count):
+    artist = Artist.from_dict(_record(field_count))
+
+    data = benchmark(artist.to_dict)
+
+    assert data["name"] == "Ada"
+
+
+@pytest.mark.parametrize("kind", ["classical", "fallback"])
+def test_get_artist_style(benchmark, kind):
+    # fallback 需要检查全部关键词，是最慢的路径
+    artist = {
+        "classical": {"name": "Leonardo da Vinci", "bio": "Renaissance polymath"},
+        "fallback": {"name": "Unknown Artist", "bio": "A painter from nowhere " * 20},
+    }[kind]
+
+    style = benchmark(AICommentService._get_artist_style, artist)
+
+    assert style == ("classical" if kind == "classical" else "modern")
+
+
+@pytest.mark.parametrize("length", [20, 200, 2000])
+def test_determine_sentiment(benchmark, length):
+    content = ("这幅作品的色彩运用令人赞叹，构图缺乏一些层次。" * (length // 20 + 1))[:length]
+
+    benchmark(AICommentService._determine_sentiment, content)
+
+
+@pytest.mark.parametrize("artist_count,artwork_count", [(10, 100), (50, 1000), (200, 5000)])
+def test_establish_relationships(benchmark, artist_count, artwork_count):
+    artists = [dict(artist, id=ArtistDataGenerator.generate_id())
+               for artist in (ArtistDataGenerator.generate_fictional_artists(10) * (artist_count // 10 + 1))]
+    artists = artists[:artist_count]
+    artworks = ArtworkDataGenerator.generate_artworks([a["id"] for a in artists], count=artwork_count)
+    for artwork in artworks:
+        artwork.pop("style_vector")
+    movements = ArtMovementDataGenerator.generate_movements()
+
+    def setup():
+        return (copy.deepcopy(artists), copy.deepcopy(artworks), copy.deepcopy(movements)), {}
+
+    benchmark.pedantic(FullDatasetGenerator._establish_relationships, setup=setup, rounds=5 if artwork_count > 1000 else 20)
@@ -1,7 +1,6 @@
 import uvicorn
 from app import create_app
 from app.core.config import HOST, PORT, BASE_URL
-from app.utils.startup import run_startup
 
 # 创建应用
 app = create_app()
@@ -15,10 +14,5 @@ print(f"- ReDoc: {BASE_URL}/api/redoc")
 print(f"{'='*50}\n")
 
 if __name__ == "__main__":
-    print("Running startup initialization...")
-    startup_success = run_startup()
-    if startup_success:
-        print(f"✅ Database initialized successfully")
-    else:
-        print(f"⚠️  Database initialization had issues")
+    # 数据库初始化在应用 lifespan 中于后台执行，进度见 /api/v1/database/startup-status
     uvicorn.run("main:app", host=HOST, port=PORT, reload=True)
\ No newline at end of file
@@ -51,6 +51,39 @@ def mock_db(mock_mongo_client):
             }
 
 
+def _reset_process_state():
+    """重置各服务的进程内状态（缓存、排行、点赞缓冲、启动与预热状态）"""
+    from app.services.artist_service import ArtistService
+    from app.services.artwork_service import ArtworkService
+    from app.services.feed_service import FeedService
+    from app.services.like_counter_service import LikeCounterService
+    from app.services.trending_service import TrendingService
+    from app.utils.startup import StartupState
+    from app.utils.warmup import warmup
+
+    for service in (ArtistService, ArtworkService, FeedService, LikeCounterService, TrendingService, StartupState):
+        service.reset_state()
+    warmup.reset_state()
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """
+    每个测试使用独立的 mongomock 数据库
+
+    替换 app.db.mongodb 的客户端，并在测试前后重置各服务的进程内状态。
+    测试模块通过 pytestmark = pytest.mark.usefixtures("mongo") 对所有测试启用。
+
+    Returns:
+        mongomock 数据库
+    """
+    import app.db.mongodb as mongodb
+    monkeypatch.setattr(mongodb, "_client", mongomock.MongoClient())
+    _reset_process_state()
+    yield mongodb.get_database()
+    _reset_process_state()
+
+
 @pytest.fixture(scope="session")
 def app():
     """创建测试应用"""
@@ -0,0 +1,80 @@
+"""
+按 ID 批量获取测试
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.artist_service import ArtistService
+from app.services.art_movement_service import ArtMovementService
+from app.utils.query_cache import query_cache
+
+
+@pytest.fixture(autouse=True)
+def artists(mongo):
+    """准备三位艺术家"""
+    for artist_id, name in (("a1", "Ada"), ("a2", "Grace"), ("a3", "Hedy")):
+        ArtistService.create({"id": artist_id, "name": name, "nationality": "UK"})
+
+
+class TestGetMany:
+    """BaseService.get_many"""
+
+    def test_request_order_and_missing(self):
+        """结果按请求顺序返回，重复 ID 只返回一次，不存在的 ID 单独列出"""
+        result = ArtistService.get_many(["a3", "missing", "a1", "a3"]).data
+
+        assert [record["id"] for record in result["records"]] == ["a3", "a1"]
+        assert result["missing"] == ["missing"]
+        assert "_id" not in result["records"][0]
+
+    def test_fields_projection(self):
+        """限定字段时只返回这些字段和 id"""
+        result = ArtistService.get_many(["a1"], fields=["name"]).data
+
+        assert result["records"] == [{"id": "a1", "name": "Ada"}]
+
+    def test_fields_limited_to_schema(self, mongo):
+        """默认只返回响应模型的字段，fields 中响应模型之外的字段忽略"""
+        from app.db.mongodb import get_collection
+        get_collection("artists").update_one({"id": "a1"}, {"$set": {"secret_internal": "token"}})
+
+        assert "secret_internal" not in ArtistService.get_many(["a1"]).data["records"][0]
+        assert ArtistService.get_many(["a1"], fields=["name", "secret_internal"]).data["records"] == [
+            {"id": "a1", "name": "Ada"}]
+        assert ArtistService.get_many(["a1"], fields=["secret_internal"]).data["records"] == [{"id": "a1"}]
+
+    def test_cached_until_write(self):
+        """结果经过查询缓存，集合写入后失效"""
+        ArtistService.get_many(["a1", "a2"])
+        ArtistService.get_many(["a1", "a2"])
+        assert query_cache.stats()["hits"] == 1
+
+        ArtistService.update("a1", {"name": "Ada L."})
+        assert ArtistService.get_many(["a1", "a2"]).data["records"][0]["name"] == "Ada L."
+        assert ArtistService.get_many(["a1", "a2"], use_cache=False).data["records"][0]["name"] == "Ada L."
+
+    def test_too_many_ids(self, monkeypatch):
+        """超过上限时拒绝"""
+        import app.services.base_service as base_service
+        monkeypatch.setattr(base_service, "BATCH_GET_MAX_IDS", 2)
+
+        assert ArtistService.get_many(["a1", "a2", "a3"]).code == 400
+
+
+class TestBatchEndpoints:
+    """批量端点"""
+
+    def test_artists_and_movements(self):
+        """POST /batch 返回记录和缺失的 ID"""
+        from app import create_app
+        client = TestClient(create_app())
+        ArtMovementService.create({"id": "m1", "name": "Cubism"})
+
+        artists = client.post("/api/v1/artists/batch", json={"ids": ["a2", "x", "a1"], "fields": ["name"]}).json()
+        movements = client.post("/api/v1/art-movements/batch", json={"ids": ["m1"]}).json()
+
+        assert artists["data"] == {"records": [{"id": "a2", "name": "Grace"}, {"id": "a1", "name": "Ada"}],
+                                   "missing": ["x"]}
+        assert movements["data"]["records"][0]["name"] == "Cubism"
+        assert client.post("/api/v1/artworks/batch", json={"ids": []}).json()["data"] == {"records": [], "missing": []}
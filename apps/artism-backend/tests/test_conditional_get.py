@@ -0,0 +1,133 @@
+"""
+ETag 与条件请求测试
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.artist_service import ArtistService
+from app.services.art_movement_service import ArtMovementService
+from app.utils.collection_versions import CollectionVersions
+
+
+@pytest.fixture
+def client(mongo):
+    """使用独立 mongomock 数据库的应用"""
+    from app import create_app
+    return TestClient(create_app())
+
+
+class TestCollectionVersions:
+    """集合版本号"""
+
+    def test_bumped_on_writes(self, client):
+        """BaseService 的每次写入都递增版本号"""
+        assert CollectionVersions.get("artists") == 0
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        ArtistService.update("a1", {"name": "Grace"})
+        ArtistService.delete("a1")
+        ArtistService.update("missing", {"name": "x"})
+
+        assert CollectionVersions.get("artists") == 3
+
+    def test_relation_updates_touch_record(self, client):
+        """关联字段的更新刷新 updated_at 并递增版本号，未变化时不计入"""
+        ArtMovementService.create({"id": "m1", "name": "Cubism"})
+        stamp = ArtMovementService.get_record_stamp("m1")
+        # updated_at 在数据库中精确到毫秒
+        time.sleep(0.002)
+
+        assert ArtMovementService.add_artist_to_movement("m1", "a1")
+        assert not ArtMovementService.add_artist_to_movement("m1", "a1")
+
+        assert ArtMovementService.get_record_stamp("m1") != stamp
+        assert CollectionVersions.get("art_movements") == 2
+
+    def test_cached_in_process(self, client, mongo):
+        """默认在进程内短暂缓存版本号；本进程的写入立即可见，其他 worker 的写入在缓存过期后可见"""
+        from app.core.config import COLLECTION_META_COLLECTION
+        CollectionVersions.get("artists")
+        mongo[COLLECTION_META_COLLECTION].update_one({"_id": "artists"}, {"$inc": {"version": 5}}, upsert=True)
+        assert CollectionVersions.get("artists") == 0
+
+        assert CollectionVersions.bump("artists") == 6
+        assert CollectionVersions.get("artists") == 6
+
+        # 让缓存过期
+        CollectionVersions._cache["artists"] = (time.monotonic() - 60, 6)
+        mongo[COLLECTION_META_COLLECTION].update_one({"_id": "artists"}, {"$inc": {"version": 1}})
+        assert CollectionVersions.get("artists") == 7
+
+
+class TestConditionalGet:
+    """条件请求"""
+
+    def test_detail_not_modified(self, client):
+        """详情 ETag 命中返回 304，记录更新后失效"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+
+        first = client.get("/api/v1/artists/a1")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        assert "max-age" in first.headers["cache-control"]
+
+        cached = client.get("/api/v1/artists/a1", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        ArtistService.update("a1", {"name": "Grace"})
+        changed = client.get("/api/v1/artists/a1", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["data"]["name"] == "Grace"
+        assert changed.headers["etag"] != etag
+
+    def test_list_checked_without_query(self, client, monkeypatch):
+        """列表 ETag 由版本号判断，命中时不执行查询"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        first = client.get("/api/v1/artists/?pageSize=5")
+        etag = first.headers["etag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("query should not run")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(ArtistService, "get_all", fail)
+            cached = client.get("/api/v1/artists/?pageSize=5", headers={"If-None-Match": f'"other", {etag}'})
+        assert cached.status_code == 304
+
+        # 查询参数不同或集合发生写入时 ETag 不同
+        assert client.get("/api/v1/artists/?pageSize=6").headers["etag"] != etag
+        ArtistService.create({"id": "a2", "name": "Grace"})
+        assert client.get("/api/v1/artists/?pageSize=5", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_missing_record_has_no_etag(self, client):
+        """不存在的记录不返回 ETag"""
+        response = client.get("/api/v1/artworks/missing", headers={"If-None-Match": "*"})
+
+        assert response.status_code != 304
+        assert "etag" not in response.headers
+
+    def test_reset_invalidates_list(self, client):
+        """重置数据库后旧 ETag 失效，列表不再返回已删除的记录"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        etag = client.get("/api/v1/artists/").headers["etag"]
+
+        assert client.delete("/api/v1/database/reset").status_code == 200
+        response = client.get("/api/v1/artists/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["data"] == []
+        assert response.json()["total"] == 0
+
+    def test_migration_invalidates_list(self, client):
+        """直接改写集合的迁移递增版本号"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        etag = client.get("/api/v1/artists/").headers["etag"]
+
+        from app.utils.database_setup import DatabaseMigration
+        DatabaseMigration.add_timestamps()
+
+        assert client.get("/api/v1/artists/", headers={"If-None-Match": etag}).status_code == 200
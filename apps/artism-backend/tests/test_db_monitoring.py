@@ -0,0 +1,100 @@
+"""
+数据库命令监听测试
+
+mongomock 不会触发命令事件，这里直接构造 pymongo 的命令事件
+"""
+
+from datetime import timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo import monitoring
+
+from app.db.monitoring import CommandMonitor, command_shape, normalize_shape
+from app.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+ADDRESS = ("localhost", 27017)
+
+
+def _run(listener, command, duration_ms=1.0, request_id=1, failed=False):
+    """模拟一次命令的开始和结束事件"""
+    listener.started(monitoring.CommandStartedEvent(command, "artism", request_id, ADDRESS, request_id))
+    command_name = next(iter(command))
+    duration = timedelta(milliseconds=duration_ms)
+    if failed:
+        listener.failed(monitoring.CommandFailedEvent(
+            duration, {"ok": 0}, command_name, request_id, ADDRESS, request_id, database_name="artism"))
+    else:
+        listener.succeeded(monitoring.CommandSucceededEvent(
+            duration, {"ok": 1}, command_name, request_id, ADDRESS, request_id, database_name="artism"))
+
+
+class TestQueryShape:
+    """查询结构归一化"""
+
+    def test_values_replaced(self):
+        """值替换为占位符，字段和操作符保留"""
+        shape = normalize_shape({"author_id": "a1", "likes": {"$gte": 5}, "tags": {"$in": ["x", "y", "z"]},
+                                 "$or": [{"a": 1}, {"b": 2}]})
+        assert shape == {"author_id": "?", "likes": {"$gte": "?"}, "tags": {"$in": ["?"]},
+                         "$or": [{"a": "?"}, {"b": "?"}]}
+
+    def test_command_shapes(self):
+        """按命令类型提取查询条件"""
+        assert command_shape("find", {"find": "posts", "filter": {"id": "p1"}, "sort": {"created_at": -1}}) == {
+            "filter": {"id": "?"}, "sort": {"created_at": -1}}
+        assert command_shape("update", {"update": "posts", "updates": [{"q": {"id": "p1"}, "u": {}}]}) == {
+            "q": {"id": "?"}}
+        assert command_shape("insert", {"insert": "posts", "documents": [{"id": "p1"}]}) == {}
+
+
+class TestCommandMonitor:
+    """命令统计与慢查询日志"""
+
+    def test_counts_by_command_and_collection(self):
+        """按命令和集合统计次数、失败数和耗时"""
+        listener = CommandMonitor(slow_query_ms=1000)
+        _run(listener, {"find": "posts", "filter": {}}, 2.0, request_id=1)
+        _run(listener, {"find": "posts", "filter": {}}, 4.0, request_id=2)
+        _run(listener, {"insert": "comments", "documents": []}, 1.0, request_id=3, failed=True)
+        _run(listener, {"hello": 1}, request_id=4)
+
+        stats = {(item["command"], item["collection"]): item for item in listener.snapshot()}
+
+        assert set(stats) == {("find", "posts"), ("insert", "comments")}
+        assert stats[("find", "posts")]["count"] == 2
+        assert stats[("find", "posts")]["max_ms"] == 4.0
+        assert stats[("insert", "comments")]["failures"] == 1
+        assert listener.slow_queries() == []
+        assert 'mongodb_command_duration_seconds_count{command="find",collection="posts"} 2' in \
+            listener.render_prometheus()
+
+    def test_slow_log(self, caplog):
+        """超过阈值的命令记录归一化的查询结构"""
+        listener = CommandMonitor(slow_query_ms=50)
+        _run(listener, {"find": "artworks", "filter": {"artist_id": "secret"}}, 120.0)
+
+        slow = listener.slow_queries()
+        assert len(slow) == 1
+        assert slow[0]["collection"] == "artworks"
+        assert slow[0]["shape"] == {"filter": {"artist_id": "?"}}
+        assert "secret" not in caplog.text
+        assert "Slow MongoDB command find" in caplog.text
+
+    def test_round_trips_header(self):
+        """请求内的命令数写入指标和调试响应头"""
+        listener = CommandMonitor()
+        registry = MetricsRegistry()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, registry=registry, round_trips_header=True)
+
+        @app.get("/items")
+        def items():
+            for request_id in range(3):
+                _run(listener, {"find": "items", "filter": {}}, request_id=request_id)
+            return []
+
+        response = TestClient(app).get("/items")
+
+        assert response.headers["x-db-round-trips"] == "3"
+        assert registry.snapshot()["counts"][("GET", "/items", "db_round_trips")] == [3, 1]
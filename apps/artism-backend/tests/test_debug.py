@@ -0,0 +1,103 @@
+"""
+诊断端点测试
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.debug as debug
+from app.utils.profiling import SamplingProfiler, memory_tracer
+
+HEADERS = {"X-Debug-Token": "secret"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """挂载诊断路由并配置令牌"""
+    monkeypatch.setattr(debug, "DEBUG_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(debug.router, prefix="/debug")
+    yield TestClient(app)
+    debug.profiler.stop()
+    memory_tracer.stop()
+
+
+def _busy_loop(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(100))
+
+
+class TestSamplingProfiler:
+    """采样分析器"""
+
+    def test_collapsed_stacks(self):
+        """输出 collapsed stack 格式，包含被采样线程的调用栈"""
+        profiler = SamplingProfiler()
+        assert profiler.start(0.3, 0.005)
+        assert not profiler.start(0.3, 0.005)
+        _busy_loop(0.3)
+        assert profiler.wait(timeout=5)
+
+        lines = profiler.collapsed().splitlines()
+        assert profiler.status()["samples"] > 0
+        assert any("_busy_loop (test_debug.py:" in line for line in lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1 and ";" in stack
+
+
+class TestDebugEndpoints:
+    """诊断端点"""
+
+    def test_disabled_by_default(self, mongo):
+        """默认不挂载诊断路由"""
+        from app import create_app
+
+        assert TestClient(create_app()).get("/debug/tasks", headers=HEADERS).status_code == 404
+
+    def test_token_required(self, client, monkeypatch):
+        """令牌错误或未配置时拒绝"""
+        assert client.get("/debug/tasks").status_code == 403
+        assert client.get("/debug/tasks", headers={"X-Debug-Token": "wrong"}).status_code == 403
+        monkeypatch.setattr(debug, "DEBUG_TOKEN", "")
+        assert client.get("/debug/tasks", headers={"X-Debug-Token": ""}).status_code == 403
+
+    def test_profile_flow(self, client):
+        """开始、等待结束后获取采样结果"""
+        started = client.post("/debug/profile/start?seconds=0.2&interval_ms=5", headers=HEADERS)
+        assert started.status_code == 200
+        assert client.post("/debug/profile/start?seconds=0.2", headers=HEADERS).status_code == 409
+        assert client.post("/debug/profile/start?seconds=100000", headers=HEADERS).status_code == 400
+
+        assert debug.profiler.wait(timeout=5)
+        response = client.get("/debug/profile", headers=HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert int(response.headers["x-profile-samples"]) > 0
+        assert response.text.strip()
+
+    def test_tracemalloc_diff(self, client):
+        """第二次快照报告相对基线的增长"""
+        assert client.post("/debug/tracemalloc/snapshot", headers=HEADERS).status_code == 409
+        client.post("/debug/tracemalloc/start", headers=HEADERS)
+        first = client.post("/debug/tracemalloc/snapshot", headers=HEADERS).json()["data"]
+        leak = [bytearray(1024) for _ in range(1000)]
+        second = client.post("/debug/tracemalloc/snapshot", headers=HEADERS).json()["data"]
+
+        assert first["since_baseline"] is None
+        growth = sum(item["size_diff_bytes"] for item in second["since_baseline"])
+        assert growth >= 1000 * 1024
+        assert any("test_debug.py" in item["location"] for item in second["since_baseline"])
+        del leak
+
+    def test_task_dump(self, client):
+        """导出 asyncio 任务和线程调用栈"""
+        data = client.get("/debug/tasks", headers=HEADERS).json()["data"]
+
+        assert data["task_count"] >= 1
+        assert all("stack" in task for task in data["tasks"])
+        assert any("MainThread" in name for name in data["threads"])
@@ -0,0 +1,127 @@
+"""
+事件总线与评论实时推送测试
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.utils.event_bus import EventBus
+from app.schemas.comment import CommentCreate
+
+
+class TestEventBus:
+    """进程内事件总线"""
+
+    def test_publish_delivers_to_matching_topics(self):
+        """只有订阅了对应主题的订阅者会收到事件"""
+        bus = EventBus()
+
+        async def run():
+            all_sub, _, _ = bus.subscribe(["comments"])
+            post_sub, _, _ = bus.subscribe(["comments:post:p1"])
+            bus.publish("comment.created", {"n": 1}, topics=("comments", "comments:post:p1"))
+            bus.publish("comment.created", {"n": 2}, topics=("comments", "comments:post:p2"))
+            all_events = [await all_sub.get(timeout=0.1), await all_sub.get(timeout=0.1)]
+            post_events = [await post_sub.get(timeout=0.1), await post_sub.get(timeout=0.05)]
+            return all_events, post_events
+
+        all_events, post_events = asyncio.run(run())
+        assert [e.data["n"] for e in all_events] == [1, 2]
+        assert post_events[0].data["n"] == 1
+        assert post_events[1] is None
+
+    def test_resume_replays_missed_events(self):
+        """携带 last_event_id 订阅时回放遗漏的事件"""
+        bus = EventBus(replay_size=10)
+        first = bus.publish("comment.created", {"n": 1}, topics=("comments",))
+        bus.publish("comment.created", {"n": 2}, topics=("comments",))
+        bus.publish("comment.created", {"n": 3}, topics=("comments",))
+
+        async def run():
+            return bus.subscribe(["comments"], last_event_id=first.id)
+
+        _, replay, gap = asyncio.run(run())
+        assert [e.data["n"] for e in replay] == [2, 3]
+        assert gap is False
+
+    def test_gap_when_replay_buffer_exhausted(self):
+        """回放缓冲区已覆盖不到的事件标记为缺口"""
+        bus = EventBus(replay_size=2)
+        for n in range(5):
+            bus.publish("comment.created", {"n": n}, topics=("comments",))
+
+        async def run():
+            return bus.subscribe(["comments"], last_event_id=1), bus.subscribe(["comments"], last_event_id=99)
+
+        (_, replay, gap), (_, _, restart_gap) = asyncio.run(run())
+        assert [e.data["n"] for e in replay] == [3, 4]
+        assert gap is True
+        assert restart_gap is True
+
+    def test_publish_from_worker_thread(self):
+        """在线程池中发布的事件会投递到订阅者的事件循环"""
+        bus = EventBus()
+
+        async def run():
+            sub, _, _ = bus.subscribe(["comments"])
+            worker = threading.Thread(target=bus.publish, args=("comment.created", {"n": 1}, ("comments",)))
+            worker.start()
+            worker.join()
+            return await sub.get(timeout=0.5)
+
+        event = asyncio.run(run())
+        assert event is not None and event.data["n"] == 1
+
+
+class _FakeRequest:
+    """可手动断开的请求"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+class TestCommentStream:
+    """评论写入与 SSE 推送"""
+
+    pytestmark = pytest.mark.usefixtures("mongo")
+
+    def test_create_comment_is_streamed(self, monkeypatch):
+        """create_comment 发布的事件通过 SSE 生成器推送给按目标订阅的客户端"""
+        from app.api.v1.endpoints import ai_comments
+        from app.services.comment_service import CommentService
+
+        bus = EventBus()
+        monkeypatch.setattr("app.services.comment_service.event_bus", bus)
+        monkeypatch.setattr(ai_comments, "event_bus", bus)
+
+        async def run():
+            request = _FakeRequest()
+            topic = CommentService.target_topic("post", "post-1")
+            stream = ai_comments._comment_event_stream(request, topic, heartbeat=0.05)
+            messages = [await stream.__anext__()]
+            CommentService.create_comment(CommentCreate(
+                content="Lovely light", author_id="artist-1", target_type="post", target_id="post-1"
+            ))
+            CommentService.create_comment(CommentCreate(
+                content="Elsewhere", author_id="artist-1", target_type="post", target_id="post-2"
+            ))
+            messages.append(await stream.__anext__())
+            messages.append(await stream.__anext__())
+            request.disconnected = True
+            await stream.aclose()
+            return messages
+
+        messages = asyncio.run(run())
+        assert messages[0].startswith("retry:")
+        assert "event: comment.created" in messages[1]
+        payload = json.loads(messages[1].split("data: ", 1)[1])
+        assert payload["content"] == "Lovely light"
+        assert payload["author_name"] == "AI Artist artist-1"
+        assert messages[2] == ": keep-alive\n\n"
+        assert bus.subscriber_count == 0
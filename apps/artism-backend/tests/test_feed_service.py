@@ -0,0 +1,161 @@
+"""
+首页动态流测试
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas.post import PostCreate
+from app.services.feed_service import FeedService
+from app.services.post_service import PostService
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+def _create_artist(client, artist_id="artist-1", name="Ada Lovelace"):
+    from app.db.mongodb import get_collection
+    get_collection("artists").insert_one({"id": artist_id, "name": name, "avatar_url": "https://example.com/a.png"})
+
+
+class TestFeedService:
+    """物化时间线"""
+
+    def test_create_post_denormalizes_author(self, mongo):
+        """创建帖子时冗余保存作者信息"""
+        _create_artist(mongo)
+        PostService.create_post(PostCreate(title="Hello", content="World", author_id="artist-1"))
+
+        posts = PostService.get_recent_posts(limit=10)
+
+        assert len(posts) == 1
+        assert posts[0]["author_name"] == "Ada Lovelace"
+        assert posts[0]["author_username"] == "ada_lovelace"
+        assert posts[0]["timestamp_display"] == "Just now"
+        assert "feed_key" not in posts[0]
+
+    def test_cursor_pagination(self, mongo):
+        """游标分页按时间倒序返回且不重复"""
+        for i in range(5):
+            PostService.create_post(PostCreate(title=f"Post {i}", content="...", author_id="artist-1"))
+
+        first = PostService.get_feed_page(limit=2)
+        second = PostService.get_feed_page(limit=2, cursor=first["next_cursor"])
+        third = PostService.get_feed_page(limit=2, cursor=second["next_cursor"])
+
+        posts = [p for page in (first, second, third) for p in page["posts"]]
+        assert sorted(p["title"] for p in posts) == [f"Post {i}" for i in range(5)]
+        created = [FeedService.to_datetime(p["created_at"]) for p in posts]
+        assert created == sorted(created, reverse=True)
+        assert third["next_cursor"] is None
+
+    def test_counters_are_mirrored(self, mongo):
+        """点赞、评论计数同步到动态流"""
+        post = PostService.create_post(PostCreate(title="Count me", content="...", author_id="artist-1"))
+        PostService.increment_likes(post["id"])
+        PostService.increment_comments(post["id"])
+
+        feed_post = PostService.get_recent_posts(limit=1)[0]
+        assert feed_post["likes_count"] == 1
+        assert feed_post["comments_count"] == 1
+
+    def test_author_update_fans_out(self, mongo):
+        """作者改名后扇出到动态流"""
+        _create_artist(mongo)
+        PostService.create_post(PostCreate(title="Hello", content="World", author_id="artist-1"))
+
+        from app.db.mongodb import get_collection
+        get_collection("artists").update_one({"id": "artist-1"}, {"$set": {"name": "Grace Hopper"}})
+        updated = FeedService.update_author("artist-1")
+
+        assert updated == 1
+        assert PostService.get_recent_posts(limit=1)[0]["author_name"] == "Grace Hopper"
+
+    def test_backfill_from_posts(self, mongo):
+        """动态流为空时从 posts 集合回填（兼容 datetime 与字符串时间）"""
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow()
+        get_collection("posts").insert_many([
+            {"id": "old", "title": "Old", "content": "...", "author_id": "a", "created_at": (now - timedelta(days=2)).isoformat()},
+            {"id": "new", "title": "New", "content": "...", "author_id": "a", "created_at": now},
+        ])
+
+        posts = PostService.get_recent_posts(limit=10)
+
+        assert [p["id"] for p in posts] == ["new", "old"]
+        assert posts[1]["timestamp_display"] == "2 days ago"
+
+    def test_trim_keeps_newest_entries(self, mongo):
+        """裁剪后只保留最新的条目"""
+        for i in range(5):
+            PostService.create_post(PostCreate(title=f"Post {i}", content="...", author_id="artist-1"))
+
+        newest = PostService.get_recent_posts(limit=3)
+
+        assert FeedService.trim(max_entries=3) == 2
+        assert FeedService.get_collection().count_documents({}) == 3
+        assert PostService.get_recent_posts(limit=3) == newest
+
+    def test_pages_past_trimmed_window_read_posts(self, mongo):
+        """游标或偏移超出裁剪后的动态流时，从 posts 集合继续读取更早的帖子"""
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow().replace(microsecond=0)
+        get_collection("posts").insert_many([
+            {"id": f"p{i}", "title": f"Post {i}", "content": "...", "author_id": "artist-1",
+             "created_at": now - timedelta(minutes=i)}
+            for i in range(5)
+        ])
+        _create_artist(mongo)
+        FeedService.rebuild()
+        FeedService.trim(max_entries=3)
+
+        pages, cursor = [], None
+        for _ in range(3):
+            page = PostService.get_feed_page(limit=2, cursor=cursor)
+            pages.append(page)
+            cursor = page["next_cursor"]
+
+        assert [p["id"] for page in pages for p in page["posts"]] == [f"p{i}" for i in range(5)]
+        assert pages[-1]["next_cursor"] is None
+        assert pages[-1]["posts"][0]["author_name"] == "Ada Lovelace"
+        assert [p["id"] for p in PostService.get_feed_page(limit=10, skip=2)["posts"]] == ["p2", "p3", "p4"]
+        assert [p["id"] for p in PostService.get_feed_page(limit=10, skip=4)["posts"]] == ["p4"]
+
+    def test_posts_sharing_a_millisecond_are_not_skipped(self, mongo):
+        """超出动态流后，与游标同一毫秒的帖子按 (created_at, id) 继续翻页，不跳过也不重复"""
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow().replace(microsecond=0)
+        get_collection("posts").insert_many(
+            [{"id": f"p{i}", "title": f"Post {i}", "content": "...", "author_id": "a", "created_at": now}
+             for i in range(5)]
+            + [{"id": "older", "title": "Older", "content": "...", "author_id": "a",
+                "created_at": now - timedelta(minutes=1)}]
+        )
+        FeedService.rebuild()
+        FeedService.trim(max_entries=1)
+
+        ids, cursor = [], None
+        while True:
+            page = PostService.get_feed_page(limit=2, cursor=cursor)
+            ids.extend(p["id"] for p in page["posts"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert ids == ["p4", "p3", "p2", "p1", "p0", "older"]
+
+    def test_backfill_when_feed_is_behind_posts(self, mongo):
+        """动态流非空但落后于 posts 集合时也会回填"""
+        from app.db.mongodb import get_collection
+        PostService.create_post(PostCreate(title="Via service", content="...", author_id="a"))
+        FeedService.reset_state()
+        get_collection("posts").insert_one(
+            {"id": "imported", "title": "Imported", "content": "...", "author_id": "a",
+             "created_at": datetime.utcnow() - timedelta(hours=1)}
+        )
+
+        posts = PostService.get_recent_posts(limit=10)
+
+        assert {p["id"] for p in posts} >= {"imported"}
+        assert len(posts) == 2
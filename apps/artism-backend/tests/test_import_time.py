@@ -0,0 +1,69 @@
+"""
+应用导入时间测试
+
+用 python -X importtime 在子进程中导入应用，确认 pandas 不会在启动时加载。
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动时不应加载的重量级模块（只在 CSV 导入导出时按需加载）
+LAZY_MODULES = ("pandas",)
+
+
+def _import_times(code: str) -> Dict[str, int]:
+    """
+    在子进程中执行代码，返回顶层模块的累计导入时间（微秒）
+
+    Args:
+        code: 要执行的 Python 代码
+
+    Returns:
+        Dict[str, int]: 模块名 -> 累计导入时间
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # 表头
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime:
+    """启动导入开销"""
+
+    def test_app_startup_does_not_import_pandas(self):
+        """创建应用和加载启动脚本时不导入 pandas"""
+        times = _import_times("from app import create_app; create_app(); import app.utils.startup")
+
+        assert "app" in times
+        for module in LAZY_MODULES:
+            assert module not in times, f"{module} imported at startup ({times[module] / 1000:.0f} ms)"
+
+    def test_csv_handler_loads_pandas_on_demand(self):
+        """CSV 读取时才加载 pandas"""
+        code = (
+            "import sys\n"
+            "from app.utils.csv_handler import CSVHandler\n"
+            "assert 'pandas' not in sys.modules\n"
+            "import io\n"
+            "CSVHandler.read_csv(io.StringIO('id,name\\n1,Ada\\n'))\n"
+            "assert 'pandas' in sys.modules\n"
+        )
+        times = _import_times(code)
+
+        assert "pandas" in times
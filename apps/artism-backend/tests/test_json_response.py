@@ -0,0 +1,65 @@
+"""
+快速 JSON 响应测试
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.utils import json_response
+from app.utils.data_generator import ArtistDataGenerator
+
+
+class TestFastJSONResponse:
+    """编码与端点输出"""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_native_types(self, monkeypatch, use_orjson):
+        """datetime 与 ObjectId 直接编码（orjson 与标准库回退结果一致）"""
+        if not use_orjson:
+            monkeypatch.setattr(json_response, "orjson", None)
+        oid = ObjectId()
+
+        encoded = json_response.dumps({"at": datetime(2024, 5, 1, 12, 30), "oid": oid, "name": "莫奈"})
+
+        assert json.loads(encoded) == {"at": "2024-05-01T12:30:00", "oid": str(oid), "name": "莫奈"}
+
+    def test_fast_path_matches_default_output(self, mongo, monkeypatch):
+        """快速路径与默认路径的列表输出一致"""
+        mongo["artists"].insert_many(ArtistDataGenerator.generate_real_artists(5))
+
+        from app import create_app
+        client = TestClient(create_app())
+
+        def fetch(enabled):
+            monkeypatch.setattr(json_response, "FAST_JSON_RESPONSES", enabled)
+            body = client.get("/api/v1/artists/?pageSize=5").json()
+            body.pop("timestamp")
+            return body
+
+        default, fast = fetch(False), fetch(True)
+        assert fast == default
+        assert len(fast["data"]) == 5
+
+    def test_fast_path_omits_fields_outside_schema(self, mongo, monkeypatch):
+        """文档中响应模型之外的字段在快速路径下同样不会输出（列表、详情和 fields 参数）"""
+        mongo["artists"].insert_one({"id": "a1", "name": "Ada", "secret_internal": "token"})
+
+        from app import create_app
+        client = TestClient(create_app())
+
+        def fetch(enabled):
+            monkeypatch.setattr(json_response, "FAST_JSON_RESPONSES", enabled)
+            bodies = [client.get(path).json() for path in (
+                "/api/v1/artists/?profile=full", "/api/v1/artists/a1", "/api/v1/artists/?fields=id,name,secret_internal")]
+            for body in bodies:
+                body.pop("timestamp", None)
+            return bodies
+
+        default, fast = fetch(False), fetch(True)
+        assert fast == default
+        assert "secret_internal" not in json.dumps(fast)
+        assert fast[2]["data"] == [{"id": "a1", "name": "Ada"}]
@@ -0,0 +1,124 @@
+"""
+点赞计数缓冲测试
+"""
+
+import pytest
+
+from app.schemas.post import PostCreate
+from app.services import like_counter_service
+from app.services.like_counter_service import LikeCounterService
+from app.services.post_service import PostService
+
+
+@pytest.fixture(autouse=True)
+def no_flusher(mongo, monkeypatch):
+    """不启动后台刷新线程"""
+    monkeypatch.setattr(LikeCounterService, "_ensure_flusher", classmethod(lambda cls: None))
+
+
+def _stored_likes(post_id):
+    from app.db.mongodb import get_collection
+    return get_collection("posts").find_one({"id": post_id})["likes_count"]
+
+
+class TestLikeCounterService:
+    """缓冲与批量写入"""
+
+    def test_likes_are_buffered_until_flush(self):
+        """点赞先进入缓冲区，读取时叠加，刷新后一次写入"""
+        post = PostService.create_post(PostCreate(title="Viral", content="...", author_id="artist-1"))
+        for _ in range(50):
+            assert PostService.increment_likes(post["id"]) is True
+
+        assert _stored_likes(post["id"]) == 0
+        assert PostService.get_recent_posts(limit=1)[0]["likes_count"] == 50
+
+        assert LikeCounterService.flush() == 50
+        assert _stored_likes(post["id"]) == 50
+        assert PostService.get_recent_posts(limit=1)[0]["likes_count"] == 50
+
+    def test_unknown_post_is_rejected(self):
+        """不存在的帖子返回 False"""
+        assert PostService.increment_likes("missing") is False
+
+    def test_failed_flush_keeps_likes(self, monkeypatch):
+        """写入失败时点赞保留在缓冲区"""
+        post = PostService.create_post(PostCreate(title="Retry", content="...", author_id="artist-1"))
+        PostService.increment_likes(post["id"])
+
+        def fail(cls, batch):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(LikeCounterService, "_write", classmethod(fail))
+        assert LikeCounterService.flush() == 0
+        assert LikeCounterService.get_unflushed_counts([post["id"]]) == {post["id"]: 1}
+
+    def test_shutdown_flushes_pending_likes(self):
+        """关闭时写入剩余的点赞"""
+        post = PostService.create_post(PostCreate(title="Bye", content="...", author_id="artist-1"))
+        PostService.increment_likes(post["id"])
+
+        LikeCounterService.shutdown()
+
+        assert _stored_likes(post["id"]) == 1
+
+    def test_sharded_counters_are_summed(self, monkeypatch):
+        """启用分片时增量写入分片，读取时求和"""
+        monkeypatch.setattr(like_counter_service, "LIKE_COUNTER_SHARDS", 4)
+        post = PostService.create_post(PostCreate(title="Hot", content="...", author_id="artist-1"))
+        for _ in range(3):
+            PostService.increment_likes(post["id"])
+            LikeCounterService.flush()
+        PostService.increment_likes(post["id"])
+
+        assert _stored_likes(post["id"]) == 0
+        assert LikeCounterService.get_unflushed_counts([post["id"]]) == {post["id"]: 4}
+        assert PostService.get_post_stats().total_likes == 4
+
+    def test_failed_feed_write_is_not_retried(self, monkeypatch):
+        """动态流同步失败时不重复计入帖子的点赞数"""
+        post = PostService.create_post(PostCreate(title="Feed", content="...", author_id="artist-1"))
+        PostService.increment_likes(post["id"])
+
+        original = like_counter_service.get_collection
+
+        class FailingFeed:
+            def bulk_write(self, *args, **kwargs):
+                raise RuntimeError("feed unavailable")
+
+        monkeypatch.setattr(like_counter_service, "get_collection",
+                            lambda name: FailingFeed() if name == "post_feed" else original(name))
+        assert LikeCounterService.flush() == 1
+        assert LikeCounterService.flush() == 0
+
+        assert _stored_likes(post["id"]) == 1
+        assert LikeCounterService.get_unflushed_counts([post["id"]]) == {}
+
+    def test_partial_bulk_write_requeues_failed_operations(self, monkeypatch):
+        """批量写入部分失败时只放回失败的操作"""
+        from pymongo.errors import BulkWriteError
+        first = PostService.create_post(PostCreate(title="One", content="...", author_id="artist-1"))
+        second = PostService.create_post(PostCreate(title="Two", content="...", author_id="artist-1"))
+        PostService.increment_likes(first["id"])
+        PostService.increment_likes(second["id"])
+        PostService.increment_likes(second["id"])
+
+        original = like_counter_service.get_collection
+
+        class PartiallyFailingPosts:
+            def __init__(self, collection):
+                self._collection = collection
+
+            def bulk_write(self, operations, **kwargs):
+                self._collection.bulk_write(operations[:1], **kwargs)
+                raise BulkWriteError({"writeErrors": [{"index": 1, "code": 1, "errmsg": "boom"}]})
+
+        with monkeypatch.context() as patch:
+            patch.setattr(like_counter_service, "get_collection",
+                          lambda name: PartiallyFailingPosts(original(name)) if name == "posts" else original(name))
+            assert LikeCounterService.flush() == 1
+
+        assert _stored_likes(first["id"]) == 1
+        assert LikeCounterService.get_unflushed_counts([first["id"], second["id"]]) == {second["id"]: 2}
+        assert LikeCounterService.flush() == 2
+        assert _stored_likes(first["id"]) == 1 and _stored_likes(second["id"]) == 2
@@ -0,0 +1,237 @@
+"""
+LLM 生成后端测试
+使用本地桩后端与桩服务器，不访问外部网络
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.llm_backend import (
+    StubLLMBackend, OpenAICompatibleBackend, LLMBackendError, LLMTransientError
+)
+
+
+class FlakyStubBackend(StubLLMBackend):
+    """前 N 次调用失败的桩后端"""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    async def _complete_batch(self, prompts, options):
+        if self.failures > 0:
+            self.failures -= 1
+            raise LLMTransientError("temporary failure")
+        return await super()._complete_batch(prompts, options)
+
+    async def _stream_tokens(self, prompt, options):
+        if self.failures > 0:
+            self.failures -= 1
+            raise LLMTransientError("temporary failure")
+        async for token in super()._stream_tokens(prompt, options):
+            yield token
+
+
+class TestLLMBackend:
+    """生成后端核心行为"""
+
+    def test_batching_groups_concurrent_prompts(self):
+        """并发提示词在合批窗口内合并为一次调用"""
+        backend = StubLLMBackend(latency=0.01, batch_size=8, batch_window_ms=20)
+        prompts = [f"prompt {i}" for i in range(8)]
+
+        results = asyncio.run(backend.generate_many(prompts))
+
+        assert results == [StubLLMBackend.render(p) for p in prompts]
+        assert backend.calls == 1
+        assert backend.stats["batched_prompts"] == 8
+
+    def test_cache_hits_skip_backend(self):
+        """相同提示词命中缓存，不再调用后端"""
+        backend = StubLLMBackend(latency=0.0, batch_window_ms=0)
+
+        async def run():
+            first = await backend.generate("hello")
+            second = await backend.generate("hello")
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert backend.calls == 1
+        assert backend.stats["cache_hits"] == 1
+
+    def test_cancelled_caller_does_not_cancel_shared_result(self):
+        """发起请求的调用被取消后，共享同一结果的调用仍拿到结果，且只调用一次后端"""
+        backend = StubLLMBackend(latency=0.02, batch_window_ms=0)
+
+        async def run():
+            leader = asyncio.ensure_future(backend.generate("hello"))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(backend.generate("hello"))
+            await asyncio.sleep(0)
+            leader.cancel()
+            text = await follower
+            late = await backend.generate("hello")
+            return text, late, backend._inflight, backend._batch_tasks
+
+        text, late, inflight, batch_tasks = asyncio.run(run())
+        assert text == late == StubLLMBackend.render("hello")
+        assert backend.calls == 1
+        assert inflight == {} and batch_tasks == set()
+
+    def test_cache_expires_after_ttl(self):
+        """缓存条目在 TTL 之后失效"""
+        backend = StubLLMBackend(latency=0.0, batch_window_ms=0, cache_ttl=0.01)
+
+        async def run():
+            await backend.generate("hello")
+            await asyncio.sleep(0.02)
+            await backend.generate("hello")
+
+        asyncio.run(run())
+        assert backend.calls == 2
+
+    def test_concurrency_is_bounded(self):
+        """同时进行的批次数不超过并发上限"""
+        backend = StubLLMBackend(latency=0.05, max_concurrency=2, batch_size=1, batch_window_ms=0, cache_ttl=0)
+
+        start = time.perf_counter()
+        asyncio.run(backend.generate_many([f"p{i}" for i in range(4)]))
+        elapsed = time.perf_counter() - start
+
+        # 4 个批次、并发 2，至少需要两轮延迟
+        assert elapsed >= 0.1
+        assert backend.calls == 4
+
+    def test_retries_transient_errors(self):
+        """瞬时错误按退避策略重试"""
+        backend = FlakyStubBackend(failures=2, latency=0.0, batch_window_ms=0, retry_backoff=0.001)
+
+        result = asyncio.run(backend.generate("retry me"))
+
+        assert result == StubLLMBackend.render("retry me")
+        assert backend.stats["retries"] == 2
+
+    def test_gives_up_after_max_retries(self):
+        """超过重试次数后抛出错误"""
+        backend = FlakyStubBackend(failures=5, latency=0.0, batch_window_ms=0, max_retries=1, retry_backoff=0.001)
+
+        with pytest.raises(LLMBackendError):
+            asyncio.run(backend.generate("never"))
+
+    def test_stream_yields_tokens(self):
+        """流式输出拼接后与完整生成一致"""
+        backend = StubLLMBackend(latency=0.0)
+
+        async def run():
+            return [token async for token in backend.stream("stream me")]
+
+        tokens = asyncio.run(run())
+        assert len(tokens) > 1
+        assert "".join(tokens) == StubLLMBackend.render("stream me")
+
+    def test_stream_retries_before_first_token(self):
+        """流式输出在第一个 token 之前的瞬时错误和超时按退避策略重试"""
+        backend = FlakyStubBackend(failures=1, latency=0.0, retry_backoff=0.001)
+
+        async def run():
+            return [token async for token in backend.stream("stream me")]
+
+        assert "".join(asyncio.run(run())) == StubLLMBackend.render("stream me")
+        assert backend.stats["retries"] == 1
+
+        slow = StubLLMBackend(latency=0.05, request_timeout=0.01, max_retries=1, retry_backoff=0.001)
+        with pytest.raises(LLMBackendError):
+            asyncio.run(slow.stream("too slow").__anext__())
+        assert slow.calls == 2
+
+    def test_stream_interact_falls_back_to_template(self):
+        """流式生成失败且尚未输出内容时回退到模板回复"""
+        from app.services.ai_service import AIService
+        from app.services.llm_backend import set_llm_backend
+
+        set_llm_backend(FlakyStubBackend(failures=5, latency=0.0, max_retries=1, retry_backoff=0.001))
+
+        async def run():
+            return [token async for token in AIService.stream_interact("hello")]
+
+        try:
+            tokens = asyncio.run(run())
+        finally:
+            set_llm_backend(None)
+        assert len(tokens) == 1
+        assert tokens[0] and not tokens[0].startswith("[stub:")
+
+
+class TestStubServer:
+    """OpenAI 兼容后端与本地桩服务器"""
+
+    def _backend(self):
+        import httpx
+        from app.services.llm_stub_server import create_stub_server_app
+
+        stub_app = create_stub_server_app(latency=0.0)
+        transport = httpx.ASGITransport(app=stub_app)
+        backend = OpenAICompatibleBackend(
+            base_url="http://stub/v1", api_key="", transport=transport, batch_window_ms=5
+        )
+        return backend, stub_app
+
+    def test_batched_completion(self):
+        """多个提示词通过一次 HTTP 请求完成"""
+        backend, stub_app = self._backend()
+        prompts = ["a", "b", "c"]
+
+        async def run():
+            try:
+                return await backend.generate_many(prompts)
+            finally:
+                await backend.aclose()
+
+        results = asyncio.run(run())
+        assert results == [StubLLMBackend.render(p) for p in prompts]
+        assert stub_app.state.requests == 1
+
+    def test_streaming_completion(self):
+        """SSE 流式输出"""
+        backend, _ = self._backend()
+
+        async def run():
+            try:
+                return [token async for token in backend.stream("hello stream")]
+            finally:
+                await backend.aclose()
+
+        tokens = asyncio.run(run())
+        assert "".join(tokens) == StubLLMBackend.render("hello stream")
+
+    def test_streaming_retries_server_errors(self):
+        """流式请求的 5xx 响应视为瞬时错误重试"""
+        import httpx
+        from app.services.llm_stub_server import create_stub_server_app
+
+        asgi = httpx.ASGITransport(app=create_stub_server_app(latency=0.0))
+        statuses = []
+
+        async def handler(request):
+            if not statuses:
+                statuses.append(503)
+                return httpx.Response(503)
+            statuses.append(200)
+            return await asgi.handle_async_request(request)
+
+        backend = OpenAICompatibleBackend(
+            base_url="http://stub/v1", api_key="", transport=httpx.MockTransport(handler), retry_backoff=0.001
+        )
+
+        async def run():
+            try:
+                return [token async for token in backend.stream("hello stream")]
+            finally:
+                await backend.aclose()
+
+        tokens = asyncio.run(run())
+        assert "".join(tokens) == StubLLMBackend.render("hello stream")
+        assert statuses == [503, 200]
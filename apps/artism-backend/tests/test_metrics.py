@@ -0,0 +1,95 @@
+"""
+请求指标测试
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.metrics import MetricsMiddleware, MetricsRegistry, metrics, phase, record_phase
+
+
+def _app(registry):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: str):
+        # 同步端点在线程池中执行，阶段耗时仍应计入当前请求
+        record_phase("db", 0.002)
+        with phase("serialize"):
+            pass
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+class TestMetricsRegistry:
+    """指标存储与导出"""
+
+    def test_histogram_buckets(self):
+        """按桶累计计数并导出 Prometheus 文本"""
+        registry = MetricsRegistry(buckets=[0.01, 0.1])
+        for seconds in (0.005, 0.05, 0.5):
+            registry.request_started("GET")
+            registry.request_finished("GET", "/x", 200, seconds)
+
+        text = registry.render_prometheus()
+
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.01"} 1' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.1"} 2' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"} 3' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/x"} 3' in text
+        assert 'http_requests_total{method="GET",route="/x",status="200"} 3' in text
+        assert 'http_requests_in_flight{method="GET"} 0' in text
+
+    def test_phase_outside_request_is_noop(self):
+        """不在请求中时记录阶段不报错"""
+        record_phase("db", 1.0)
+        with phase("serialize"):
+            pass
+
+
+class TestMetricsMiddleware:
+    """ASGI 中间件"""
+
+    def test_route_template_and_phases(self):
+        """按路由模板聚合，阶段耗时通过上下文变量汇总"""
+        registry = MetricsRegistry()
+        client = TestClient(_app(registry))
+
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        data = registry.snapshot()
+        assert data["status"][("GET", "/items/{item_id}", 200)] == 2
+        assert data["status"][("GET", "<unmatched>", 404)] == 1
+        total, count = data["phases"][("GET", "/items/{item_id}", "db")]
+        assert count == 2 and total == pytest.approx(0.004)
+        assert ("GET", "/items/{item_id}", "serialize") in data["phases"]
+
+    def test_unhandled_error_counts_as_500(self):
+        """未处理的异常记录为 500"""
+        registry = MetricsRegistry()
+        client = TestClient(_app(registry), raise_server_exceptions=False)
+
+        assert client.get("/boom").status_code == 500
+        assert registry.snapshot()["status"][("GET", "/boom", 500)] == 1
+
+    def test_metrics_endpoint(self, mongo):
+        """应用在 /metrics 导出指标"""
+        from app import create_app
+
+        metrics.reset()
+        client = TestClient(create_app())
+        client.get("/api/v1/posts/some-post")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/api/v1/posts/{post_id}"' in response.text
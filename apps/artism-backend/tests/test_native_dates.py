@@ -0,0 +1,110 @@
+"""
+评论和帖子时间戳存储为 BSON 日期的测试
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas.comment import CommentCreate
+from app.schemas.post import PostCreate
+from app.services.auto_comment_service import AutoCommentService
+from app.services.comment_service import CommentService
+from app.services.post_service import PostService
+from app.utils.database_setup import DatabaseMigration
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+class TestWrites:
+    """写入"""
+
+    def test_comments_and_posts_store_dates(self, mongo):
+        """新建的评论、帖子和动态流条目以 datetime 保存时间戳"""
+        post = PostService.create_post(PostCreate(title="Post", content="Body", author_id="a1"))
+        comment = CommentService.create_comment(CommentCreate(
+            content="Nice", author_id="a2", target_type="post", target_id=post["id"]))
+
+        for collection, record_id in (("posts", post["id"]), ("post_feed", post["id"]), ("comments", comment["id"])):
+            document = mongo[collection].find_one({"id": record_id})
+            assert isinstance(document["created_at"], datetime)
+            assert isinstance(document["updated_at"], datetime)
+
+    def test_responses_encode_iso(self, mongo):
+        """响应中的时间戳编码为 ISO 字符串"""
+        from app import create_app
+        from app.api.v1.endpoints.ai_comments import _format_sse
+        from app.utils.event_bus import Event
+
+        post = PostService.create_post(PostCreate(title="Post", content="Body", author_id="a1"))
+        created_at = mongo["posts"].find_one({"id": post["id"]})["created_at"]
+
+        body = TestClient(create_app()).get(f"/api/v1/posts/{post['id']}").json()
+        sse = _format_sse(Event(id=1, event="comment.created", data={"created_at": created_at}, topics=frozenset()))
+
+        assert created_at.isoformat() in str(body)
+        assert f'"created_at":"{created_at.isoformat()}"' in sse
+
+    def test_should_generate_comment_accepts_dates(self, monkeypatch):
+        """自动评论按 datetime 或旧的 ISO 字符串判断帖子年龄"""
+        monkeypatch.setattr("app.services.auto_comment_service.random.random", lambda: 0.0)
+        recent = datetime.utcnow() - timedelta(hours=1)
+        old = datetime.utcnow() - timedelta(hours=30)
+
+        def should(created_at):
+            return asyncio.run(AutoCommentService._should_generate_comment({"created_at": created_at}))
+
+        assert should(recent) is True
+        assert should(recent.isoformat() + "Z") is True
+        assert should(old) is False
+
+
+class TestMigration:
+    """时间戳迁移"""
+
+    def test_converts_strings_in_batches(self, mongo):
+        """按批转换所有字符串时间戳，已是日期的文档和无法解析的值保持不变"""
+        now = datetime.utcnow().replace(microsecond=0)
+        mongo["comments"].insert_many([
+            {"id": f"c{index}", "created_at": (now - timedelta(minutes=index)).isoformat(),
+             "updated_at": now.isoformat() + "Z"}
+            for index in range(5)
+        ])
+        mongo["comments"].insert_one({"id": "native", "created_at": now, "updated_at": now})
+        mongo["posts"].insert_one({"id": "bad", "created_at": "yesterday", "updated_at": now.isoformat()})
+
+        assert DatabaseMigration.convert_timestamps_to_dates(batch_size=2) == 6
+
+        first = mongo["comments"].find_one({"id": "c1"})
+        assert first["created_at"] == now - timedelta(minutes=1)
+        assert first["updated_at"] == now
+        assert mongo["comments"].count_documents({"created_at": {"$type": "string"}}) == 0
+        bad = mongo["posts"].find_one({"id": "bad"})
+        assert bad["created_at"] == "yesterday" and bad["updated_at"] == now
+        assert DatabaseMigration.convert_timestamps_to_dates(batch_size=2) == 0
+
+    def test_resumes_after_interruption(self, mongo, monkeypatch):
+        """中途失败后再次执行，只处理剩余的文档"""
+        from pymongo.errors import BulkWriteError
+        mongo["comments"].insert_many([{"id": f"c{index}", "created_at": "2024-01-01T00:00:00"} for index in range(4)])
+
+        collection_class = type(mongo["comments"])
+        original = collection_class.bulk_write
+        calls = []
+
+        def failing_bulk_write(self, requests, **kwargs):
+            calls.append(len(requests))
+            if len(calls) == 2:
+                raise BulkWriteError({"writeErrors": []})
+            return original(self, requests, **kwargs)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(collection_class, "bulk_write", failing_bulk_write)
+            with pytest.raises(BulkWriteError):
+                DatabaseMigration.convert_timestamps_to_dates(batch_size=2)
+
+        assert mongo["comments"].count_documents({"created_at": {"$type": "string"}}) == 2
+        assert DatabaseMigration.convert_timestamps_to_dates(batch_size=2) == 2
@@ -0,0 +1,81 @@
+"""
+列表投影配置测试
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.artist_service import ArtistService
+from app.services.artwork_service import ArtworkService
+from app.utils.query_params import QueryParams
+
+
+@pytest.fixture(autouse=True)
+def records(mongo):
+    """准备一位艺术家及其作品"""
+    ArtistService.create({"id": "a1", "name": "Ada", "bio": "long text " * 50, "nationality": "UK",
+                          "agent": {"enabled": True}, "associated_movements": ["m1"]})
+    ArtworkService.create({"id": "w1", "title": "Work", "artist_id": "a1", "description": "long text",
+                           "style_vector": [0.1] * 64, "movement_ids": ["m1"]})
+
+
+class TestProfiles:
+    """投影配置"""
+
+    def test_list_defaults_to_card(self):
+        """列表默认排除大字段，详情返回完整记录"""
+        artist = ArtistService.get_all().data[0]
+        artwork = ArtworkService.get_all().data[0]
+
+        assert "bio" not in artist and "agent" not in artist
+        assert artist["associated_movements"] == ["m1"]
+        assert "style_vector" not in artwork and "description" not in artwork
+        assert "bio" in ArtistService.get_by_id("a1").data
+
+    def test_summary_and_full(self):
+        """summary 只含展示字段，full 返回完整记录"""
+        summary = ArtistService.get_all(QueryParams(profile="summary")).data[0]
+        full = ArtistService.get_all(QueryParams(profile="full")).data[0]
+
+        assert set(summary) == {"id", "name", "nationality"}
+        assert "bio" in full and "agent" in full
+
+    def test_fields_override_profile(self):
+        """指定 fields 时投影配置不生效"""
+        artist = ArtistService.get_all(QueryParams(fields="id,bio", profile="summary")).data[0]
+
+        assert set(artist) == {"id", "bio"}
+
+    def test_specialised_methods(self):
+        """专用列表方法同样使用投影配置"""
+        assert "style_vector" not in ArtworkService.get_artworks_by_artist("a1")[0]
+        assert "style_vector" in ArtworkService.get_artworks_by_artist("a1", profile="full")[0]
+        assert set(ArtistService.search_artists("Ada", profile="summary")[0]) == {"id", "name", "nationality"}
+
+    def test_include_with_summary(self):
+        """summary 不含关联字段时仍能填充 include"""
+        artist = ArtistService.get_all(QueryParams(profile="summary", include="associatedMovements")).data[0]
+
+        assert "associated_movements" not in artist
+        assert artist["included"] == {"associatedMovements": []}
+
+    def test_unknown_profile(self):
+        """未知的配置名称被拒绝"""
+        with pytest.raises(ValueError):
+            ArtistService.projection_for("tiny")
+
+
+class TestEndpoints:
+    """端点"""
+
+    def test_response_model_keeps_projection(self):
+        """响应模型不为未读取的字段补默认值"""
+        from app import create_app
+        client = TestClient(create_app())
+
+        artist = client.get("/api/v1/artists/?profile=summary").json()["data"][0]
+        artwork = client.get("/api/v1/artworks/artist/a1?profile=summary").json()["data"][0]
+
+        assert set(artist) == {"id", "name", "nationality"}
+        assert "style_vector" not in artwork
+        assert client.get("/api/v1/artists/?profile=tiny").status_code == 422
@@ -0,0 +1,163 @@
+"""
+查询结果缓存测试
+"""
+
+import os
+
+import pymongo
+import pytest
+
+from app.services.artist_service import ArtistService
+from app.utils.query_cache import QueryCache, query_cache
+from app.utils.query_params import QueryParams, QueryParamsParser
+
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI")
+TEST_DATABASE = "artism_query_cache_test"
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """统计实际执行的列表查询"""
+    executed = []
+    original = ArtistService._query_all.__func__
+
+    def counting(cls, params=None):
+        executed.append(params)
+        return original(cls, params)
+
+    monkeypatch.setattr(ArtistService, "_query_all", classmethod(counting))
+    return executed
+
+
+class TestCacheKey:
+    """规范化的缓存键"""
+
+    def test_equivalent_params_share_key(self):
+        """标签和字段顺序、重复项以及未排序时的排序方向不影响键"""
+        first = QueryParams(tags="b,a,a", fields="name, id", order="desc")
+        second = QueryParams(tags="a,b", fields="id,name", order="asc")
+
+        assert QueryParamsParser.build_cache_key(first) == QueryParamsParser.build_cache_key(second)
+        assert QueryParamsParser.build_cache_key(None) == QueryParamsParser.build_cache_key(QueryParams())
+
+    def test_distinct_params_differ(self):
+        """影响结果的参数得到不同的键"""
+        base = QueryParamsParser.build_cache_key(QueryParams(sortBy="name"))
+
+        assert QueryParamsParser.build_cache_key(QueryParams(sortBy="name", order="desc")) != base
+        assert QueryParamsParser.build_cache_key(QueryParams(sortBy="name", page=2)) != base
+
+
+class TestGetAllCache:
+    """BaseService.get_all 缓存"""
+
+    def test_hit_and_invalidation_on_write(self, queries):
+        """重复查询命中缓存，写入后立即失效"""
+        ArtistService.create({"id": "a1", "name": "Ada", "tags": ["x"]})
+
+        assert ArtistService.get_all(QueryParams(tags="x,y")).total == 1
+        assert ArtistService.get_all(QueryParams(tags="y,x")).total == 1
+        assert len(queries) == 1
+
+        ArtistService.create({"id": "a2", "name": "Grace", "tags": ["y"]})
+        assert ArtistService.get_all(QueryParams(tags="x,y")).total == 2
+        assert len(queries) == 2
+
+        stats = query_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["invalidations"] == 1
+        assert stats["entries"] == 1
+
+    def test_metrics_exported(self):
+        """命中情况和占用字节数在 /metrics 导出"""
+        from fastapi.testclient import TestClient
+        from app import create_app
+
+        ArtistService.get_all()
+        ArtistService.get_all()
+        text = TestClient(create_app()).get("/metrics").text
+
+        assert 'query_cache_requests_total{result="hit"} 1' in text
+        assert "query_cache_bytes " in text
+
+
+class TestQueryCache:
+    """缓存本身"""
+
+    def test_byte_bound_evicts_least_recent(self):
+        """超出字节上限时淘汰最久未使用的条目"""
+        cache = QueryCache(max_bytes=250, ttl=60, stale=0, enabled=True)
+        value = "x" * 100
+
+        cache.get_or_compute(["c"], "a", lambda: value)
+        cache.get_or_compute(["c"], "b", lambda: value)
+        cache.get_or_compute(["c"], "a", lambda: value)
+        cache.get_or_compute(["c"], "c", lambda: value)
+
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= 250
+        assert cache.get_or_compute(["c"], "a", lambda: "fresh") == value
+        assert cache.get_or_compute(["c"], "b", lambda: "fresh") == "fresh"
+
+    def test_oversized_result_not_cached(self):
+        """单个结果超过上限时不缓存"""
+        cache = QueryCache(max_bytes=10, ttl=60, stale=0, enabled=True)
+
+        cache.get_or_compute(["c"], "a", lambda: "x" * 100)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_stale_while_revalidate(self, monkeypatch):
+        """过期条目先返回旧值，同时在后台刷新一次"""
+        import app.utils.query_cache as module
+        refreshes = []
+        monkeypatch.setattr(module, "run_in_background", lambda func, *args: refreshes.append((func, args)))
+        cache = QueryCache(max_bytes=1000, ttl=0, stale=60, enabled=True)
+
+        cache.get_or_compute(["c"], "a", lambda: "old")
+        assert cache.get_or_compute(["c"], "a", lambda: "new") == "old"
+        assert cache.get_or_compute(["c"], "a", lambda: "new") == "old"
+        assert len(refreshes) == 1
+
+        func, args = refreshes[0]
+        func(*args)
+        cache.ttl = 60
+        assert cache.get_or_compute(["c"], "a", lambda: "newer") == "new"
+        assert cache.stats()["stale_hits"] == 2
+
+
+@pytest.mark.skipif(not MONGODB_TEST_URI, reason="MONGODB_TEST_URI not set")
+class TestCacheHitRoundTrips:
+    """缓存命中的数据库往返（mongomock 不触发命令事件，需要真实的 MongoDB）"""
+
+    @pytest.fixture
+    def commands(self, monkeypatch):
+        """连接测试库，通过命令监听器统计实际发出的命令"""
+        import app.db.mongodb as mongodb
+        from app.db.monitoring import command_listener
+
+        client = pymongo.MongoClient(MONGODB_TEST_URI, event_listeners=[command_listener])
+        client.drop_database(TEST_DATABASE)
+        monkeypatch.setattr(mongodb, "_client", client)
+        monkeypatch.setattr(mongodb, "DATABASE_NAME", TEST_DATABASE)
+        monkeypatch.setattr(command_listener, "enabled", True)
+        ArtistService.reset_state()
+        yield command_listener
+
+        ArtistService.reset_state()
+        client.drop_database(TEST_DATABASE)
+        client.close()
+
+    def test_hit_issues_no_commands(self, commands):
+        """版本号缓存有效期内，命中缓存的列表查询不发出任何 MongoDB 命令"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        params = QueryParams(sortBy="name")
+        first = ArtistService.get_all(params)
+        commands.reset()
+
+        assert ArtistService.get_all(params).data == first.data
+        assert commands.snapshot() == []
@@ -0,0 +1,144 @@
+"""
+评论和帖子查询计划测试
+
+TestDeclaredIndexes 在 mongomock 上检查索引声明；TestQueryPlans 需要真实的 MongoDB，
+通过 MONGODB_TEST_URI 指定（例如 mongodb://localhost:27017），在独立的测试库中执行服务层的每种查询，
+再对记录下的查询执行 explain()，任何一种查询走 COLLSCAN 即失败。
+"""
+
+import os
+
+import pymongo
+import pytest
+
+from app.core.config import POSTS_COLLECTION
+from app.schemas.comment import CommentCreate, CommentUpdate
+from app.schemas.post import PostCreate, PostUpdate
+from app.services.artist_service import ArtistService
+from app.services.comment_service import CommentService
+from app.services.post_service import PostService
+from app.utils.database_setup import DatabaseSetup, INTERACTION_INDEXES
+
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI")
+TEST_DATABASE = "artism_query_plans_test"
+
+
+class RecordingCollection:
+    """记录服务层查询的集合代理：find 记录游标，其余方法记录过滤条件"""
+
+    def __init__(self, collection, recorded):
+        self._collection = collection
+        self._recorded = recorded
+
+    def find(self, *args, **kwargs):
+        cursor = self._collection.find(*args, **kwargs)
+        self._recorded.append((self._collection.name, cursor))
+        return cursor
+
+    def _record_filter(self, name):
+        def call(filter, *args, **kwargs):
+            if filter:
+                self._recorded.append((self._collection.name, filter))
+            return getattr(self._collection, name)(filter, *args, **kwargs)
+        return call
+
+    def __getattr__(self, name):
+        if name in ("find_one", "update_one", "delete_one", "count_documents"):
+            return self._record_filter(name)
+        return getattr(self._collection, name)
+
+
+def plan_stages(plan):
+    """递归收集 explain 结果中的所有 stage 名称"""
+    if isinstance(plan, dict):
+        stages = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+        return stages
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in plan_stages(item)]
+    return []
+
+
+class TestDeclaredIndexes:
+    """索引声明"""
+
+    def test_create_indexes_covers_interaction_collections(self, mongo):
+        """create_indexes 为评论、评论线程和帖子集合创建声明的索引"""
+        DatabaseSetup.create_indexes()
+
+        for collection_name, indexes in INTERACTION_INDEXES.items():
+            created = [list(info["key"]) for info in mongo[collection_name].index_information().values()]
+            for index in indexes:
+                assert list(index.document["key"].items()) in created
+        assert set(INTERACTION_INDEXES) == {"comments", "comment_threads", POSTS_COLLECTION}
+
+
+@pytest.mark.skipif(not MONGODB_TEST_URI, reason="MONGODB_TEST_URI not set")
+class TestQueryPlans:
+    """服务层查询在真实 MongoDB 上都走索引"""
+
+    @pytest.fixture
+    def recorded(self, monkeypatch):
+        """连接测试库、创建索引，并记录评论和帖子服务的查询"""
+        import app.db.mongodb as mongodb
+        import app.services.comment_service as comment_service
+        import app.services.post_service as post_service
+
+        client = pymongo.MongoClient(MONGODB_TEST_URI)
+        client.drop_database(TEST_DATABASE)
+        monkeypatch.setattr(mongodb, "_client", client)
+        monkeypatch.setattr(mongodb, "DATABASE_NAME", TEST_DATABASE)
+        ArtistService.reset_state()
+        DatabaseSetup.create_indexes()
+
+        records = []
+        for module in (comment_service, post_service):
+            monkeypatch.setattr(module, "get_collection",
+                                lambda name: RecordingCollection(mongodb.get_collection(name), records))
+        yield records
+
+        ArtistService.reset_state()
+        client.drop_database(TEST_DATABASE)
+        client.close()
+
+    def run_service_queries(self):
+        """执行评论和帖子服务的每种读写查询"""
+        post = PostService.create_post(PostCreate(title="Post", content="Body", author_id="a1"))
+        PostService.get_post_by_id(post["id"])
+        PostService.update_post(post["id"], PostUpdate(title="Renamed"))
+        PostService.increment_comments(post["id"])
+
+        comment = CommentService.create_comment(CommentCreate(
+            content="Nice", author_id="a2", target_type="post", target_id=post["id"]))
+        CommentService.create_comment(CommentCreate(
+            content="Reply", author_id="a1", target_type="post", target_id=post["id"],
+            parent_comment_id=comment["id"]))
+        CommentService.get_comment_by_id(comment["id"])
+        CommentService.get_comments_by_target("post", post["id"])
+        CommentService.get_comments_with_replies("post", post["id"])
+        CommentService.get_comment_replies(comment["id"])
+        CommentService.get_recent_comments()
+        CommentService.get_comment_stats()
+        CommentService.update_comment(comment["id"], CommentUpdate(content="Edited"))
+
+        CommentService.delete_comment(comment["id"])
+        PostService.delete_post(post["id"])
+
+    def test_no_collection_scans(self, recorded):
+        """每种查询形状的执行计划都不包含 COLLSCAN"""
+        self.run_service_queries()
+
+        from app.db.mongodb import get_collection
+        assert recorded
+        scans = []
+        for collection_name, query in recorded:
+            if isinstance(query, dict):
+                plan = get_collection(collection_name).find(query).limit(1).explain()
+            else:
+                plan = query.clone().explain()
+            if "COLLSCAN" in plan_stages(plan["queryPlanner"]["winningPlan"]):
+                scans.append((collection_name, plan["queryPlanner"].get("parsedQuery")))
+
+        assert scans == []
@@ -0,0 +1,69 @@
+"""
+记录批量处理测试
+"""
+
+import pytest
+
+from app.services.artist_service import ArtistService
+from app.services.base_service import BaseService
+from app.utils.query_params import QueryParams
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+def _insert_artists(*artists):
+    from app.db.mongodb import get_collection
+    get_collection("artists").insert_many([dict(artist) for artist in artists])
+
+
+class TestRecordProcessing:
+    """列表查询的记录处理"""
+
+    def test_projection_excludes_object_id(self, mongo):
+        """_id 由查询投影排除"""
+        _insert_artists({"id": "a1", "name": "Ada"}, {"id": "a2", "name": "Grace"})
+
+        response = ArtistService.get_all(QueryParams())
+
+        assert [artist["id"] for artist in response.data] == ["a1", "a2"]
+        assert all("_id" not in artist for artist in response.data)
+        assert "_id" not in ArtistService.get_by_id("a1").data
+
+    def test_legacy_nan_is_scrubbed(self, mongo):
+        """未清理的集合仍将 NaN 转为 None"""
+        _insert_artists({"id": "a1", "name": "Ada", "birth_year": float("nan")})
+
+        artists = ArtistService.search_artists("Ada")
+
+        assert artists[0]["birth_year"] is None
+
+    def test_repair_marks_collection_nan_free(self, mongo):
+        """清理后写入标记，后续读取跳过 NaN 检查"""
+        _insert_artists(
+            {"id": "a1", "name": "Ada", "birth_year": float("nan")},
+            {"id": "a2", "name": "Grace", "birth_year": 1906},
+        )
+
+        assert ArtistService._may_contain_nan() is True
+        assert ArtistService.repair_nan_values() == 1
+        assert ArtistService._may_contain_nan() is False
+
+        # 标记保存在数据库中，缓存清空后仍然有效
+        BaseService.reset_state()
+        assert ArtistService._may_contain_nan() is False
+        assert ArtistService.repair_nan_values() == 0
+        assert ArtistService.get_by_id("a1").data["birth_year"] is None
+
+    def test_import_from_csv_drops_empty_cells(self, mongo, tmp_path):
+        """CSV 中的空单元格不会以 NaN 写入数据库"""
+        csv_path = tmp_path / "artists.csv"
+        csv_path.write_text("id,name,birth_year\na1,Ada,1815\na2,Grace,\n", encoding="utf-8")
+
+        response = ArtistService.import_from_csv(str(csv_path))
+
+        assert response.success
+        from app.db.mongodb import get_collection
+        stored = {doc["id"]: doc for doc in get_collection("artists").find({}, {"_id": 0})}
+        assert stored["a1"]["birth_year"] == 1815
+        assert "birth_year" not in stored["a2"]
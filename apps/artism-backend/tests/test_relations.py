@@ -0,0 +1,119 @@
+"""
+include 关联填充测试
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.artist_service import ArtistService
+from app.services.artwork_service import ArtworkService
+from app.services.art_movement_service import ArtMovementService
+from app.utils.query_params import QueryParams
+
+
+@pytest.fixture(autouse=True)
+def records(mongo):
+    """准备两位艺术家及其作品和流派"""
+    ArtMovementService.create({"id": "m1", "name": "Cubism", "start_year": 1907})
+    for index in range(1, 4):
+        ArtworkService.create({"id": f"w{index}", "title": f"Work {index}", "artist_id": "a1", "movement_ids": ["m1"]})
+    ArtistService.create({"id": "a1", "name": "Ada", "notable_works": ["w2", "missing", "w1"],
+                          "associated_movements": ["m1"]})
+    ArtistService.create({"id": "a2", "name": "Grace", "notable_works": ["w3", "w1"]})
+
+
+class RecordingCollection:
+    """记录 find 调用的集合代理"""
+
+    def __init__(self, collection, recorded):
+        self._collection = collection
+        self._recorded = recorded
+
+    def find(self, *args, **kwargs):
+        self._recorded.append((self._collection.name, args[0] if args else kwargs.get("filter")))
+        return self._collection.find(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+@pytest.fixture
+def finds(monkeypatch):
+    """记录服务层的 find 查询"""
+    import app.services.base_service as base_service
+    recorded = []
+    original = base_service.get_collection
+    monkeypatch.setattr(base_service, "get_collection", lambda name: RecordingCollection(original(name), recorded))
+    return recorded
+
+
+class TestPopulate:
+    """关联填充"""
+
+    def test_one_query_per_relation(self, finds):
+        """一页记录的每种关联只执行一次 $in 查询，保持 ID 顺序并跳过不存在的 ID"""
+        page = ArtistService.get_all(QueryParams(include="notableWorks,associated_movements", sortBy="name"))
+
+        ada, grace = page.data
+        assert [work["id"] for work in ada["included"]["notableWorks"]] == ["w2", "w1"]
+        assert [work["id"] for work in grace["included"]["notableWorks"]] == ["w3", "w1"]
+        assert ada["included"]["associatedMovements"] == [{"id": "m1", "name": "Cubism", "start_year": 1907}]
+        assert set(ada["included"]["notableWorks"][0]) == {"id", "title"}
+
+        related = [(name, query) for name, query in finds if name != "artists"]
+        assert len(related) == 2
+        assert sorted(related[0][1]["id"]["$in"]) == ["missing", "w1", "w2", "w3"]
+
+    def test_scalar_relation_and_unknown_names(self):
+        """单值关联填充为记录，未知的名称忽略"""
+        artwork = ArtworkService.get_by_id("w1", include="artist,unknown").data
+
+        assert artwork["included"] == {"artist": {"id": "a1", "name": "Ada"}}
+
+    def test_fields_keep_relation_ids_hidden(self):
+        """限定返回字段时仍能填充，但不返回未请求的 ID 字段"""
+        page = ArtistService.get_all(QueryParams(fields="id,name", include="notableWorks", sortBy="name"))
+
+        assert "notable_works" not in page.data[0]
+        assert len(page.data[0]["included"]["notableWorks"]) == 2
+
+    def test_fan_out_capped(self, monkeypatch):
+        """每条记录展开的 ID 数受限"""
+        import app.services.base_service as base_service
+        monkeypatch.setattr(base_service, "INCLUDE_MAX_PER_RECORD", 1)
+
+        artist = ArtistService.get_by_id("a2", include="notableWorks").data
+
+        assert [work["id"] for work in artist["included"]["notableWorks"]] == ["w3"]
+
+    def test_no_include_leaves_records_unchanged(self):
+        """未请求 include 时不添加 included 字段"""
+        assert "included" not in ArtistService.get_by_id("a1").data
+
+
+class TestInvalidation:
+    """关联集合变化时的缓存失效"""
+
+    def test_list_cache_follows_related_writes(self):
+        """关联集合写入后，带 include 的列表缓存失效"""
+        params = QueryParams(include="notableWorks", sortBy="name")
+        assert ArtistService.get_all(params).data[0]["included"]["notableWorks"][0]["title"] == "Work 2"
+
+        ArtworkService.update("w2", {"title": "Renamed"})
+
+        assert ArtistService.get_all(params).data[0]["included"]["notableWorks"][0]["title"] == "Renamed"
+
+    def test_detail_etag_includes_related_versions(self):
+        """详情 ETag 包含关联集合的版本号"""
+        from app import create_app
+        client = TestClient(create_app())
+
+        first = client.get("/api/v1/artists/a1?include=notableWorks")
+        assert first.json()["data"]["included"]["notableWorks"][0]["id"] == "w2"
+        etag = first.headers["etag"]
+        assert client.get("/api/v1/artists/a1?include=notableWorks", headers={"If-None-Match": etag}).status_code == 304
+
+        ArtworkService.update("w2", {"title": "Renamed"})
+        changed = client.get("/api/v1/artists/a1?include=notableWorks", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["data"]["included"]["notableWorks"][0]["title"] == "Renamed"
@@ -0,0 +1,128 @@
+"""
+请求合并测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.utils.singleflight import SingleFlight, singleflight, singleflight_group
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    """每个测试清空全局统计"""
+    singleflight_group.reset()
+    yield
+    singleflight_group.reset()
+
+
+def run_concurrently(count, func):
+    """在 count 个线程中同时调用 func，返回线程和结果列表"""
+    results = [None] * count
+
+    def target(index):
+        try:
+            results[index] = func()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    """合并组"""
+
+    def test_concurrent_calls_share_result(self):
+        """正在执行时到达的相同调用等待并共享结果"""
+        group = SingleFlight(enabled=True)
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+
+        def compute():
+            executions.append(1)
+            started.set()
+            release.wait(5)
+            return {"value": 42}
+
+        leader, leader_results = run_concurrently(1, lambda: group.do("k", compute, "compute"))
+        started.wait(5)
+        waiters, results = run_concurrently(4, lambda: group.do("k", compute, "compute"))
+        while group.stats()["compute"]["calls"] < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in leader + waiters:
+            thread.join(5)
+
+        assert len(executions) == 1
+        assert all(result is leader_results[0] for result in results)
+        assert group.stats()["compute"] == {"calls": 5, "executions": 1, "deduplicated": 4}
+        assert group.in_flight() == 0
+
+    def test_error_shared_and_not_cached(self):
+        """异常传递给所有等待的调用，之后的调用重新执行"""
+        group = SingleFlight(enabled=True)
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        leader, leader_results = run_concurrently(1, lambda: group.do("k", fail))
+        started.wait(5)
+        waiters, results = run_concurrently(2, lambda: group.do("k", fail))
+        while group.stats()[""]["calls"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in leader + waiters:
+            thread.join(5)
+
+        assert all(isinstance(result, ValueError) for result in leader_results + results)
+        assert group.do("k", lambda: "ok") == "ok"
+
+    def test_recursive_call_runs_directly(self):
+        """同一线程内相同键的递归调用不等待自己"""
+        group = SingleFlight(enabled=True)
+
+        def outer():
+            return group.do("k", lambda: "inner") + "-outer"
+
+        assert group.do("k", outer) == "inner-outer"
+
+
+class TestDecorator:
+    """装饰器"""
+
+    def test_keyed_by_function_and_args(self, monkeypatch):
+        """不同参数不合并，不可哈希的参数直接执行"""
+        calls = []
+
+        class Service:
+            @classmethod
+            @singleflight
+            def lookup(cls, value):
+                calls.append(value)
+                return value
+
+        assert Service.lookup(1) == 1
+        assert Service.lookup([2]) == [2]
+        assert calls == [1, [2]]
+        assert singleflight_group.stats()["TestDecorator.test_keyed_by_function_and_args.<locals>.Service.lookup"][
+            "executions"] == 1
+
+    def test_metrics_exported(self):
+        """合并次数在 /metrics 导出"""
+        from fastapi.testclient import TestClient
+        from app import create_app
+
+        singleflight_group.do("k", lambda: None, "exported")
+        text = TestClient(create_app()).get("/metrics").text
+
+        assert 'singleflight_deduplicated_total{function="exported"} 0' in text
@@ -0,0 +1,100 @@
+"""
+启动初始化与版本化迁移测试
+"""
+
+import pytest
+
+from app.utils import migrations
+from app.utils.startup import StartupState, start_background_initialization, wait_for_startup
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+class TestMigrations:
+    """迁移注册表"""
+
+    def test_migrations_run_once(self, mongo):
+        """已执行的迁移记录在 _migrations 集合中，再次启动时跳过"""
+        from app.db.mongodb import get_collection
+        get_collection("artists").insert_one({"id": "a1", "name": "Ada"})
+
+        first = migrations.run_pending_migrations()
+        second = migrations.run_pending_migrations()
+
+        assert first == [item.name for item in migrations.get_migrations()]
+        assert second == []
+        assert get_collection("artists").find_one({"id": "a1"})["tags"] == []
+        assert set(migrations.get_applied_versions()) == {item.version for item in migrations.get_migrations()}
+
+    def test_claimed_migration_is_skipped(self, mongo):
+        """其他进程正在执行的迁移不会重复执行"""
+        from app.db.mongodb import get_collection
+        from datetime import datetime
+        get_collection("_migrations").insert_one(
+            {"_id": 1, "name": "add_timestamps", "status": "running", "started_at": datetime.utcnow()}
+        )
+
+        executed = migrations.run_pending_migrations()
+
+        assert "add_timestamps" not in executed
+        assert "migrate_to_new_schema" in executed
+
+    def test_failed_migration_is_retried(self, mongo, monkeypatch):
+        """失败的迁移不留下记录，下次启动重试"""
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        monkeypatch.setitem(migrations._registry, 99, migrations.Migration(99, "broken", broken))
+        monkeypatch.setattr(migrations, "_load_builtin_migrations", lambda: None)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                migrations.run_pending_migrations()
+
+        assert len(calls) == 2
+        assert 99 not in migrations.get_applied_versions()
+
+    def test_migrate_endpoint_uses_registry(self, mongo):
+        """迁移端点经过注册表执行并返回本次执行的迁移，再次调用不重复执行"""
+        from fastapi.testclient import TestClient
+        from app import create_app
+
+        client = TestClient(create_app())
+        first = client.post("/api/v1/database/migrate").json()["data"]["applied"]
+        second = client.post("/api/v1/database/migrate").json()["data"]["applied"]
+
+        assert first == [item.name for item in migrations.get_migrations()]
+        assert second == []
+        assert set(migrations.get_applied_versions()) == {item.version for item in migrations.get_migrations()}
+
+
+class TestBackgroundStartup:
+    """后台初始化"""
+
+    def test_background_initialization_reports_readiness(self, mongo):
+        """初始化在后台线程执行，完成后状态为 ready"""
+        assert StartupState.snapshot()["status"] == "pending"
+
+        assert start_background_initialization() is True
+        assert start_background_initialization() is False
+        assert wait_for_startup(timeout=30) is True
+
+        status = StartupState.snapshot()
+        assert status["ready"] is True
+        assert all(step["status"] == "done" for step in status["steps"].values())
+        assert set(status["steps"]) == set(StartupState.STEPS)
+
+    def test_startup_status_endpoint(self, mongo):
+        """启动状态端点不访问数据库即可返回"""
+        from fastapi.testclient import TestClient
+        from app import create_app
+
+        client = TestClient(create_app())
+        response = client.get("/api/v1/database/startup-status")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "pending"
@@ -0,0 +1,124 @@
+"""
+热门帖子排行测试
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas.post import PostCreate
+from app.services.like_counter_service import LikeCounterService
+from app.services.post_service import PostService
+from app.services.trending_service import TrendingService
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+def _create_post(title):
+    return PostService.create_post(PostCreate(title=title, content="...", author_id="artist-1"))
+
+
+class TestTrendingService:
+    """时间衰减热度排行"""
+
+    def test_interactions_raise_rank(self):
+        """评论和点赞多的帖子排在前面"""
+        quiet = _create_post("Quiet")
+        busy = _create_post("Busy")
+        liked = _create_post("Liked")
+        PostService.increment_comments(busy["id"])
+        PostService.increment_likes(liked["id"])
+
+        titles = [p["title"] for p in PostService.get_trending_posts(limit=3)]
+
+        assert titles == ["Busy", "Liked", "Quiet"]
+
+    def test_recent_activity_beats_old_activity(self):
+        """同样的互动量，越近发生热度越高"""
+        TrendingService._ensure_loaded()
+        TrendingService.record("old", "like", count=10, at=datetime.utcnow() - timedelta(days=3))
+        TrendingService.record("fresh", "like", count=2)
+
+        ranked = TrendingService.top(2)
+
+        assert [post_id for post_id, _ in ranked] == ["fresh", "old"]
+        assert ranked[0][1] == pytest.approx(2, rel=1e-3)
+        # 3 天 = 12 个半衰期
+        assert ranked[1][1] == pytest.approx(10 / 2 ** 12, rel=1e-2)
+
+    def test_stats_use_trending_ranking(self):
+        """帖子统计中的最活跃帖子来自热度排行"""
+        first = _create_post("First")
+        _create_post("Second")
+        PostService.increment_comments(first["id"])
+
+        stats = PostService.get_post_stats()
+
+        assert stats.most_active_posts[0]["id"] == first["id"]
+        assert "trending_score" in stats.most_active_posts[0]
+
+    def test_loads_existing_counters(self):
+        """首次使用时根据已有帖子的计数器初始化"""
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow().isoformat()
+        get_collection("posts").insert_many([
+            {"id": "a", "author_id": "x", "title": "A", "content": "...", "likes_count": 1, "created_at": now},
+            {"id": "b", "author_id": "x", "title": "B", "content": "...", "likes_count": 9, "created_at": now},
+        ])
+
+        assert [post_id for post_id, _ in TrendingService.top(2)] == ["b", "a"]
+
+    def test_first_like_after_startup_counts_once(self):
+        """启动后的第一次点赞（尚在缓冲中）触发初始化时计入且只计入一次"""
+        from app.core.config import TRENDING_WEIGHT_LIKE, TRENDING_WEIGHT_POST
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow()
+        get_collection("posts").insert_many([
+            {"id": post_id, "author_id": "x", "title": post_id, "content": "...", "likes_count": 0, "created_at": now}
+            for post_id in ("a", "b")
+        ])
+        LikeCounterService.add("b", 3)
+
+        assert PostService.increment_likes("a") is True
+
+        scores = dict(TrendingService.top(2))
+        assert scores["a"] == pytest.approx(TRENDING_WEIGHT_POST + TRENDING_WEIGHT_LIKE, rel=1e-3)
+        assert scores["b"] == pytest.approx(TRENDING_WEIGHT_POST + 3 * TRENDING_WEIGHT_LIKE, rel=1e-3)
+
+    def test_deleted_posts_leave_ranking(self):
+        """删除的帖子从排行中移除"""
+        post = _create_post("Gone")
+        PostService.delete_post(post["id"])
+
+        assert PostService.get_trending_posts(limit=5) == []
+
+    def test_skips_posts_beyond_decay_horizon(self):
+        """初始化只读取衰减范围内的帖子"""
+        from app.db.mongodb import get_collection
+        now = datetime.utcnow()
+        get_collection("posts").insert_many([
+            {"id": "recent", "author_id": "x", "title": "R", "content": "...", "likes_count": 1, "created_at": now},
+            {"id": "ancient", "author_id": "x", "title": "A", "content": "...", "likes_count": 1000,
+             "created_at": now - timedelta(days=365)},
+        ])
+
+        assert [post_id for post_id, _ in TrendingService.top(5)] == ["recent"]
+
+    def test_failed_load_is_retried(self, monkeypatch):
+        """初始化失败时不标记为已加载，下次使用时重试"""
+        from app.db.mongodb import get_collection
+        get_collection("posts").insert_one(
+            {"id": "a", "author_id": "x", "title": "A", "content": "...", "likes_count": 2, "created_at": datetime.utcnow()}
+        )
+
+        def unavailable(post_ids):
+            raise RuntimeError("buffer unavailable")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(LikeCounterService, "get_unflushed_counts", unavailable)
+            assert TrendingService.top(5) == []
+            TrendingService.record("a", "like")
+
+        assert [post_id for post_id, _ in TrendingService.top(5)] == ["a"]
+        assert TrendingService.top(5)[0][1] == pytest.approx(3, rel=1e-3)
@@ -0,0 +1,120 @@
+"""
+UUID 主键存储模式测试
+"""
+
+import uuid
+
+import pytest
+from bson import ObjectId
+from bson.binary import Binary, UUID_SUBTYPE
+
+from app.schemas.comment import CommentCreate, CommentUpdate
+from app.schemas.post import PostCreate
+from app.services.comment_service import CommentService
+from app.services.post_service import PostService
+from app.utils import migrations, primary_key
+from app.utils.database_setup import DatabaseMigration, DatabaseSetup
+
+
+@pytest.fixture(autouse=True)
+def uuid_mode(mongo, monkeypatch):
+    """开启 UUID 主键模式"""
+    monkeypatch.setattr(primary_key, "UUID_PRIMARY_KEYS", True)
+
+
+def insert_legacy_post(db, post_id=None):
+    """插入旧格式（ObjectId _id + 字符串 id）的帖子"""
+    post_id = post_id or str(uuid.uuid4())
+    db["posts"].insert_one({"id": post_id, "title": "Old", "content": "Body", "author_id": "a1",
+                            "comments_count": 0, "likes_count": 0, "views_count": 0})
+    return post_id
+
+
+class TestStorage:
+    """读写"""
+
+    def test_id_stored_as_binary_uuid(self, mongo):
+        """新文档以二进制 UUID 作为 _id，不再保存 id 字段，响应中的 id 和 _id 相同"""
+        post = PostService.create_post(PostCreate(title="Post", content="Body", author_id="a1"))
+        document = mongo["posts"].find_one()
+
+        assert isinstance(document["_id"], Binary) and document["_id"].subtype == UUID_SUBTYPE
+        assert "id" not in document
+        assert document["_id"].as_uuid() == uuid.UUID(post["id"])
+        assert post["_id"] == post["id"]
+        assert PostService.get_post_by_id(post["id"])["title"] == "Post"
+        assert PostService.increment_comments(post["id"]) is True
+        assert PostService.get_recent_posts()[0]["_id"] == post["id"]
+
+    def test_comment_lifecycle(self):
+        """评论按 id 读取、更新、删除，列表返回字符串 id"""
+        comment = CommentService.create_comment(CommentCreate(
+            content="Nice", author_id="a2", target_type="post", target_id="p1"))
+
+        assert CommentService.get_comments_by_target("post", "p1")[0]["id"] == comment["id"]
+        assert CommentService.update_comment(comment["id"], CommentUpdate(content="Edited"))["content"] == "Edited"
+        assert CommentService.delete_comment(comment["id"]) is True
+        assert CommentService.get_comment_by_id(comment["id"]) is None
+
+    def test_legacy_documents_still_readable(self, mongo):
+        """迁移前写入的旧格式文档仍能按 id 读取和更新"""
+        post_id = insert_legacy_post(mongo)
+
+        post = PostService.get_post_by_id(post_id)
+
+        assert post["id"] == post_id and ObjectId.is_valid(post["_id"])
+        assert PostService.increment_comments(post_id) is True
+        assert PostService.delete_post(post_id) is True
+
+    def test_id_index_becomes_sparse(self, mongo):
+        """开启后默认的 id_1 索引替换为稀疏索引，新格式文档不会违反唯一约束"""
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(primary_key, "UUID_PRIMARY_KEYS", False)
+            DatabaseSetup.create_indexes()
+        assert "id_1" in mongo["posts"].index_information()
+
+        DatabaseSetup.create_indexes()
+        PostService.create_post(PostCreate(title="One", content="Body", author_id="a1"))
+        PostService.create_post(PostCreate(title="Two", content="Body", author_id="a1"))
+
+        indexes = mongo["posts"].index_information()
+        assert "id_1" not in indexes and indexes[primary_key.LEGACY_ID_INDEX]["sparse"] is True
+        assert mongo["posts"].count_documents({}) == 2
+
+
+class TestMigration:
+    """主键迁移"""
+
+    def test_rewrites_legacy_documents(self, mongo):
+        """旧文档改写为新格式，动态流 post_oid 同步更新，非 UUID 的 id 保持原样"""
+        post_id = insert_legacy_post(mongo)
+        mongo["post_feed"].insert_one({"id": post_id, "post_oid": "old", "feed_key": "k"})
+        insert_legacy_post(mongo, "not-a-uuid")
+        mongo["comments"].insert_many([{"id": str(uuid.uuid4()), "content": f"c{index}"} for index in range(5)])
+
+        assert DatabaseMigration.migrate_uuid_primary_keys(batch_size=2) == 6
+
+        document = mongo["posts"].find_one({"_id": Binary.from_uuid(uuid.UUID(post_id))})
+        assert document["title"] == "Old" and "id" not in document
+        assert mongo["posts"].find_one({"id": "not-a-uuid"}) is not None
+        assert mongo["post_feed"].find_one({"id": post_id})["post_oid"] == post_id
+        assert mongo["comments"].count_documents({"id": {"$exists": True}}) == 0
+        assert PostService.get_post_by_id(post_id)["title"] == "Old"
+        assert DatabaseMigration.migrate_uuid_primary_keys(batch_size=2) == 0
+
+    def test_resumes_after_partial_batch(self, mongo):
+        """新文档已写入、旧文档未删除时再次执行，删除剩余的旧文档"""
+        post_id = insert_legacy_post(mongo)
+        legacy = mongo["posts"].find_one({"id": post_id})
+        mongo["posts"].insert_one(primary_key.prepare_document({key: value for key, value in legacy.items()
+                                                                if key != "_id"}))
+
+        assert DatabaseMigration.migrate_uuid_primary_keys() == 1
+        assert mongo["posts"].count_documents({}) == 1
+
+    def test_registered_only_when_enabled(self, monkeypatch):
+        """迁移只在开启 UUID 主键模式时注册"""
+        assert "migrate_uuid_primary_keys" in [item.name for item in migrations.get_migrations()]
+
+        monkeypatch.setattr(primary_key, "UUID_PRIMARY_KEYS", False)
+        assert "migrate_uuid_primary_keys" not in [item.name for item in migrations.get_migrations()]
@@ -0,0 +1,134 @@
+"""
+预热与就绪检查测试
+"""
+
+import pytest
+
+from app.models.artwork import Artwork
+from app.services.artist_service import ArtistService
+from app.services.artwork_service import ArtworkService
+from app.utils.warmup import Warmup, warmup
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+def _seed_artworks():
+    from app.db.mongodb import get_collection
+    get_collection("artworks").insert_many([
+        {"id": "w1", "title": "One", "style_vector": [1.0, 0.0, 0.0]},
+        {"id": "w2", "title": "Two", "style_vector": [0.9, 0.1, 0.0]},
+        {"id": "w3", "title": "Three", "style_vector": [0.0, 1.0, 0.0]},
+        {"id": "w4", "title": "Four", "style_vector": [0.8, 0.3, 0.1]},
+    ])
+
+
+class TestWarmupRegistry:
+    """预热注册表"""
+
+    def test_components_run_and_report(self):
+        """各组件并行执行并记录结果"""
+        registry = Warmup(max_workers=2)
+        registry.register("a", lambda: 1)
+        registry.register("b", lambda: 2)
+
+        components = registry.run([])
+
+        assert registry.is_ready()
+        assert {name: c["result"] for name, c in components.items()} == {"a": 1, "b": 2}
+        assert all(c["status"] == "ready" for c in components.values())
+
+    def test_required_failure_blocks_readiness(self):
+        """必需组件失败时不就绪，可选组件失败不影响"""
+        def broken():
+            raise RuntimeError("boom")
+
+        registry = Warmup()
+        registry.register("optional", broken, required=False)
+        registry.register("ok", lambda: True)
+        registry.run([])
+        assert registry.is_ready()
+
+        registry.register("required", broken)
+        registry.run([])
+        assert not registry.is_ready()
+        assert registry.components()["required"]["error"] == "boom"
+
+    def test_component_selection(self):
+        """只执行选中的组件"""
+        calls = []
+        registry = Warmup()
+        registry.register("a", lambda: calls.append("a"))
+        registry.register("b", lambda: calls.append("b"))
+
+        registry.run(["b", "missing"])
+
+        assert calls == ["b"]
+        assert set(registry.components()) == {"b"}
+
+
+class TestWarmedCaches:
+    """预热加载的缓存"""
+
+    def test_artist_profile_cache(self, mongo):
+        """资料缓存命中后不再查询，更新后失效"""
+        from app.db.mongodb import get_collection
+        get_collection("artists").insert_one({"id": "a1", "name": "Ada"})
+
+        assert ArtistService.preload_profiles() == 1
+        get_collection("artists").update_one({"id": "a1"}, {"$set": {"name": "Changed directly"}})
+        assert ArtistService.get_profile("a1")["name"] == "Ada"
+
+        ArtistService.update("a1", {"name": "Grace"})
+        assert ArtistService.get_profile("a1")["name"] == "Grace"
+        assert ArtistService.get_profile("missing") is None
+
+    def test_style_index_matches_direct_similarity(self, mongo):
+        """风格向量索引的结果与逐条计算一致"""
+        _seed_artworks()
+        assert ArtworkService.build_style_index() == 4
+
+        similar = ArtworkService.get_similar_artworks("w1", threshold=0.8, limit=10)
+
+        vectors = {"w2": [0.9, 0.1, 0.0], "w4": [0.8, 0.3, 0.1]}
+        expected = sorted(vectors, key=lambda i: Artwork.calculate_style_similarity([1.0, 0.0, 0.0], vectors[i]),
+                          reverse=True)
+        assert [a["id"] for a in similar] == expected
+        assert all("_id" not in a for a in similar)
+        assert similar[0]["similarity_score"] == pytest.approx(
+            Artwork.calculate_style_similarity([1.0, 0.0, 0.0], vectors[expected[0]]))
+
+    def test_style_index_follows_vector_updates(self, mongo):
+        """更新风格向量后索引同步更新"""
+        _seed_artworks()
+        ArtworkService.build_style_index()
+
+        ArtworkService.update_style_vector("w3", [1.0, 0.0, 0.0])
+
+        assert "w3" in [a["id"] for a in ArtworkService.get_similar_artworks("w1", threshold=0.99)]
+
+
+class TestHealthEndpoints:
+    """健康检查端点"""
+
+    def test_live_and_ready(self, mongo):
+        """预热完成前 ready 返回 503，完成后返回 200"""
+        from fastapi.testclient import TestClient
+        from app import create_app
+        from app.utils.startup import wait_for_startup
+
+        client = TestClient(create_app())
+        assert client.get("/health/live").json() == {"status": "alive"}
+
+        not_ready = client.get("/health/ready")
+        assert not_ready.status_code == 503
+
+        with TestClient(create_app()) as started:
+            assert warmup.wait(timeout=30)
+            assert wait_for_startup(timeout=30)
+            ready = started.get("/health/ready")
+
+        assert ready.status_code == 200
+        components = ready.json()["components"]
+        assert components["startup"]["status"] == "ready"
+        assert {"mongodb", "artist_profiles", "style_vectors", "feed", "trending"} <= set(components)
@@ -0,0 +1,137 @@
+"""
+BaseService 写入路径测试
+"""
+
+import pytest
+
+from app.services.artist_service import ArtistService
+
+
+class CountingCollection:
+    """记录集合方法调用的代理"""
+
+    def __init__(self, collection, calls):
+        self._collection = collection
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if callable(attr) and not name.startswith("_"):
+            def wrapper(*args, **kwargs):
+                self._calls.append(name)
+                return attr(*args, **kwargs)
+            return wrapper
+        return attr
+
+
+pytestmark = pytest.mark.usefixtures("mongo")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """统计服务层对集合的调用"""
+    import app.services.base_service as base_service
+    recorded = []
+    original = base_service.get_collection
+    monkeypatch.setattr(base_service, "get_collection", lambda name: CountingCollection(original(name), recorded))
+    return recorded
+
+
+class TestCreate:
+    """创建"""
+
+    def test_single_insert(self, calls):
+        """创建只需一次写入，不再先查询"""
+        # NaN 标记每个进程只读取一次，不计入
+        ArtistService._may_contain_nan()
+        calls.clear()
+
+        response = ArtistService.create({"id": "a1", "name": "Ada"})
+
+        assert response.code == 201
+        assert "_id" not in response.data
+        assert [name for name in calls if name != "create_index"] == ["insert_one"]
+
+    def test_duplicate_id_conflict(self):
+        """重复 ID 由唯一索引拒绝并返回 409"""
+        assert ArtistService.create({"id": "a1", "name": "Ada"}).code == 201
+
+        response = ArtistService.create({"id": "a1", "name": "Grace"})
+
+        assert response.code == 409
+        assert ArtistService.get_by_id("a1").data["name"] == "Ada"
+
+    def test_duplicate_rejected_after_indexes_dropped(self):
+        """删除索引后再次写入时重新创建唯一索引"""
+        from app.utils.database_setup import DatabaseSetup
+        assert ArtistService.create({"id": "a1", "name": "Ada"}).code == 201
+
+        DatabaseSetup.drop_indexes()
+
+        assert ArtistService.create({"id": "dup", "name": "Ada"}).code == 201
+        assert ArtistService.create({"id": "dup", "name": "Grace"}).code == 409
+
+    def test_validation_before_insert(self, calls):
+        """验证失败时不写入"""
+        assert ArtistService.create({"id": "a1", "name": " "}).code == 400
+        assert "insert_one" not in calls
+
+
+class TestUpdate:
+    """更新"""
+
+    def test_single_round_trip(self, calls):
+        """读取验证后写入一次，返回合并后的记录"""
+        ArtistService.create({"id": "a1", "name": "Ada", "nationality": "UK"})
+        calls.clear()
+
+        response = ArtistService.update("a1", {"name": "Grace"})
+
+        assert response.success
+        assert response.data["name"] == "Grace"
+        assert response.data["nationality"] == "UK"
+        assert "_id" not in response.data
+        assert calls == ["find_one", "update_one"]
+
+    def test_missing_record(self):
+        """记录不存在返回 404"""
+        assert ArtistService.update("missing", {"name": "Grace"}).code == 404
+
+    def test_validation_failure_does_not_write(self, calls):
+        """验证失败时不写入，也不更新集合版本"""
+        from app.utils.collection_versions import CollectionVersions
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        version = CollectionVersions.get("artists")
+        calls.clear()
+
+        response = ArtistService.update("a1", {"name": "", "nickname": "x"})
+
+        assert response.code == 400
+        assert calls == ["find_one"]
+        assert CollectionVersions.get("artists") == version
+        record = ArtistService.get_by_id("a1").data
+        assert record["name"] == "Ada"
+        assert "nickname" not in record
+
+    def test_fields_outside_schema_survive_failed_update(self, mongo):
+        """更新模式接受、响应模型不含的字段在验证失败后仍保留，响应中不输出"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        response = ArtistService.update("a1", {"image_url": "https://example.com/a.png"})
+        assert response.success and "image_url" not in response.data
+
+        assert ArtistService.update("a1", {"name": "", "image_url": "https://example.com/b.png"}).code == 400
+
+        assert mongo["artists"].find_one({"id": "a1"})["image_url"] == "https://example.com/a.png"
+
+
+class TestDelete:
+    """删除"""
+
+    def test_single_round_trip(self, calls):
+        """删除一次往返"""
+        ArtistService.create({"id": "a1", "name": "Ada"})
+        calls.clear()
+
+        assert ArtistService.delete("a1").success
+        assert calls == ["find_one_and_delete"]
+        assert ArtistService.delete("a1").code == 404